@@ -0,0 +1,105 @@
+import logging
+import os
+import time
+from typing import Optional
+
+import numpy as np
+
+from aind_behavior_dynamic_foraging.task_logic.interventions.bias_intervention import BiasThreshold
+from aind_behavior_dynamic_foraging.task_logic.trial_generators import CoupledTrialGeneratorSpec
+from aind_behavior_dynamic_foraging.task_logic.trial_models import TrialOutcome
+from aind_behavior_dynamic_foraging.task_logic.utils.bias_estimators import BIAS_ESTIMATORS, create_bias_estimator
+
+logging.basicConfig(level=logging.INFO)
+logging.getLogger("aind_behavior_dynamic_foraging").setLevel(logging.ERROR)
+logger = logging.getLogger(__name__)
+
+REFERENCE_ESTIMATOR = "logistic_regression"
+
+
+def simulate_session(n_trials: int, seed: int) -> list[TrialOutcome]:
+    """Simulate a session of a coupled trial generator with a biased, reward-following subject."""
+    rng = np.random.default_rng(seed)
+    generator = CoupledTrialGeneratorSpec().create_generator(seed=seed)
+    side_bias = rng.normal(0, 1.5)
+    value = np.zeros(2)
+    outcomes = []
+    for _ in range(n_trials):
+        trial = generator.next()
+        if trial is None:
+            break
+        if rng.random() < 0.1:
+            outcome = TrialOutcome(trial=trial, is_right_choice=None, is_rewarded=False)
+        else:
+            is_right = bool(rng.random() < 1 / (1 + np.exp(-(side_bias + 3 * (value[1] - value[0])))))
+            p_reward = trial.p_reward_right if is_right else trial.p_reward_left
+            outcome = TrialOutcome(trial=trial, is_right_choice=is_right, is_rewarded=bool(rng.random() < p_reward))
+            value[int(is_right)] += 0.3 * (outcome.is_rewarded - value[int(is_right)])
+        generator.update(outcome)
+        outcomes.append(outcome)
+    return outcomes
+
+
+def load_session(data_directory: os.PathLike) -> list[TrialOutcome]:
+    """Load the trial outcomes of a recorded session."""
+    from aind_behavior_dynamic_foraging.data_contract import dataset as df_foraging_dataset
+
+    trial_outcomes = df_foraging_dataset(data_directory)["Behavior"]["SoftwareEvents"]["TrialOutcome"]
+    return [TrialOutcome.model_validate(outcome) for outcome in trial_outcomes.data["data"].iloc]
+
+
+def run_estimator(name: str, outcomes: list[TrialOutcome], window_length: int) -> tuple[np.ndarray, float]:
+    """Return the per-trial bias trajectory and the mean update cost in microseconds."""
+    estimator = create_bias_estimator(name, window_length)
+    bias = np.empty(len(outcomes))
+    t0 = time.perf_counter()
+    for i, outcome in enumerate(outcomes):
+        bias[i] = estimator.update(outcome)
+    return bias, (time.perf_counter() - t0) * 1e6 / max(len(outcomes), 1)
+
+
+def benchmark(sessions: list[list[TrialOutcome]], window_length: int = 200) -> None:
+    """Log per-trial cost and agreement with the reference estimator for every registered estimator.
+
+    Agreement is the correlation with the reference trajectory and the fraction of trials on
+    which both estimators take the same bias intervention decision (outside the upper threshold,
+    inside the lower threshold, or in between).
+    """
+    threshold = BiasThreshold()
+
+    def decision(bias: np.ndarray) -> np.ndarray:
+        return np.where(np.abs(bias) >= threshold.upper, np.sign(bias), np.where(np.abs(bias) < threshold.lower, 0, 2))
+
+    reference = [run_estimator(REFERENCE_ESTIMATOR, outcomes, window_length)[0] for outcomes in sessions]
+    logger.info("%-32s %12s %12s %12s", "estimator", "us/trial", "correlation", "decisions")
+    for name in BIAS_ESTIMATORS:
+        results = [run_estimator(name, outcomes, window_length) for outcomes in sessions]
+        bias = np.concatenate([trajectory for trajectory, _ in results])
+        expected = np.concatenate(reference)
+        cost = np.mean([cost for _, cost in results])
+        correlation = np.corrcoef(bias, expected)[0, 1]
+        agreement = np.mean(decision(bias) == decision(expected))
+        logger.info("%-32s %12.1f %12.3f %12.3f", name, cost, correlation, agreement)
+
+
+def main(data_directories: Optional[list[str]] = None, n_simulated: int = 10, n_trials: int = 600) -> None:
+    simulated = [simulate_session(n_trials, seed) for seed in range(n_simulated)]
+    logger.info("Simulated sessions (%d x %d trials)", n_simulated, n_trials)
+    benchmark(simulated)
+
+    if data_directories:
+        recorded = [load_session(directory) for directory in data_directories]
+        logger.info("Recorded sessions (%d)", len(recorded))
+        benchmark(recorded)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark bias estimators on simulated and recorded sessions.")
+    parser.add_argument("--data-directory", nargs="*", default=None, help="Paths to recorded session directories")
+    parser.add_argument("--n-simulated", type=int, default=10, help="Number of simulated sessions")
+    parser.add_argument("--n-trials", type=int, default=600, help="Trials per simulated session")
+    args = parser.parse_args()
+
+    main(args.data_directory, args.n_simulated, args.n_trials)
@@ -1,7 +1,11 @@
+import json
 import logging
 import os
 
+import pandas as pd
+
 from aind_behavior_dynamic_foraging.data_contract import dataset as df_foraging_dataset
+from aind_behavior_dynamic_foraging.data_contract import software_events_table
 from aind_behavior_dynamic_foraging.task_logic.trial_generators.coupled_trial_generators.coupled_warmup_trial_generator import (
     CoupledWarmupTrialGeneratorSpec,
 )
@@ -15,10 +19,7 @@ logger = logging.getLogger(__name__)
 
 def walk_through_session(data_directory: os.PathLike):
     dataset = df_foraging_dataset(data_directory)
-    software_events = dataset["Behavior"]["SoftwareEvents"]
-    software_events.load_all()
-
-    trial_outcomes = software_events["TrialOutcome"].data["data"].iloc
+    trial_outcomes = _to_event_data(software_events_table(dataset, "TrialOutcome"))
     trial_generator = CoupledWarmupTrialGeneratorSpec().create_generator()
     for i, outcome in enumerate(trial_outcomes):
         trial_generator.update(TrialOutcome.model_validate(outcome))
@@ -29,6 +30,32 @@ def walk_through_session(data_directory: os.PathLike):
             return
 
 
+def _to_event_data(table: pd.DataFrame) -> list[dict]:
+    """Rebuild the nested event data of each row of a flat software events table."""
+    records = []
+    for row in json.loads(table.to_json(orient="records", double_precision=15)):
+        record: dict = {}
+        for column, value in row.items():
+            # objects without a Parquet type are stored as JSON strings
+            if isinstance(value, str) and value.startswith(("{", "[")):
+                value = json.loads(value)
+            *parents, leaf = column.split(".")
+            node = record
+            for parent in parents:
+                node = node.setdefault(parent, {})
+            node[leaf] = value
+        records.append({key: _null_objects(value) for key, value in record.items()})
+    return records
+
+
+def _null_objects(value):
+    """Replace the objects whose fields are all null, i.e. null objects of other events, by None."""
+    if not isinstance(value, dict):
+        return value
+    value = {key: _null_objects(field) for key, field in value.items()}
+    return None if value and all(field is None for field in value.values()) else value
+
+
 if __name__ == "__main__":
     import argparse
 
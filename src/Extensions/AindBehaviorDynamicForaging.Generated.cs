@@ -1298,6 +1298,8 @@ namespace AindDynamicForagingDataSchema
     
         private int _biasWindowLength;
     
+        private BiasInterventionParametersBiasEstimator _biasEstimator;
+    
         private double _lickspoutOffsetDelta;
     
         private double _rewardFraction;
@@ -1308,6 +1310,7 @@ namespace AindDynamicForagingDataSchema
             _interventionInterval = 10;
             _maximumWaterCorrections = 5;
             _biasWindowLength = 200;
+            _biasEstimator = BiasInterventionParametersBiasEstimator.LogisticRegression;
             _lickspoutOffsetDelta = 0.05D;
             _rewardFraction = 0.8D;
         }
@@ -1318,6 +1321,7 @@ namespace AindDynamicForagingDataSchema
             _interventionInterval = other._interventionInterval;
             _maximumWaterCorrections = other._maximumWaterCorrections;
             _biasWindowLength = other._biasWindowLength;
+            _biasEstimator = other._biasEstimator;
             _lickspoutOffsetDelta = other._lickspoutOffsetDelta;
             _rewardFraction = other._rewardFraction;
         }
@@ -1391,6 +1395,24 @@ namespace AindDynamicForagingDataSchema
             }
         }
     
+        /// <summary>
+        /// Estimator used to calculate bias. Defaults to the Su2022 logistic regression intercept.
+        /// </summary>
+        [Newtonsoft.Json.JsonPropertyAttribute("bias_estimator")]
+        [System.ComponentModel.DescriptionAttribute("Estimator used to calculate bias. Defaults to the Su2022 logistic regression inte" +
+            "rcept.")]
+        public BiasInterventionParametersBiasEstimator BiasEstimator
+        {
+            get
+            {
+                return _biasEstimator;
+            }
+            set
+            {
+                _biasEstimator = value;
+            }
+        }
+    
         /// <summary>
         /// Distance (mm) to move the stage spouts by. This is a relative distance to the current value, not absolute.
         /// </summary>
@@ -1443,6 +1465,7 @@ namespace AindDynamicForagingDataSchema
             stringBuilder.Append("InterventionInterval = " + _interventionInterval + ", ");
             stringBuilder.Append("MaximumWaterCorrections = " + _maximumWaterCorrections + ", ");
             stringBuilder.Append("BiasWindowLength = " + _biasWindowLength + ", ");
+            stringBuilder.Append("BiasEstimator = " + _biasEstimator + ", ");
             stringBuilder.Append("LickspoutOffsetDelta = " + _lickspoutOffsetDelta + ", ");
             stringBuilder.Append("RewardFraction = " + _rewardFraction);
             return true;
@@ -8221,6 +8244,25 @@ namespace AindDynamicForagingDataSchema
     }
 
 
+    [System.CodeDom.Compiler.GeneratedCodeAttribute("Bonsai.Sgen", "0.9.0.0 (Newtonsoft.Json v13.0.0.0)")]
+    [Newtonsoft.Json.JsonConverter(typeof(Newtonsoft.Json.Converters.StringEnumConverter))]
+    public enum BiasInterventionParametersBiasEstimator
+    {
+    
+        [System.Runtime.Serialization.EnumMemberAttribute(Value="logistic_regression")]
+        LogisticRegression = 0,
+    
+        [System.Runtime.Serialization.EnumMemberAttribute(Value="incremental_logistic_regression")]
+        IncrementalLogisticRegression = 1,
+    
+        [System.Runtime.Serialization.EnumMemberAttribute(Value="choice_rate")]
+        ChoiceRate = 2,
+    
+        [System.Runtime.Serialization.EnumMemberAttribute(Value="beta_binomial")]
+        BetaBinomial = 3,
+    }
+
+
     [System.CodeDom.Compiler.GeneratedCodeAttribute("Bonsai.Sgen", "0.9.0.0 (Newtonsoft.Json v13.0.0.0)")]
     [Newtonsoft.Json.JsonConverter(typeof(Newtonsoft.Json.Converters.StringEnumConverter))]
     public enum SpinnakerCameraColorProcessing
@@ -1,6 +1,6 @@
 import logging
 import sys
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional
 
 from pydantic import TypeAdapter
 
@@ -16,9 +16,12 @@ if TYPE_CHECKING:
     from aind_behavior_dynamic_foraging.task_logic.trial_generators._base import ITrialGenerator
 
 
-def resolve_generator(spec: TrialGeneratorSpec | str) -> "ITrialGenerator":
-    """Resolves and creates the trial generator instance based on the task logic's trial generator model."""
+def resolve_generator(spec: TrialGeneratorSpec | str, seed: Optional[int] = None) -> "ITrialGenerator":
+    """Resolves and creates the trial generator instance based on the task logic's trial generator model.
+
+    The workflow passes the task logic's rng_seed as the seed, which makes the generated trial sequence
+    reproducible. Bonsai marshals the nullable rng_seed as a float, so it is converted back to an integer."""
     if isinstance(spec, str):
         adapter: TypeAdapter[TrialGeneratorSpec] = TypeAdapter(TrialGeneratorSpec)
         spec = adapter.validate_json(spec)
-    return spec.create_generator()
+    return spec.create_generator(None if seed is None else int(seed))
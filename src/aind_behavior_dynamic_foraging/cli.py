@@ -5,7 +5,7 @@ from pydantic_settings import BaseSettings, CliApp, CliSubCommand
 
 from aind_behavior_dynamic_foraging import __semver__, regenerate
 
-from .data_qc import DataQcCli
+from .data_qc import BatchQcCli, DataQcCli, LiveQcCli
 
 
 class VersionCli(RootModel):
@@ -30,6 +30,8 @@ class DynamicForagingCli(BaseSettings, cli_prog_name="dynamic-foraging", cli_keb
         description="Regenerate the dynamic-foraging dsl dependencies.",
     )
     data_qc: CliSubCommand[DataQcCli] = Field(description="Run data quality checks.")
+    batch_qc: CliSubCommand[BatchQcCli] = Field(description="Run data quality checks on many sessions.")
+    live_qc: CliSubCommand[LiveQcCli] = Field(description="Run data quality checks while a session is acquired.")
 
     def cli_cmd(self):
         return CliApp().run_subcommand(self)
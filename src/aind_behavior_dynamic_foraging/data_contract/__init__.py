@@ -5,23 +5,185 @@ from pathlib import Path
 from .. import __semver__
 
 if t.TYPE_CHECKING:
-    from contraqctor.contract import Dataset
+    import pandas as pd
+    from contraqctor.contract import Dataset, DataStream
 
+    from .camera_frames import FrameIndex
 
-def dataset(path: os.PathLike, version: str = __semver__) -> "Dataset":
+
+def dataset(
+    path: os.PathLike,
+    version: str = __semver__,
+    streams: t.Optional[t.Iterable[str]] = None,
+    use_cache: bool = False,
+) -> "Dataset":
     """
     Loads the dataset for an acquisition from an experiment with a specified version.
 
+    Streams are read lazily, the first time their data is accessed. Consumers that know which
+    streams they need can declare them with `streams` to read them up front and fail early if
+    any of them cannot be read.
+
+    With `use_cache`, every call with the same path and version in a process returns the same
+    dataset, so streams read by one consumer are not read again by the next. Streams whose source
+    file changed since they were read are cleared and read again on access.
+
     Args:
         path (os.PathLike): The path to the dataset root directory.
         version (str): The version of the dataset to load. By default, it uses the package version.
+        streams (Optional[Iterable[str]]): Paths of the streams to read eagerly, see `load_streams`.
+        use_cache (bool): Whether to return the dataset shared by the process.
 
     Returns:
         "Dataset": The loaded dataset.
     """
-    from ._dataset import make_dataset
+    if use_cache:
+        from ._dataset_cache import get_cached_dataset
+
+        this_dataset = get_cached_dataset(Path(path), version=version)
+    else:
+        from ._dataset import make_dataset
+
+        this_dataset = make_dataset(Path(path), version=version)
+    if streams is not None:
+        load_streams(this_dataset, streams, strict=True)
+    return this_dataset
+
+
+def clear_dataset_cache() -> None:
+    """Drops every dataset shared through `dataset(..., use_cache=True)`."""
+    from ._dataset_cache import clear_dataset_cache as _clear_dataset_cache
+
+    _clear_dataset_cache()
+
+
+def set_cache_directory(path: t.Optional[os.PathLike]) -> None:
+    """
+    Sets the directory where files derived from the sessions are cached, e.g. flat SoftwareEvents tables.
+
+    Derived files are never written into the sessions, so that they are not shipped with the raw
+    data. By default no cache directory is set and nothing is cached on disk. The setting applies to
+    the whole process.
+
+    Args:
+        path (Optional[os.PathLike]): A directory outside the sessions, or None to stop caching.
+    """
+    from ._file_cache import set_cache_directory as _set_cache_directory
+
+    _set_cache_directory(path)
+
+
+def get_cache_directory() -> t.Optional[Path]:
+    """Returns the directory set by `set_cache_directory`, or None if derived files are not cached."""
+    from ._file_cache import get_cache_directory as _get_cache_directory
+
+    return _get_cache_directory()
+
+
+def load_streams(dataset: "Dataset", streams: t.Iterable[str], strict: bool = False) -> list["DataStream"]:
+    """
+    Reads only the given streams of a dataset, leaving every other stream unread.
+
+    Streams are given by their path from the dataset root, separated by "/"
+    (e.g. "Behavior/SoftwareEvents/TrialOutcome"). A collection, such as a Harp device, is read
+    with all of its children. Streams that were already read are not read again, so consumers
+    sharing a dataset only pay for each stream once.
+
+    Args:
+        dataset (Dataset): The dataset returned by `dataset`.
+        streams (Iterable[str]): Paths of the streams to read.
+        strict (bool): If True, raises the first error encountered while reading. Otherwise errors
+            are kept on the streams, as in `Dataset.load_all(strict=False)`.
+
+    Returns:
+        list["DataStream"]: The requested streams, in the given order.
+    """
+    loaded = []
+    for stream_path in streams:
+        stream: "DataStream" = dataset
+        for name in stream_path.strip("/").split("/"):
+            stream = stream[name]
+        _load_stream(stream, strict)
+        loaded.append(stream)
+    return loaded
+
+
+def _load_stream(stream: "DataStream", strict: bool) -> None:
+    if not (stream.has_data or stream.has_error):
+        stream.load()
+    if stream.has_error:
+        if strict:
+            stream.data  # re-raises the error kept on the stream
+        return
+    if stream.is_collection:
+        for child in stream:
+            _load_stream(child, strict)
+
+
+def software_events_table(dataset: "Dataset", name: str, use_cache: bool = True) -> "pd.DataFrame":
+    """
+    Loads a SoftwareEvents stream of a dataset as a flat table with one typed column per event data field.
+
+    Nested fields are named by their dotted path (e.g. "trial.p_reward_left"). When a cache directory
+    is set (see `set_cache_directory`), the table is cached there as Parquet and rebuilt when the
+    source file changes.
+
+    Args:
+        dataset (Dataset): The dataset returned by `dataset`.
+        name (str): The name of the SoftwareEvents stream (e.g. "TrialOutcome").
+        use_cache (bool): Whether to read and write the Parquet cache, if a cache directory is set.
+
+    Returns:
+        "pd.DataFrame": The events indexed by timestamp.
+    """
+    from ._software_events_table import read_software_events_table
+
+    stream = dataset["Behavior"]["SoftwareEvents"][name]
+    return read_software_events_table(stream.reader_params.path, use_cache=use_cache)
+
+
+def camera_frame_index(dataset: "Dataset", camera: str, use_cache: bool = True) -> "FrameIndex":
+    """
+    Loads the frame index of a camera, which maps its frame numbers to Harp times.
+
+    The index is built by streaming the camera metadata once. When a cache directory is set (see
+    `set_cache_directory`), it is cached there, so later calls memory-map it instead of parsing the
+    metadata again.
+
+    Args:
+        dataset (Dataset): The dataset returned by `dataset`.
+        camera (str): The name of the camera in the BehaviorVideos collection (e.g. "FaceCamera").
+        use_cache (bool): Whether to read and write the index cache, if a cache directory is set.
+
+    Returns:
+        "FrameIndex": The frame index of the camera.
+    """
+    from .camera_frames import build_frame_index
+
+    stream = dataset["BehaviorVideos"][camera]
+    return build_frame_index(stream.reader_params.path, use_cache=use_cache)
+
+
+def trial_table(dataset: "Dataset", include_licks: bool = True) -> "pd.DataFrame":
+    """
+    Builds a table with one row per trial of a session.
+
+    Each row holds the start time of every trial period, the response time and latency, the
+    choice and reward, the reward sizes and probabilities of the trial and its block, the trial generator
+    metadata and, with `include_licks`, the number of licks on each side within each period.
+    Use `pyarrow.Table.from_pandas` for an Arrow table.
+
+    Args:
+        dataset (Dataset): The dataset returned by `dataset`.
+        include_licks (bool): Whether to read the lick sensors and add the lick counts.
+
+    Returns:
+        "pd.DataFrame": The trial table, indexed by trial number.
+    """
+    from ._trial_table import make_trial_table
+    from .licks import get_lick_times
 
-    return make_dataset(Path(path), version=version)
+    return make_trial_table(dataset, lick_times=get_lick_times(dataset) if include_licks else None)
 
 
 def render_dataset(version: str = __semver__) -> str:
@@ -4,16 +4,14 @@ from aind_behavior_curriculum import Metrics, TrainerState
 from aind_behavior_services.session import Session
 from contraqctor.contract import Dataset, DataStreamCollection
 from contraqctor.contract.camera import Camera
-from contraqctor.contract.harp import (
-    DeviceYmlByFile,
-    HarpDevice,
-)
+from contraqctor.contract.harp import DeviceYmlByFile
 from contraqctor.contract.json import Json, PydanticModel, SoftwareEvents
 from contraqctor.contract.mux import MapFromPaths
 
 from .. import __semver__
 from ..rig import AindDynamicForagingRig
 from ..task_logic import AindDynamicForagingTaskLogic
+from ._indexed_harp import IndexedHarpDevice
 
 
 def make_dataset(
@@ -80,58 +78,58 @@ def make_dataset(
                             path=root_path / "behavior/trainer_state.json",
                         ),
                     ),
-                    HarpDevice(
+                    IndexedHarpDevice(
                         name="HarpBehavior",
-                        reader_params=HarpDevice.make_params(
+                        reader_params=IndexedHarpDevice.make_params(
                             path=root_path / "behavior/Behavior.harp",
                             device_yml_hint=DeviceYmlByFile(),
                         ),
                     ),
-                    HarpDevice(
+                    IndexedHarpDevice(
                         name="HarpManipulator",
-                        reader_params=HarpDevice.make_params(
+                        reader_params=IndexedHarpDevice.make_params(
                             path=root_path / "behavior/StepperDriver.harp",
                             device_yml_hint=DeviceYmlByFile(),
                         ),
                     ),
-                    HarpDevice(
+                    IndexedHarpDevice(
                         name="HarpSniffDetector",
-                        reader_params=HarpDevice.make_params(
+                        reader_params=IndexedHarpDevice.make_params(
                             path=root_path / "behavior/SniffDetector.harp",
                             device_yml_hint=DeviceYmlByFile(),
                         ),
                     ),
-                    HarpDevice(
+                    IndexedHarpDevice(
                         name="HarpLickometerRight",
-                        reader_params=HarpDevice.make_params(
+                        reader_params=IndexedHarpDevice.make_params(
                             path=root_path / "behavior/LickometerRight.harp",
                             device_yml_hint=DeviceYmlByFile(),
                         ),
                     ),
-                    HarpDevice(
+                    IndexedHarpDevice(
                         name="HarpLickometerLeft",
-                        reader_params=HarpDevice.make_params(
+                        reader_params=IndexedHarpDevice.make_params(
                             path=root_path / "behavior/LickometerLeft.harp",
                             device_yml_hint=DeviceYmlByFile(),
                         ),
                     ),
-                    HarpDevice(
+                    IndexedHarpDevice(
                         name="HarpClockGenerator",
-                        reader_params=HarpDevice.make_params(
+                        reader_params=IndexedHarpDevice.make_params(
                             path=root_path / "behavior/ClockGenerator.harp",
                             device_yml_hint=DeviceYmlByFile(),
                         ),
                     ),
-                    HarpDevice(
+                    IndexedHarpDevice(
                         name="HarpEnvironmentSensor",
-                        reader_params=HarpDevice.make_params(
+                        reader_params=IndexedHarpDevice.make_params(
                             path=root_path / "behavior/EnvironmentSensor.harp",
                             device_yml_hint=DeviceYmlByFile(),
                         ),
                     ),
-                    HarpDevice(
+                    IndexedHarpDevice(
                         name="HarpSoundCard",
-                        reader_params=HarpDevice.make_params(
+                        reader_params=IndexedHarpDevice.make_params(
                             path=root_path / "behavior/SoundCard.harp",
                             device_yml_hint=DeviceYmlByFile(),
                         ),
@@ -140,58 +138,58 @@ def make_dataset(
                         name="HarpCommands",
                         description="Commands sent to Harp devices",
                         data_streams=[
-                            HarpDevice(
+                            IndexedHarpDevice(
                                 name="HarpBehavior",
-                                reader_params=HarpDevice.make_params(
+                                reader_params=IndexedHarpDevice.make_params(
                                     path=root_path / "behavior/HarpCommands/Behavior.harp",
                                     device_yml_hint=DeviceYmlByFile(),
                                 ),
                             ),
-                            HarpDevice(
+                            IndexedHarpDevice(
                                 name="HarpManipulator",
-                                reader_params=HarpDevice.make_params(
+                                reader_params=IndexedHarpDevice.make_params(
                                     path=root_path / "behavior/HarpCommands/StepperDriver.harp",
                                     device_yml_hint=DeviceYmlByFile(),
                                 ),
                             ),
-                            HarpDevice(
+                            IndexedHarpDevice(
                                 name="HarpSniffDetector",
-                                reader_params=HarpDevice.make_params(
+                                reader_params=IndexedHarpDevice.make_params(
                                     path=root_path / "behavior/HarpCommands/SniffDetector.harp",
                                     device_yml_hint=DeviceYmlByFile(),
                                 ),
                             ),
-                            HarpDevice(
+                            IndexedHarpDevice(
                                 name="HarpLickometerLeft",
-                                reader_params=HarpDevice.make_params(
+                                reader_params=IndexedHarpDevice.make_params(
                                     path=root_path / "behavior/HarpCommands/LickometerLeft.harp",
                                     device_yml_hint=DeviceYmlByFile(),
                                 ),
                             ),
-                            HarpDevice(
+                            IndexedHarpDevice(
                                 name="HarpLickometerRight",
-                                reader_params=HarpDevice.make_params(
+                                reader_params=IndexedHarpDevice.make_params(
                                     path=root_path / "behavior/HarpCommands/LickometerRight.harp",
                                     device_yml_hint=DeviceYmlByFile(),
                                 ),
                             ),
-                            HarpDevice(
+                            IndexedHarpDevice(
                                 name="HarpClockGenerator",
-                                reader_params=HarpDevice.make_params(
+                                reader_params=IndexedHarpDevice.make_params(
                                     path=root_path / "behavior/HarpCommands/ClockGenerator.harp",
                                     device_yml_hint=DeviceYmlByFile(),
                                 ),
                             ),
-                            HarpDevice(
+                            IndexedHarpDevice(
                                 name="HarpEnvironmentSensor",
-                                reader_params=HarpDevice.make_params(
+                                reader_params=IndexedHarpDevice.make_params(
                                     path=root_path / "behavior/HarpCommands/EnvironmentSensor.harp",
                                     device_yml_hint=DeviceYmlByFile(),
                                 ),
                             ),
-                            HarpDevice(
+                            IndexedHarpDevice(
                                 name="HarpSoundCard",
-                                reader_params=HarpDevice.make_params(
+                                reader_params=IndexedHarpDevice.make_params(
                                     path=root_path / "behavior/HarpCommands/SoundCard.harp",
                                     device_yml_hint=DeviceYmlByFile(),
                                 ),
@@ -0,0 +1,103 @@
+import logging
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Iterator, Optional
+
+from contraqctor.contract import Dataset, DataStream
+
+from ._dataset import make_dataset
+from ._indexed_harp import IndexedHarpRegister
+
+logger = logging.getLogger(__name__)
+
+MAX_CACHED_DATASETS = 8
+
+FileSignature = Optional[tuple[int, int]]
+
+
+class _CachedDataset:
+    def __init__(self, dataset: Dataset) -> None:
+        self.dataset = dataset
+        # source file signature of each stream as of the previous cache access
+        self.signatures: dict[int, FileSignature] = {}
+
+
+_cache: OrderedDict[tuple[Path, str], _CachedDataset] = OrderedDict()
+_lock = threading.Lock()
+
+
+def get_cached_dataset(path: os.PathLike, version: str) -> Dataset:
+    """Return the dataset shared by the whole process for a root path and version.
+
+    Every access records the size and modification time of the source file of each stream, Harp
+    registers also record it when they are read. Streams that were read and whose file changed,
+    appeared or disappeared since the previous access are cleared, and are read again the next
+    time their data is accessed. At most `MAX_CACHED_DATASETS` datasets are kept, the least
+    recently used one is dropped first.
+
+    Args:
+        path (os.PathLike): The path to the dataset root directory.
+        version (str): The version of the dataset.
+
+    Returns:
+        Dataset: The shared dataset.
+    """
+    key = (Path(path).resolve(), version)
+    with _lock:
+        entry = _cache.get(key)
+        if entry is None:
+            entry = _cache[key] = _CachedDataset(make_dataset(key[0], version=version))
+            while len(_cache) > MAX_CACHED_DATASETS:
+                _cache.popitem(last=False)
+        else:
+            _cache.move_to_end(key)
+        _invalidate_changed_streams(entry)
+    return entry.dataset
+
+
+def clear_dataset_cache() -> None:
+    """Drop every cached dataset."""
+    with _lock:
+        _cache.clear()
+
+
+def _invalidate_changed_streams(entry: _CachedDataset) -> None:
+    for stream in _leaf_streams(entry.dataset):
+        source = _source_path(stream)
+        if source is None:
+            continue
+        signature = _file_signature(source)
+        previous = entry.signatures.get(id(stream), signature)
+        if isinstance(stream, IndexedHarpRegister) and stream.has_data:
+            # registers of a device first read since the previous access have no recorded signature yet
+            previous = stream.read_signature
+        entry.signatures[id(stream)] = signature
+        if previous != signature and (stream.has_data or stream.has_error):
+            logger.debug("%s changed on disk, clearing %s." % (source, stream.resolved_name))
+            stream.clear()
+
+
+def _leaf_streams(stream: DataStream) -> Iterator[DataStream]:
+    """Yield the leaf streams of the collections that were already read, without reading any."""
+    if not stream.is_collection:
+        yield stream
+    elif stream.has_data:
+        for child in stream:
+            yield from _leaf_streams(child)
+
+
+def _source_path(stream: DataStream) -> Optional[Path]:
+    if isinstance(stream, IndexedHarpRegister):
+        return stream.path
+    path = getattr(stream.reader_params, "path", None)
+    return Path(path) if path is not None else None
+
+
+def _file_signature(path: Path) -> FileSignature:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return (stat.st_size, stat.st_mtime_ns)
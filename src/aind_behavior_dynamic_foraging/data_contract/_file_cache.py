@@ -0,0 +1,59 @@
+import hashlib
+import os
+import tempfile
+import typing as t
+from pathlib import Path
+
+_cache_directory: t.Optional[Path] = None
+
+
+def set_cache_directory(path: t.Optional[os.PathLike]) -> None:
+    """Set the directory files derived from the sessions are cached in, None to disable the caches."""
+    global _cache_directory
+    _cache_directory = Path(path).resolve() if path is not None else None
+
+
+def get_cache_directory() -> t.Optional[Path]:
+    """Return the directory files derived from the sessions are cached in, None if they are not cached."""
+    return _cache_directory
+
+
+def cache_path(source_directory: os.PathLike, file_name: str) -> t.Optional[Path]:
+    """Return the path of a file derived from the files of a session directory, None if caches are disabled.
+
+    The cached files of a directory are kept together in a directory named after it and the hash of
+    its absolute path, so the directories of different sessions never share their cached files.
+
+    Args:
+        source_directory (os.PathLike): The session directory holding the source files.
+        file_name (str): Name of the cached file.
+
+    Returns:
+        Optional[Path]: Path of the cached file in the cache directory.
+    """
+    if _cache_directory is None:
+        return None
+    source_directory = Path(source_directory).resolve()
+    digest = hashlib.sha256(str(source_directory).encode("utf-8")).hexdigest()[:16]
+    return _cache_directory / f"{source_directory.name}-{digest}" / file_name
+
+
+def write_atomically(path: Path, write: t.Callable[[t.BinaryIO], None]) -> None:
+    """Write a cached file through a temporary file with a unique name, then move it in place.
+
+    Concurrent writers of the same file each write their own temporary file, and readers never see a
+    partially written file.
+
+    Args:
+        path (Path): Path of the cached file.
+        write (Callable[[BinaryIO], None]): Writes the content of the file to the given binary file.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    file = tempfile.NamedTemporaryFile(dir=path.parent, prefix=f"{path.name}.", suffix=".tmp", delete=False)
+    try:
+        with file:
+            write(file)
+        os.replace(file.name, path)
+    except BaseException:
+        Path(file.name).unlink(missing_ok=True)
+        raise
@@ -0,0 +1,221 @@
+import logging
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional, Self
+
+import harp.reader
+import numpy as np
+import pandas as pd
+from contraqctor.contract.harp import HarpDevice, HarpDeviceParams, HarpRegister, HarpRegisterParams
+from harp.io import MessageType
+
+from ._file_cache import cache_path as get_cache_path
+from ._file_cache import write_atomically
+
+logger = logging.getLogger(__name__)
+
+_SECONDS_PER_TICK = 32e-6
+_PAYLOAD_TIMESTAMP_MASK = 0x10
+
+
+@dataclass
+class HarpMessageIndex:
+    """Message type and timestamp of every message in a single register Harp file.
+
+    Harp register files hold fixed-size messages, so the index stores one entry per message
+    and the byte offset of message `i` is `i * stride`.
+    """
+
+    stride: int
+    message_type: np.ndarray
+    time: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.message_type)
+
+    def select(
+        self, message_type: Optional[str] = None, start: Optional[float] = None, end: Optional[float] = None
+    ) -> np.ndarray:
+        """Return the indices of the messages of a given type within [start, end).
+
+        Args:
+            message_type (Optional[str]): Name of the message type (e.g. "WRITE"). By default, all types.
+            start (Optional[float]): Harp time of the first message to include. By default, the first message.
+            end (Optional[float]): Harp time after the last message to include. By default, the last message.
+
+        Returns:
+            np.ndarray: Sorted message indices.
+        """
+        mask = np.ones(len(self), dtype=bool)
+        if message_type is not None:
+            mask &= self.message_type == MessageType[message_type]
+        if start is not None:
+            mask &= self.time >= start
+        if end is not None:
+            mask &= self.time < end
+        return np.flatnonzero(mask)
+
+    @classmethod
+    def from_buffer(cls, data: np.ndarray) -> Self:
+        """Build the index in one vectorized pass over the raw bytes of a register file."""
+        if len(data) == 0:
+            return cls(stride=0, message_type=np.empty(0, dtype=np.uint8), time=np.empty(0))
+        stride = int(data[1]) + 2
+        # a trailing partial message is still being written, ignore it as harp.read does
+        n_messages = len(data) // stride
+        messages = data[: n_messages * stride].reshape(n_messages, stride)
+        message_type = np.array(messages[:, 0])
+        if data[4] & _PAYLOAD_TIMESTAMP_MASK:
+            seconds = np.ascontiguousarray(messages[:, 5:9]).view("<u4")[:, 0]
+            ticks = np.ascontiguousarray(messages[:, 9:11]).view("<u2")[:, 0]
+            time = ticks * _SECONDS_PER_TICK + seconds
+        else:
+            time = np.full(n_messages, np.nan)
+        return cls(stride=stride, message_type=message_type, time=time)
+
+
+def load_message_index(path: os.PathLike, data: np.ndarray, use_cache: bool = True) -> HarpMessageIndex:
+    """Load the message index of a register file from its on-disk cache, building it if needed.
+
+    When a cache directory is set (see `set_cache_directory`), the index is cached there as a ".npz"
+    file, keyed by the register file size and modification time. Nothing is written next to the
+    register file.
+
+    Args:
+        path (os.PathLike): Path to the register file.
+        data (np.ndarray): Raw bytes of the register file, usually memory-mapped.
+        use_cache (bool): Whether to read and write the index cache, if a cache directory is set.
+
+    Returns:
+        HarpMessageIndex: The index of the file.
+    """
+    path = Path(path)
+    cache_path = get_cache_path(path.parent, f"{path.stem}.npz") if use_cache else None
+    if cache_path is None:
+        return HarpMessageIndex.from_buffer(data)
+
+    stat = path.stat()
+    cache_key = np.array([stat.st_size, stat.st_mtime_ns], dtype=np.int64)
+    if cache_path.exists():
+        try:
+            with np.load(cache_path) as cached:
+                if np.array_equal(cached["key"], cache_key):
+                    return HarpMessageIndex(int(cached["stride"]), cached["message_type"], cached["time"])
+        except Exception as e:
+            logger.warning("Failed to read Harp index cache %s: %s" % (cache_path, e))
+
+    index = HarpMessageIndex.from_buffer(data)
+    try:
+        write_atomically(
+            cache_path,
+            lambda file: np.savez(
+                file, key=cache_key, stride=index.stride, message_type=index.message_type, time=index.time
+            ),
+        )
+    except Exception as e:
+        logger.warning("Failed to write Harp index cache %s: %s" % (cache_path, e))
+    return index
+
+
+class IndexedHarpRegister(HarpRegister):
+    """Harp register read through a memory map and a cached message index.
+
+    Reading the whole register returns the same data frame as `HarpRegister`. `read_messages`
+    copies only the messages of a given type or time range out of the file before parsing them.
+    """
+
+    _path: Path
+    _register_reader: harp.reader.RegisterReader
+    _read_signature: Optional[tuple[int, int]] = None
+
+    @classmethod
+    def from_register_file(cls, name: str, reg_reader: harp.reader.RegisterReader, path: os.PathLike) -> Self:
+        """Create a register data stream reading the given register file.
+
+        Args:
+            name: Name of the register data stream.
+            reg_reader: Harp RegisterReader used to parse the register payload.
+            path: Path to the register file.
+
+        Returns:
+            IndexedHarpRegister: The register data stream.
+        """
+        register = cls.from_register_reader(name, reg_reader)
+        register._path = Path(path)
+        register._register_reader = reg_reader
+        return register
+
+    @property
+    def path(self) -> Path:
+        """Path to the register file."""
+        return self._path
+
+    @property
+    def read_signature(self) -> Optional[tuple[int, int]]:
+        """Size and modification time of the register file when the register was last read, if it was."""
+        return self._read_signature
+
+    def read(self, reader_params: Optional[HarpRegisterParams] = None) -> pd.DataFrame:
+        """Read all messages of the register, see `read_messages`."""
+        try:
+            stat = self._path.stat()
+            self._read_signature = (stat.st_size, stat.st_mtime_ns)
+        except OSError:
+            self._read_signature = None
+        reader_params = reader_params if reader_params is not None else self._reader_params
+        return self.read_messages(epoch=reader_params.epoch, keep_type=reader_params.keep_type)
+
+    def read_messages(
+        self,
+        message_type: Optional[str] = None,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        epoch=None,
+        keep_type: bool = True,
+        use_cache: bool = True,
+    ) -> pd.DataFrame:
+        """Read the register messages of a given type within a Harp time range.
+
+        Unlike `data`, the result is not kept on the data stream.
+
+        Args:
+            message_type (Optional[str]): Name of the message type (e.g. "WRITE"). By default, all types.
+            start (Optional[float]): Harp time of the first message to include.
+            end (Optional[float]): Harp time after the last message to include.
+            epoch (Optional[datetime.datetime]): Reference datetime for a datetime index, as in `harp.read`.
+            keep_type (bool): Whether to include the "MessageType" column.
+            use_cache (bool): Whether to use the on-disk message index cache, if a cache directory is set.
+
+        Returns:
+            pd.DataFrame: The selected messages, parsed like the full register.
+        """
+        if (message_type is None and start is None and end is None) or self._path.stat().st_size == 0:
+            # every message is needed, a plain sequential read is faster than going through the index
+            return self._register_reader.read(np.fromfile(self._path, dtype=np.uint8), epoch=epoch, keep_type=keep_type)
+
+        data = np.memmap(self._path, dtype=np.uint8, mode="r")
+        try:
+            index = load_message_index(self._path, data, use_cache=use_cache)
+            rows = index.select(message_type, start, end)
+            messages = data[: len(index) * index.stride].reshape(len(index), index.stride)
+            # parse the first message when nothing is selected so the empty frame keeps its columns
+            buffer = messages[rows if len(rows) > 0 else slice(0, 1)].copy().reshape(-1)
+        finally:
+            del data
+        result = self._register_reader.read(buffer, epoch=epoch, keep_type=keep_type)
+        return result if len(rows) > 0 else result.iloc[:0]
+
+
+class IndexedHarpDevice(HarpDevice):
+    """Harp device whose registers are `IndexedHarpRegister` data streams."""
+
+    def _reader(self, params: HarpDeviceParams) -> List[HarpRegister]:
+        super()._reader(params)
+        reader = self.device_reader
+        path = Path(params.path)
+        base_path = path / reader.device.device if path.is_dir() else path.parent / reader.device.device
+        return [
+            IndexedHarpRegister.from_register_file(name, reg_reader, f"{base_path}_{reg_reader.register.address}.bin")
+            for name, reg_reader in reader.registers.items()
+        ]
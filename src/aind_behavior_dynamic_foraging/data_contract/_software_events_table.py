@@ -0,0 +1,139 @@
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any, Optional
+
+import pandas as pd
+
+from ._file_cache import cache_path as get_cache_path
+from ._file_cache import write_atomically
+
+logger = logging.getLogger(__name__)
+
+# bump when the flattened layout changes so stale caches are rebuilt
+_CACHE_FORMAT_VERSION = "1"
+
+
+def read_software_events_table(path: os.PathLike, use_cache: bool = True) -> pd.DataFrame:
+    """Read a SoftwareEvents JSON-lines file as a flat, typed table.
+
+    Nested event data is flattened into one column per leaf field, named by its dotted
+    path without the leading "data" (e.g. "trial.p_reward_left" or
+    "trial.metadata.extra.is_autowater"). Scalar event data is kept in a "data" column.
+    Event fields ("name", "timestamp_source", "frame_index", ...) are kept as columns and
+    the table is indexed by "timestamp", as in the SoftwareEvents stream.
+
+    When a cache directory is set (see `set_cache_directory`), the table is cached there as Parquet,
+    keyed by the source size and modification time, so re-reads skip JSON parsing. Nothing is
+    written next to the source file. The cache requires pyarrow, from the "data" extra; without it,
+    without a cache directory, or if the cache cannot be written, the file is parsed on every call.
+
+    Args:
+        path (os.PathLike): Path to the SoftwareEvents JSON-lines file.
+        use_cache (bool): Whether to read and write the Parquet cache, if a cache directory is set.
+
+    Returns:
+        pd.DataFrame: One row per event.
+    """
+    path = Path(path)
+    cache_path = get_cache_path(path.parent, f"{path.stem}.parquet") if use_cache else None
+    if cache_path is None:
+        return flatten_software_events(path)
+
+    cache_key = _cache_key(path)
+    table = _read_cache(cache_path, cache_key)
+    if table is None:
+        table = flatten_software_events(path)
+        _write_cache(table, cache_path, cache_key)
+    return table
+
+
+def flatten_software_events(path: os.PathLike) -> pd.DataFrame:
+    """Parse a SoftwareEvents JSON-lines file into a flat table without using the cache.
+
+    Args:
+        path (os.PathLike): Path to the SoftwareEvents JSON-lines file.
+
+    Returns:
+        pd.DataFrame: One row per event, see `read_software_events_table`.
+    """
+    with open(path, "r", encoding="UTF-8") as file:
+        events = [json.loads(line) for line in file if line.strip()]
+    return events_to_table(events)
+
+
+def events_to_table(events: list[dict[str, Any]]) -> pd.DataFrame:
+    """Flatten parsed SoftwareEvent records into a table, see `read_software_events_table`.
+
+    Args:
+        events (list[dict[str, Any]]): SoftwareEvent records as parsed from JSON.
+
+    Returns:
+        pd.DataFrame: One row per event, indexed by timestamp.
+    """
+    table = pd.json_normalize(events, sep=".")
+    if "timestamp" not in table.columns:
+        table["timestamp"] = pd.Series(dtype=float)
+
+    # a field that is null in some events and an object in others yields both a parent and leaf columns
+    parents = {column.rsplit(".", 1)[0] for column in table.columns if "." in column}
+    table = table.drop(columns=[column for column in table.columns if column in parents])
+    table.columns = [column.removeprefix("data.") for column in table.columns]
+
+    # empty objects and mixed-type columns have no Parquet type, keep them as JSON strings
+    for column in [column for column in table.columns if pd.api.types.is_object_dtype(table[column])]:
+        if table[column].map(lambda value: isinstance(value, dict)).any() or _has_mixed_types(table[column]):
+            table[column] = table[column].map(lambda value: None if value is None else json.dumps(value))
+
+    table = table.set_index(table.pop("timestamp").astype(float))
+    return table.convert_dtypes()
+
+
+def _has_mixed_types(column: pd.Series) -> bool:
+    return len({type(value) for value in column.dropna()}) > 1
+
+
+def _cache_key(path: Path) -> dict[bytes, bytes]:
+    stat = path.stat()
+    return {
+        b"source_size": str(stat.st_size).encode(),
+        b"source_mtime_ns": str(stat.st_mtime_ns).encode(),
+        b"format_version": _CACHE_FORMAT_VERSION.encode(),
+    }
+
+
+def _read_cache(cache_path: Path, cache_key: dict[bytes, bytes]) -> Optional[pd.DataFrame]:
+    """Return the cached table if it exists and matches the source file, None otherwise."""
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        logger.debug("pyarrow is not installed, software events cache disabled.")
+        return None
+
+    if not cache_path.exists():
+        return None
+    try:
+        metadata = pq.read_schema(cache_path).metadata or {}
+        if any(metadata.get(key) != value for key, value in cache_key.items()):
+            logger.debug("Software events cache %s is stale." % cache_path)
+            return None
+        return pq.read_table(cache_path).to_pandas()
+    except Exception as e:
+        logger.warning("Failed to read software events cache %s: %s" % (cache_path, e))
+        return None
+
+
+def _write_cache(table: pd.DataFrame, cache_path: Path, cache_key: dict[bytes, bytes]) -> None:
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        return
+
+    try:
+        arrow_table = pa.Table.from_pandas(table)
+        arrow_table = arrow_table.replace_schema_metadata({**(arrow_table.schema.metadata or {}), **cache_key})
+        write_atomically(cache_path, lambda file: pq.write_table(arrow_table, file))
+    except Exception as e:
+        logger.warning("Failed to write software events cache %s: %s" % (cache_path, e))
@@ -0,0 +1,182 @@
+import logging
+import typing as t
+
+import numpy as np
+import pandas as pd
+
+from ._software_events_table import read_software_events_table
+
+if t.TYPE_CHECKING:
+    from contraqctor.contract import Dataset
+
+logger = logging.getLogger(__name__)
+
+# period start events in the order they occur within a trial, TrialOutcome is emitted before ItiPeriod
+PRE_OUTCOME_PERIODS = {
+    "quiescent_period": "QuiescentPeriod",
+    "response_period": "ResponsePeriod",
+    "reward_consumption_period": "RewardConsumptionPeriod",
+}
+POST_OUTCOME_PERIODS = {"iti_period": "ItiPeriod"}
+PERIODS = list(PRE_OUTCOME_PERIODS) + list(POST_OUTCOME_PERIODS)
+
+_OUTCOME_COLUMNS = {
+    "is_right_choice": "is_right_choice",
+    "is_rewarded": "is_rewarded",
+    "trial.p_reward_left": "p_reward_left",
+    "trial.p_reward_right": "p_reward_right",
+    "trial.is_auto_reward_right": "is_auto_reward_right",
+    "trial.reward_size.left": "reward_size_left",
+    "trial.reward_size.right": "reward_size_right",
+    "trial.quiescence_period_duration": "quiescence_period_duration",
+    "trial.response_deadline_duration": "response_deadline_duration",
+    "trial.reward_consumption_duration": "reward_consumption_duration",
+    "trial.inter_trial_interval_duration": "inter_trial_interval_duration",
+    "trial.metadata.p_reward_left": "block_p_reward_left",
+    "trial.metadata.p_reward_right": "block_p_reward_right",
+}
+
+
+def make_trial_table(dataset: "Dataset", lick_times: t.Optional[dict[str, np.ndarray]] = None) -> pd.DataFrame:
+    """Build a table with one row per trial from the software events of a session.
+
+    Trials are delimited by their TrialOutcome event. Period start events (and the Response
+    event) emitted before an outcome belong to that trial, ItiPeriod events emitted after an
+    outcome belong to the preceding trial. When a period starts more than once in a trial
+    (e.g. a restarted quiescent period) the first start is kept. Every period ends at the start
+    of the next period of the trial, the ITI ends at the start of the next trial.
+
+    Args:
+        dataset (Dataset): The dataset of the session.
+        lick_times (Optional[dict[str, np.ndarray]]): Sorted lick onset times per side ("left", "right"),
+            in the clock of the software events. If given, lick counts per period are added.
+
+    Returns:
+        pd.DataFrame: The trial table, indexed by trial number.
+    """
+    software_events = dataset["Behavior"]["SoftwareEvents"]
+    outcomes = read_software_events_table(software_events["TrialOutcome"].reader_params.path)
+    outcome_time = outcomes.index.to_numpy(dtype=float)
+    n_trials = len(outcome_time)
+
+    table = pd.DataFrame(index=pd.RangeIndex(n_trials, name="trial"))
+    for period, name in PRE_OUTCOME_PERIODS.items():
+        table[f"{period}_start"] = _first_per_trial(_event_times(software_events, name), outcome_time, before=True)
+    response = _event_table(software_events, "Response")
+    table["response_time"] = _first_per_trial(response.index.to_numpy(dtype=float), outcome_time, before=True)
+    table["outcome_time"] = outcome_time
+    for period, name in POST_OUTCOME_PERIODS.items():
+        table[f"{period}_start"] = _first_per_trial(_event_times(software_events, name), outcome_time, before=False)
+    table["trial_end"] = np.append(table["quiescent_period_start"].to_numpy()[1:], np.nan)
+    table["response_latency"] = table["response_time"] - table["response_period_start"]
+
+    for column, name in _OUTCOME_COLUMNS.items():
+        if column in outcomes.columns:
+            table[name] = outcomes[column].to_numpy()
+    extra = [column for column in outcomes.columns if column.startswith("trial.metadata.extra.")]
+    for column in extra:
+        table[column.removeprefix("trial.metadata.extra.")] = outcomes[column].to_numpy()
+
+    if lick_times is not None:
+        _add_lick_counts(table, lick_times)
+    return table
+
+
+def count_trial_events(dataset: "Dataset") -> pd.DataFrame:
+    """Count the period start events and Response events of each trial.
+
+    Events are assigned to trials as in `make_trial_table`, so a count above one means the event
+    was emitted more than once within a trial.
+
+    Args:
+        dataset (Dataset): The dataset of the session.
+
+    Returns:
+        pd.DataFrame: Number of events per trial, with one column per period and a "response" column.
+    """
+    software_events = dataset["Behavior"]["SoftwareEvents"]
+    outcome_time = read_software_events_table(software_events["TrialOutcome"].reader_params.path).index.to_numpy(
+        dtype=float
+    )
+    counts = pd.DataFrame(index=pd.RangeIndex(len(outcome_time), name="trial"))
+    events = {**PRE_OUTCOME_PERIODS, "response": "Response", **POST_OUTCOME_PERIODS}
+    for column, name in events.items():
+        before = column not in POST_OUTCOME_PERIODS
+        counts[column] = _count_per_trial(_event_times(software_events, name), outcome_time, before=before)
+    return counts
+
+
+def period_boundaries(table: pd.DataFrame) -> np.ndarray:
+    """Return the start of every period of every trial, followed by the end of the trial.
+
+    A missing period lasts zero seconds, until the next known period starts. Each trial ends
+    when the next one starts and the last trial lasts until the end of the session.
+
+    Args:
+        table (pd.DataFrame): A table built by `make_trial_table`.
+
+    Returns:
+        np.ndarray: Array of shape (n_trials, len(PERIODS) + 1).
+    """
+    starts = table[[f"{period}_start" for period in PERIODS]].to_numpy(dtype=float).ravel()
+    starts = pd.Series(np.append(starts, np.inf)).bfill().to_numpy()
+    n_periods = len(PERIODS)
+    return np.column_stack([starts[:-1].reshape(-1, n_periods), starts[n_periods::n_periods]])
+
+
+def _add_lick_counts(table: pd.DataFrame, lick_times: dict[str, np.ndarray]) -> None:
+    """Add the number of licks on each side within each period of each trial."""
+    boundaries = period_boundaries(table)
+    for side, licks in lick_times.items():
+        cumulative = np.searchsorted(np.asarray(licks, dtype=float), boundaries, side="left")
+        counts = np.diff(cumulative, axis=1)
+        for i, period in enumerate(PERIODS):
+            table[f"{period}_{side}_licks"] = counts[:, i]
+
+
+def _event_table(software_events, name: str) -> pd.DataFrame:
+    try:
+        return read_software_events_table(software_events[name].reader_params.path)
+    except FileNotFoundError:
+        logger.debug("No %s events found." % name)
+        return pd.DataFrame(index=pd.Index([], dtype=float, name="timestamp"))
+
+
+def _event_times(software_events, name: str) -> np.ndarray:
+    return _event_table(software_events, name).index.to_numpy(dtype=float)
+
+
+def _trial_of_events(event_time: np.ndarray, outcome_time: np.ndarray, before: bool) -> np.ndarray:
+    """Return the trial of each event, -1 or the number of trials for events outside any trial."""
+    if before:
+        return np.searchsorted(outcome_time, event_time, side="left")
+    return np.searchsorted(outcome_time, event_time, side="right") - 1
+
+
+def _count_per_trial(event_time: np.ndarray, outcome_time: np.ndarray, before: bool) -> np.ndarray:
+    """Count the events of each trial, see `_first_per_trial`."""
+    trial = _trial_of_events(event_time, outcome_time, before)
+    trial = trial[(trial >= 0) & (trial < len(outcome_time))]
+    return np.bincount(trial, minlength=len(outcome_time))
+
+
+def _first_per_trial(event_time: np.ndarray, outcome_time: np.ndarray, before: bool) -> np.ndarray:
+    """Assign events to trials by their outcome time and return the first event time of each trial.
+
+    Args:
+        event_time (np.ndarray): Event times.
+        outcome_time (np.ndarray): Sorted outcome times, one per trial.
+        before (bool): Whether events precede the outcome of their trial (otherwise they follow it).
+
+    Returns:
+        np.ndarray: The first event time of each trial, NaN for trials without events.
+    """
+    event_time = np.sort(event_time)
+    trial = _trial_of_events(event_time, outcome_time, before)
+    valid = (trial >= 0) & (trial < len(outcome_time))
+    trial, event_time = trial[valid], event_time[valid]
+
+    first = np.full(len(outcome_time), np.nan)
+    trials_with_events, first_index = np.unique(trial, return_index=True)
+    first[trials_with_events] = event_time[first_index]
+    return first
@@ -0,0 +1,314 @@
+import dataclasses
+import json
+import logging
+import os
+import typing as t
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from harp.io import MessageType
+
+from ._file_cache import cache_path as get_cache_path
+from ._file_cache import write_atomically
+from ._indexed_harp import _PAYLOAD_TIMESTAMP_MASK, HarpMessageIndex
+
+logger = logging.getLogger(__name__)
+
+FRAME_INDEX_FILE_NAME = "frame_index.bin"
+FRAME_INDEX_DTYPE = np.dtype([("frame", "<i8"), ("time", "<f8"), ("camera_time", "<i8")])
+
+# rows of the camera metadata, or messages of a register file, processed at once
+DEFAULT_CHUNK_SIZE = 500_000
+
+# bit of the CameraXFrame registers of the behavior board set when a frame was triggered
+_FRAME_ACQUIRED = 0x1
+_METADATA_COLUMNS = {"CameraFrameNumber": "frame", "ReferenceTime": "time", "CameraFrameTime": "camera_time"}
+
+
+class FrameIndex:
+    """Frame number, Harp time and camera time of every frame of a camera.
+
+    The index is backed by a memory-mapped binary file of `FRAME_INDEX_DTYPE` records, so it
+    can be searched without reading it whole. Frame numbers are expected to increase, which
+    `analyze_frame_timing` checks.
+
+    Attributes:
+        records: One `FRAME_INDEX_DTYPE` record per row of the camera metadata.
+    """
+
+    def __init__(self, records: np.ndarray) -> None:
+        self.records = records
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    @property
+    def frame(self) -> np.ndarray:
+        """Frame number counted by the camera."""
+        return self.records["frame"]
+
+    @property
+    def time(self) -> np.ndarray:
+        """Harp time of the trigger of each frame, in seconds."""
+        return self.records["time"]
+
+    @property
+    def camera_time(self) -> np.ndarray:
+        """Time of each frame in the camera clock, in nanoseconds."""
+        return self.records["camera_time"]
+
+    @classmethod
+    def from_file(cls, path: os.PathLike) -> t.Self:
+        """Memory-map an index written by `build_frame_index`."""
+        if os.path.getsize(path) == 0:
+            return cls(np.empty(0, dtype=FRAME_INDEX_DTYPE))
+        return cls(np.memmap(path, dtype=FRAME_INDEX_DTYPE, mode="r"))
+
+    def chunks(self, chunk_size: int = DEFAULT_CHUNK_SIZE) -> t.Iterator[np.ndarray]:
+        """Iterate over the records in chunks of at most `chunk_size` frames."""
+        for start in range(0, len(self), chunk_size):
+            yield np.asarray(self.records[start : start + chunk_size])
+
+    def time_of(self, frames: np.ndarray) -> np.ndarray:
+        """Return the Harp time of the given frame numbers, NaN for frames that are not in the metadata."""
+        frames = np.asarray(frames)
+        if len(self) == 0:
+            return np.full(frames.shape, np.nan)
+        index = np.minimum(np.searchsorted(self.frame, frames), len(self) - 1)
+        return np.where(self.frame[index] == frames, self.time[index], np.nan)
+
+    def frame_at(self, times: np.ndarray) -> np.ndarray:
+        """Return the number of the last frame triggered at or before each Harp time, -1 before the first one."""
+        index = np.searchsorted(self.time, np.asarray(times, dtype=float), side="right") - 1
+        if len(self) == 0:
+            return np.full(index.shape, -1)
+        return np.where(index >= 0, self.frame[np.maximum(index, 0)], -1)
+
+
+@dataclasses.dataclass
+class FrameTiming:
+    """Frame timing statistics of a camera, see `analyze_frame_timing`.
+
+    Attributes:
+        n_frames: Number of frames in the metadata.
+        first_frame: First frame number, -1 without frames.
+        last_frame: Last frame number, -1 without frames.
+        start_time: Harp time of the first frame.
+        end_time: Harp time of the last frame.
+        n_dropped: Number of frame numbers skipped between consecutive frames.
+        n_gaps: Number of places where frames were skipped.
+        n_repeated: Number of frames whose number does not increase.
+        n_backwards: Number of frames whose Harp time does not increase.
+        n_clock_mismatch: Number of intervals that differ by more than the clock jitter between the
+            camera clock and the Harp clock.
+        mean_interval: Mean interval between consecutive frames, in seconds.
+        interval_std: Standard deviation of the intervals between consecutive frames, in seconds.
+        max_interval: Longest interval between consecutive frames, in seconds.
+        interval_edges: Edges of the interval histogram, in seconds. The last bin is unbounded.
+        interval_counts: Number of intervals in each bin of the histogram.
+    """
+
+    n_frames: int = 0
+    first_frame: int = -1
+    last_frame: int = -1
+    start_time: float = np.nan
+    end_time: float = np.nan
+    n_dropped: int = 0
+    n_gaps: int = 0
+    n_repeated: int = 0
+    n_backwards: int = 0
+    n_clock_mismatch: int = 0
+    mean_interval: float = np.nan
+    interval_std: float = np.nan
+    max_interval: float = np.nan
+    interval_edges: np.ndarray = dataclasses.field(default_factory=lambda: np.empty(0))
+    interval_counts: np.ndarray = dataclasses.field(default_factory=lambda: np.empty(0, dtype=np.int64))
+
+    @property
+    def n_counted_frames(self) -> int:
+        """Number of frames counted by the camera between the first and the last frame of the metadata."""
+        return self.last_frame - self.first_frame + 1 if self.n_frames else 0
+
+    def interval_histogram(self) -> pd.Series:
+        """Return the interval histogram, indexed by the lower edge of each bin."""
+        return pd.Series(self.interval_counts, index=pd.Index(self.interval_edges[:-1], name="interval"))
+
+
+def build_frame_index(
+    camera_path: os.PathLike, use_cache: bool = True, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> FrameIndex:
+    """Build the frame index of a camera by streaming its metadata.csv, or load it from its cache.
+
+    The metadata is parsed `chunk_size` rows at a time. When a cache directory is set (see
+    `set_cache_directory`), each chunk is appended to a binary file there, keyed by the size and
+    modification time of the metadata, so neither building nor using the index holds the whole
+    metadata in memory. Nothing is written to the camera directory.
+
+    Args:
+        camera_path (os.PathLike): The directory of the camera, with its metadata.csv file.
+        use_cache (bool): Whether to read and write the index cache, if a cache directory is set.
+        chunk_size (int): Number of metadata rows parsed at once.
+
+    Returns:
+        FrameIndex: The index of the camera frames.
+    """
+    metadata_path = Path(camera_path) / "metadata.csv"
+    cache_path = get_cache_path(camera_path, FRAME_INDEX_FILE_NAME) if use_cache else None
+
+    if cache_path is not None:
+        stat = metadata_path.stat()
+        cache_key = json.dumps({"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}).encode("utf-8")
+        key_path = cache_path.with_suffix(".json")
+        if cache_path.exists() and key_path.exists():
+            try:
+                if key_path.read_bytes() == cache_key:
+                    return FrameIndex.from_file(cache_path)
+            except Exception as e:
+                logger.warning("Failed to read frame index cache %s: %s" % (cache_path, e))
+
+        def write_index(file: t.BinaryIO) -> None:
+            for chunk in _read_metadata(metadata_path, chunk_size):
+                file.write(chunk.tobytes())
+
+        try:
+            write_atomically(cache_path, write_index)
+            write_atomically(key_path, lambda file: file.write(cache_key))
+            return FrameIndex.from_file(cache_path)
+        except OSError as e:
+            logger.warning("Failed to write frame index cache %s: %s" % (cache_path, e))
+
+    chunks = list(_read_metadata(metadata_path, chunk_size))
+    return FrameIndex(np.concatenate(chunks) if chunks else np.empty(0, dtype=FRAME_INDEX_DTYPE))
+
+
+def analyze_frame_timing(
+    index: FrameIndex,
+    expected_fps: t.Optional[float] = None,
+    clock_jitter: float = 1e-4,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> FrameTiming:
+    """Compute the frame timing statistics of a camera in one chunked pass over its frame index.
+
+    Memory use does not depend on the number of frames: each chunk is compared with the last
+    frame of the previous one and only running totals and a fixed histogram are kept.
+
+    Args:
+        index (FrameIndex): The index of the camera frames, see `build_frame_index`.
+        expected_fps (Optional[float]): Frame rate of the camera trigger. If given, the interval histogram has
+            60 bins up to three frame periods, otherwise log-spaced bins from 0.1 ms to 10 s.
+        clock_jitter (float): Largest difference between the intervals measured by the camera and the Harp
+            clocks, in seconds.
+        chunk_size (int): Number of frames processed at once.
+
+    Returns:
+        FrameTiming: The statistics.
+    """
+    if expected_fps:
+        edges = np.append(np.linspace(0, 3 / expected_fps, 61), np.inf)
+    else:
+        edges = np.concatenate(([0], np.geomspace(1e-4, 10, 81), [np.inf]))
+    timing = FrameTiming(interval_edges=edges, interval_counts=np.zeros(len(edges) - 1, dtype=np.int64))
+    if len(index) == 0:
+        return timing
+
+    total, total_squared, n_intervals, max_interval = 0.0, 0.0, 0, -np.inf
+    previous: t.Optional[np.ndarray] = None
+    for chunk in index.chunks(chunk_size):
+        records = chunk if previous is None else np.concatenate((previous, chunk))
+        previous = records[-1:]
+        frame_step = np.diff(records["frame"])
+        interval = np.diff(records["time"])
+        camera_interval = np.diff(records["camera_time"]) * 1e-9
+
+        timing.n_dropped += int(np.sum(frame_step[frame_step > 1] - 1))
+        timing.n_gaps += int(np.count_nonzero(frame_step > 1))
+        timing.n_repeated += int(np.count_nonzero(frame_step < 1))
+        timing.n_backwards += int(np.count_nonzero(interval <= 0))
+        timing.n_clock_mismatch += int(np.count_nonzero(np.abs(camera_interval - interval) > clock_jitter))
+        timing.interval_counts += np.histogram(interval, edges)[0]
+        if len(interval):
+            total += interval.sum()
+            total_squared += np.square(interval).sum()
+            n_intervals += len(interval)
+            max_interval = max(max_interval, interval.max())
+
+    timing.n_frames = len(index)
+    timing.first_frame, timing.last_frame = int(index.frame[0]), int(index.frame[-1])
+    timing.start_time, timing.end_time = float(index.time[0]), float(index.time[-1])
+    if n_intervals:
+        timing.mean_interval = total / n_intervals
+        timing.interval_std = float(np.sqrt(max(total_squared / n_intervals - timing.mean_interval**2, 0.0)))
+        timing.max_interval = float(max_interval)
+    return timing
+
+
+def count_frame_triggers(
+    path: os.PathLike,
+    start: t.Optional[float] = None,
+    end: t.Optional[float] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> int:
+    """Count the frame triggers logged by a CameraXFrame register of the behavior board within [start, end].
+
+    The register file is memory-mapped and scanned `chunk_size` messages at a time.
+
+    Args:
+        path (os.PathLike): Path to the register file, e.g. "Behavior_94.bin" for Camera1Frame.
+        start (Optional[float]): Harp time of the first trigger to count.
+        end (Optional[float]): Harp time of the last trigger to count.
+        chunk_size (int): Number of messages processed at once.
+
+    Returns:
+        int: The number of EVENT messages with the FrameAcquired bit set.
+    """
+    if os.path.getsize(path) == 0:
+        return 0
+    data = np.memmap(path, dtype=np.uint8, mode="r")
+    try:
+        stride = int(data[1]) + 2
+        payload = 11 if data[4] & _PAYLOAD_TIMESTAMP_MASK else 5
+        n_messages = len(data) // stride
+        count = 0
+        for first in range(0, n_messages, chunk_size):
+            chunk = data[first * stride : min(first + chunk_size, n_messages) * stride]
+            index = HarpMessageIndex.from_buffer(chunk)
+            mask = index.message_type == MessageType.EVENT
+            mask &= (chunk.reshape(-1, stride)[:, payload] & _FRAME_ACQUIRED) > 0
+            if start is not None:
+                mask &= index.time >= start
+            if end is not None:
+                mask &= index.time <= end
+            count += int(np.count_nonzero(mask))
+    finally:
+        del data
+    return count
+
+
+def find_video(camera_path: os.PathLike, video_name: str = "video") -> t.Optional[Path]:
+    """Find the video file of a camera without reading its metadata.
+
+    The video is looked up as by the Camera data stream, the first file named `video_name` with any extension.
+
+    Args:
+        camera_path (os.PathLike): The directory of the camera.
+        video_name (str): Name of the video file, without extension.
+
+    Returns:
+        Optional[Path]: Path to the video file, None if the camera has no video.
+    """
+    return next(Path(camera_path).glob(f"{video_name}.*"), None)
+
+
+def _read_metadata(path: Path, chunk_size: int) -> t.Iterator[np.ndarray]:
+    with pd.read_csv(
+        path,
+        usecols=list(_METADATA_COLUMNS),
+        dtype={"CameraFrameNumber": np.int64, "ReferenceTime": np.float64, "CameraFrameTime": np.int64},
+        chunksize=chunk_size,
+    ) as reader:
+        for chunk in reader:
+            records = np.empty(len(chunk), dtype=FRAME_INDEX_DTYPE)
+            for column, field in _METADATA_COLUMNS.items():
+                records[field] = chunk[column].to_numpy()
+            yield records
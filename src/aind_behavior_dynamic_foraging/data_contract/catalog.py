@@ -0,0 +1,244 @@
+import datetime
+import json
+import logging
+import os
+import sqlite3
+from pathlib import Path
+from typing import Any, Iterable, Optional, Self
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# files whose size and modification time decide whether a session must be indexed again
+INDEXED_FILES = {
+    "session": "behavior/Logs/session_output.json",
+    "rig": "behavior/Logs/rig_output.json",
+    "trainer_state": "behavior/trainer_state.json",
+    "metrics": "behavior/metrics.json",
+    "trial_outcome": "behavior/SoftwareEvents/TrialOutcome.json",
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    path TEXT PRIMARY KEY,
+    signature TEXT NOT NULL,
+    session_name TEXT,
+    subject TEXT,
+    date TEXT,
+    rig_name TEXT,
+    stage TEXT,
+    n_trials INTEGER,
+    n_unignored_trials INTEGER,
+    foraging_efficiency REAL,
+    water_ml REAL
+);
+CREATE INDEX IF NOT EXISTS sessions_subject ON sessions (subject, date);
+CREATE INDEX IF NOT EXISTS sessions_stage ON sessions (stage, date);
+CREATE INDEX IF NOT EXISTS sessions_rig_name ON sessions (rig_name, date);
+"""
+
+_COLUMNS = (
+    "path",
+    "signature",
+    "session_name",
+    "subject",
+    "date",
+    "rig_name",
+    "stage",
+    "n_trials",
+    "n_unignored_trials",
+    "foraging_efficiency",
+    "water_ml",
+)
+
+
+class SessionCatalog:
+    """An SQLite index of the sessions found under one or more data directories.
+
+    The catalog stores one row per session with its subject, date, rig name, curriculum stage,
+    trial counts, foraging efficiency and consumed water, read from the session output files.
+    `update` only opens the files of sessions that are new or whose files changed since they
+    were last indexed, so it can be run again cheaply as sessions arrive.
+
+    Examples:
+        ```python
+        with SessionCatalog("sessions.sqlite") as catalog:
+            catalog.update(["/data/sessions"])
+            sessions = catalog.query(subject="789", stage="STAGE_FINAL")
+        ```
+    """
+
+    def __init__(self, path: os.PathLike | str = ":memory:") -> None:
+        """Opens the catalog, creating it if needed.
+
+        Args:
+            path (os.PathLike | str): Path to the SQLite database. By default, an in-memory database.
+        """
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript(_SCHEMA)
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self.connection.close()
+
+    def update(self, roots: Iterable[os.PathLike], include_water: bool = True, prune: bool = False) -> list[Path]:
+        """Index the sessions found in the given directories.
+
+        A directory is a session if it holds "behavior/Logs/session_output.json". Each root is
+        either a session or a directory whose children are sessions. With `include_water`, sessions
+        without a consumed water, e.g. indexed without it or whose water could not be computed, are
+        indexed again even if their files did not change.
+
+        Args:
+            roots (Iterable[os.PathLike]): Directories to scan.
+            include_water (bool): Whether to compute the consumed water, which reads the Harp data of the session.
+            prune (bool): Whether to remove the indexed sessions under `roots` that no longer exist.
+
+        Returns:
+            list[Path]: The sessions that were (re-)indexed.
+        """
+        roots = [Path(root).resolve() for root in roots]
+        known = {
+            path: (signature, has_water)
+            for path, signature, has_water in self.connection.execute(
+                "SELECT path, signature, water_ml IS NOT NULL FROM sessions"
+            )
+        }
+
+        indexed = []
+        found = set()
+        for session_path in _find_sessions(roots):
+            found.add(str(session_path))
+            signature = _signature(session_path)
+            known_signature, has_water = known.get(str(session_path), (None, False))
+            if known_signature == signature and (has_water or not include_water):
+                continue
+            try:
+                row = _read_session(session_path, include_water)
+            except Exception as e:
+                logger.warning("Failed to index %s: %s" % (session_path, e))
+                continue
+            row.update(path=str(session_path), signature=signature)
+            self.connection.execute(
+                "INSERT OR REPLACE INTO sessions (%s) VALUES (%s)"
+                % (", ".join(_COLUMNS), ", ".join("?" * len(_COLUMNS))),
+                [row.get(column) for column in _COLUMNS],
+            )
+            indexed.append(session_path)
+
+        if prune:
+            for path in known:
+                if path not in found and any(Path(path).is_relative_to(root) for root in roots):
+                    self.connection.execute("DELETE FROM sessions WHERE path = ?", (path,))
+        self.connection.commit()
+        return indexed
+
+    def query(
+        self,
+        subject: Optional[str] = None,
+        stage: Optional[str] = None,
+        rig_name: Optional[str] = None,
+        start_date: Optional[datetime.date] = None,
+        end_date: Optional[datetime.date] = None,
+    ) -> pd.DataFrame:
+        """Select sessions from the catalog.
+
+        Args:
+            subject (Optional[str]): Subject id.
+            stage (Optional[str]): Curriculum stage name.
+            rig_name (Optional[str]): Rig name.
+            start_date (Optional[datetime.date]): First session date to include.
+            end_date (Optional[datetime.date]): Last session date to include.
+
+        Returns:
+            pd.DataFrame: One row per matching session, sorted by date.
+        """
+        conditions: list[str] = []
+        parameters: list[Any] = []
+        for column, value in (("subject", subject), ("stage", stage), ("rig_name", rig_name)):
+            if value is not None:
+                conditions.append("%s = ?" % column)
+                parameters.append(value)
+        if start_date is not None:
+            conditions.append("date >= ?")
+            parameters.append(start_date.isoformat())
+        if end_date is not None:
+            conditions.append("date <= ?")
+            parameters.append(end_date.isoformat())
+
+        sql = "SELECT %s FROM sessions" % ", ".join(column for column in _COLUMNS if column != "signature")
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        return pd.read_sql_query(sql + " ORDER BY date, path", self.connection, params=parameters)
+
+
+def _find_sessions(roots: list[Path]) -> Iterable[Path]:
+    for root in roots:
+        if (root / INDEXED_FILES["session"]).exists():
+            yield root
+        elif root.is_dir():
+            for child in sorted(root.iterdir()):
+                if (child / INDEXED_FILES["session"]).exists():
+                    yield child
+
+
+def _signature(session_path: Path) -> str:
+    signature = {}
+    for key, relative_path in INDEXED_FILES.items():
+        try:
+            stat = (session_path / relative_path).stat()
+        except OSError:
+            continue
+        signature[key] = [stat.st_size, stat.st_mtime_ns]
+    return json.dumps(signature, sort_keys=True)
+
+
+def _read_json(path: Path) -> Optional[dict[str, Any]]:
+    try:
+        with open(path, "r", encoding="utf-8") as file:
+            return json.load(file)
+    except FileNotFoundError:
+        return None
+
+
+def _read_session(session_path: Path, include_water: bool) -> dict[str, Any]:
+    """Read the catalog fields of a session from its output files."""
+    session = _read_json(session_path / INDEXED_FILES["session"])
+    rig = _read_json(session_path / INDEXED_FILES["rig"]) or {}
+    trainer_state = _read_json(session_path / INDEXED_FILES["trainer_state"]) or {}
+    metrics = _read_json(session_path / INDEXED_FILES["metrics"]) or {}
+
+    row = {
+        "session_name": session.get("session_name"),
+        "subject": session.get("subject"),
+        "date": datetime.datetime.fromisoformat(session["date"]).date().isoformat() if session.get("date") else None,
+        "rig_name": rig.get("rig_name"),
+        "stage": (trainer_state.get("stage") or {}).get("name"),
+        "n_unignored_trials": _last(metrics.get("unignored_trials_per_session")),
+        "foraging_efficiency": _last(metrics.get("foraging_efficiency_per_session")),
+    }
+
+    trial_outcome_path = session_path / INDEXED_FILES["trial_outcome"]
+    if trial_outcome_path.exists():
+        with open(trial_outcome_path, "rb") as file:
+            row["n_trials"] = sum(1 for line in file if line.strip())
+
+    if include_water:
+        from .utils import calculate_consumed_water
+
+        try:
+            row["water_ml"] = calculate_consumed_water(session_path)
+        except Exception as e:
+            logger.info("Could not calculate the water consumed in %s: %s" % (session_path, e))
+    return row
+
+
+def _last(values: Optional[list[Any]]) -> Any:
+    return values[-1] if values else None
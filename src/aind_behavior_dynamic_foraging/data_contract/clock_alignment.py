@@ -0,0 +1,288 @@
+import json
+import logging
+import typing as t
+from pathlib import Path
+
+import numpy as np
+from pydantic import BaseModel, Field
+
+from ._file_cache import cache_path as get_cache_path
+from ._file_cache import write_atomically
+from ._software_events_table import read_software_events_table
+
+if t.TYPE_CHECKING:
+    from contraqctor.contract import Dataset
+
+logger = logging.getLogger(__name__)
+
+CACHE_FILE_NAME = "clock_alignment.json"
+
+
+class AlignmentPair(BaseModel):
+    """A software event and the Harp register message emitted for the same action."""
+
+    software_event: str = Field(description="Name of the SoftwareEvents stream.")
+    harp_device: str = Field(description="Name of the Harp device stream.")
+    harp_register: str = Field(description="Name of the Harp register.")
+    message_type: str = Field(default="WRITE", description="Harp message type to match.")
+
+
+DEFAULT_ALIGNMENT_PAIRS = (
+    # the go cue is played by the sound card when the response period starts
+    AlignmentPair(software_event="ResponsePeriod", harp_device="HarpSoundCard", harp_register="PlaySoundOrFrequency"),
+    AlignmentPair(software_event="GiveManualWaterRight", harp_device="HarpBehavior", harp_register="OutputSet"),
+)
+
+
+class ClockAlignment(BaseModel):
+    """Piecewise-linear mapping from software event timestamps to Harp time.
+
+    The mapping is defined by knots holding the Harp minus software offset at a given
+    software time. The offset is linearly interpolated between knots and held constant
+    before the first and after the last knot.
+    """
+
+    knot_times: list[float] = Field(description="Software times of the knots, sorted.")
+    knot_offsets: list[float] = Field(description="Harp minus software time at each knot.")
+    n_pairs: int = Field(description="Number of matched event pairs used for the fit.")
+    residual_std: float = Field(description="Standard deviation of the residuals of the fit, in seconds.")
+
+    @classmethod
+    def fit(
+        cls,
+        software_times: np.ndarray,
+        harp_times: np.ndarray,
+        max_distance: float = 0.1,
+        segment_duration: float = 60.0,
+    ) -> t.Self:
+        """Match software and Harp events and fit the mapping between their clocks.
+
+        Args:
+            software_times (np.ndarray): Software timestamps of the events.
+            harp_times (np.ndarray): Harp timestamps of the candidate counterparts.
+            max_distance (float): Largest residual offset of a matched pair, in seconds, see `match_events`.
+            segment_duration (float): Duration of the segments used to place the knots, in seconds.
+
+        Returns:
+            ClockAlignment: The fitted mapping.
+
+        Raises:
+            ValueError: If no events could be matched.
+        """
+        return cls.from_pairs(*match_events(software_times, harp_times, max_distance), segment_duration)
+
+    @classmethod
+    def from_pairs(cls, software_times: np.ndarray, harp_times: np.ndarray, segment_duration: float = 60.0) -> t.Self:
+        """Fit the mapping from matched event pairs.
+
+        The offset of each knot is the median offset of the pairs within a segment of
+        `segment_duration` seconds, which keeps the fit robust to mismatched pairs.
+
+        Args:
+            software_times (np.ndarray): Software timestamps of the pairs, sorted.
+            harp_times (np.ndarray): Harp timestamps of the pairs.
+            segment_duration (float): Duration of the segments used to place the knots, in seconds.
+
+        Returns:
+            ClockAlignment: The fitted mapping.
+
+        Raises:
+            ValueError: If there are no pairs.
+        """
+        software_times = np.asarray(software_times, dtype=float)
+        harp_times = np.asarray(harp_times, dtype=float)
+        if len(software_times) == 0:
+            raise ValueError("No software events could be matched to Harp events.")
+        offsets = harp_times - software_times
+
+        segment = np.floor((software_times - software_times[0]) / segment_duration).astype(int)
+        _, starts = np.unique(segment, return_index=True)
+        ends = np.append(starts[1:], len(software_times))
+        alignment = cls(
+            knot_times=[float(np.median(software_times[s:e])) for s, e in zip(starts, ends)],
+            knot_offsets=[float(np.median(offsets[s:e])) for s, e in zip(starts, ends)],
+            n_pairs=len(software_times),
+            residual_std=0.0,
+        )
+        alignment.residual_std = float(np.std(alignment.to_harp(software_times) - harp_times))
+        return alignment
+
+    def to_harp(self, software_times: np.ndarray) -> np.ndarray:
+        """Convert software timestamps to Harp time.
+
+        Args:
+            software_times (np.ndarray): Software timestamps, in any order.
+
+        Returns:
+            np.ndarray: The corresponding Harp times.
+        """
+        software_times = np.asarray(software_times, dtype=float)
+        return software_times + np.interp(software_times, self.knot_times, self.knot_offsets)
+
+    def to_software(self, harp_times: np.ndarray) -> np.ndarray:
+        """Convert Harp timestamps to software time, the inverse of `to_harp`.
+
+        Args:
+            harp_times (np.ndarray): Harp timestamps, in any order.
+
+        Returns:
+            np.ndarray: The corresponding software times.
+        """
+        harp_times = np.asarray(harp_times, dtype=float)
+        knot_harp_times = np.asarray(self.knot_times) + np.asarray(self.knot_offsets)
+        return harp_times - np.interp(harp_times, knot_harp_times, self.knot_offsets)
+
+
+def match_nearest(
+    software_times: np.ndarray, harp_times: np.ndarray, max_distance: float
+) -> tuple[np.ndarray, np.ndarray]:
+    """Match each software time to its nearest Harp time, keeping at most one match per Harp time.
+
+    Args:
+        software_times (np.ndarray): Sorted software times.
+        harp_times (np.ndarray): Sorted Harp times.
+        max_distance (float): Largest distance between matched times.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: Indices of the matched software and Harp times, sorted by software time.
+    """
+    if len(software_times) == 0 or len(harp_times) == 0:
+        return np.empty(0, dtype=int), np.empty(0, dtype=int)
+    after = np.minimum(np.searchsorted(harp_times, software_times), len(harp_times) - 1)
+    before = np.maximum(after - 1, 0)
+    harp_index = np.where(
+        np.abs(harp_times[before] - software_times) <= np.abs(harp_times[after] - software_times), before, after
+    )
+    distance = np.abs(harp_times[harp_index] - software_times)
+    software_index = np.flatnonzero(distance <= max_distance)
+
+    # when several software times share a Harp time, keep the closest one
+    order = software_index[np.argsort(distance[software_index], kind="stable")]
+    _, first = np.unique(harp_index[order], return_index=True)
+    software_index = np.sort(order[first])
+    return software_index, harp_index[software_index]
+
+
+def match_events(
+    software_times: np.ndarray, harp_times: np.ndarray, max_distance: float = 0.1
+) -> tuple[np.ndarray, np.ndarray]:
+    """Pair software events with the Harp events emitted for the same actions.
+
+    Events are first matched to their nearest neighbour to estimate the median offset between
+    the two clocks. They are then matched again after removing that offset, discarding pairs
+    further apart than `max_distance`.
+
+    Args:
+        software_times (np.ndarray): Software timestamps of the events.
+        harp_times (np.ndarray): Harp timestamps of the candidate counterparts.
+        max_distance (float): Largest residual offset of a matched pair, in seconds.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: The software and Harp times of the pairs, sorted by software time.
+    """
+    software_times = np.sort(np.asarray(software_times, dtype=float))
+    harp_times = np.sort(np.asarray(harp_times, dtype=float))
+    software_index, harp_index = match_nearest(software_times, harp_times, max_distance=np.inf)
+    if len(software_index) == 0:
+        return np.empty(0), np.empty(0)
+    median_offset = np.median(harp_times[harp_index] - software_times[software_index])
+    software_index, harp_index = match_nearest(software_times + median_offset, harp_times, max_distance)
+    return software_times[software_index], harp_times[harp_index]
+
+
+def align_software_events(
+    dataset: "Dataset",
+    pairs: t.Sequence[AlignmentPair] = DEFAULT_ALIGNMENT_PAIRS,
+    max_distance: float = 0.1,
+    segment_duration: float = 60.0,
+    use_cache: bool = True,
+) -> ClockAlignment:
+    """Fit the mapping from the SoftwareEvents timestamps of a session to Harp time.
+
+    Every pair whose software events and Harp register exist in the session contributes
+    matched events. When a cache directory is set (see `set_cache_directory`), the fit is cached
+    there as JSON, keyed by the size and modification time of the files it was fitted from.
+
+    Args:
+        dataset (Dataset): The dataset of the session.
+        pairs (Sequence[AlignmentPair]): The events to match.
+        max_distance (float): Largest residual offset of a matched pair, in seconds, see `ClockAlignment.fit`.
+        segment_duration (float): Duration of the segments used to place the knots, in seconds.
+        use_cache (bool): Whether to read and write the cached fit, if a cache directory is set.
+
+    Returns:
+        ClockAlignment: The fitted mapping.
+
+    Raises:
+        ValueError: If none of the pairs could be matched.
+    """
+    behavior = dataset["Behavior"]
+    sources = []
+    for pair in pairs:
+        software_path = Path(behavior["SoftwareEvents"][pair.software_event].reader_params.path)
+        try:
+            register = behavior[pair.harp_device][pair.harp_register]
+        except FileNotFoundError:
+            logger.debug("%s was not found, skipping it for clock alignment." % pair.harp_device)
+            continue
+        if software_path.exists() and register.path.exists():
+            sources.append((pair, software_path, register))
+    if not sources:
+        raise ValueError("None of the alignment events were found in the dataset.")
+
+    cache_path = get_cache_path(sources[0][1].parent, CACHE_FILE_NAME) if use_cache else None
+    cache_key = {
+        "sources": [
+            _file_signature(path) for _, software_path, register in sources for path in (software_path, register.path)
+        ],
+        "max_distance": max_distance,
+        "segment_duration": segment_duration,
+    }
+    if cache_path is not None:
+        alignment = _read_cache(cache_path, cache_key)
+        if alignment is not None:
+            return alignment
+
+    # each pair is matched on its own so that an event can only match its own register
+    software, harp = [], []
+    for pair, software_path, register in sources:
+        pair_software, pair_harp = match_events(
+            read_software_events_table(software_path, use_cache=use_cache).index.to_numpy(dtype=float),
+            register.read_messages(message_type=pair.message_type).index.to_numpy(dtype=float),
+            max_distance,
+        )
+        software.append(pair_software)
+        harp.append(pair_harp)
+    software, harp = np.concatenate(software), np.concatenate(harp)
+    order = np.argsort(software, kind="stable")
+    alignment = ClockAlignment.from_pairs(software[order], harp[order], segment_duration)
+
+    if cache_path is not None:
+        _write_cache(cache_path, cache_key, alignment)
+    return alignment
+
+
+def _file_signature(path: Path) -> list:
+    stat = path.stat()
+    return [str(path.name), stat.st_size, stat.st_mtime_ns]
+
+
+def _read_cache(cache_path: Path, cache_key: dict) -> t.Optional[ClockAlignment]:
+    if not cache_path.exists():
+        return None
+    try:
+        with open(cache_path, "r", encoding="utf-8") as file:
+            cached = json.load(file)
+        if cached["key"] == cache_key:
+            return ClockAlignment.model_validate(cached["alignment"])
+    except Exception as e:
+        logger.warning("Failed to read clock alignment cache %s: %s" % (cache_path, e))
+    return None
+
+
+def _write_cache(cache_path: Path, cache_key: dict, alignment: ClockAlignment) -> None:
+    try:
+        content = json.dumps({"key": cache_key, "alignment": alignment.model_dump(mode="json")}).encode("utf-8")
+        write_atomically(cache_path, lambda file: file.write(content))
+    except Exception as e:
+        logger.warning("Failed to write clock alignment cache %s: %s" % (cache_path, e))
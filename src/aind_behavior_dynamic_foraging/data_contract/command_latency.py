@@ -0,0 +1,212 @@
+import logging
+import os
+import re
+import typing as t
+from pathlib import Path
+
+import harp.reader
+import numpy as np
+import pandas as pd
+
+from ._indexed_harp import load_message_index
+
+if t.TYPE_CHECKING:
+    from contraqctor.contract import Dataset
+
+logger = logging.getLogger(__name__)
+
+# longest wait for the reply to a command, in seconds, later replies answer a later command
+DEFAULT_REPLY_TIMEOUT = 1.0
+# latencies above the Q3 + OUTLIER_FENCE * IQR of their device are tail outliers
+DEFAULT_OUTLIER_FENCE = 3.0
+# shortest latency reported as an outlier, in seconds, so a narrow distribution does not flag every jitter
+DEFAULT_MIN_OUTLIER_LATENCY = 0.005
+
+LATENCY_COLUMNS = ["device", "register", "address", "time", "reply_time", "latency", "is_outlier"]
+
+_REGISTER_FILE = re.compile(r"_(\d+)\.bin$")
+_OPERATION_CONTROL_ADDRESS = 10
+
+
+def pair_replies(
+    command_times: np.ndarray, reply_times: np.ndarray, timeout: float = DEFAULT_REPLY_TIMEOUT
+) -> np.ndarray:
+    """Pair the commands sent to a register with the replies of the device.
+
+    A device answers the commands to a register in the order it receives them. Commands sent before
+    any reply arrived are in flight at the same time, and share the replies that arrive before the
+    next command is sent after a reply. Each command may only take a reply from its own share, so a
+    lost reply does not shift the pairing of later commands. When a share has fewer replies than
+    commands, the replies answer the latest commands, which gives the shortest latencies.
+
+    Args:
+        command_times (np.ndarray): Sorted times of the commands.
+        reply_times (np.ndarray): Sorted times of the replies.
+        timeout (float): Longest wait for a reply, in seconds.
+
+    Returns:
+        np.ndarray: Index of the reply to each command, -1 for commands without a reply within `timeout`.
+    """
+    command_times = np.asarray(command_times, dtype=float)
+    reply_times = np.asarray(reply_times, dtype=float)
+    if len(command_times) == 0:
+        return np.empty(0, dtype=int)
+    first = np.searchsorted(reply_times, command_times, side="left")
+    # commands without a reply between them are in flight at the same time and form a burst
+    is_start = np.concatenate(([True], first[1:] != first[:-1]))
+    starts = np.flatnonzero(is_start)
+    burst = np.cumsum(is_start) - 1
+    shared = np.diff(np.append(first[starts], len(reply_times)))
+    rank = np.arange(len(command_times)) - starts[burst]
+    unanswered = np.maximum(np.diff(np.append(starts, len(command_times))) - shared, 0)[burst]
+    reply = first + rank - unanswered
+    answered = rank >= unanswered
+    answered[answered] = reply_times[reply[answered]] - command_times[answered] <= timeout
+    return np.where(answered, reply, -1)
+
+
+def measure_device_latency(
+    device_path: os.PathLike,
+    commands_path: os.PathLike,
+    timeout: float = DEFAULT_REPLY_TIMEOUT,
+    use_cache: bool = True,
+) -> pd.DataFrame:
+    """Measure the latency between the WRITE commands sent to a Harp device and their replies.
+
+    Only the message index of each register file is read (see `load_message_index`), payloads
+    are not parsed. As in the request/response test of the Harp device QC, messages logged before
+    the first OperationControl command are ignored.
+
+    Args:
+        device_path (os.PathLike): The ".harp" directory of the messages of the device.
+        commands_path (os.PathLike): The ".harp" directory of the commands sent to the device.
+        timeout (float): Longest wait for a reply, in seconds, see `pair_replies`.
+        use_cache (bool): Whether to read and write the message index caches, if a cache directory is set.
+
+    Returns:
+        pd.DataFrame: One row per command with its "register", "address", "time", "reply_time" and
+            "latency" (in seconds, NaN without a reply), sorted by time.
+    """
+    device_path, commands_path = Path(device_path), Path(commands_path)
+    commands = _write_times(commands_path, use_cache)
+    replies = _write_times(device_path, use_cache)
+    start = commands.get(_OPERATION_CONTROL_ADDRESS, np.empty(0))
+    start = start[0] if len(start) > 0 else -np.inf
+    names = _register_names(device_path)
+
+    latencies = []
+    for address, command_times in commands.items():
+        command_times = command_times[command_times >= start]
+        reply_times = replies.get(address, np.empty(0))
+        reply_times = reply_times[reply_times >= start]
+        reply = pair_replies(command_times, reply_times, timeout)
+        reply_time = np.where(reply >= 0, np.append(reply_times, np.nan)[reply], np.nan)
+        latencies.append(
+            pd.DataFrame(
+                {
+                    "register": names.get(address, str(address)),
+                    "address": address,
+                    "time": command_times,
+                    "reply_time": reply_time,
+                    "latency": reply_time - command_times,
+                }
+            )
+        )
+    if not latencies:
+        return pd.DataFrame(columns=["register", "address", "time", "reply_time", "latency"])
+    return pd.concat(latencies, ignore_index=True).sort_values("time", kind="stable", ignore_index=True)
+
+
+def measure_command_latency(
+    dataset: "Dataset",
+    timeout: float = DEFAULT_REPLY_TIMEOUT,
+    outlier_fence: float = DEFAULT_OUTLIER_FENCE,
+    min_outlier_latency: float = DEFAULT_MIN_OUTLIER_LATENCY,
+    use_cache: bool = True,
+) -> pd.DataFrame:
+    """Measure the command latency of every Harp device of a session with logged commands.
+
+    A latency is a tail outlier when it is above the Tukey fence Q3 + `outlier_fence` * IQR of the
+    latencies of its device, and longer than `min_outlier_latency`.
+
+    Args:
+        dataset (Dataset): The dataset of the session.
+        timeout (float): Longest wait for a reply, in seconds, see `pair_replies`.
+        outlier_fence (float): Number of interquartile ranges above the third quartile of a tail outlier.
+        min_outlier_latency (float): Shortest latency reported as an outlier, in seconds.
+        use_cache (bool): Whether to read and write the message index caches, if a cache directory is set.
+
+    Returns:
+        pd.DataFrame: One row per WRITE command, see `LATENCY_COLUMNS`, sorted by device and time.
+    """
+    behavior = dataset["Behavior"]
+    latencies = []
+    for commands in behavior["HarpCommands"]:
+        commands_path = Path(commands.reader_params.path)
+        if not commands_path.is_dir():
+            continue
+        device_path = Path(behavior[commands.name].reader_params.path)
+        latency = measure_device_latency(device_path, commands_path, timeout, use_cache)
+        latency.insert(0, "device", commands.name)
+        latencies.append(latency)
+    if not latencies:
+        return pd.DataFrame(columns=LATENCY_COLUMNS)
+    latency = pd.concat(latencies, ignore_index=True)
+    by_device = latency.groupby("device")["latency"]
+    q1, q3 = by_device.transform("quantile", 0.25), by_device.transform("quantile", 0.75)
+    fence = np.maximum(q3 + outlier_fence * (q3 - q1), min_outlier_latency)
+    latency["is_outlier"] = (latency["latency"] > fence).to_numpy(dtype=bool)
+    return latency[LATENCY_COLUMNS]
+
+
+def summarize_command_latency(latency: pd.DataFrame, by: t.Sequence[str] = ("device",)) -> pd.DataFrame:
+    """Summarize the latency distribution of the commands of each device.
+
+    Args:
+        latency (pd.DataFrame): The latencies returned by `measure_command_latency`.
+        by (Sequence[str]): Columns to group the commands by, e.g. ("device", "register").
+
+    Returns:
+        pd.DataFrame: The "n_commands", "n_unanswered", "n_outliers" and the "median", "p95", "p99" and
+            "max" latency in seconds of each group.
+    """
+    groups = latency.groupby(list(by), sort=True)
+    summary = groups["latency"].agg(
+        median="median",
+        p95=lambda x: x.quantile(0.95),
+        p99=lambda x: x.quantile(0.99),
+        max="max",
+    )
+    summary.insert(0, "n_commands", groups.size())
+    summary.insert(1, "n_unanswered", groups["latency"].apply(lambda x: int(x.isna().sum())))
+    summary.insert(2, "n_outliers", groups["is_outlier"].sum().astype(int))
+    return summary
+
+
+def _write_times(path: Path, use_cache: bool) -> dict[int, np.ndarray]:
+    """Return the sorted times of the WRITE messages of every register file in a device directory."""
+    times = {}
+    try:
+        entries = list(os.scandir(path))
+    except FileNotFoundError:
+        return times
+    for entry in entries:
+        match = _REGISTER_FILE.search(entry.name)
+        if match is None or entry.stat().st_size == 0:
+            continue
+        data = np.memmap(entry.path, dtype=np.uint8, mode="r")
+        try:
+            index = load_message_index(entry.path, data, use_cache=use_cache)
+        finally:
+            del data
+        times[int(match.group(1))] = np.sort(index.time[index.select("WRITE")])
+    return times
+
+
+def _register_names(device_path: Path) -> dict[int, str]:
+    try:
+        reader = harp.reader.create_reader(device_path / "device.yml")
+    except Exception as e:
+        logger.debug("Could not read the registers of %s: %s" % (device_path, e))
+        return {}
+    return {register.register.address: name for name, register in reader.registers.items()}
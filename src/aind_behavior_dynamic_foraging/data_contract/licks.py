@@ -0,0 +1,162 @@
+import typing as t
+
+import numpy as np
+import pandas as pd
+
+from ..rig import AindDynamicForagingRig
+from ._trial_table import PERIODS, period_boundaries
+
+if t.TYPE_CHECKING:
+    from contraqctor.contract import Dataset
+
+SIDES = ("left", "right")
+
+# licks separated by more than this many seconds belong to different bouts
+DEFAULT_BOUT_INTERVAL = 1.0
+
+
+def get_lick_onsets(state: pd.Series) -> np.ndarray:
+    """Return the times at which a binary lick state switches on.
+
+    Args:
+        state (pd.Series): Time-indexed lick state of one channel, from EVENT messages.
+
+    Returns:
+        np.ndarray: Sorted lick onset times.
+    """
+    return get_lick_edges(state)["onset"].to_numpy()
+
+
+def get_lick_edges(state: pd.Series) -> pd.DataFrame:
+    """Pair the rising and falling edges of a binary lick state into licks.
+
+    Args:
+        state (pd.Series): Time-indexed lick state of one channel, from EVENT messages.
+
+    Returns:
+        pd.DataFrame: One row per lick with its "onset", "offset" and "duration", sorted by onset.
+            The offset of a lick still in progress at the end of the data is NaN.
+    """
+    state = state.sort_index()
+    values = state.to_numpy(dtype=bool)
+    times = state.index.to_numpy(dtype=float)
+    # events are only emitted on changes, so a first message in the on state is an onset too
+    previous = np.concatenate(([False], values[:-1]))
+    onset = times[values & ~previous]
+    offset = times[~values & previous]
+    # pair each onset with the first falling edge after it
+    after_onset = np.searchsorted(offset, onset, side="right")
+    offset = np.append(offset, np.nan)[after_onset]
+    return pd.DataFrame({"onset": onset, "offset": offset, "duration": offset - onset})
+
+
+def get_lick_events(dataset: "Dataset") -> pd.DataFrame:
+    """Return the licks on both sides of a session, in Harp time.
+
+    Licks are read from the lickometer of a side when the rig has one, and from the
+    corresponding digital input of the behavior board otherwise, as in the task workflow.
+
+    Args:
+        dataset (Dataset): The dataset of the session.
+
+    Returns:
+        pd.DataFrame: One row per lick with its "side", "onset", "offset" and "duration", sorted by onset.
+    """
+    behavior = dataset["Behavior"]
+    rig = AindDynamicForagingRig.model_validate(behavior["InputSchemas"]["Rig"].data)
+    sources = {
+        "left": (rig.harp_lickometer_left, "HarpLickometerLeft", "DIPort0"),
+        "right": (rig.harp_lickometer_right, "HarpLickometerRight", "DIPort1"),
+    }
+
+    licks = []
+    for side, (lickometer, lickometer_name, behavior_port) in sources.items():
+        if lickometer is not None:
+            register, column = behavior[lickometer_name]["LickState"], "Channel0"
+        else:
+            register, column = behavior["HarpBehavior"]["DigitalInputState"], behavior_port
+        edges = get_lick_edges(register.read_messages(message_type="EVENT")[column])
+        edges.insert(0, "side", side)
+        licks.append(edges)
+    return pd.concat(licks, ignore_index=True).sort_values("onset", kind="stable", ignore_index=True)
+
+
+def get_lick_times(dataset: "Dataset") -> dict[str, np.ndarray]:
+    """Return the lick onset times on each side, in Harp time, see `get_lick_events`.
+
+    Args:
+        dataset (Dataset): The dataset of the session.
+
+    Returns:
+        dict[str, np.ndarray]: Sorted lick onset times for "left" and "right".
+    """
+    licks = get_lick_events(dataset)
+    return {side: licks.loc[licks["side"] == side, "onset"].to_numpy() for side in SIDES}
+
+
+def detect_lick_bouts(licks: pd.DataFrame, max_interval: float = DEFAULT_BOUT_INTERVAL) -> pd.DataFrame:
+    """Group licks into bouts.
+
+    A bout is a run of licks on the same side where each lick starts at most `max_interval`
+    seconds after the previous one. A lick on the other side always starts a new bout.
+
+    Args:
+        licks (pd.DataFrame): Licks with "side" and "onset" columns, sorted by onset, see `get_lick_events`.
+        max_interval (float): Longest inter-lick interval within a bout, in seconds.
+
+    Returns:
+        pd.DataFrame: One row per bout with its "side", "start" (first onset), "end" (last onset) and
+            "n_licks", indexed by bout number.
+    """
+    onset = licks["onset"].to_numpy(dtype=float)
+    side = licks["side"].to_numpy()
+    is_first = np.ones(len(onset), dtype=bool)
+    is_first[1:] = (np.diff(onset) > max_interval) | (side[1:] != side[:-1])
+    first = np.flatnonzero(is_first)
+    last = np.append(first[1:], len(onset))[: len(first)] - 1
+    return pd.DataFrame(
+        {"side": side[first], "start": onset[first], "end": onset[last], "n_licks": last - first + 1},
+        index=pd.RangeIndex(len(first), name="bout"),
+    )
+
+
+def assign_licks_to_periods(licks: pd.DataFrame, trial_table: pd.DataFrame) -> pd.DataFrame:
+    """Add the trial and trial period in which each lick starts.
+
+    Args:
+        licks (pd.DataFrame): Licks with an "onset" column, see `get_lick_events`.
+        trial_table (pd.DataFrame): The trial table of the session, see `trial_table`.
+
+    Returns:
+        pd.DataFrame: The licks with "trial" and "period" columns. Licks before the first trial are dropped.
+    """
+    boundaries = period_boundaries(trial_table)[:, :-1].ravel()
+    position = np.searchsorted(boundaries, licks["onset"].to_numpy(dtype=float), side="right") - 1
+    valid = position >= 0
+    licks = licks[valid].copy()
+    licks["trial"] = trial_table.index.to_numpy()[position[valid] // len(PERIODS)]
+    licks["period"] = pd.Categorical.from_codes(position[valid] % len(PERIODS), categories=PERIODS)
+    return licks
+
+
+def lick_interval_statistics(licks: pd.DataFrame, trial_table: pd.DataFrame) -> pd.DataFrame:
+    """Summarize the inter-lick intervals on each side within each period of each trial.
+
+    The interval of a lick is the time since the previous lick on the same side in the same
+    trial period, so the first lick of a period has no interval.
+
+    Args:
+        licks (pd.DataFrame): Licks with "side" and "onset" columns, sorted by onset, see `get_lick_events`.
+        trial_table (pd.DataFrame): The trial table of the session, see `trial_table`.
+
+    Returns:
+        pd.DataFrame: The "n_licks" and the "mean", "median", "min" and "max" inter-lick interval,
+            indexed by trial, period and side, for the periods with at least one lick.
+    """
+    licks = assign_licks_to_periods(licks, trial_table)
+    groups = [licks["trial"], licks["period"], licks["side"]]
+    licks["interval"] = licks["onset"].groupby(groups, observed=True).diff()
+    intervals = licks.groupby(["trial", "period", "side"], observed=True)
+    statistics = intervals["interval"].agg(["mean", "median", "min", "max"])
+    statistics.insert(0, "n_licks", intervals.size())
+    return statistics
@@ -0,0 +1,195 @@
+import asyncio
+import json
+import logging
+import os
+from collections import deque
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Iterable, Optional
+
+import pandas as pd
+
+from ._software_events_table import events_to_table
+
+logger = logging.getLogger(__name__)
+
+SoftwareEventRecord = dict[str, Any]
+
+
+class SoftwareEventsTail:
+    """Follows a SoftwareEvents JSON-lines file while it is being written.
+
+    The reader remembers the byte offset of the last complete line, so each call to `read_new`
+    only parses lines appended since the previous call. A trailing line without a newline is
+    considered partially written and is left for the next call. If the file shrinks (e.g. it
+    was replaced), the reader starts over from the beginning.
+    """
+
+    def __init__(self, path: os.PathLike, from_end: bool = False) -> None:
+        """Initializes the reader.
+
+        Args:
+            path (os.PathLike): Path to the SoftwareEvents JSON-lines file. It does not need to exist yet.
+            from_end (bool): If True, skip the events already in the file.
+        """
+        self.path = Path(path)
+        self.offset = self.path.stat().st_size if from_end and self.path.exists() else 0
+
+    def read_new(self) -> list[SoftwareEventRecord]:
+        """Parse the events appended since the last call.
+
+        Returns:
+            list[SoftwareEventRecord]: The new events, in file order.
+        """
+        try:
+            size = self.path.stat().st_size
+        except FileNotFoundError:
+            return []
+        if size < self.offset:
+            logger.info("%s was truncated, reading from the start." % self.path)
+            self.offset = 0
+        if size == self.offset:
+            return []
+
+        with open(self.path, "rb") as file:
+            file.seek(self.offset)
+            chunk = file.read(size - self.offset)
+        end = chunk.rfind(b"\n") + 1
+        self.offset += end
+
+        events = []
+        for line in chunk[:end].splitlines():
+            if not line.strip():
+                continue
+            try:
+                events.append(json.loads(line))
+            except json.JSONDecodeError as e:
+                logger.warning("Skipping malformed line in %s: %s" % (self.path, e))
+        return events
+
+
+class RollingEventsBuffer:
+    """Keeps the most recent events of a stream and exposes them as a flat table.
+
+    The table uses the same columns as `software_events_table` and is only rebuilt when new
+    events were added since it was last requested.
+    """
+
+    def __init__(self, maxlen: int = 500) -> None:
+        """Initializes an empty buffer.
+
+        Args:
+            maxlen (int): Number of most recent events to keep.
+        """
+        self.events: deque[SoftwareEventRecord] = deque(maxlen=maxlen)
+        self._table: Optional[pd.DataFrame] = None
+
+    def __len__(self) -> int:
+        return len(self.events)
+
+    def extend(self, events: Iterable[SoftwareEventRecord]) -> None:
+        """Add events to the buffer, dropping the oldest ones beyond its length."""
+        events = list(events)
+        if events:
+            self.events.extend(events)
+            self._table = None
+
+    def to_frame(self) -> pd.DataFrame:
+        """Return the buffered events as a table indexed by timestamp."""
+        if self._table is None:
+            self._table = events_to_table(list(self.events))
+        return self._table
+
+
+class SoftwareEventsFollower:
+    """Follows the SoftwareEvents streams of a running session.
+
+    Each call to `poll` reads the lines appended to every followed stream, stores them in a
+    per-stream `RollingEventsBuffer` and passes each new event to the subscribed callbacks.
+    When no stream names are given, stream files created after the follower are picked up too.
+    `follow` wraps `poll` in an async iterator, so several sessions can be followed from one
+    event loop.
+
+    Examples:
+        ```python
+        follower = SoftwareEventsFollower(session_path, names=["TrialOutcome"])
+        async for event in follower.follow():
+            print(event["name"], event["timestamp"])
+        ```
+    """
+
+    def __init__(
+        self,
+        session_path: os.PathLike,
+        names: Optional[Iterable[str]] = None,
+        buffer_length: int = 500,
+        from_end: bool = False,
+    ) -> None:
+        """Initializes the follower without reading any data.
+
+        Args:
+            session_path (os.PathLike): The session root directory, as passed to `dataset`.
+            names (Optional[Iterable[str]]): SoftwareEvents streams to follow (e.g. "TrialOutcome"). By default,
+                every stream in the SoftwareEvents directory.
+            buffer_length (int): Number of most recent events kept per stream.
+            from_end (bool): If True, skip the events already written when a stream is first seen.
+        """
+        self.directory = Path(session_path) / "behavior" / "SoftwareEvents"
+        self.names = list(names) if names is not None else None
+        self.buffer_length = buffer_length
+        self.from_end = from_end
+        self.tails: dict[str, SoftwareEventsTail] = {}
+        self.buffers: dict[str, RollingEventsBuffer] = {}
+        self._callbacks: list[Callable[[SoftwareEventRecord], None]] = []
+        for name in self.names or []:
+            self._add_stream(name)
+
+    def subscribe(self, callback: Callable[[SoftwareEventRecord], None]) -> None:
+        """Register a callback called with every new event during `poll`."""
+        self._callbacks.append(callback)
+
+    def poll(self) -> list[SoftwareEventRecord]:
+        """Read the events appended to the followed streams since the last poll.
+
+        Returns:
+            list[SoftwareEventRecord]: The new events of all streams, sorted by timestamp.
+        """
+        if self.names is None and self.directory.exists():
+            for path in self.directory.glob("*.json"):
+                if path.stem not in self.tails:
+                    self._add_stream(path.stem)
+
+        events: list[SoftwareEventRecord] = []
+        for name, tail in self.tails.items():
+            new_events = tail.read_new()
+            self.buffers[name].extend(new_events)
+            events.extend(new_events)
+        events.sort(key=lambda event: event.get("timestamp") or 0)
+
+        for event in events:
+            for callback in self._callbacks:
+                callback(event)
+        return events
+
+    async def follow(self, poll_interval: float = 0.5) -> AsyncIterator[SoftwareEventRecord]:
+        """Yield new events as they are written, polling the streams every `poll_interval` seconds.
+
+        Args:
+            poll_interval (float): Seconds to wait between polls when no new events were found.
+
+        Yields:
+            SoftwareEventRecord: Each new event, in timestamp order within a poll.
+        """
+        while True:
+            events = self.poll()
+            for event in events:
+                yield event
+            if not events:
+                await asyncio.sleep(poll_interval)
+
+    def table(self, name: str) -> pd.DataFrame:
+        """Return the buffered events of a stream as a flat table, see `RollingEventsBuffer`."""
+        return self.buffers[name].to_frame()
+
+    def _add_stream(self, name: str) -> None:
+        self.tails[name] = SoftwareEventsTail(self.directory / f"{name}.json", from_end=self.from_end)
+        self.buffers[name] = RollingEventsBuffer(self.buffer_length)
@@ -0,0 +1,149 @@
+import logging
+import multiprocessing
+import os
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterable, Optional
+
+import pandas as pd
+
+from . import dataset as df_dataset
+from . import trial_table
+
+logger = logging.getLogger(__name__)
+
+PARTITION_COLUMNS = ("subject", "date", "stage")
+UNKNOWN_PARTITION = "unknown"
+
+
+@dataclass
+class TrialStoreReport:
+    """Outcome of a `write_trial_store` call."""
+
+    written: list[Path] = field(default_factory=list)
+    """Sessions whose trial table was added to the store."""
+    skipped: list[Path] = field(default_factory=list)
+    """Sessions already in the store."""
+    failed: dict[Path, str] = field(default_factory=dict)
+    """Sessions that could not be read, with the formatted error."""
+
+
+def write_trial_store(
+    session_paths: Iterable[os.PathLike],
+    store_path: os.PathLike,
+    max_workers: Optional[int] = None,
+    include_licks: bool = True,
+    overwrite: bool = False,
+) -> TrialStoreReport:
+    """Add the trial tables of many sessions to a partitioned Parquet store.
+
+    Every session is read in a worker process and written as a single Parquet file under
+    "subject=<subject>/date=<YYYY-MM-DD>/stage=<stage>/" in the store, named after the session.
+    Sessions already in the store are skipped, so the same call can be repeated as new sessions
+    arrive. A session that fails to load is reported and does not stop the others. Requires the "data" extra.
+
+    Args:
+        session_paths (Iterable[os.PathLike]): Root directories of the sessions, as passed to `dataset`.
+        store_path (os.PathLike): Root directory of the Parquet store. Created if needed.
+        max_workers (Optional[int]): Number of worker processes. By default, the number of CPUs.
+            With 1, sessions are read in the calling process.
+        include_licks (bool): Whether to add the lick counts, see `trial_table`.
+        overwrite (bool): Whether to rewrite sessions that are already in the store.
+
+    Returns:
+        TrialStoreReport: The sessions written, skipped and failed.
+    """
+    store_path = Path(store_path)
+    store_path.mkdir(parents=True, exist_ok=True)
+    stored = {file.stem for file in store_path.rglob("*.parquet")}
+
+    report = TrialStoreReport()
+    pending = []
+    for session_path in map(Path, session_paths):
+        if not overwrite and session_path.name in stored:
+            report.skipped.append(session_path)
+        else:
+            pending.append(session_path)
+
+    if max_workers == 1:
+        results = [_write_session(path, store_path, include_licks) for path in pending]
+    else:
+        # spawn matches the behavior on Windows rigs and avoids forking a multi-threaded parent
+        with ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+            results = list(
+                executor.map(_write_session, pending, [store_path] * len(pending), [include_licks] * len(pending))
+            )
+
+    for session_path, error in zip(pending, results):
+        if error is None:
+            report.written.append(session_path)
+        else:
+            logger.warning("Failed to add %s to the trial store: %s" % (session_path, error.splitlines()[-1]))
+            report.failed[session_path] = error
+    return report
+
+
+def read_trial_store(store_path: os.PathLike, filters: Optional[list[tuple[str, str, Any]]] = None) -> pd.DataFrame:
+    """Read the trials of a store written by `write_trial_store`.
+
+    Sessions may hold different columns, e.g. the metadata of different trial generators or the
+    lick counts of sessions written with and without `include_licks`. The store is read with the
+    union of their columns, missing values are null, and columns whose type differs between
+    sessions are promoted to a common type (e.g. integers and floats to floats).
+
+    Args:
+        store_path (os.PathLike): Root directory of the Parquet store.
+        filters (Optional[list[tuple[str, str, Any]]]): Row filters, as in `pandas.read_parquet`
+            (e.g. `[("subject", "==", "789")]`). Filters on the partition columns only read the matching files.
+
+    Returns:
+        pd.DataFrame: One row per trial, with the "session", "subject", "date" and "stage" columns.
+    """
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+
+    files = sorted(Path(store_path).rglob("*.parquet"))
+    if not files:
+        return pd.DataFrame(columns=["session", *PARTITION_COLUMNS])
+    # read partition values as strings, subject ids and stage names must not be parsed as numbers
+    partition_schema = pa.schema([(name, pa.string()) for name in PARTITION_COLUMNS])
+    # the schema of the first file would drop the columns that only later sessions have
+    schema = pa.unify_schemas([pq.read_schema(file) for file in files], promote_options="permissive")
+    schema = pa.unify_schemas([schema, partition_schema])
+    store = ds.dataset(
+        store_path, schema=schema, format="parquet", partitioning=ds.partitioning(partition_schema, flavor="hive")
+    )
+    return store.to_table(filter=pq.filters_to_expression(filters) if filters else None).to_pandas()
+
+
+def _write_session(session_path: Path, store_path: Path, include_licks: bool) -> Optional[str]:
+    """Write the trial table of a session to the store, returning the formatted error on failure."""
+    try:
+        this_dataset = df_dataset(session_path)
+        session = this_dataset["Behavior"]["InputSchemas"]["Session"].data
+        try:
+            stage = this_dataset["Behavior"]["TrainerState"].data.stage
+        except FileNotFoundError:
+            stage = None
+
+        table = trial_table(this_dataset, include_licks=include_licks).reset_index()
+        table.insert(0, "session", session_path.name)
+        partition = {
+            "subject": session.subject,
+            "date": session.date.date().isoformat(),
+            "stage": stage.name if stage is not None else UNKNOWN_PARTITION,
+        }
+
+        directory = store_path.joinpath(*(f"{key}={partition[key]}" for key in PARTITION_COLUMNS))
+        directory.mkdir(parents=True, exist_ok=True)
+        for previous in store_path.rglob(f"{session_path.name}.parquet"):
+            previous.unlink()
+        tmp_path = directory / f".{session_path.name}.parquet.tmp"
+        table.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, directory / f"{session_path.name}.parquet")
+    except Exception:
+        return traceback.format_exc()
+    return None
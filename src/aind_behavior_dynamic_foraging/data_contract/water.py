@@ -0,0 +1,188 @@
+import logging
+import typing as t
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from ..rig import AindDynamicForagingRig
+from ._trial_table import make_trial_table, period_boundaries
+from .clock_alignment import match_nearest
+
+if t.TYPE_CHECKING:
+    from contraqctor.contract import Dataset
+
+logger = logging.getLogger(__name__)
+
+SIDES = ("left", "right")
+
+# largest relative difference between the volume delivered in a trial and its reward size
+DEFAULT_VOLUME_TOLERANCE = 0.2
+
+# largest distance between a manual water event and its valve write, in seconds
+DEFAULT_MANUAL_WATER_WINDOW = 0.5
+
+# valve of each side, as (OutputSet bit, open time register)
+_VALVES = {"left": ("SupplyPort0", "PulseSupplyPort0"), "right": ("SupplyPort1", "PulseSupplyPort1")}
+
+
+@dataclass
+class WaterReconciliation:
+    """Water delivered by the valves of a session, matched to the rewards of its trials.
+
+    Attributes:
+        deliveries (pd.DataFrame): One row per valve opening, sorted by "time", with its "side", "open_time" (s),
+            "volume_ml", "trial" (-1 before the first trial) and whether it was given manually ("is_manual").
+        trials (pd.DataFrame): One row per trial, indexed as the trial table, with the "expected_<side>_ml",
+            "delivered_<side>_ml" and "n_deliveries_<side>" of each side and whether they do not match
+            ("is_discrepant"). Manual deliveries are not counted in their trial.
+    """
+
+    deliveries: pd.DataFrame
+    trials: pd.DataFrame
+
+    @property
+    def total_delivered_ml(self) -> float:
+        """Water delivered during the session, including manual water, in mL."""
+        return float(self.deliveries["volume_ml"].sum())
+
+    @property
+    def total_expected_ml(self) -> float:
+        """Water the trials of the session should have delivered, in mL."""
+        return float(self.trials[[f"expected_{side}_ml" for side in SIDES]].to_numpy().sum())
+
+    @property
+    def discrepancies(self) -> pd.DataFrame:
+        """The trials whose delivered water does not match their reward."""
+        return self.trials[self.trials["is_discrepant"]]
+
+
+def match_open_times(set_open_time_ms: pd.Series, delivery_times: np.ndarray) -> np.ndarray:
+    """Return the open time of each valve opening, from the latest open time set before it.
+
+    Args:
+        set_open_time_ms (pd.Series): Time-indexed set open-time values in milliseconds.
+        delivery_times (np.ndarray): Sorted times at which the valve was commanded open.
+
+    Returns:
+        np.ndarray: Open time of each opening in seconds, NaN for openings before the first setpoint.
+    """
+    setpoints = pd.to_numeric(set_open_time_ms, errors="coerce").dropna().sort_index()
+    if setpoints.empty:
+        return np.full(len(delivery_times), np.nan)
+    # Each valve-open event uses the most recent set open-time configured at or before that event.
+    position = np.searchsorted(setpoints.index.to_numpy(dtype=float), delivery_times, side="right") - 1
+    open_times_ms = np.where(position >= 0, setpoints.to_numpy(dtype=float)[np.maximum(position, 0)], np.nan)
+    return open_times_ms / 1000.0
+
+
+def get_valve_deliveries(dataset: "Dataset") -> pd.DataFrame:
+    """Return every opening of the water valves of a session with its volume.
+
+    The volume of an opening is estimated from its open time with the calibration of the valve:
+    Volume(g) = Slope(g/s) * time(s) + offset(g), taking 1 g as 1 mL.
+
+    Args:
+        dataset (Dataset): The dataset of the session.
+
+    Returns:
+        pd.DataFrame: One row per opening with its "time", "side", "open_time" (s) and "volume_ml", sorted by time.
+            The volume of openings before the first open time is set is NaN.
+    """
+    behavior = dataset["Behavior"]
+    rig = AindDynamicForagingRig.model_validate(behavior["InputSchemas"]["Rig"].data)
+    calibrations = {"left": rig.calibration.water_valve_left, "right": rig.calibration.water_valve_right}
+    writes = behavior["HarpBehavior"]["OutputSet"].read_messages(message_type="WRITE")
+
+    deliveries = []
+    for side, (port, open_time_register) in _VALVES.items():
+        times = np.sort(writes.index[writes[port].fillna(False).astype(bool)].to_numpy(dtype=float))
+        open_time_setpoints = behavior["HarpBehavior"][open_time_register].read_messages()[open_time_register]
+        open_time = match_open_times(open_time_setpoints, times)
+        calibration = calibrations[side]
+        volume = np.round(float(calibration.slope) * open_time + float(calibration.offset), 4)
+        deliveries.append(pd.DataFrame({"time": times, "side": side, "open_time": open_time, "volume_ml": volume}))
+    return pd.concat(deliveries, ignore_index=True).sort_values("time", kind="stable", ignore_index=True)
+
+
+def reconcile_water(
+    dataset: "Dataset",
+    trial_table: t.Optional[pd.DataFrame] = None,
+    tolerance: float = DEFAULT_VOLUME_TOLERANCE,
+    manual_water_window: float = DEFAULT_MANUAL_WATER_WINDOW,
+) -> WaterReconciliation:
+    """Match the water delivered by the valves of a session to the rewards of its trials.
+
+    Each valve opening belongs to the trial during which it occurs, from the start of its
+    quiescent period to the start of the next trial. Openings matched to a GiveManualWaterRight
+    event are manual water and are not counted in their trial. The water a trial should deliver
+    is the reward size of the side of its auto reward, if any, plus the reward size of the chosen
+    side when the choice is rewarded on the other side, as counted by the trial generator.
+
+    Args:
+        dataset (Dataset): The dataset of the session.
+        trial_table (Optional[pd.DataFrame]): The trial table of the session, built if not given.
+        tolerance (float): Largest relative difference between the volume delivered on a side and the
+            expected volume. Any water delivered on a side that should not deliver any is a discrepancy.
+        manual_water_window (float): Largest distance between a manual water event and its valve write, in seconds.
+
+    Returns:
+        WaterReconciliation: The valve openings and the delivered and expected water of every trial.
+    """
+    if trial_table is None:
+        trial_table = make_trial_table(dataset)
+    deliveries = get_valve_deliveries(dataset)
+    deliveries["is_manual"] = _is_manual(dataset, deliveries, manual_water_window)
+
+    n_trials = len(trial_table)
+    trial_start = period_boundaries(trial_table)[:, 0]
+    deliveries["trial"] = np.searchsorted(trial_start, deliveries["time"].to_numpy(), side="right") - 1
+    counted = (deliveries["trial"] >= 0) & ~deliveries["is_manual"]
+
+    trials = pd.DataFrame(index=trial_table.index)
+    expected = _expected_volume_ml(trial_table)
+    discrepant = np.zeros(n_trials, dtype=bool)
+    for side in SIDES:
+        of_side = deliveries[counted & (deliveries["side"] == side)]
+        trial = of_side["trial"].to_numpy()
+        delivered = np.bincount(trial, weights=of_side["volume_ml"].fillna(0.0).to_numpy(), minlength=n_trials)
+        trials[f"expected_{side}_ml"] = expected[side]
+        trials[f"delivered_{side}_ml"] = delivered
+        trials[f"n_deliveries_{side}"] = np.bincount(trial, minlength=n_trials)
+        discrepant |= np.abs(delivered - expected[side]) > tolerance * expected[side] + 1e-9
+    trials["is_discrepant"] = discrepant
+    return WaterReconciliation(deliveries=deliveries, trials=trials)
+
+
+def _expected_volume_ml(trial_table: pd.DataFrame) -> dict[str, np.ndarray]:
+    """Return the water each trial should deliver on each side, in mL."""
+    is_right_choice = trial_table["is_right_choice"]
+    is_rewarded = trial_table["is_rewarded"].fillna(False).astype(bool)
+    is_auto_reward_right = trial_table.get("is_auto_reward_right", pd.Series(None, index=trial_table.index))
+    expected = {}
+    for side, is_right in zip(SIDES, (False, True)):
+        reward_size_ul = trial_table[f"reward_size_{side}"].to_numpy(dtype=float)
+        is_auto_reward = (is_auto_reward_right == is_right).fillna(False).astype(bool)
+        earned = is_rewarded & (is_right_choice == is_right).fillna(False).astype(bool) & ~is_auto_reward
+        expected[side] = np.where(is_auto_reward | earned, reward_size_ul / 1000.0, 0.0)
+    return expected
+
+
+def _is_manual(dataset: "Dataset", deliveries: pd.DataFrame, max_distance: float) -> np.ndarray:
+    """Flag the valve openings matched to a manual water event of their side."""
+    from ._software_events_table import read_software_events_table
+
+    is_manual = np.zeros(len(deliveries), dtype=bool)
+    try:
+        events = read_software_events_table(
+            dataset["Behavior"]["SoftwareEvents"]["GiveManualWaterRight"].reader_params.path
+        )
+    except FileNotFoundError:
+        return is_manual
+    for side, is_right in zip(SIDES, (False, True)):
+        of_side = np.flatnonzero(deliveries["side"].to_numpy() == side)
+        event_times = np.sort(events.index[events["data"] == is_right].to_numpy(dtype=float))
+        _, matched = match_nearest(event_times, deliveries["time"].to_numpy()[of_side], max_distance)
+        is_manual[of_side[matched]] = True
+    logger.debug("%d valve opening(s) are manual water." % is_manual.sum())
+    return is_manual
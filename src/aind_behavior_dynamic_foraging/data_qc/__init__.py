@@ -1,6 +1,7 @@
 import logging
 import os
 from pathlib import Path
+from typing import Literal
 
 from pydantic import Field
 from pydantic_settings import BaseSettings, CliPositionalArg
@@ -16,17 +17,148 @@ class DataQcCli(BaseSettings, cli_kebab_case=True):
     report_path: Path | None = Field(
         default=None, description="Path to save the Html QC report. If not provided, report is not saved."
     )
+    workers: int = Field(default=1, ge=1, description="Number of QC suites to run concurrently.")
+    executor: Literal["thread", "process"] = Field(
+        default="thread", description="Whether concurrent QC suites run on a thread or a process pool."
+    )
+    usage_path: Path | None = Field(
+        default=None,
+        description="Path to save the resource usage of every suite and test as JSON. "
+        "By default, saved next to the Html QC report.",
+    )
+    trace_memory: bool = Field(
+        default=False,
+        description="Whether to measure the peak memory of every test. Slows down the tests, and runs the suites "
+        "one at a time with the thread executor.",
+    )
+    profile: Path | None = Field(default=None, description="Path to save a cProfile of the slowest QC suite.")
+    cache_directory: Path | None = Field(
+        default=None,
+        description="Directory to cache the results of QC suites in, to reuse those whose code and data did not "
+        "change since the last run, and the tables derived from the session files. Keep it outside the sessions, "
+        "their data is not written to. If not provided, nothing is cached.",
+    )
 
     def cli_cmd(self):
         """Run data quality checks on the dataset located at the specified path."""
-        from ..data_contract import dataset
+        from ..data_contract import dataset, set_cache_directory
+        from .cache import QcResultCache
         from .suite import make_qc_runner
 
+        cache = None
+        if self.cache_directory is not None:
+            set_cache_directory(self.cache_directory / "data")
+            cache = QcResultCache(self.cache_directory / "qc")
         this_dataset = dataset(Path(self.data_path), self.version)
-        runner = make_qc_runner(this_dataset)
+        runner = make_qc_runner(
+            this_dataset, max_workers=self.workers, executor=self.executor, cache=cache, trace_memory=self.trace_memory
+        )
         results = runner.run_all_with_progress()
         if report_path := self.report_path:
-            from contraqctor.qc.reporters import HtmlReporter
+            from .reporters import UsageHtmlReporter
 
-            reporter = HtmlReporter(output_path=report_path)
+            reporter = UsageHtmlReporter(runner.usage, output_path=report_path)
             reporter.report_results(results, serialize_context_exportable_obj=True)
+
+        usage_path = self.usage_path or (self.report_path.with_suffix(".usage.json") if self.report_path else None)
+        if usage_path is not None:
+            from .usage import write_usage_report
+
+            write_usage_report(runner.usage, usage_path)
+
+        if self.profile is not None:
+            runner.profile_slowest_suite(self.profile)
+
+
+class BatchQcCli(BaseSettings, cli_kebab_case=True):
+    sessions: CliPositionalArg[list[str]] = Field(
+        description="Session data directories, or glob patterns matching them (e.g. 'archive/*')."
+    )
+    version: str = Field(default=__semver__, description="Version of the datasets.")
+    summary_path: Path = Field(
+        default=Path("qc_summary.csv"),
+        description="Path to save the status of every test of every session. Saved as Parquet if it ends with "
+        "'.parquet', as CSV otherwise.",
+    )
+    report_directory: Path | None = Field(
+        default=None,
+        description="Directory to save the Html QC report of every session. If not provided, reports are not saved.",
+    )
+    workers: int = Field(default=1, ge=1, description="Number of sessions to run concurrently, on a process pool.")
+    cache_directory: Path | None = Field(
+        default=None,
+        description="Directory to cache the results of QC suites in, to reuse those whose code and data did not "
+        "change since the last run, and the tables derived from the session files. Keep it outside the sessions, "
+        "their data is not written to. If not provided, nothing is cached.",
+    )
+
+    def cli_cmd(self):
+        """Run data quality checks on many sessions and save a consolidated summary."""
+        from .batch import count_statuses, expand_sessions, run_batch_qc, write_summary
+
+        sessions = expand_sessions(self.sessions)
+        if not sessions:
+            raise ValueError("No session directory matches %s." % self.sessions)
+        summary = run_batch_qc(
+            sessions,
+            max_workers=self.workers,
+            version=self.version,
+            report_directory=self.report_directory,
+            cache_directory=self.cache_directory,
+        )
+        write_summary(summary, self.summary_path)
+        print(count_statuses(summary).to_string())
+
+
+class LiveQcCli(BaseSettings, cli_kebab_case=True):
+    data_path: CliPositionalArg[os.PathLike] = Field(description="Path to the data directory of the running session.")
+    interval: float = Field(
+        default=1.0, gt=0, description="Seconds between polls of the session files. Longer intervals use less CPU."
+    )
+    duration: float | None = Field(
+        default=None, description="Stop after this many seconds. By default, stop when the session ends."
+    )
+    response_timeout: float = Field(
+        default=5.0, gt=0, description="Seconds a command to a Harp device may wait for its reply."
+    )
+    camera_timeout: float = Field(
+        default=5.0, gt=0, description="Seconds without a new frame before a camera is reported as stalled."
+    )
+    trial_timeout: float = Field(
+        default=120.0, gt=0, description="Seconds without a new trial before the task is reported as stalled."
+    )
+    lick_trials: int = Field(
+        default=30, ge=1, description="Consecutive trials without a lick on a side before it is reported."
+    )
+    alerts_path: Path | None = Field(
+        default=None, description="Path of a JSON-lines file the alerts are appended to. If not provided, not saved."
+    )
+
+    def cli_cmd(self):
+        """Run incremental quality checks on a session while it is being acquired."""
+        import dataclasses
+        import json
+
+        from ..rig import AindDynamicForagingRig
+        from .live import LiveQcMonitor
+
+        rig_path = Path(self.data_path) / "behavior" / "Logs" / "rig_output.json"
+        rig = None
+        if rig_path.exists():
+            rig = AindDynamicForagingRig.model_validate_json(rig_path.read_text(encoding="utf-8"))
+        else:
+            logger.warning("%s not found, clock outputs will not be checked." % rig_path)
+
+        monitor = LiveQcMonitor(
+            self.data_path,
+            rig=rig,
+            response_timeout=self.response_timeout,
+            camera_timeout=self.camera_timeout,
+            trial_timeout=self.trial_timeout,
+            lick_trials=self.lick_trials,
+        )
+        for alert in monitor.run(interval=self.interval, duration=self.duration):
+            print(alert)
+            if self.alerts_path is not None:
+                with open(self.alerts_path, "a", encoding="utf-8") as file:
+                    file.write(json.dumps(dataclasses.asdict(alert)) + "\n")
@@ -0,0 +1,196 @@
+import glob
+import logging
+import multiprocessing
+import os
+import typing as t
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+import pandas as pd
+
+from .. import __semver__
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_COLUMNS = ["session", "group", "suite", "test", "status", "message"]
+
+
+def expand_sessions(patterns: t.Iterable[str]) -> list[Path]:
+    """Expand session root paths and glob patterns into a list of session directories.
+
+    Args:
+        patterns (Iterable[str]): Session root directories or glob patterns (e.g. "archive/*/"), which are
+            expanded here so they also work in shells that do not expand them.
+
+    Returns:
+        list[Path]: The session directories, in the given order and without duplicates.
+    """
+    sessions: list[Path] = []
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern)) if glob.has_magic(pattern) else [pattern]
+        for match in matches:
+            path = Path(match)
+            if path.is_dir() and path not in sessions:
+                sessions.append(path)
+            elif not path.is_dir():
+                logger.warning("%s is not a directory, skipping it." % path)
+    return sessions
+
+
+def run_session_qc(
+    session_path: os.PathLike,
+    version: str = __semver__,
+    report_path: t.Optional[os.PathLike] = None,
+    cache_directory: t.Optional[os.PathLike] = None,
+) -> pd.DataFrame:
+    """Run the QC suites of one session and return one row per test, see `SUMMARY_COLUMNS`.
+
+    Errors raised while building the QC runner of the session are returned as a single row with
+    an "error" status, see `_error_summary`, so one broken session does not stop a batch.
+
+    Args:
+        session_path (os.PathLike): The session root directory.
+        version (str): Version of the dataset.
+        report_path (Optional[os.PathLike]): Path to save the Html QC report of the session.
+        cache_directory (Optional[os.PathLike]): Directory to cache the results of QC suites in, see
+            `QcResultCache`, and the tables derived from the session files, see `set_cache_directory`.
+            If not provided, nothing is cached.
+
+    Returns:
+        pd.DataFrame: The status and message of every test of the session.
+    """
+    from ..data_contract import dataset, get_cache_directory, set_cache_directory
+    from .cache import QcResultCache
+    from .suite import make_qc_runner
+
+    session = str(session_path)
+    previous_cache_directory = get_cache_directory()
+    if cache_directory is not None:
+        set_cache_directory(Path(cache_directory) / "data")
+    try:
+        runner = make_qc_runner(
+            dataset(Path(session_path), version),
+            cache=QcResultCache(Path(cache_directory) / "qc") if cache_directory is not None else None,
+        )
+        results = runner.run_all()
+    except Exception as e:
+        return _error_summary(session, e)
+    finally:
+        set_cache_directory(previous_cache_directory)
+
+    if report_path is not None:
+        from .reporters import UsageHtmlReporter
+
+        UsageHtmlReporter(runner.usage, output_path=Path(report_path)).report_results(
+            results, serialize_context_exportable_obj=True
+        )
+    rows = [
+        [session, group, result.suite_name, result.test_name, result.status.name.lower(), result.message]
+        for group, group_results in results.items()
+        for result in group_results
+    ]
+    return pd.DataFrame(rows, columns=SUMMARY_COLUMNS)
+
+
+def run_batch_qc(
+    sessions: t.Sequence[os.PathLike],
+    max_workers: int = 1,
+    version: str = __semver__,
+    report_directory: t.Optional[os.PathLike] = None,
+    cache_directory: t.Optional[os.PathLike] = None,
+) -> pd.DataFrame:
+    """Run the QC of many sessions on a process pool and consolidate the results.
+
+    Each worker process imports the package once and runs the QC of one session after the other,
+    so the import cost is paid once per worker rather than once per session. Within a session,
+    suites run serially. A session whose QC fails, including its report or its worker process,
+    gets a single "error" row rather than stopping the batch.
+
+    Args:
+        sessions (Sequence[os.PathLike]): The session root directories, see `expand_sessions`.
+        max_workers (int): Number of sessions to run concurrently. With 1, sessions run in this process.
+        version (str): Version of the datasets.
+        report_directory (Optional[os.PathLike]): Directory to save the Html QC report of every session, named
+            after the session directory. If not provided, reports are not saved.
+        cache_directory (Optional[os.PathLike]): Directory to cache the results of QC suites and the tables
+            derived from the session files in, shared by the sessions since cached files are keyed by the paths
+            of their sources. If not provided, nothing is cached.
+
+    Returns:
+        pd.DataFrame: One row per test per session, see `SUMMARY_COLUMNS`, in the order of `sessions`.
+    """
+    report_paths: list[t.Optional[Path]] = [None] * len(sessions)
+    if report_directory is not None:
+        names = [Path(session).name for session in sessions]
+        if len(set(names)) != len(names):
+            raise ValueError("Sessions must have distinct directory names to save their reports to one directory.")
+        Path(report_directory).mkdir(parents=True, exist_ok=True)
+        report_paths = [Path(report_directory) / f"{name}.html" for name in names]
+
+    summaries: list[t.Optional[pd.DataFrame]] = [None] * len(sessions)
+    if max_workers == 1:
+        for i, (session, report_path) in enumerate(zip(sessions, report_paths)):
+            try:
+                summaries[i] = run_session_qc(session, version, report_path, cache_directory)
+            except Exception as e:
+                summaries[i] = _error_summary(session, e)
+            _log_session(i, sessions, summaries[i])
+    else:
+        with ProcessPoolExecutor(max_workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+            futures = {
+                executor.submit(run_session_qc, session, version, report_path, cache_directory): i
+                for i, (session, report_path) in enumerate(zip(sessions, report_paths))
+            }
+            for future in as_completed(futures):
+                i = futures[future]
+                try:
+                    summaries[i] = future.result()
+                except Exception as e:
+                    summaries[i] = _error_summary(sessions[i], e)
+                _log_session(i, sessions, summaries[i])
+    if not summaries:
+        return pd.DataFrame(columns=SUMMARY_COLUMNS)
+    return pd.concat(summaries, ignore_index=True)
+
+
+def write_summary(summary: pd.DataFrame, path: os.PathLike) -> None:
+    """Write a batch QC summary as Parquet if the path ends with ".parquet", as CSV otherwise.
+
+    Parquet requires the "data" extra.
+
+    Args:
+        summary (pd.DataFrame): The summary returned by `run_batch_qc`.
+        path (os.PathLike): Path of the summary file.
+    """
+    path = Path(path)
+    if path.suffix == ".parquet":
+        summary.to_parquet(path, index=False)
+    else:
+        summary.to_csv(path, index=False)
+
+
+def count_statuses(summary: pd.DataFrame) -> pd.DataFrame:
+    """Count the tests of each status in every session of a batch QC summary.
+
+    Args:
+        summary (pd.DataFrame): The summary returned by `run_batch_qc`.
+
+    Returns:
+        pd.DataFrame: One row per session, in the order of the summary, and one column per status.
+    """
+    counts = pd.crosstab(summary["session"], summary["status"])
+    return counts.reindex(summary["session"].unique())
+
+
+def _log_session(i: int, sessions: t.Sequence[os.PathLike], summary: pd.DataFrame) -> None:
+    statuses = summary["status"].value_counts()
+    logger.info(
+        "[%d/%d] %s: %s"
+        % (i + 1, len(sessions), sessions[i], ", ".join("%d %s" % (n, status) for status, n in statuses.items()))
+    )
+
+
+def _error_summary(session: os.PathLike, error: Exception) -> pd.DataFrame:
+    """Return the summary of a session whose QC failed, a single row with an "error" status."""
+    logger.error("QC of %s failed: %s" % (session, error))
+    return pd.DataFrame([[str(session), None, None, None, "error", str(error)]], columns=SUMMARY_COLUMNS)
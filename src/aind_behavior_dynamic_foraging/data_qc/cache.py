@@ -0,0 +1,204 @@
+import dataclasses
+import hashlib
+import inspect
+import json
+import logging
+import os
+import pickle
+import re
+import typing as t
+from pathlib import Path
+
+import contraqctor
+from contraqctor import qc
+from contraqctor.contract import DataStream
+
+from .. import __version__
+from .runner import leaf_streams
+
+logger = logging.getLogger(__name__)
+
+CACHED_MESSAGE_PREFIX = "(cached) "
+
+# bump when the layout of the cached results changes so stale entries are ignored
+_CACHE_FORMAT_VERSION = "1"
+
+
+class QcResultCache:
+    """On-disk cache of the results of QC suites.
+
+    Results are stored per suite, keyed by the identity and version of the suite and its tests,
+    and by the size and modification time of every file of the streams and file streams it
+    declared (see `ParallelRunner.add_suite`). A suite is served from the cache until its code,
+    its parameters, contraqctor or this package change, or until any of its files change. Suites
+    without declared streams, or whose streams are not backed by files, are never cached.
+
+    Results served from the cache have their message prefixed with `CACHED_MESSAGE_PREFIX`, so
+    they are marked as such in the reports.
+    """
+
+    def __init__(self, path: os.PathLike):
+        """Initialize the cache.
+
+        Args:
+            path (os.PathLike): Directory holding the cached results. Created on the first write.
+        """
+        self.path = Path(path)
+
+    def key(self, suite: qc.Suite, streams: t.Sequence[DataStream]) -> t.Optional[str]:
+        """Compute the cache key of a suite.
+
+        Args:
+            suite (qc.Suite): The suite.
+            streams (Sequence[DataStream]): The streams the suite declared.
+
+        Returns:
+            Optional[str]: The key, or None if the suite cannot be cached.
+        """
+        if not streams:
+            return None
+        signatures = [stream_signature(stream) for stream in streams]
+        if any(signature is None for signature in signatures):
+            return None
+        identity = {
+            "format": _CACHE_FORMAT_VERSION,
+            "contraqctor": contraqctor.__version__,
+            "package": __version__,
+            "suite": suite_identity(suite),
+            "tests": sorted(test.__name__ for test in suite.get_tests()),
+            "streams": signatures,
+        }
+        return hashlib.sha256(json.dumps(identity, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+    def get(self, key: str, suite: qc.Suite) -> t.Optional[list[qc.Result]]:
+        """Read the cached results of a suite.
+
+        Args:
+            key (str): The cache key, see `key`.
+            suite (qc.Suite): The suite, referenced by the returned results.
+
+        Returns:
+            Optional[list[qc.Result]]: The results, or None on a cache miss.
+        """
+        entry = self.path / f"{key}.pkl"
+        if not entry.exists():
+            return None
+        try:
+            with open(entry, "rb") as file:
+                results: list[qc.Result] = pickle.load(file)
+        except Exception as e:
+            logger.warning("Failed to read QC cache entry %s: %s" % (entry, e))
+            return None
+        return [
+            dataclasses.replace(
+                result,
+                message=CACHED_MESSAGE_PREFIX + (result.message or ""),
+                test_reference=getattr(suite, result.test_name, None),
+                suite_reference=suite,
+            )
+            for result in results
+        ]
+
+    def put(self, key: str, results: list[qc.Result]) -> None:
+        """Write the results of a suite to the cache.
+
+        Results that cannot be pickled, e.g. with an exception holding an open file, are not cached.
+
+        Args:
+            key (str): The cache key, see `key`.
+            results (list[qc.Result]): The results of the suite.
+        """
+        entry = self.path / f"{key}.pkl"
+        try:
+            payload = pickle.dumps(
+                [dataclasses.replace(result, test_reference=None, suite_reference=None) for result in results]
+            )
+            self.path.mkdir(parents=True, exist_ok=True)
+            tmp_path = entry.with_suffix(".pkl.tmp")
+            tmp_path.write_bytes(payload)
+            os.replace(tmp_path, entry)
+        except Exception as e:
+            logger.warning("Failed to write QC cache entry %s: %s" % (entry, e))
+
+
+def suite_identity(suite: qc.Suite) -> dict[str, t.Any]:
+    """Describe the code and parameters of a suite, for use in a cache key.
+
+    The code is identified by the hash of the source of the suite class and its bases, so that
+    editing a suite invalidates its results. Streams held by the suite are described by name only,
+    their content is part of the key through the declared streams.
+
+    Args:
+        suite (qc.Suite): The suite.
+
+    Returns:
+        dict[str, Any]: JSON serializable description of the suite.
+    """
+    sources = []
+    for cls in type(suite).__mro__:
+        if cls in (qc.Suite, object):
+            break
+        try:
+            sources.append(inspect.getsource(cls))
+        except (OSError, TypeError):
+            sources.append(cls.__qualname__)
+    return {
+        "class": f"{type(suite).__module__}.{type(suite).__qualname__}",
+        "name": suite.name,
+        "source": hashlib.sha256("".join(sources).encode("utf-8")).hexdigest(),
+        "parameters": {name: _describe(value) for name, value in sorted(vars(suite).items())},
+    }
+
+
+def stream_signature(stream: DataStream) -> t.Optional[list]:
+    """Describe the files backing a stream by their path, size and modification time.
+
+    Args:
+        stream (DataStream): A data stream or collection.
+
+    Returns:
+        Optional[list]: The signature, or None if the stream is not backed by files.
+    """
+    path = _stream_path(stream)
+    if path is None:
+        if not stream.is_collection:
+            return None
+        leaves = [leaf for leaf in leaf_streams(stream) if leaf is not stream]
+        signatures = [stream_signature(leaf) for leaf in leaves]
+        if not leaves or any(signature is None for signature in signatures):
+            return None
+        return signatures
+    if not path.exists():
+        return [str(path), None]
+    if not path.is_dir():
+        return [_file_signature(path)]
+    # hidden entries hold caches rather than data
+    files = sorted(
+        file
+        for file in path.rglob("*")
+        if file.is_file() and not any(part.startswith(".") for part in file.relative_to(path).parts)
+    )
+    return [_file_signature(file) for file in files]
+
+
+def _stream_path(stream: DataStream) -> t.Optional[Path]:
+    path = getattr(stream, "path", None)
+    if path is None:
+        path = getattr(stream.reader_params, "path", None)
+    return Path(path) if path is not None else None
+
+
+def _file_signature(path: Path) -> list:
+    stat = path.stat()
+    return [str(path), stat.st_size, stat.st_mtime_ns]
+
+
+def _describe(value: t.Any) -> t.Any:
+    if isinstance(value, DataStream):
+        return f"<{type(value).__name__} {value.resolved_name}>"
+    if isinstance(value, (list, tuple)):
+        return [_describe(item) for item in value]
+    if isinstance(value, dict):
+        return {str(key): _describe(item) for key, item in value.items()}
+    # default reprs hold the address of the object, which changes between runs
+    return re.sub(r" at 0x[0-9a-fA-F]+", "", repr(value))
@@ -0,0 +1,149 @@
+import typing as t
+from pathlib import Path
+
+from contraqctor import qc
+from contraqctor.contract.camera import Camera, CameraData
+
+from ..data_contract._indexed_harp import IndexedHarpRegister
+from ..data_contract.camera_frames import (
+    analyze_frame_timing,
+    build_frame_index,
+    count_frame_triggers,
+    find_video,
+)
+
+# largest relative difference between the mean frame period and the trigger period
+_FRAME_RATE_TOLERANCE = 0.01
+# intervals longer than this many trigger periods are reported as long
+_LONG_INTERVAL_PERIODS = 1.5
+
+
+class CameraFrameTimingQcSuite(qc.Suite):
+    """Checks the frame timing of a camera from its metadata, read in chunks.
+
+    The metadata is streamed once into the frame index of the camera (see `build_frame_index`),
+    which later analyses can reuse, and every test runs on the statistics of one chunked pass
+    over the index, so memory use does not grow with the length of the session. The video is only
+    opened to count its frames.
+    """
+
+    def __init__(
+        self,
+        camera: Camera,
+        expected_fps: t.Optional[float] = None,
+        triggers: t.Optional[IndexedHarpRegister] = None,
+        clock_jitter: float = 1e-4,
+    ):
+        """Initialize the suite.
+
+        Args:
+            camera (Camera): The camera data stream. Only its path is used, its data is not read.
+            expected_fps (Optional[float]): Frame rate of the camera trigger.
+            triggers (Optional[IndexedHarpRegister]): CameraXFrame register of the behavior board that logs the
+                triggers of the camera. If not given, the trigger count is not checked.
+            clock_jitter (float): Largest difference between the intervals measured by the camera and the Harp
+                clocks, in seconds.
+        """
+        self.camera = camera
+        self.expected_fps = expected_fps
+        self.triggers = triggers
+        self.clock_jitter = clock_jitter
+
+    def setup_suite(self) -> None:
+        self._index = build_frame_index(Path(self.camera.reader_params.path))
+        self._timing = analyze_frame_timing(self._index, self.expected_fps, self.clock_jitter)
+
+    def test_has_frames(self):
+        """Check that the metadata has frames."""
+        if self._timing.n_frames == 0:
+            return self.fail_test(None, "Camera metadata has no frames.")
+        return self.pass_test(self._timing.n_frames, "Camera metadata has %d frames." % self._timing.n_frames)
+
+    def test_dropped_frames(self):
+        """Check that the frame numbers increase one by one."""
+        timing = self._timing
+        if timing.n_repeated:
+            return self.fail_test(timing.n_repeated, "%d frame number(s) do not increase." % timing.n_repeated)
+        if timing.n_dropped:
+            return self.fail_test(
+                timing.n_dropped, "Detected %d dropped frames in %d gap(s)." % (timing.n_dropped, timing.n_gaps)
+            )
+        return self.pass_test(0, "No dropped frames detected in metadata.")
+
+    def test_frame_rate(self):
+        """Check that the mean frame period matches the trigger period."""
+        if not self.expected_fps:
+            return self.skip_test("No expected FPS provided, skipping test.")
+        if self._timing.n_frames < 2:
+            return self.skip_test("Not enough frames to compute the frame rate.")
+        expected = 1.0 / self.expected_fps
+        mean = self._timing.mean_interval
+        if abs(mean - expected) > expected * _FRAME_RATE_TOLERANCE:
+            return self.fail_test(
+                mean, "Mean frame period (%.6f s) is different than expected: %.6f s." % (mean, expected)
+            )
+        return self.pass_test(mean, "Mean frame period (%.6f s) is within expected range: %.6f s." % (mean, expected))
+
+    def test_inter_frame_intervals(self):
+        """Check that frames are never late by more than half a trigger period."""
+        timing = self._timing
+        histogram = timing.interval_histogram()
+        if timing.n_backwards:
+            return self.fail_test(histogram, "%d frame(s) are not later than the previous one." % timing.n_backwards)
+        if not self.expected_fps:
+            return self.pass_test(histogram, "Longest interval between frames: %.6f s." % timing.max_interval)
+        n_long = histogram[histogram.index >= _LONG_INTERVAL_PERIODS / self.expected_fps].sum()
+        if n_long:
+            return self.warn_test(
+                histogram,
+                "%d interval(s) between frames are longer than %.1f trigger periods, the longest is %.6f s."
+                % (n_long, _LONG_INTERVAL_PERIODS, timing.max_interval),
+            )
+        return self.pass_test(
+            histogram, "Intervals between frames have a standard deviation of %.6f s." % timing.interval_std
+        )
+
+    def test_clock_jitter(self):
+        """Check that the camera and Harp clocks measure the same intervals between frames."""
+        n_mismatch = self._timing.n_clock_mismatch
+        if n_mismatch:
+            return self.fail_test(
+                n_mismatch,
+                "%d interval(s) differ by more than %s s between the camera and Harp clocks."
+                % (n_mismatch, self.clock_jitter),
+            )
+        return self.pass_test(0, "Camera and Harp clocks agree on every interval between frames.")
+
+    def test_trigger_frame_count(self):
+        """Check that the camera counted one frame per trigger sent while it was recording."""
+        if self.triggers is None:
+            return self.skip_test("No trigger register provided, skipping test.")
+        timing = self._timing
+        if timing.n_frames == 0:
+            return self.skip_test("Camera metadata has no frames.")
+        # each frame is timestamped with its trigger, half a period of margin absorbs rounding
+        margin = 0.5 / self.expected_fps if self.expected_fps else 0.0
+        n_triggers = count_frame_triggers(self.triggers.path, timing.start_time - margin, timing.end_time + margin)
+        counts = {"triggers": n_triggers, "counted_frames": timing.n_counted_frames, "frames": timing.n_frames}
+        if n_triggers != timing.n_counted_frames:
+            return self.fail_test(
+                counts,
+                "%d trigger(s) were sent while the camera counted %d frames (%d in the metadata)."
+                % (n_triggers, timing.n_counted_frames, timing.n_frames),
+            )
+        return self.pass_test(counts, "The camera counted one frame per trigger (%d)." % n_triggers)
+
+    def test_video_frame_count(self):
+        """Check that the video has one frame per row of the metadata."""
+        video_path = find_video(self.camera.reader_params.path, self.camera.reader_params.video_name)
+        video = CameraData(metadata=None, video_path=video_path)
+        if not video.has_video:
+            return self.skip_test("No video data available. Skipping test.")
+        n_frames = video.video_frame_count
+        if n_frames != self._timing.n_frames:
+            return self.fail_test(
+                n_frames,
+                "Number of frames in video (%d) does not match number of rows in metadata (%d)."
+                % (n_frames, self._timing.n_frames),
+            )
+        return self.pass_test(n_frames, "Number of frames in video (%d) matches the metadata." % n_frames)
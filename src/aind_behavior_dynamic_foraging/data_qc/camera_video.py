@@ -0,0 +1,38 @@
+import typing as t
+
+from contraqctor import qc
+from contraqctor.contract.camera import Camera, CameraData
+
+from ..data_contract.camera_frames import find_video
+
+
+class _VideoStream(t.NamedTuple):
+    data: CameraData
+
+
+class CameraVideoQcSuite(qc.Suite):
+    """Creates the video assets of `qc.camera.CameraTestSuite` without reading the camera metadata.
+
+    The metadata checks of `CameraTestSuite` are done by `CameraFrameTimingQcSuite`, which streams
+    the metadata in chunks. This suite only opens the video file of the camera to plot a frame
+    of the middle of the video.
+    """
+
+    test_histogram_and_create_asset = qc.camera.CameraTestSuite.test_histogram_and_create_asset
+    test_create_pixel_saturation_visualizer = qc.camera.CameraTestSuite.test_create_pixel_saturation_visualizer
+
+    def __init__(self, camera: Camera, saturation_bounds: tuple[t.Optional[int], t.Optional[int]] = (5, 250)):
+        """Initialize the suite.
+
+        Args:
+            camera (Camera): The camera data stream. Only its path is used, its data is not read.
+            saturation_bounds (tuple[Optional[int], Optional[int]]): Pixel values at or below the first bound are
+                underexposed, at or above the second are saturated.
+        """
+        self.camera = camera
+        self.saturation_bounds = saturation_bounds
+
+    def setup_suite(self) -> None:
+        # the tests of CameraTestSuite only read the video of `data_stream.data`
+        video_path = find_video(self.camera.reader_params.path, self.camera.reader_params.video_name)
+        self.data_stream = _VideoStream(CameraData(metadata=None, video_path=video_path))
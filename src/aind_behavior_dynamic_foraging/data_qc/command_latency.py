@@ -0,0 +1,86 @@
+from contraqctor import contract, qc
+
+from ..data_contract.command_latency import (
+    DEFAULT_REPLY_TIMEOUT,
+    measure_command_latency,
+    summarize_command_latency,
+)
+
+# largest 99th percentile of the command latency of a device, in seconds
+DEFAULT_MAX_LATENCY = 0.01
+
+
+class HarpCommandLatencyQcSuite(qc.Suite):
+    """Checks the time Harp devices take to reply to the commands sent by the workflow.
+
+    Commands and replies are paired from the message index of their register files, in one
+    vectorized pass per register, see `measure_command_latency`. Slow or irregular replies point
+    to USB or host load problems that delay the trial loop.
+    """
+
+    def __init__(
+        self,
+        dataset: contract.Dataset,
+        max_latency: float = DEFAULT_MAX_LATENCY,
+        timeout: float = DEFAULT_REPLY_TIMEOUT,
+    ):
+        """Initialize the suite.
+
+        Args:
+            dataset (contract.Dataset): The dataset of the session.
+            max_latency (float): Largest 99th percentile of the command latency of a device, in seconds.
+            timeout (float): Longest wait for a reply, in seconds, see `pair_replies`.
+        """
+        self.dataset = dataset
+        self.max_latency = max_latency
+        self.timeout = timeout
+
+    def setup_suite(self) -> None:
+        self._latency = measure_command_latency(self.dataset, timeout=self.timeout)
+        self._summary = summarize_command_latency(self._latency)
+
+    def test_commands_answered(self):
+        """Check that every command got a reply within the timeout."""
+        if self._latency.empty:
+            return self.skip_test("No commands were logged.")
+        unanswered = self._summary[self._summary["n_unanswered"] > 0]
+        if not unanswered.empty:
+            return self.fail_test(
+                unanswered,
+                "Commands got no reply within %s s: %s"
+                % (self.timeout, ", ".join("%s (%d)" % (d, n) for d, n in unanswered["n_unanswered"].items())),
+            )
+        return self.pass_test(None, "All %d commands got a reply." % len(self._latency))
+
+    def test_command_latency(self):
+        """Check that the 99th percentile of the command latency of every device is below the maximum."""
+        if self._latency.empty:
+            return self.skip_test("No commands were logged.")
+        slow = self._summary[self._summary["p99"] > self.max_latency]
+        if not slow.empty:
+            return self.fail_test(
+                self._summary,
+                "99th percentile of the command latency is above %s s: %s"
+                % (self.max_latency, ", ".join("%s (%.6f s)" % (d, p99) for d, p99 in slow["p99"].items())),
+            )
+        return self.pass_test(
+            self._summary,
+            "99th percentile of the command latency is at most %.6f s." % self._summary["p99"].max(),
+        )
+
+    def test_latency_outliers(self):
+        """Check that no command waited much longer for its reply than the other commands to its device."""
+        if self._latency.empty:
+            return self.skip_test("No commands were logged.")
+        outliers = self._latency[self._latency["is_outlier"]]
+        if not outliers.empty:
+            return self.warn_test(
+                outliers,
+                "%d command(s) have a tail latency, the longest is %.6f s: %s"
+                % (
+                    len(outliers),
+                    outliers["latency"].max(),
+                    ", ".join("%s (%d)" % (d, n) for d, n in outliers["device"].value_counts().items()),
+                ),
+            )
+        return self.pass_test(None, "No command latency outliers.")
@@ -0,0 +1,582 @@
+import dataclasses
+import logging
+import os
+import re
+import time
+import typing as t
+from pathlib import Path
+
+import harp.reader
+import numpy as np
+import pandas as pd
+from harp.io import MessageType
+
+from ..data_contract._indexed_harp import _PAYLOAD_TIMESTAMP_MASK, HarpMessageIndex
+from ..data_contract.streaming import SoftwareEventRecord, SoftwareEventsFollower
+from ..rig import AindDynamicForagingRig
+
+logger = logging.getLogger(__name__)
+
+# seconds without a reply to a WRITE command before the device is reported
+DEFAULT_RESPONSE_TIMEOUT = 5.0
+# seconds without a new frame before a camera is reported as stalled
+DEFAULT_CAMERA_TIMEOUT = 5.0
+# seconds without a new trial before the task is reported as stalled
+DEFAULT_TRIAL_TIMEOUT = 120.0
+# consecutive trials without a lick on a side before its lick sensor is reported
+DEFAULT_LICK_TRIALS = 30
+
+CLOCK_GENERATOR = "ClockGenerator"
+
+_REGISTER_FILE = re.compile(r"_(\d+)\.bin$")
+_MESSAGE_TYPE_MASK = 0x03
+_ERROR_MASK = 0x08
+
+Severity = t.Literal["warning", "error"]
+
+
+@dataclasses.dataclass
+class LiveAlert:
+    """A problem found while a session is being acquired.
+
+    Attributes:
+        source: Device, camera or "Task" where the problem was found.
+        check: Name of the check that raised the alert.
+        message: Description of the problem.
+        severity: "error" when the data of the session is compromised, "warning" when it may be.
+        time: Wall clock time at which the alert was raised, in seconds since the epoch.
+    """
+
+    source: str
+    check: str
+    message: str
+    severity: Severity = "error"
+    time: float = dataclasses.field(default_factory=time.time)
+
+    def __str__(self) -> str:
+        return "[%s] %s.%s: %s" % (self.severity.upper(), self.source, self.check, self.message)
+
+
+class HarpRegisterTail:
+    """Follows a single register Harp file while it is being written.
+
+    Register files hold fixed-size messages, so the reader keeps the byte offset of the last
+    complete message and each call to `read_new` only returns the messages appended since the
+    previous call. A trailing partial message is left for the next call.
+    """
+
+    def __init__(self, path: os.PathLike) -> None:
+        """Initializes the reader.
+
+        Args:
+            path (os.PathLike): Path to the register file. It does not need to exist yet.
+        """
+        self.path = Path(path)
+        self.offset = 0
+        self.stride = 0
+
+    def read_new(self, size: t.Optional[int] = None) -> np.ndarray:
+        """Read the messages appended since the last call.
+
+        Args:
+            size (Optional[int]): Current size of the file, if already known, to save a call to stat.
+
+        Returns:
+            np.ndarray: The new messages, one row of raw bytes per message.
+        """
+        if size is None:
+            try:
+                size = self.path.stat().st_size
+            except FileNotFoundError:
+                size = 0
+        if size < self.offset:
+            logger.info("%s was truncated, reading from the start." % self.path)
+            self.offset = 0
+        if size - self.offset < max(self.stride, 2):
+            return np.empty((0, self.stride), dtype=np.uint8)
+
+        with open(self.path, "rb") as file:
+            if self.stride == 0:
+                self.stride = file.read(2)[1] + 2
+            n_messages = (size - self.offset) // self.stride
+            file.seek(self.offset)
+            chunk = file.read(n_messages * self.stride)
+        n_messages = len(chunk) // self.stride
+        self.offset += n_messages * self.stride
+        return np.frombuffer(chunk, dtype=np.uint8, count=n_messages * self.stride).reshape(n_messages, self.stride)
+
+
+class HarpDeviceMonitor:
+    """Incremental version of the Harp device checks on the register files of one device.
+
+    On each poll, the monitor checks that the timestamps of every register and message type keep
+    increasing, that the device does not reply with errors and that every WRITE command logged in
+    the commands directory gets a reply within `response_timeout`. Commands and replies are counted
+    per register, as in `HarpDeviceTestSuite.test_request_response`.
+    """
+
+    def __init__(
+        self,
+        path: os.PathLike,
+        commands_path: t.Optional[os.PathLike] = None,
+        response_timeout: float = DEFAULT_RESPONSE_TIMEOUT,
+    ) -> None:
+        """Initializes the monitor without reading any data.
+
+        Args:
+            path (os.PathLike): The ".harp" directory of the device.
+            commands_path (Optional[os.PathLike]): The ".harp" directory of the commands sent to the device.
+            response_timeout (float): Seconds a WRITE command may wait for its reply.
+        """
+        self.path = Path(path)
+        self.name = self.path.stem
+        self.commands_path = Path(commands_path) if commands_path is not None else None
+        self.response_timeout = response_timeout
+        self.tails: dict[int, HarpRegisterTail] = {}
+        self.command_tails: dict[int, HarpRegisterTail] = {}
+        self._reader: t.Optional[harp.reader.DeviceReader] = None
+        self._last_time: dict[tuple[int, int], float] = {}
+        self._pending: dict[int, int] = {}
+        self._pending_since: dict[int, float] = {}
+        self._reported: set[int] = set()
+
+    @property
+    def reader(self) -> t.Optional[harp.reader.DeviceReader]:
+        """The reader of the device, once its device.yml was written."""
+        if self._reader is None and (self.path / "device.yml").exists():
+            self._reader = harp.reader.create_reader(self.path / "device.yml")
+        return self._reader
+
+    def address_of(self, register: str) -> t.Optional[int]:
+        """Return the address of a register by name, if the device.yml is available."""
+        reader = self.reader
+        if reader is None or register not in reader.registers:
+            return None
+        return reader.registers[register].register.address
+
+    def decode(self, register: str, messages: np.ndarray) -> pd.DataFrame:
+        """Parse raw messages of a register as `harp.read` does, see `read_new`."""
+        return self.reader.registers[register].read(messages.reshape(-1), keep_type=True)
+
+    def poll(self, now: float) -> tuple[list[LiveAlert], dict[int, np.ndarray]]:
+        """Read the messages written since the last poll and check them.
+
+        Args:
+            now (float): Current time of the monotonic clock, in seconds.
+
+        Returns:
+            tuple[list[LiveAlert], dict[int, np.ndarray]]: The alerts, and the new messages of each register address.
+        """
+        alerts: list[LiveAlert] = []
+        messages = _read_registers(self.path, self.tails)
+        for address, new in messages.items():
+            alerts.extend(self._check_monotonic(address, new))
+            errors = np.count_nonzero(new[:, 0] & _ERROR_MASK)
+            if errors:
+                alerts.append(
+                    LiveAlert(self.name, "reply_errors", "%d error replies on register %d." % (errors, address))
+                )
+
+        if self.commands_path is not None:
+            commands = _read_registers(self.commands_path, self.command_tails)
+            for address in set(commands) | set(messages):
+                sent = _count_type(commands.get(address), MessageType.WRITE)
+                replied = _count_type(messages.get(address), MessageType.WRITE)
+                self._pending[address] = self._pending.get(address, 0) + sent - replied
+            alerts.extend(self._check_replies(now))
+        return alerts, messages
+
+    def _check_monotonic(self, address: int, messages: np.ndarray) -> list[LiveAlert]:
+        index = HarpMessageIndex.from_buffer(messages.reshape(-1))
+        if np.isnan(index.time).all():
+            return []
+        alerts = []
+        message_types = index.message_type & _MESSAGE_TYPE_MASK
+        for message_type in np.unique(message_types):
+            times = index.time[message_types == message_type]
+            previous = self._last_time.get((address, message_type), -np.inf)
+            n_backwards = np.count_nonzero(np.diff(times, prepend=previous) < 0)
+            self._last_time[(address, message_type)] = times[-1]
+            if n_backwards:
+                alerts.append(
+                    LiveAlert(
+                        self.name,
+                        "registers_are_monotonic",
+                        "%d %s message(s) of register %d go back in time."
+                        % (n_backwards, MessageType(message_type).name, address),
+                    )
+                )
+        return alerts
+
+    def _check_replies(self, now: float) -> list[LiveAlert]:
+        alerts = []
+        for address, pending in self._pending.items():
+            if pending <= 0:
+                self._pending_since.pop(address, None)
+                self._reported.discard(address)
+                continue
+            since = self._pending_since.setdefault(address, now)
+            if now - since > self.response_timeout and address not in self._reported:
+                self._reported.add(address)
+                alerts.append(
+                    LiveAlert(
+                        self.name,
+                        "request_response",
+                        "%d WRITE command(s) to register %d got no reply for %.0f s." % (pending, address, now - since),
+                    )
+                )
+        return alerts
+
+
+class CameraMetadataTail:
+    """Follows the metadata.csv file of a camera while it is being written.
+
+    As `SoftwareEventsTail`, only complete lines appended since the previous call are parsed.
+    """
+
+    def __init__(self, path: os.PathLike) -> None:
+        """Initializes the reader.
+
+        Args:
+            path (os.PathLike): Path to the metadata.csv file. It does not need to exist yet.
+        """
+        self.path = Path(path)
+        self.offset = 0
+        self.columns: t.Optional[list[str]] = None
+
+    def read_new(self) -> pd.DataFrame:
+        """Parse the rows appended since the last call.
+
+        Returns:
+            pd.DataFrame: The new rows, with the columns of the file header.
+        """
+        try:
+            size = self.path.stat().st_size
+        except FileNotFoundError:
+            size = 0
+        if size < self.offset:
+            self.offset = 0
+            self.columns = None
+        if size == self.offset:
+            return pd.DataFrame(columns=self.columns)
+
+        with open(self.path, "rb") as file:
+            file.seek(self.offset)
+            chunk = file.read(size - self.offset)
+        end = chunk.rfind(b"\n") + 1
+        self.offset += end
+        lines = [line for line in chunk[:end].decode("utf-8").splitlines() if line.strip()]
+        if self.columns is None:
+            if not lines:
+                return pd.DataFrame()
+            self.columns = lines.pop(0).strip().split(",")
+        rows = np.array([line.split(",") for line in lines], dtype=float).reshape(-1, len(self.columns))
+        return pd.DataFrame(rows, columns=self.columns)
+
+
+class CameraMonitor:
+    """Incremental version of the camera checks on the metadata of one camera.
+
+    Checks that no frame number is skipped, including across polls, and that new frames keep
+    arriving once the camera started.
+    """
+
+    def __init__(self, path: os.PathLike, timeout: float = DEFAULT_CAMERA_TIMEOUT) -> None:
+        """Initializes the monitor without reading any data.
+
+        Args:
+            path (os.PathLike): The directory of the camera, with its metadata.csv file.
+            timeout (float): Seconds without a new frame before the camera is reported as stalled.
+        """
+        self.path = Path(path)
+        self.name = self.path.name
+        self.tail = CameraMetadataTail(self.path / "metadata.csv")
+        self.stall = _StallTimer(timeout)
+        self.n_frames = 0
+        self._last_frame: t.Optional[float] = None
+
+    def poll(self, now: float, running: bool = True) -> list[LiveAlert]:
+        """Read the frames written since the last poll and check them.
+
+        Args:
+            now (float): Current time of the monotonic clock, in seconds.
+            running (bool): Whether frames are expected, i.e. the session did not end.
+
+        Returns:
+            list[LiveAlert]: The alerts.
+        """
+        alerts = []
+        metadata = self.tail.read_new()
+        if len(metadata) > 0:
+            self.stall.feed(now)
+            self.n_frames += len(metadata)
+            frames = metadata["CameraFrameNumber"].to_numpy()
+            previous = self._last_frame if self._last_frame is not None else frames[0] - 1
+            dropped = int(np.sum(np.diff(frames, prepend=previous) - 1))
+            self._last_frame = frames[-1]
+            if dropped:
+                alerts.append(LiveAlert(self.name, "check_dropped_frames", "Detected %d dropped frames." % dropped))
+        if running and (elapsed := self.stall.check(now)) is not None:
+            alerts.append(
+                LiveAlert(
+                    self.name, "camera_stalled", "No new frame for %.0f s after %d frames." % (elapsed, self.n_frames)
+                )
+            )
+        return alerts
+
+
+class LiveQcMonitor:
+    """Runs incremental QC checks on a session while it is being acquired.
+
+    Each call to `poll` reads only the data appended since the previous call to the Harp register
+    files, the camera metadata and the software events, and returns the alerts raised by:
+
+    - Every Harp device: `HarpDeviceMonitor`.
+    - The Harp hub: every device other than the clock generator must be subordinate to it and,
+      when the rig is known, the clock generator must see every connected clock output of the rig,
+      as in `ValidateClkOutput.bonsai`.
+    - Every camera: `CameraMonitor`.
+    - The task: trials must keep coming, and each side must keep registering licks.
+
+    Stall alerts are raised once until the stream recovers, and no longer after the session ends.
+
+    Examples:
+        ```python
+        monitor = LiveQcMonitor(session_path, rig=rig)
+        for alert in monitor.run(interval=1.0):
+            print(alert)
+        ```
+    """
+
+    def __init__(
+        self,
+        session_path: os.PathLike,
+        rig: t.Optional[AindDynamicForagingRig] = None,
+        response_timeout: float = DEFAULT_RESPONSE_TIMEOUT,
+        camera_timeout: float = DEFAULT_CAMERA_TIMEOUT,
+        trial_timeout: float = DEFAULT_TRIAL_TIMEOUT,
+        lick_trials: int = DEFAULT_LICK_TRIALS,
+    ) -> None:
+        """Initializes the monitor without reading any data.
+
+        Args:
+            session_path (os.PathLike): The session root directory, as passed to `dataset`.
+            rig (Optional[AindDynamicForagingRig]): The rig of the session. Without it, the clock outputs are not
+                checked and licks are read from the lickometers found in the session.
+            response_timeout (float): Seconds a WRITE command may wait for its reply.
+            camera_timeout (float): Seconds without a new frame before a camera is reported as stalled.
+            trial_timeout (float): Seconds without a new trial before the task is reported as stalled.
+            lick_trials (int): Consecutive trials without a lick on a side before it is reported.
+        """
+        self.session_path = Path(session_path)
+        self.rig = rig
+        self.response_timeout = response_timeout
+        self.camera_timeout = camera_timeout
+        self.lick_trials = lick_trials
+        self.devices: dict[str, HarpDeviceMonitor] = {}
+        self.cameras: dict[str, CameraMonitor] = {}
+        self.events = SoftwareEventsFollower(self.session_path, names=["TrialOutcome", "EndSession"])
+        self.trial_stall = _StallTimer(trial_timeout)
+        self.n_trials = 0
+        self.finished = False
+        self._trials_without_lick = {"left": 0, "right": 0}
+        self._lick_state: dict[str, bool] = {}
+        self._reported: set[tuple[str, ...]] = set()
+
+    def poll(self, now: t.Optional[float] = None) -> list[LiveAlert]:
+        """Read the data written since the last poll and check it.
+
+        Args:
+            now (Optional[float]): Current time of the monotonic clock, in seconds. By default, `time.monotonic()`.
+
+        Returns:
+            list[LiveAlert]: The alerts raised by this poll, which are also logged.
+        """
+        now = time.monotonic() if now is None else now
+        running = not self.finished
+        self._discover()
+        alerts: list[LiveAlert] = []
+
+        licks = {"left": 0, "right": 0}
+        for device in self.devices.values():
+            device_alerts, messages = device.poll(now)
+            alerts.extend(device_alerts)
+            if messages and device.reader is not None:
+                alerts.extend(self._check_hub(device, messages))
+                for side, (name, register, column) in self._lick_sources().items():
+                    address = device.address_of(register)
+                    if device.name == name and address in messages:
+                        licks[side] += self._count_licks(side, device.decode(register, messages[address]), column)
+
+        for camera in self.cameras.values():
+            alerts.extend(camera.poll(now, running))
+
+        alerts.extend(self._check_task(now, self.events.poll(), licks))
+        if running and (elapsed := self.trial_stall.check(now)) is not None:
+            alerts.append(LiveAlert("Task", "trials_stalled", "No new trial for %.0f s." % elapsed))
+
+        for alert in alerts:
+            logger.log(logging.ERROR if alert.severity == "error" else logging.WARNING, str(alert))
+        return alerts
+
+    def run(self, interval: float = 1.0, duration: t.Optional[float] = None) -> t.Iterator[LiveAlert]:
+        """Poll the session every `interval` seconds until it ends.
+
+        Args:
+            interval (float): Seconds between polls. Longer intervals use less CPU but delay the alerts.
+            duration (Optional[float]): Stop after this many seconds even if the session did not end.
+
+        Yields:
+            LiveAlert: Each alert, as soon as the poll that raised it returns.
+        """
+        start = time.monotonic()
+        while True:
+            yield from self.poll()
+            if self.finished or (duration is not None and time.monotonic() - start > duration):
+                return
+            time.sleep(interval)
+
+    def _discover(self) -> None:
+        behavior = self.session_path / "behavior"
+        for path in behavior.glob("*.harp"):
+            if path.stem not in self.devices:
+                commands = behavior / "HarpCommands" / path.name
+                self.devices[path.stem] = HarpDeviceMonitor(path, commands, self.response_timeout)
+        for path in (self.session_path / "behavior-videos").glob("*"):
+            if path.is_dir() and path.name not in self.cameras:
+                self.cameras[path.name] = CameraMonitor(path, self.camera_timeout)
+
+    def _check_hub(self, device: HarpDeviceMonitor, messages: dict[int, np.ndarray]) -> list[LiveAlert]:
+        alerts = []
+        address = device.address_of("ClockConfiguration")
+        if address in messages:
+            is_generator = device.decode("ClockConfiguration", messages[address])["ClockGenerator"].iloc[-1]
+            if bool(is_generator) != (device.name == CLOCK_GENERATOR):
+                alerts.append(
+                    LiveAlert(
+                        device.name,
+                        "clock_generator_reg" if device.name == CLOCK_GENERATOR else "devices_are_subordinate",
+                        "Device is a clock generator." if is_generator else "Device is not a clock generator.",
+                    )
+                )
+
+        address = device.address_of("ConnectedDevices")
+        if device.name == CLOCK_GENERATOR and self.rig is not None and address in messages:
+            connected = _payload_values(messages[address])[-1]
+            missing = [
+                output
+                for output in self.rig.harp_clock_generator.connected_clock_outputs
+                if not connected >> output.output_channel & 1
+            ]
+            if missing:
+                alerts.append(
+                    LiveAlert(
+                        device.name,
+                        "clock_outputs_connected",
+                        "No clock signal on output(s): %s."
+                        % ", ".join("%d (%s)" % (output.output_channel, output.target_device) for output in missing),
+                    )
+                )
+        return alerts
+
+    def _lick_sources(self) -> dict[str, tuple[str, str, str]]:
+        """Device, register and column of the lick state of each side, as read by `get_lick_events`."""
+        if self.rig is not None:
+            lickometers = {"left": self.rig.harp_lickometer_left, "right": self.rig.harp_lickometer_right}
+        else:
+            lickometers = {side: side.capitalize() in self._lickometer_names() for side in ("left", "right")}
+        return {
+            side: ("Lickometer%s" % side.capitalize(), "LickState", "Channel0")
+            if lickometers[side]
+            else ("Behavior", "DigitalInputState", port)
+            for side, port in (("left", "DIPort0"), ("right", "DIPort1"))
+        }
+
+    def _lickometer_names(self) -> list[str]:
+        return [name.removeprefix("Lickometer") for name in self.devices if name.startswith("Lickometer")]
+
+    def _count_licks(self, side: str, state: pd.DataFrame, column: str) -> int:
+        values = state.loc[state["MessageType"] == "EVENT", column].to_numpy(dtype=bool)
+        previous = np.concatenate(([self._lick_state.get(side, False)], values[:-1]))
+        if len(values):
+            self._lick_state[side] = bool(values[-1])
+        return int(np.count_nonzero(values & ~previous))
+
+    def _check_task(self, now: float, events: list[SoftwareEventRecord], licks: dict[str, int]) -> list[LiveAlert]:
+        alerts = []
+        n_trials = sum(event.get("name") == "TrialOutcome" for event in events)
+        if n_trials:
+            self.n_trials += n_trials
+            self.trial_stall.feed(now)
+        for side, n_licks in licks.items():
+            # licks read in the same poll as a trial are counted for it
+            if n_licks:
+                self._trials_without_lick[side] = 0
+                self._reported.discard(("licks", side))
+            elif n_trials:
+                self._trials_without_lick[side] += n_trials
+                if self._trials_without_lick[side] >= self.lick_trials and ("licks", side) not in self._reported:
+                    self._reported.add(("licks", side))
+                    alerts.append(
+                        LiveAlert(
+                            "Task",
+                            "licks_registered",
+                            "No lick on the %s side in the last %d trials." % (side, self._trials_without_lick[side]),
+                            severity="warning",
+                        )
+                    )
+        if any(event.get("name") == "EndSession" for event in events):
+            self.finished = True
+        return alerts
+
+
+class _StallTimer:
+    """Reports a stream once when no data arrived for `timeout` seconds after its first data."""
+
+    def __init__(self, timeout: float) -> None:
+        self.timeout = timeout
+        self.last: t.Optional[float] = None
+        self.reported = False
+
+    def feed(self, now: float) -> None:
+        self.last = now
+        self.reported = False
+
+    def check(self, now: float) -> t.Optional[float]:
+        """Return the seconds since the last data when the stream just stalled, None otherwise."""
+        if self.last is None or self.reported or now - self.last <= self.timeout:
+            return None
+        self.reported = True
+        return now - self.last
+
+
+def _read_registers(path: Path, tails: dict[int, HarpRegisterTail]) -> dict[int, np.ndarray]:
+    """Read the new messages of every register file in a device directory, by register address."""
+    messages = {}
+    try:
+        entries = list(os.scandir(path))
+    except FileNotFoundError:
+        return messages
+    for entry in entries:
+        match = _REGISTER_FILE.search(entry.name)
+        if match is None:
+            continue
+        address = int(match.group(1))
+        tail = tails.setdefault(address, HarpRegisterTail(entry.path))
+        new = tail.read_new(entry.stat().st_size)
+        if len(new) > 0:
+            messages[address] = new
+    return messages
+
+
+def _count_type(messages: t.Optional[np.ndarray], message_type: MessageType) -> int:
+    if messages is None:
+        return 0
+    return int(np.count_nonzero(messages[:, 0] & _MESSAGE_TYPE_MASK == message_type))
+
+
+def _payload_values(messages: np.ndarray) -> np.ndarray:
+    """Payload of single value register messages, as unsigned integers."""
+    start = 11 if messages[0, 4] & _PAYLOAD_TIMESTAMP_MASK else 5
+    payload = messages[:, start:-1].astype(np.uint64)
+    return (payload << (8 * np.arange(payload.shape[1], dtype=np.uint64))).sum(axis=1)
@@ -0,0 +1,68 @@
+import typing as t
+
+from contraqctor.qc.reporters import HtmlReporter
+
+from .usage import SuiteUsage
+
+_USAGE_SECTION = """
+{% macro row(usage) -%}
+<td>{{ "%.3f" % usage.wall_time }}</td><td>{{ "%.3f" % usage.cpu_time }}</td>
+<td>{{ usage.bytes_read if usage.bytes_read is not none else "" }}</td>
+<td>{{ usage.peak_memory if usage.peak_memory is not none else "" }}</td>
+{%- endmacro %}
+<div class="container">
+    <h2>Resource Usage</h2>
+    <p style="color: #7f8c8d">Suites by decreasing wall time. Setup includes reading the declared streams.</p>
+    <table style="width: 100%; border-collapse: collapse; font-size: 0.9em">
+        <thead>
+            <tr style="text-align: left; border-bottom: 2px solid #ddd">
+                <th>Group</th><th>Suite</th><th>Step</th><th>Wall time (s)</th><th>CPU time (s)</th>
+                <th>Bytes read</th><th>Peak memory (bytes)</th>
+            </tr>
+        </thead>
+        <tbody>
+            {% for usage in usages %}
+            <tr style="border-top: 1px solid #ddd; font-weight: bold">
+                <td>{{ usage.group or "" }}</td><td>{{ usage.suite }}</td>
+                <td>{{ "cached" if usage.cached else "total" }}</td>
+                {{ row(usage.total) }}
+            </tr>
+            {% if not usage.cached %}
+            <tr><td></td><td></td><td>setup</td>{{ row(usage.setup) }}</tr>
+            {% for name, test in usage.tests.items() %}
+            <tr><td></td><td></td><td>{{ name }}</td>{{ row(test) }}</tr>
+            {% endfor %}
+            {% endif %}
+            {% endfor %}
+        </tbody>
+    </table>
+</div>
+"""
+
+
+class UsageHtmlReporter(HtmlReporter):
+    """Html reporter that adds a section with the resources used by each suite and test."""
+
+    def __init__(self, usage: t.Sequence[SuiteUsage], **kwargs: t.Any):
+        """Initialize the reporter.
+
+        Args:
+            usage (Sequence[SuiteUsage]): The usage of each suite, e.g. `ParallelRunner.usage` after a run.
+            **kwargs: Passed to `HtmlReporter`.
+        """
+        super().__init__(**kwargs)
+        self.usage = usage
+
+    def report_results(self, results, **kwargs: t.Any) -> None:
+        """Generate the HTML report of the results, followed by the resource usage section.
+
+        Args:
+            results: The results, as accepted by `HtmlReporter.report_results`.
+            **kwargs: Passed to `HtmlReporter.report_results`.
+        """
+        super().report_results(results, **kwargs)
+        usages = sorted(self.usage, key=lambda usage: usage.total.wall_time, reverse=True)
+        section = self.env.from_string(_USAGE_SECTION).render(usages=usages)
+        html = self.output_path.read_text(encoding="utf-8")
+        head, body_end, tail = html.rpartition("</body>")
+        self.output_path.write_text(head + section + body_end + tail if body_end else html + section, encoding="utf-8")
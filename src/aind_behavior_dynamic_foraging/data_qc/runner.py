@@ -0,0 +1,414 @@
+import contextlib
+import contextvars
+import cProfile
+import logging
+import multiprocessing
+import os
+import threading
+import tracemalloc
+import typing as t
+from collections import Counter, defaultdict
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+
+import rich.progress
+from contraqctor import qc
+from contraqctor.contract import DataStream
+from contraqctor.qc.base import ResultsStatistics, _TaggedResult, _TaggedTest
+from rich.console import Console
+
+from .usage import ResourceUsage, SuiteUsage, measure_usage
+
+if t.TYPE_CHECKING:
+    from contraqctor.qc.reporters import Reporter
+
+    from .cache import QcResultCache
+
+logger = logging.getLogger(__name__)
+
+ExecutorKind = t.Literal["thread", "process"]
+
+
+def leaf_streams(stream: DataStream) -> list[DataStream]:
+    """Return the leaf streams under a stream, reading the structure of collections but no leaf data.
+
+    A collection that cannot be read is returned as a leaf, so that the error is kept on it when
+    the suites that declared it load it.
+
+    Args:
+        stream (DataStream): A data stream or collection.
+
+    Returns:
+        list[DataStream]: The leaf streams, depth first.
+    """
+    if not stream.is_collection:
+        return [stream]
+    if not (stream.has_data or stream.has_error):
+        stream.load()
+    if stream.has_error:
+        return [stream]
+    return [leaf for child in stream.data for leaf in leaf_streams(child)]
+
+
+def load_leaf_streams(leaves: t.Iterable[DataStream]) -> None:
+    """Read the leaf streams that were not read yet, keeping read errors on the streams."""
+    for leaf in leaves:
+        if not (leaf.has_data or leaf.has_error):
+            leaf.load()
+
+
+class _StreamLeases:
+    """Loads the streams declared by suites when they start and releases them when no pending suite needs them.
+
+    Only streams read by the runner are released, streams read before the run are left untouched.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._stream_locks: defaultdict[int, threading.Lock] = defaultdict(threading.Lock)
+        self._pending: Counter[int] = Counter()
+        self._loaded: set[int] = set()
+
+    def acquire(self, streams: t.Iterable[DataStream]) -> list[DataStream]:
+        """Register a pending suite that declared the given streams, returning their leaves."""
+        leaves = list({id(leaf): leaf for stream in streams for leaf in leaf_streams(stream)}.values())
+        for leaf in leaves:
+            self._pending[id(leaf)] += 1
+        return leaves
+
+    def load(self, leaves: list[DataStream]) -> None:
+        for leaf in leaves:
+            with self._lock:
+                stream_lock = self._stream_locks[id(leaf)]
+            with stream_lock:
+                if not (leaf.has_data or leaf.has_error):
+                    leaf.load()
+                    with self._lock:
+                        self._loaded.add(id(leaf))
+
+    def release(self, leaves: list[DataStream]) -> None:
+        with self._lock:
+            for leaf in leaves:
+                self._pending[id(leaf)] -= 1
+                if self._pending[id(leaf)] == 0 and id(leaf) in self._loaded:
+                    self._loaded.discard(id(leaf))
+                    leaf.clear()
+
+
+def run_suite(
+    suite: qc.Suite,
+    on_test_done: t.Optional[t.Callable[[], None]] = None,
+    usage: t.Optional[SuiteUsage] = None,
+) -> list[qc.Result]:
+    """Run every test of a suite, as `Runner.run_all` does for each suite.
+
+    Args:
+        suite (qc.Suite): The suite to run.
+        on_test_done (Optional[Callable[[], None]]): Called after each test, e.g. to report progress.
+        usage (Optional[SuiteUsage]): If given, filled with the resources used to set up the suite and by each test.
+
+    Returns:
+        list[qc.Result]: The results, in test order.
+    """
+    results: list[qc.Result] = []
+    with _measure(usage) as setup_usage:
+        setup_failure = suite._try_setup_suite()
+    if usage is not None:
+        usage.setup = usage.setup + setup_usage
+    try:
+        for test in suite.get_tests():
+            with _measure(usage) as test_usage:
+                if setup_failure is None:
+                    results.extend(suite.run_test(test))
+                else:
+                    exception, tb = setup_failure
+                    results.append(suite._suite_setup_error_result(test, exception, tb))
+            if usage is not None:
+                usage.tests[test.__name__] = test_usage
+            if on_test_done is not None:
+                on_test_done()
+    finally:
+        if setup_failure is None:
+            suite.teardown_suite()
+    return results
+
+
+def _load_and_run_suite(
+    suite: qc.Suite, leaves: list[DataStream], trace_memory: bool = False
+) -> tuple[list[qc.Result], SuiteUsage]:
+    """Read the declared streams of a suite in a worker process and run it."""
+    if trace_memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    usage = SuiteUsage(suite=suite.name)
+    with measure_usage() as usage.setup:
+        load_leaf_streams(leaves)
+    return run_suite(suite, usage=usage), usage
+
+
+def _measure(usage: t.Optional[SuiteUsage]) -> t.ContextManager[t.Optional[ResourceUsage]]:
+    return measure_usage() if usage is not None else contextlib.nullcontext()
+
+
+class ParallelRunner(qc.Runner):
+    """Runner that runs its suites concurrently on a thread or process pool.
+
+    Suites run independently of each other, so they are scheduled as they are registered and
+    run on up to `max_workers` workers. Tests within a suite still run in order. Results are
+    collected in registration order, so they are the same as with `qc.Runner` regardless of the
+    order in which suites finish.
+
+    Threads share the dataset between suites and suit the I/O- and NumPy-bound suites of a
+    session. Processes also parallelize pure Python tests, but every suite and its results must
+    be picklable and streams are read again in each worker process.
+
+    Suites can declare the streams they read when they are added. Declared streams are read
+    when the suite starts and, with threads, cleared once every suite that declared them has
+    finished, so memory is bounded by the streams of the running suites rather than the session.
+    Suites that read the files of a stream themselves, without going through its data, declare
+    it as a file stream instead, which is never read nor cleared by the runner.
+
+    With a `QcResultCache`, suites whose code and declared streams and file streams did not
+    change since a previous run are served from the cache without reading their streams.
+
+    The resources used by each suite and test are kept in `usage` after a run, see `SuiteUsage`.
+    """
+
+    def __init__(
+        self,
+        max_workers: t.Optional[int] = None,
+        executor: ExecutorKind = "thread",
+        console: t.Optional[Console] = None,
+        cache: t.Optional["QcResultCache"] = None,
+        trace_memory: bool = False,
+    ):
+        """Initialize the runner.
+
+        Args:
+            max_workers (Optional[int]): Number of workers. By default, the number of CPUs.
+            executor (ExecutorKind): Whether to run suites on a "thread" or a "process" pool.
+            console (Optional[Console]): Rich console for the progress display.
+            cache (Optional[QcResultCache]): Cache of suite results. By default, every suite is run.
+            trace_memory (bool): Whether to trace allocations with tracemalloc to measure the peak memory of
+                each test. Tracing slows down the tests. The peak is process-wide, so on a thread pool suites
+                then run one at a time, whatever `max_workers`.
+        """
+        super().__init__(console=console)
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.executor = executor
+        self.cache = cache
+        self.trace_memory = trace_memory
+        self.usage: list[SuiteUsage] = []
+        self._declared_streams: dict[int, list[DataStream]] = {}
+        self._file_streams: dict[int, list[DataStream]] = {}
+
+    def add_suite(
+        self,
+        suite: qc.Suite,
+        group: t.Optional[str] = None,
+        streams: t.Optional[t.Iterable[DataStream]] = None,
+        file_streams: t.Optional[t.Iterable[DataStream]] = None,
+    ) -> t.Self:
+        """Add a test suite to the runner.
+
+        Args:
+            suite (qc.Suite): Test suite to add.
+            group (Optional[str]): Group name for organizing suites.
+            streams (Optional[Iterable[DataStream]]): Streams the suite reads. Collections stand for all
+                their streams. Undeclared streams are read on first access and never released.
+            file_streams (Optional[Iterable[DataStream]]): Streams whose files the suite reads without going
+                through their data. They are only used to key the cache.
+
+        Returns:
+            ParallelRunner: Self for method chaining.
+        """
+        self._declared_streams[id(suite)] = list(streams or [])
+        self._file_streams[id(suite)] = list(file_streams or [])
+        return super().add_suite(suite, group)
+
+    def run_all(self) -> dict[t.Optional[str], list[qc.Result]]:
+        """Run all tests in all suites concurrently, without progress display.
+
+        Returns:
+            dict[Optional[str], list[qc.Result]]: Results grouped by test group name.
+        """
+        return self._run(on_suite_start=None)
+
+    def run_all_with_progress(
+        self, *, reporter: t.Optional["Reporter"] = None, **reporter_kwargs: t.Any
+    ) -> dict[t.Optional[str], list[qc.Result]]:
+        """Run all tests in all suites concurrently, with a progress bar per suite.
+
+        Args:
+            reporter (Optional[Reporter]): Reporter for the results. By default, a `ConsoleReporter`.
+            **reporter_kwargs: Passed to `reporter.report_results`.
+
+        Returns:
+            dict[Optional[str], list[qc.Result]]: Results grouped by test group name.
+        """
+        from contraqctor.qc.reporters import ConsoleReporter
+
+        if reporter is None:
+            reporter = ConsoleReporter(console=self._console)
+
+        tests = self._collect_tests()
+        name_width = max([len(suite.name) for suite, _ in _TaggedTest.group_by_suite(tests)] + [14])
+        columns = [
+            f"[progress.description]{{task.description:<{name_width + 5}}}",
+            rich.progress.BarColumn(),
+            "[progress.percentage]{task.percentage:>3.0f}%",
+            "•",
+            rich.progress.TimeElapsedColumn(),
+        ]
+        with rich.progress.Progress(*columns, console=self._console) as progress:
+            total_task = progress.add_task("[bold green]TOTAL PROGRESS", total=len(tests))
+
+            def on_suite_start(suite: qc.Suite, n_tests: int) -> t.Callable[[], None]:
+                suite_task = progress.add_task(f"[cyan]{suite.name}", total=n_tests)
+
+                def on_test_done() -> None:
+                    progress.advance(suite_task)
+                    progress.advance(total_task)
+
+                return on_test_done
+
+            out = self._run(on_suite_start)
+            stats = ResultsStatistics.from_results([result for results in out.values() for result in results])
+            status_bar = self._render_status_bar(stats)
+            progress.update(
+                total_task, description=f"[bold green]TOTAL PROGRESS | {status_bar} | {stats.get_status_summary()}"
+            )
+
+        if self._results:
+            reporter.report_results(self._results, **reporter_kwargs)
+        return out
+
+    def _run(
+        self, on_suite_start: t.Optional[t.Callable[[qc.Suite, int], t.Callable[[], None]]]
+    ) -> dict[t.Optional[str], list[qc.Result]]:
+        suites = [(group, suite) for group, group_suites in self.suites.items() for suite in group_suites]
+        cache_keys = [
+            self.cache.key(suite, [*self._declared_streams.get(id(suite), []), *self._file_streams.get(id(suite), [])])
+            if self.cache is not None
+            else None
+            for _, suite in suites
+        ]
+        cached = [
+            self.cache.get(key, suite) if key is not None else None for (_, suite), key in zip(suites, cache_keys)
+        ]
+        start_tracing = self.trace_memory and not tracemalloc.is_tracing()
+        if start_tracing:
+            tracemalloc.start()
+        leases = _StreamLeases()
+        declared = [
+            leases.acquire(self._declared_streams.get(id(suite), [])) if hit is None else []
+            for (_, suite), hit in zip(suites, cached)
+        ]
+        try:
+            collected, usage = self._submit(suites, cached, cache_keys, declared, leases, on_suite_start)
+        finally:
+            if start_tracing:
+                tracemalloc.stop()
+
+        self._results = collected
+        self.usage = usage
+        out: dict[t.Optional[str], list[qc.Result]] = {}
+        for group, grouped in _TaggedResult.group_by_group(collected):
+            out.setdefault(group, []).extend(tagged.result for tagged in grouped)
+        return out
+
+    def _submit(
+        self,
+        suites: list[tuple[t.Optional[str], qc.Suite]],
+        cached: list[t.Optional[list[qc.Result]]],
+        cache_keys: list[t.Optional[str]],
+        declared: list[list[DataStream]],
+        leases: _StreamLeases,
+        on_suite_start: t.Optional[t.Callable[[qc.Suite, int], t.Callable[[], None]]],
+    ) -> tuple[list[_TaggedResult], list[SuiteUsage]]:
+        with self._make_executor() as executor:
+            futures: list[t.Optional[Future]] = []
+            progress_callbacks: list[tuple[t.Optional[t.Callable[[], None]], int]] = []
+            for (_, suite), leaves, hit in zip(suites, declared, cached):
+                n_tests = len(list(suite.get_tests()))
+                on_test_done = on_suite_start(suite, n_tests) if on_suite_start is not None else None
+                if hit is not None:
+                    futures.append(None)
+                    progress_callbacks.append((on_test_done, n_tests))
+                elif self.executor == "process":
+                    # callbacks cannot cross the process boundary, progress is reported when the suite returns
+                    futures.append(executor.submit(_load_and_run_suite, suite, leaves, self.trace_memory))
+                    progress_callbacks.append((on_test_done, n_tests))
+                else:
+                    # keep the caller's context, which holds the qc settings such as elevated warnings
+                    context = contextvars.copy_context()
+                    futures.append(
+                        executor.submit(context.run, self._run_with_leases, suite, leaves, leases, on_test_done)
+                    )
+                    progress_callbacks.append((None, 0))
+
+            collected: list[_TaggedResult] = []
+            usage: list[SuiteUsage] = []
+            for (group, suite), future, hit, key, (on_test_done, n_tests) in zip(
+                suites, futures, cached, cache_keys, progress_callbacks
+            ):
+                if future is None:
+                    results, suite_usage = hit, SuiteUsage(suite=suite.name, cached=True)
+                else:
+                    results, suite_usage = future.result()
+                    if key is not None:
+                        self.cache.put(key, results)
+                suite_usage.group = group
+                usage.append(suite_usage)
+                for _ in range(n_tests if on_test_done is not None else 0):
+                    on_test_done()
+                for result in results:
+                    collected.append(_TaggedResult(suite=suite, group=group, result=result, test=result.test_reference))
+        return collected, usage
+
+    def profile_slowest_suite(self, path: os.PathLike) -> t.Optional[SuiteUsage]:
+        """Run the slowest suite of the last run again under cProfile and save the profile.
+
+        The suite reads its declared streams again, so their reading is part of the profile.
+
+        Args:
+            path (os.PathLike): Path of the profile, which can be read with `pstats` or snakeviz.
+
+        Returns:
+            Optional[SuiteUsage]: The usage of the profiled suite in the last run, None if no suite was run.
+        """
+        suites = [suite for group_suites in self.suites.values() for suite in group_suites]
+        ran = [(usage, suite) for usage, suite in zip(self.usage, suites) if not usage.cached]
+        if not ran:
+            return None
+        usage, suite = max(ran, key=lambda item: item[0].total.wall_time)
+        leases = _StreamLeases()
+        leaves = leases.acquire(self._declared_streams.get(id(suite), []))
+        profiler = cProfile.Profile()
+        profiler.runcall(self._run_with_leases, suite, leaves, leases, None)
+        profiler.dump_stats(path)
+        logger.info("Saved the profile of %s to %s" % (suite.name, path))
+        return usage
+
+    @staticmethod
+    def _run_with_leases(
+        suite: qc.Suite,
+        leaves: list[DataStream],
+        leases: _StreamLeases,
+        on_test_done: t.Optional[t.Callable[[], None]],
+    ) -> tuple[list[qc.Result], SuiteUsage]:
+        usage = SuiteUsage(suite=suite.name)
+        try:
+            with measure_usage() as usage.setup:
+                leases.load(leaves)
+            return run_suite(suite, on_test_done, usage), usage
+        finally:
+            leases.release(leaves)
+
+    def _make_executor(self) -> Executor:
+        if self.executor == "process":
+            return ProcessPoolExecutor(self.max_workers, mp_context=multiprocessing.get_context("spawn"))
+        max_workers = self.max_workers
+        if self.trace_memory and max_workers > 1:
+            # every step resets the peak of the process, which would hide the peaks of the steps of other threads
+            logger.warning("Memory is traced, running the QC suites one at a time instead of %d." % max_workers)
+            max_workers = 1
+        return ThreadPoolExecutor(max_workers, thread_name_prefix="qc")
@@ -5,6 +5,13 @@ from contraqctor import contract, qc
 from contraqctor.contract.harp import HarpDevice
 
 from ..rig import AindDynamicForagingRig
+from .cache import QcResultCache
+from .camera_timing import CameraFrameTimingQcSuite
+from .camera_video import CameraVideoQcSuite
+from .command_latency import HarpCommandLatencyQcSuite
+from .runner import ExecutorKind, ParallelRunner, leaf_streams
+from .trial_timing import TrialTimingQcSuite
+from .water import WaterDeliveryQcSuite
 
 
 class DynamicForagingQcSuite(qc.Suite):
@@ -26,20 +33,32 @@ class DynamicForagingQcSuite(qc.Suite):
             return self.pass_test(None, "EndSession event exists with data.")
 
 
-def make_qc_runner(dataset: contract.Dataset) -> qc.Runner:
-    _runner = qc.Runner()
-    dataset.load_all(strict=False)
-    exclude: list[contract.DataStream] = []
+def make_qc_runner(
+    dataset: contract.Dataset,
+    max_workers: int = 1,
+    executor: ExecutorKind = "thread",
+    cache: t.Optional[QcResultCache] = None,
+    trace_memory: bool = False,
+) -> ParallelRunner:
+    """Build the QC runner of a session.
+
+    No stream data is read here. Every suite declares the streams it reads, which are read when
+    the suite starts and cleared once no pending suite needs them, and the streams whose files it
+    reads directly, which only key the result cache.
+
+    Args:
+        dataset (contract.Dataset): The dataset of the session.
+        max_workers (int): Number of suites to run concurrently. With 1, suites run serially.
+        executor (ExecutorKind): Whether concurrent suites run on a "thread" or a "process" pool.
+        cache (Optional[QcResultCache]): Cache of suite results from previous runs.
+        trace_memory (bool): Whether to measure the peak memory of every test, see `ParallelRunner`.
+
+    Returns:
+        ParallelRunner: The runner with every suite of the session.
+    """
+    _runner = ParallelRunner(max_workers=max_workers, executor=executor, cache=cache, trace_memory=trace_memory)
     rig: AindDynamicForagingRig = dataset["Behavior"]["InputSchemas"]["Rig"].data
 
-    # Exclude commands to Harp boards as these are tested separately
-    for cmd in dataset["Behavior"]["HarpCommands"]:
-        if cmd.has_error:
-            continue
-        for stream in cmd:
-            if isinstance(stream, contract.harp.HarpRegister):
-                exclude.append(stream)
-
     # Add harp board specific tests
     exclude_streams: list[str] = []
     if not rig.harp_sniff_detector:
@@ -54,36 +73,86 @@ def make_qc_runner(dataset: contract.Dataset) -> qc.Runner:
     if not rig.harp_lickometer_left:
         exclude_streams.append("HarpLickometerLeft")
 
+    # Only the structure of the streams is read here, their data is read by the suites that declare them
+    harp_devices = [
+        stream
+        for stream in dataset["Behavior"]
+        if isinstance(stream, HarpDevice) and stream.name not in exclude_streams
+    ]
+
     # Add Harp tests for ALL Harp devices in the dataset
-    for stream in (_r := dataset["Behavior"]):
-        if isinstance(stream, HarpDevice) and stream.name not in exclude_streams:
-            commands = t.cast(HarpDevice, _r["HarpCommands"][stream.name])
-            _runner.add_suite(qc.harp.HarpDeviceTestSuite(stream, commands), stream.name)
+    for device in harp_devices:
+        # Commands to Harp boards are tested with their device, not on their own
+        commands = t.cast(HarpDevice, dataset["Behavior"]["HarpCommands"][device.name])
+        _runner.add_suite(qc.harp.HarpDeviceTestSuite(device, commands), device.name, streams=[device, commands])
 
-    # Add Harp Hub tests
+    # Add Harp Hub tests, which only read the clock configuration and operation control registers
+    clock_generator = dataset["Behavior"]["HarpClockGenerator"]
     _runner.add_suite(
-        qc.harp.HarpHubTestSuite(
-            dataset["Behavior"]["HarpClockGenerator"],
-            [
-                harp_device
-                for harp_device in dataset["Behavior"]
-                if isinstance(harp_device, HarpDevice) and harp_device.name not in exclude_streams
-            ],
-        ),
+        qc.harp.HarpHubTestSuite(clock_generator, harp_devices),
         "HarpHub",
+        streams=[
+            stream
+            for device in [clock_generator, *harp_devices]
+            for stream in leaf_streams(device)
+            if stream.name in ("ClockConfiguration", "OperationControl")
+        ],
+    )
+
+    # Pairs the commands of every device with their replies from the message index of the register files
+    _runner.add_suite(
+        HarpCommandLatencyQcSuite(dataset),
+        "HarpCommands",
+        file_streams=[
+            dataset["Behavior"]["HarpCommands"],
+            *(stream for stream in dataset["Behavior"] if isinstance(stream, HarpDevice)),
+        ],
     )
 
     # Add camera qc
+    # every triggered camera is triggered by the Camera1 output of the behavior board
+    triggers = next(
+        (stream for stream in leaf_streams(dataset["Behavior"]["HarpBehavior"]) if stream.name == "Camera1Frame"),
+        None,
+    )
+    # the camera metadata is streamed in chunks and the video opened from its file, neither through the stream
     for camera in dataset["BehaviorVideos"]:
+        camera_triggers = triggers if camera.name in rig.triggered_camera_controller.cameras else None
         _runner.add_suite(
-            qc.camera.CameraTestSuite(camera, expected_fps=rig.triggered_camera_controller.frame_rate), camera.name
+            CameraFrameTimingQcSuite(
+                camera,
+                expected_fps=rig.triggered_camera_controller.frame_rate,
+                triggers=camera_triggers,
+            ),
+            camera.name,
+            file_streams=[camera] if camera_triggers is None else [camera, camera_triggers],
         )
+        _runner.add_suite(CameraVideoQcSuite(camera), camera.name, file_streams=[camera])
 
     # Add Csv tests
-    csv_streams = [stream for stream in dataset.iter_all() if isinstance(stream, contract.csv.Csv)]
+    csv_streams = [
+        stream
+        for root in [
+            *harp_devices,
+            *(dataset["Behavior"]["HarpCommands"][device.name] for device in harp_devices),
+            dataset["Behavior"]["SoftwareEvents"]["EndSession"],
+            dataset["BehaviorVideos"],
+        ]
+        for stream in leaf_streams(root)
+        if isinstance(stream, contract.csv.Csv)
+    ]
     for stream in csv_streams:
-        _runner.add_suite(qc.csv.CsvTestSuite(stream), stream.name)
+        _runner.add_suite(qc.csv.CsvTestSuite(stream), stream.name, streams=[stream])
 
     # Add the task specific tests
-    _runner.add_suite(DynamicForagingQcSuite(dataset), "DynamicForaging")
+    _runner.add_suite(
+        DynamicForagingQcSuite(dataset),
+        "DynamicForaging",
+        streams=[dataset["Behavior"]["SoftwareEvents"]["EndSession"]],
+    )
+    # read the rig through its stream, and the software events and Harp messages from their files
+    task_files = [dataset["Behavior"]["SoftwareEvents"], *harp_devices]
+    rig_stream = dataset["Behavior"]["InputSchemas"]["Rig"]
+    _runner.add_suite(TrialTimingQcSuite(dataset), "DynamicForaging", streams=[rig_stream], file_streams=task_files)
+    _runner.add_suite(WaterDeliveryQcSuite(dataset), "DynamicForaging", streams=[rig_stream], file_streams=task_files)
     return _runner
@@ -0,0 +1,182 @@
+import typing as t
+
+import numpy as np
+import pandas as pd
+from contraqctor import contract, qc
+
+from ..data_contract._trial_table import count_trial_events, make_trial_table
+from ..data_contract.licks import get_lick_times
+
+# largest difference between a logged duration and its trial parameter, in seconds
+DEFAULT_TIMING_TOLERANCE = 0.05
+
+# number of offending trials listed in test messages
+_MAX_LISTED_TRIALS = 10
+
+# trial events in the order the task engine emits them
+_EVENT_ORDER = [
+    "quiescent_period_start",
+    "response_period_start",
+    "response_time",
+    "reward_consumption_period_start",
+    "outcome_time",
+    "iti_period_start",
+    "trial_end",
+]
+
+
+class TrialTimingQcSuite(qc.Suite):
+    """Checks the timing of the task engine against the parameters of each trial.
+
+    The whole session is checked at once from the trial table, so the suite runs in a few
+    vectorized passes regardless of the number of trials.
+    """
+
+    def __init__(self, dataset: contract.Dataset, tolerance: float = DEFAULT_TIMING_TOLERANCE):
+        """Initialize the suite.
+
+        Args:
+            dataset (contract.Dataset): The dataset of the session.
+            tolerance (float): Largest difference between a logged duration and its trial parameter, in seconds.
+        """
+        self.dataset = dataset
+        self.tolerance = tolerance
+
+    def setup_suite(self) -> None:
+        self._trials = make_trial_table(self.dataset)
+        self._counts = count_trial_events(self.dataset)
+        self._licks: t.Optional[np.ndarray] = None
+        self._licks_error: t.Optional[str] = None
+        try:
+            self._licks = np.sort(np.concatenate(list(get_lick_times(self.dataset).values())))
+        except Exception as e:
+            self._licks_error = str(e)
+
+    def test_period_events_complete(self):
+        """Check that every trial has one start event per period and at most one response."""
+        counts = self._counts
+        responded = self._trials["is_right_choice"].notna()
+        invalid = (
+            (counts[["quiescent_period", "response_period", "iti_period"]] != 1).any(axis=1)
+            | (counts[["response", "reward_consumption_period"]] > 1).any(axis=1)
+            | (responded & ((counts["response"] == 0) | (counts["reward_consumption_period"] == 0)))
+        )
+        if invalid.any():
+            return self.fail_test(
+                counts[invalid],
+                "%d trial(s) have missing or repeated period events: %s" % (invalid.sum(), _list_trials(invalid)),
+            )
+        return self.pass_test(None, "All %d trials have their period events." % len(counts))
+
+    def test_period_events_monotonic(self):
+        """Check that the events of every trial occur in the order emitted by the task engine."""
+        times = self._trials[_EVENT_ORDER].to_numpy(dtype=float)
+        # missing events are skipped by comparing each event with the latest known one
+        previous = pd.DataFrame(times).ffill(axis=1).to_numpy()
+        invalid = pd.Series((times[:, 1:] < previous[:, :-1]).any(axis=1), index=self._trials.index)
+        if invalid.any():
+            return self.fail_test(
+                self._trials.loc[invalid, _EVENT_ORDER],
+                "Events of %d trial(s) are out of order: %s" % (invalid.sum(), _list_trials(invalid)),
+            )
+        return self.pass_test(None, "Events of all trials are in order.")
+
+    def test_quiescence_duration(self):
+        """Check that no response period starts before the quiescence period duration elapsed."""
+        duration = self._trials["response_period_start"] - self._trials["quiescent_period_start"]
+        too_short = duration < self._trials["quiescence_period_duration"] - self.tolerance
+        if too_short.any():
+            return self.fail_test(
+                duration[too_short],
+                "Quiescence of %d trial(s) is shorter than specified: %s" % (too_short.sum(), _list_trials(too_short)),
+            )
+        return self.pass_test(None, "Quiescence periods last at least their specified duration.")
+
+    def test_quiescence_resets_match_licks(self):
+        """Check that each response period starts the quiescence duration after the last lick before it."""
+        if self._licks is None:
+            return self.skip_test("Licks could not be read: %s" % self._licks_error)
+        start = self._trials["quiescent_period_start"].to_numpy(dtype=float)
+        end = self._trials["response_period_start"].to_numpy(dtype=float)
+        # each lick resets the quiescence timer, so the period ends a full duration after the last one
+        last = np.searchsorted(self._licks, end, side="left") - 1
+        last_lick = np.where(last >= 0, self._licks[np.maximum(last, 0)], -np.inf)
+        expected = np.maximum(start, last_lick) + self._trials["quiescence_period_duration"].to_numpy(dtype=float)
+        error = pd.Series(end - expected, index=self._trials.index)
+        invalid = error.abs() > self.tolerance
+        if invalid.any():
+            return self.fail_test(
+                error[invalid],
+                "Response periods of %d trial(s) do not start a quiescence duration after the last lick: %s"
+                % (invalid.sum(), _list_trials(invalid)),
+            )
+        return self.pass_test(None, "Quiescence resets match the licks.")
+
+    def test_response_window_duration(self):
+        """Check that responses occur within the response deadline, and that the deadline elapses without one."""
+        latency = self._trials["response_latency"]
+        deadline = self._trials["response_deadline_duration"]
+        responded = self._trials["is_right_choice"].notna()
+        late = responded & (latency > deadline + self.tolerance)
+        # trials without a choice end their response period when the deadline elapses
+        timed_out = ~responded & latency.notna() & ((latency - deadline).abs() > self.tolerance)
+        invalid = late | timed_out
+        if invalid.any():
+            return self.fail_test(
+                latency[invalid],
+                "Response windows of %d trial(s) do not match the response deadline: %s"
+                % (invalid.sum(), _list_trials(invalid)),
+            )
+        return self.pass_test(None, "Response windows match the response deadline.")
+
+    def test_iti_duration(self):
+        """Check that each inter-trial interval lasts its specified duration."""
+        duration = self._trials["trial_end"] - self._trials["iti_period_start"]
+        error = duration - self._trials["inter_trial_interval_duration"]
+        too_short = error < -self.tolerance
+        if too_short.any():
+            return self.fail_test(
+                duration[too_short],
+                "ITI of %d trial(s) is shorter than specified: %s" % (too_short.sum(), _list_trials(too_short)),
+            )
+        # the next trial is generated during the ITI, a slow generation delays it
+        too_long = error > self.tolerance
+        if too_long.any():
+            return self.warn_test(
+                duration[too_long],
+                "ITI of %d trial(s) is longer than specified: %s" % (too_long.sum(), _list_trials(too_long)),
+            )
+        return self.pass_test(None, "ITIs match their specified duration.")
+
+    def test_auto_reward_valve_writes(self):
+        """Check that every auto reward trial opened the valve of its side."""
+        is_auto_reward_right = self._trials.get("is_auto_reward_right")
+        if is_auto_reward_right is None or is_auto_reward_right.isna().all():
+            return self.skip_test("No auto reward trials.")
+        try:
+            writes = self.dataset["Behavior"]["HarpBehavior"]["OutputSet"].read_messages(message_type="WRITE")
+        except Exception as e:
+            return self.skip_test("Valve writes could not be read: %s" % e)
+
+        start = self._trials["response_period_start"].to_numpy(dtype=float) - self.tolerance
+        end = self._trials["trial_end"].fillna(np.inf).to_numpy(dtype=float)
+        missing = pd.Series(False, index=self._trials.index)
+        for is_right, port in ((False, "SupplyPort0"), (True, "SupplyPort1")):
+            times = np.sort(writes.index[writes[port].fillna(False).astype(bool)].to_numpy(dtype=float))
+            # number of writes within each trial, from the response period start to the trial end
+            n_writes = np.searchsorted(times, end, side="left") - np.searchsorted(times, start, side="left")
+            missing |= (is_auto_reward_right == is_right).fillna(False).astype(bool) & (n_writes == 0)
+        if missing.any():
+            return self.fail_test(
+                self._trials.loc[missing, ["response_period_start", "is_auto_reward_right"]],
+                "%d auto reward trial(s) have no valve write: %s" % (missing.sum(), _list_trials(missing)),
+            )
+        return self.pass_test(
+            None, "All %d auto reward trials opened their valve." % is_auto_reward_right.notna().sum()
+        )
+
+
+def _list_trials(mask: pd.Series) -> str:
+    trials = mask.index[mask.to_numpy(dtype=bool)]
+    listed = ", ".join(str(trial) for trial in trials[:_MAX_LISTED_TRIALS])
+    return listed + (", ..." if len(trials) > _MAX_LISTED_TRIALS else "")
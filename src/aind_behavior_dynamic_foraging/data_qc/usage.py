@@ -0,0 +1,148 @@
+import contextlib
+import dataclasses
+import json
+import os
+import time
+import tracemalloc
+import typing as t
+from pathlib import Path
+
+# per-thread I/O counters, only available on Linux
+_THREAD_IO_PATH = Path("/proc/thread-self/io")
+
+
+@dataclasses.dataclass
+class ResourceUsage:
+    """Resources used by a step of a QC run.
+
+    Attributes:
+        wall_time: Elapsed time, in seconds.
+        cpu_time: CPU time of the thread running the step, in seconds.
+        bytes_read: Bytes read by the thread through read calls, None where the platform does not report it.
+            Memory-mapped reads are not included.
+        peak_memory: Peak memory allocated above the memory at the start of the step, in bytes, None unless
+            tracemalloc is tracing. Only valid when no other step is measured at the same time in the process.
+    """
+
+    wall_time: float = 0.0
+    cpu_time: float = 0.0
+    bytes_read: t.Optional[int] = None
+    peak_memory: t.Optional[int] = None
+
+    def __add__(self, other: "ResourceUsage") -> "ResourceUsage":
+        return ResourceUsage(
+            wall_time=self.wall_time + other.wall_time,
+            cpu_time=self.cpu_time + other.cpu_time,
+            bytes_read=_combine(self.bytes_read, other.bytes_read, sum),
+            peak_memory=_combine(self.peak_memory, other.peak_memory, max),
+        )
+
+
+@dataclasses.dataclass
+class SuiteUsage:
+    """Resources used by a suite and each of its tests.
+
+    Attributes:
+        suite: Name of the suite.
+        group: Group of the suite in the runner.
+        setup: Resources used to read the declared streams of the suite and to set it up.
+        tests: Resources used by each test, by test name.
+        cached: Whether the results were served from the cache, in which case nothing was measured.
+    """
+
+    suite: str
+    group: t.Optional[str] = None
+    setup: ResourceUsage = dataclasses.field(default_factory=ResourceUsage)
+    tests: dict[str, ResourceUsage] = dataclasses.field(default_factory=dict)
+    cached: bool = False
+
+    @property
+    def total(self) -> ResourceUsage:
+        """Resources used by the suite as a whole."""
+        total = self.setup
+        for usage in self.tests.values():
+            total = total + usage
+        return total
+
+
+@contextlib.contextmanager
+def measure_usage() -> t.Iterator[ResourceUsage]:
+    """Measure the resources used by the thread within the context.
+
+    The tracemalloc peak is reset when the context starts. It is shared by the whole process, so
+    contexts measuring the peak memory must not run at the same time in several threads.
+
+    Yields:
+        ResourceUsage: Filled in when the context exits.
+    """
+    usage = ResourceUsage()
+    tracing = tracemalloc.is_tracing()
+    if tracing:
+        memory_start = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+    bytes_start = _thread_bytes_read()
+    cpu_start = time.thread_time()
+    wall_start = time.perf_counter()
+    try:
+        yield usage
+    finally:
+        usage.wall_time = time.perf_counter() - wall_start
+        usage.cpu_time = time.thread_time() - cpu_start
+        bytes_end = _thread_bytes_read()
+        if bytes_start is not None and bytes_end is not None:
+            usage.bytes_read = bytes_end - bytes_start
+        if tracing and tracemalloc.is_tracing():
+            usage.peak_memory = max(tracemalloc.get_traced_memory()[1] - memory_start, 0)
+
+
+def usage_to_dict(usages: t.Iterable[SuiteUsage]) -> dict[str, t.Any]:
+    """Serialize the usage of a QC run, with the total of each suite.
+
+    Args:
+        usages (Iterable[SuiteUsage]): The usage of each suite.
+
+    Returns:
+        dict[str, Any]: JSON serializable usage, with suites sorted by decreasing wall time.
+    """
+    usages = sorted(usages, key=lambda usage: usage.total.wall_time, reverse=True)
+    return {
+        "suites": [
+            {
+                "suite": usage.suite,
+                "group": usage.group,
+                "cached": usage.cached,
+                "total": dataclasses.asdict(usage.total),
+                "setup": dataclasses.asdict(usage.setup),
+                "tests": {name: dataclasses.asdict(test) for name, test in usage.tests.items()},
+            }
+            for usage in usages
+        ]
+    }
+
+
+def write_usage_report(usages: t.Iterable[SuiteUsage], path: os.PathLike) -> None:
+    """Write the usage of a QC run as JSON, see `usage_to_dict`.
+
+    Args:
+        usages (Iterable[SuiteUsage]): The usage of each suite.
+        path (os.PathLike): Path of the JSON file.
+    """
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(usage_to_dict(usages), file, indent=2)
+
+
+def _thread_bytes_read() -> t.Optional[int]:
+    try:
+        with open(_THREAD_IO_PATH, "r", encoding="ascii") as file:
+            for line in file:
+                if line.startswith("rchar:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def _combine(a: t.Optional[int], b: t.Optional[int], how: t.Callable[[tuple[int, int]], int]) -> t.Optional[int]:
+    if a is None or b is None:
+        return b if a is None else a
+    return how((a, b))
@@ -0,0 +1,82 @@
+import typing as t
+
+from contraqctor import contract, qc
+
+from ..data_contract.water import DEFAULT_VOLUME_TOLERANCE, WaterReconciliation, reconcile_water
+from .trial_timing import _list_trials
+
+
+class WaterDeliveryQcSuite(qc.Suite):
+    """Checks the water delivered by the valves against the rewards of each trial.
+
+    Valve openings are matched to trials and converted to volumes in one vectorized pass,
+    see `reconcile_water`.
+    """
+
+    def __init__(self, dataset: contract.Dataset, tolerance: float = DEFAULT_VOLUME_TOLERANCE):
+        """Initialize the suite.
+
+        Args:
+            dataset (contract.Dataset): The dataset of the session.
+            tolerance (float): Largest relative difference between the volume delivered on a side of a trial
+                and its reward size.
+        """
+        self.dataset = dataset
+        self.tolerance = tolerance
+
+    def setup_suite(self) -> None:
+        self._reconciliation: t.Optional[WaterReconciliation] = None
+        self._error: t.Optional[str] = None
+        try:
+            self._reconciliation = reconcile_water(self.dataset, tolerance=self.tolerance)
+        except FileNotFoundError as e:
+            # sessions without a behavior board or rig skip the tests, other errors are reported by the runner
+            self._error = str(e)
+
+    def test_valve_open_times(self):
+        """Check that the open time of every valve opening was set before it."""
+        if self._reconciliation is None:
+            return self.skip_test("Valve writes could not be read: %s" % self._error)
+        deliveries = self._reconciliation.deliveries
+        unset = deliveries["open_time"].isna()
+        if unset.any():
+            return self.fail_test(
+                deliveries[unset], "%d valve opening(s) happened before their open time was set." % unset.sum()
+            )
+        return self.pass_test(None, "All %d valve openings have an open time." % len(deliveries))
+
+    def test_deliveries_within_trials(self):
+        """Check that the valves only open during trials or to give manual water."""
+        if self._reconciliation is None:
+            return self.skip_test("Valve writes could not be read: %s" % self._error)
+        deliveries = self._reconciliation.deliveries
+        outside = (deliveries["trial"] < 0) & ~deliveries["is_manual"]
+        if outside.any():
+            return self.warn_test(
+                deliveries[outside], "%d valve opening(s) happened before the first trial." % outside.sum()
+            )
+        return self.pass_test(None, "All valve openings happened during trials or gave manual water.")
+
+    def test_trial_water_matches_rewards(self):
+        """Check that every trial delivered the reward size of its rewarded side, and no water otherwise."""
+        if self._reconciliation is None:
+            return self.skip_test("Valve writes could not be read: %s" % self._error)
+        reconciliation = self._reconciliation
+        deliveries = reconciliation.deliveries
+        totals = {
+            "delivered_ml": reconciliation.total_delivered_ml,
+            "expected_ml": reconciliation.total_expected_ml,
+            "manual_ml": float(deliveries.loc[deliveries["is_manual"], "volume_ml"].sum()),
+        }
+        discrepant = reconciliation.trials["is_discrepant"]
+        if discrepant.any():
+            return self.fail_test(
+                reconciliation.discrepancies,
+                "Water delivered in %d trial(s) does not match their reward: %s"
+                % (discrepant.sum(), _list_trials(discrepant)),
+            )
+        return self.pass_test(
+            totals,
+            "Water delivered in all %d trials matches their reward (%.4f mL delivered, %.4f mL of manual water)."
+            % (len(discrepant), totals["delivered_ml"], totals["manual_ml"]),
+        )
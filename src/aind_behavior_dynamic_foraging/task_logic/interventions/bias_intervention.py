@@ -3,6 +3,8 @@ from typing import Optional
 
 from pydantic import BaseModel, Field
 
+from aind_behavior_dynamic_foraging.task_logic.utils.bias_estimators import BiasEstimatorName
+
 logger = logging.getLogger(__name__)
 
 
@@ -18,6 +20,10 @@ class BiasInterventionParameters(BaseModel):
     intervention_interval: int = Field(default=10, ge=0, description="Trials between bias intervention.")
     maximum_water_corrections: int = Field(default=5, ge=0, description="Number of water correction to attempt.")
     bias_window_length: int = Field(default=200, ge=0, description="Trials to calculate bias over.")
+    bias_estimator: BiasEstimatorName = Field(
+        default="logistic_regression",
+        description="Estimator used to calculate bias. Defaults to the Su2022 logistic regression intercept.",
+    )
     lickspout_offset_delta: float = Field(
         default=0.05,
         ge=0,
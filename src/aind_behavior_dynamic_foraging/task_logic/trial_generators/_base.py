@@ -1,10 +1,28 @@
 import abc
-from typing import Protocol
+from typing import Optional, Protocol, TypeAlias
 
+import numpy as np
 from pydantic import BaseModel
 
 from ..trial_models import Trial, TrialMetrics, TrialOutcome
 
+# Seed accepted by trial generators: an integer, a SeedSequence (e.g. a spawned child stream) or None for OS entropy.
+SeedLike: TypeAlias = Optional[int | np.random.SeedSequence]
+
+
+def make_seed_sequence(seed: SeedLike = None) -> np.random.SeedSequence:
+    """Normalize a seed into a `numpy.random.SeedSequence`.
+
+    Args:
+        seed: Integer seed, an existing SeedSequence, or None to draw fresh entropy from the OS.
+
+    Returns:
+        A SeedSequence that can be used to create a Generator or spawn independent child streams.
+    """
+    if isinstance(seed, np.random.SeedSequence):
+        return seed
+    return np.random.SeedSequence(seed)
+
 
 class BaseTrialGeneratorSpecModel(BaseModel, abc.ABC):
     """Base model for trial generator specifications."""
@@ -12,8 +30,13 @@ class BaseTrialGeneratorSpecModel(BaseModel, abc.ABC):
     type: str
 
     @abc.abstractmethod
-    def create_generator(self) -> "ITrialGenerator":
-        """Create a trial generator instance from the specification."""
+    def create_generator(self, seed: SeedLike = None) -> "ITrialGenerator":
+        """Create a trial generator instance from the specification.
+
+        Args:
+            seed: Seed for the random number generator owned by the trial generator.
+                Generators created with the same spec and seed produce identical trial sequences.
+        """
 
 
 class ITrialGenerator(Protocol):
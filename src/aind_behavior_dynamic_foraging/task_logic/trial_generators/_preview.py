@@ -0,0 +1,168 @@
+from dataclasses import dataclass
+from typing import Literal
+
+import numpy as np
+from aind_behavior_services.task.distributions import Distribution
+from aind_behavior_services.task.distributions_utils import draw_samples
+
+_MAX_RESAMPLE_ROUNDS = 100
+
+
+@dataclass(frozen=True)
+class BlockSchedulePreview:
+    """Block schedules sampled from a block based trial generator specification.
+
+    Returned by the `preview_block_schedules` method of the specifications that support previews:
+    `UncoupledTrialGeneratorSpec`, and `BaseCoupledTrialGeneratorSpec` and its subclasses.
+
+    All arrays have shape (n_schedules, n_trials), one row per sampled schedule.
+
+    Attributes:
+        p_left_reward: Block reward probability of the left side on each trial.
+        p_right_reward: Block reward probability of the right side on each trial.
+        is_left_block_start: True on the first trial of each left block.
+        is_right_block_start: True on the first trial of each right block.
+    """
+
+    p_left_reward: np.ndarray
+    p_right_reward: np.ndarray
+    is_left_block_start: np.ndarray
+    is_right_block_start: np.ndarray
+
+    @property
+    def n_schedules(self) -> int:
+        """Number of sampled schedules."""
+        return self.p_left_reward.shape[0]
+
+    @property
+    def n_trials(self) -> int:
+        """Number of trials in each sampled schedule."""
+        return self.p_left_reward.shape[1]
+
+    def n_blocks(self, side: Literal["left", "right"]) -> np.ndarray:
+        """Number of blocks started in each schedule for one side.
+
+        Args:
+            side: Side to count blocks for.
+
+        Returns:
+            Array of shape (n_schedules,) with the number of blocks per schedule.
+        """
+        return self._block_starts(side).sum(axis=1)
+
+    def block_lengths(self, side: Literal["left", "right"]) -> np.ndarray:
+        """Lengths of all completed blocks for one side, pooled across schedules.
+
+        The last block of each schedule is truncated by the preview horizon and is excluded.
+
+        Args:
+            side: Side to compute block lengths for.
+
+        Returns:
+            Flat array with the length (in trials) of every completed block.
+        """
+        rows, trials = np.nonzero(self._block_starts(side))
+        same_schedule = rows[1:] == rows[:-1]
+        return np.diff(trials)[same_schedule]
+
+    def _block_starts(self, side: Literal["left", "right"]) -> np.ndarray:
+        if side == "left":
+            return self.is_left_block_start
+        if side == "right":
+            return self.is_right_block_start
+        raise ValueError("Side %s not recognized." % side)
+
+
+class ScheduleRecorder:
+    """Accumulates block changes of many schedules and expands them into per-trial arrays."""
+
+    def __init__(self, n_schedules: int, n_trials: int) -> None:
+        self.n_trials = n_trials
+        self.is_change = np.zeros((n_schedules, n_trials), dtype=bool)
+        self.is_left_block_start = np.zeros((n_schedules, n_trials), dtype=bool)
+        self.is_right_block_start = np.zeros((n_schedules, n_trials), dtype=bool)
+        self.p_left_reward = np.full((n_schedules, n_trials), np.nan)
+        self.p_right_reward = np.full((n_schedules, n_trials), np.nan)
+
+    def record(
+        self,
+        rows: np.ndarray,
+        trial: np.ndarray,
+        p_left_reward: np.ndarray,
+        p_right_reward: np.ndarray,
+        is_left_block_start: np.ndarray,
+        is_right_block_start: np.ndarray,
+    ) -> None:
+        """Record the block state of the given schedules from the given trial onwards."""
+        in_horizon = trial < self.n_trials
+        rows, trial = rows[in_horizon], trial[in_horizon].astype(int)
+        self.is_change[rows, trial] = True
+        self.p_left_reward[rows, trial] = p_left_reward[in_horizon]
+        self.p_right_reward[rows, trial] = p_right_reward[in_horizon]
+        self.is_left_block_start[rows, trial] = is_left_block_start[in_horizon]
+        self.is_right_block_start[rows, trial] = is_right_block_start[in_horizon]
+
+    def to_preview(self) -> BlockSchedulePreview:
+        """Forward fill the recorded changes into per-trial arrays."""
+        last_change = np.where(self.is_change, np.arange(self.n_trials), 0)
+        np.maximum.accumulate(last_change, axis=1, out=last_change)
+        return BlockSchedulePreview(
+            p_left_reward=np.take_along_axis(self.p_left_reward, last_change, axis=1),
+            p_right_reward=np.take_along_axis(self.p_right_reward, last_change, axis=1),
+            is_left_block_start=self.is_left_block_start,
+            is_right_block_start=self.is_right_block_start,
+        )
+
+
+def draw_samples_vectorized(distribution: Distribution, n: int, rng: np.random.Generator) -> np.ndarray:
+    """Draw many samples from a distribution without per-sample Python work.
+
+    Equivalent in distribution to repeated `draw_sample` calls. Truncation in "exclude"
+    mode is implemented by batched rejection sampling instead of a resampling loop per value.
+
+    Args:
+        distribution: Distribution to sample from.
+        n: Number of samples.
+        rng: Random number generator used for the draws.
+
+    Returns:
+        Array of n samples with scaling and truncation applied.
+    """
+    truncation = distribution.truncation_parameters
+    if truncation is None or truncation.min == truncation.max or truncation.truncation_mode == "clamp":
+        return draw_samples(distribution, n, rng)
+
+    untruncated = distribution.model_copy(update={"truncation_parameters": None})
+    values = np.empty(n)
+    pending = np.arange(n)
+    for _ in range(_MAX_RESAMPLE_ROUNDS):
+        candidates = draw_samples(untruncated, len(pending), rng)
+        is_valid = (candidates >= truncation.min) & (candidates <= truncation.max)
+        values[pending[is_valid]] = candidates[is_valid]
+        pending = pending[~is_valid]
+        if len(pending) == 0:
+            return values
+
+    # mirror draw_sample and fall back to the nearest bound when no valid value is found
+    values[pending] = np.clip(candidates[~is_valid], truncation.min, truncation.max)
+    return values
+
+
+def choose_excluding(previous: np.ndarray, candidates: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    """Uniformly choose one candidate per row, excluding candidates equal to the previous value.
+
+    Rows where every candidate is excluded keep their previous value.
+
+    Args:
+        previous: Array of shape (n,) with the value to exclude for each row.
+        candidates: Array of shape (k,) with candidate values shared by all rows.
+        rng: Random number generator used for the draws.
+
+    Returns:
+        Array of shape (n,) with the chosen values.
+    """
+    allowed = candidates[np.newaxis, :] != previous[:, np.newaxis]
+    cumulative = np.cumsum(allowed, axis=1)
+    threshold = rng.random(len(previous)) * cumulative[:, -1]
+    chosen = np.argmax(cumulative > threshold[:, np.newaxis], axis=1)
+    return np.where(cumulative[:, -1] > 0, candidates[chosen], previous)
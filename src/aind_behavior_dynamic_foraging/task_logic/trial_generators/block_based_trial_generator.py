@@ -18,10 +18,10 @@ from aind_behavior_dynamic_foraging.task_logic.interventions.bias_intervention i
     BiasIntervention,
     BiasInterventionParameters,
 )
-from aind_behavior_dynamic_foraging.task_logic.utils import calculate_bias, calculate_foraging_efficiency
+from aind_behavior_dynamic_foraging.task_logic.utils import calculate_foraging_efficiency, create_bias_estimator
 
 from ..trial_models import Metadata, RewardSize, Trial, TrialMetrics
-from ._base import BaseTrialGeneratorSpecModel, ITrialGenerator, TrialOutcome
+from ._base import BaseTrialGeneratorSpecModel, ITrialGenerator, SeedLike, TrialOutcome, make_seed_sequence
 
 logger = logging.getLogger(__name__)
 
@@ -139,6 +139,7 @@ class BlockBasedTrialGenerator(ITrialGenerator, ABC):
 
     Attributes:
         spec: The specification used to configure this generator.
+        rng: Random number generator owning all random draws of this generator.
         is_right_choice_history: Record of whether each trial was a right choice.
             None indicates no choice was made (e.g. missed trial).
         reward_history: Record of whether each trial resulted in a reward.
@@ -149,14 +150,16 @@ class BlockBasedTrialGenerator(ITrialGenerator, ABC):
         bias: bias of session. Negative values correspond to left bias, positive right.
     """
 
-    def __init__(self, spec: BlockBasedTrialGeneratorSpec) -> None:
+    def __init__(self, spec: BlockBasedTrialGeneratorSpec, seed: SeedLike = None) -> None:
         """Initializes the generator and generates the first block.
 
         Args:
             spec: The BlockBasedTrialGenerator defining task parameters.
+            seed: Seed for the generator's random number generator. If None, fresh OS entropy is used.
         """
 
         self.spec = spec
+        self.rng = np.random.default_rng(make_seed_sequence(seed))
         self.start_time = datetime.datetime.now()
         self.outcome_history: list[TrialOutcome] = []
         self.is_right_choice_history: list[bool | None] = []
@@ -167,6 +170,8 @@ class BlockBasedTrialGenerator(ITrialGenerator, ABC):
 
         self.bias: float = np.nan
         self.bias_intervention = BiasIntervention(self.spec.bias_intervention_parameters)
+        bias_parameters = self.spec.bias_intervention_parameters or BiasInterventionParameters()
+        self.bias_estimator = create_bias_estimator(bias_parameters.bias_estimator, bias_parameters.bias_window_length)
 
     def update(self, outcome: TrialOutcome | str):
         """Updates generator state from the previous trial outcome. Records choice and reward history and manages baiting state.
@@ -192,7 +197,7 @@ class BlockBasedTrialGenerator(ITrialGenerator, ABC):
                 # trial ignored so current baiting state retained
                 pass
 
-        self.bias = calculate_bias(outcomes=self.outcome_history)
+        self.bias = self.bias_estimator.update(outcome)
 
     def next(self) -> Trial | None:
         """Generates the next trial in the session.
@@ -211,12 +216,12 @@ class BlockBasedTrialGenerator(ITrialGenerator, ABC):
             return
 
         # determine iti and quiescent period duration
-        iti = draw_sample(self.spec.inter_trial_interval_duration)
-        quiescent = draw_sample(self.spec.quiescent_duration)
+        iti = draw_sample(self.spec.inter_trial_interval_duration, self.rng)
+        quiescent = draw_sample(self.spec.quiescent_duration, self.rng)
 
         # determine baiting
         if self.spec.is_baiting:
-            random_numbers = np.random.random(2)
+            random_numbers = self.rng.random(2)
 
             self.is_left_baited = self.block.p_left_reward > random_numbers[0] or self.is_left_baited
             logger.debug("Left baited: %s" % self.is_left_baited)
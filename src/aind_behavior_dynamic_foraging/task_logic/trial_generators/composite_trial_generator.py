@@ -3,7 +3,7 @@ from typing import Generic, Literal, TypeVar
 from pydantic import Field, SerializeAsAny
 
 from ..trial_models import Trial, TrialOutcome
-from ._base import BaseTrialGeneratorSpecModel, ITrialGenerator
+from ._base import BaseTrialGeneratorSpecModel, ITrialGenerator, SeedLike, make_seed_sequence
 
 _TSpec = TypeVar("_TSpec", bound=BaseTrialGeneratorSpecModel, covariant=True)
 
@@ -19,8 +19,8 @@ class TrialGeneratorCompositeSpec(BaseTrialGeneratorSpecModel, Generic[_TSpec]):
         min_length=1,
     )
 
-    def create_generator(self) -> "TrialGeneratorComposite":
-        return TrialGeneratorComposite(self)
+    def create_generator(self, seed: SeedLike = None) -> "TrialGeneratorComposite":
+        return TrialGeneratorComposite(self, seed)
 
 
 class TrialGeneratorComposite(ITrialGenerator):
@@ -28,17 +28,22 @@ class TrialGeneratorComposite(ITrialGenerator):
     A composite trial generator that concatenates multiple trial generators.
 
     When the current generator's next() method returns None, the composite
-    automatically moves to the next generator in the list.
+    automatically moves to the next generator in the list. Each child generator
+    receives its own independent random stream spawned from the composite seed.
     """
 
-    def __init__(self, spec: TrialGeneratorCompositeSpec[BaseTrialGeneratorSpecModel]) -> None:
+    def __init__(self, spec: TrialGeneratorCompositeSpec[BaseTrialGeneratorSpecModel], seed: SeedLike = None) -> None:
         """
         Initialize the composite trial generator.
 
         :param spec: The specification containing the list of generator specs
+        :param seed: Seed from which independent child streams are spawned, one per generator
         """
         self._spec = spec
-        self._generators: list[ITrialGenerator] = [gen_spec.create_generator() for gen_spec in spec.generators]
+        child_seeds = make_seed_sequence(seed).spawn(len(spec.generators))
+        self._generators: list[ITrialGenerator] = [
+            gen_spec.create_generator(child_seed) for gen_spec, child_seed in zip(spec.generators, child_seeds)
+        ]
         self._current_index = 0
 
     def next(self) -> Trial | None:
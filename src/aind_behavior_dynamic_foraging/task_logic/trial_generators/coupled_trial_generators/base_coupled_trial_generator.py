@@ -1,5 +1,4 @@
 import logging
-import random
 from typing import Annotated, List, Literal, Optional
 
 import numpy as np
@@ -8,6 +7,8 @@ from aind_behavior_services.task.distributions_utils import draw_sample
 from pydantic import BaseModel, Field
 
 from ...trial_models import TrialOutcome
+from .._base import SeedLike, make_seed_sequence
+from .._preview import BlockSchedulePreview, ScheduleRecorder, draw_samples_vectorized
 from ..block_based_trial_generator import Block, BlockBasedTrialGenerator, BlockBasedTrialGeneratorSpec
 
 logger = logging.getLogger(__name__)
@@ -49,26 +50,96 @@ class BaseCoupledTrialGeneratorSpec(BlockBasedTrialGeneratorSpec):
         validate_default=True,
     )
 
-    def create_generator(self) -> "BaseCoupledTrialGenerator":
-        return BaseCoupledTrialGenerator(self)
+    def create_generator(self, seed: SeedLike = None) -> "BaseCoupledTrialGenerator":
+        return BaseCoupledTrialGenerator(self, seed)
+
+    def preview_block_schedules(
+        self, n_schedules: int = 1000, n_trials: int = 1000, seed: SeedLike = None
+    ) -> BlockSchedulePreview:
+        """Sample many block schedules implied by this specification in one vectorized call.
+
+        Assumes a behavior model where block switches are never gated by behavior, i.e.
+        every block ends exactly when its sampled length is reached. Next blocks follow the
+        same exclusion rules as `BaseCoupledTrialGenerator._generate_next_block`.
+
+        Args:
+            n_schedules: Number of independent schedules to sample.
+            n_trials: Number of trials in each schedule.
+            seed: Seed for the random number generator used for sampling.
+
+        Returns:
+            The sampled block schedules.
+
+        Raises:
+            ValueError: If a block in the reward probability pool has no valid next block.
+        """
+        rng = np.random.default_rng(make_seed_sequence(seed))
+        pool = _reward_probability_pool(
+            self.reward_probability_parameters.reward_pairs, self.reward_probability_parameters.base_reward_sum
+        )
+
+        # transition[i, j] is True if block j may follow block i
+        high_is_right = pool[:, 0] > pool[:, 1]
+        is_different = np.any(pool[:, np.newaxis, :] != pool[np.newaxis, :, :], axis=2)
+        switches_high_side = (high_is_right[:, np.newaxis] != high_is_right[np.newaxis, :]) | (
+            pool[:, 0] == pool[:, 1]
+        )[:, np.newaxis]
+        transition = is_different & switches_high_side
+        n_candidates = transition.sum(axis=1)
+        if np.any(n_candidates == 0):
+            raise ValueError("No valid next block for reward probabilities %s." % pool[n_candidates == 0].tolist())
+        cumulative = np.cumsum(transition, axis=1)
+
+        recorder = ScheduleRecorder(n_schedules, n_trials)
+        rows = np.arange(n_schedules)
+        block = rng.integers(len(pool), size=n_schedules)
+        block_start = np.zeros(n_schedules, dtype=int)
+        while rows.size > 0:
+            is_start = np.ones(rows.size, dtype=bool)
+            recorder.record(rows, block_start, pool[block, 1], pool[block, 0], is_start, is_start)
+
+            # a block always lasts at least one trial since the switch is evaluated after each update
+            block_length = np.floor(draw_samples_vectorized(self.block_length, rows.size, rng))
+            block_start = block_start + np.maximum(block_length, 1).astype(int)
+
+            is_active = block_start < n_trials
+            rows, block, block_start = rows[is_active], block[is_active], block_start[is_active]
+            threshold = rng.random(rows.size) * n_candidates[block]
+            block = np.argmax(cumulative[block] > threshold[:, np.newaxis], axis=1)
+
+        return recorder.to_preview()
+
+
+def _reward_probability_pool(reward_pairs: list[list[float]], base_reward_sum: float) -> np.ndarray:
+    """Normalize reward pairs by base_reward_sum and mirror them into the pool of candidate blocks.
+
+    Returns:
+        Array of unique (p_right_reward, p_left_reward) rows.
+    """
+    reward_prob = np.array(reward_pairs, dtype=float)
+    reward_prob /= reward_prob.sum(axis=1, keepdims=True)
+    reward_prob *= float(base_reward_sum)
+    return np.unique(np.vstack([reward_prob, np.fliplr(reward_prob)]), axis=0)
 
 
 class BaseCoupledTrialGenerator(BlockBasedTrialGenerator):
     spec: BaseCoupledTrialGeneratorSpec
 
-    def __init__(self, spec: BaseCoupledTrialGeneratorSpec) -> None:
+    def __init__(self, spec: BaseCoupledTrialGeneratorSpec, seed: SeedLike = None) -> None:
         """Initializes the generator and generates the first block.
 
         Args:
             spec: The BaseCoupledTrialGeneratorSpec defining task parameters.
+            seed: Seed for the generator's random number generator. If None, fresh OS entropy is used.
         """
 
-        super().__init__(spec)
+        super().__init__(spec, seed)
 
         self.block: Block = self._generate_next_block(
             reward_pairs=self.spec.reward_probability_parameters.reward_pairs,
             base_reward_sum=self.spec.reward_probability_parameters.base_reward_sum,
             block_length=self.spec.block_length,
+            rng=self.rng,
         )
         self.p_right_reward = self.block.p_right_reward
         self.p_left_reward = self.block.p_left_reward
@@ -94,6 +165,7 @@ class BaseCoupledTrialGenerator(BlockBasedTrialGenerator):
                 base_reward_sum=self.spec.reward_probability_parameters.base_reward_sum,
                 current_block=self.block,
                 block_length=self.spec.block_length,
+                rng=self.rng,
             )
             self.block_history.append(self.block)
 
@@ -103,6 +175,7 @@ class BaseCoupledTrialGenerator(BlockBasedTrialGenerator):
         base_reward_sum: float,
         block_length: Distribution,
         current_block: Optional[Block] = None,
+        rng: Optional[np.random.Generator] = None,
     ) -> Block:
         """Generates the next block, avoiding repeating the current block's side bias.
 
@@ -116,12 +189,14 @@ class BaseCoupledTrialGenerator(BlockBasedTrialGenerator):
             block_length: Distribution from which to sample the next block length.
             current_block: The currently active block, used to avoid repeating the
                 same reward probabilities or high-reward side. Defaults to None.
+            rng: Random number generator used for the draws. Defaults to a freshly seeded generator.
 
         Returns:
             A new Block with sampled reward probabilities and length.
         """
 
         logger.info("Generating next block.")
+        rng = rng if rng is not None else np.random.default_rng()
 
         # determine candidate reward pairs
         reward_prob = np.array(reward_pairs, dtype=float)
@@ -152,11 +227,11 @@ class BaseCoupledTrialGenerator(BlockBasedTrialGenerator):
         logger.debug("Final reward probability pool after removing duplicates: %s" % reward_prob_pool.tolist())
 
         # randomly pick next block reward probability
-        p_right_reward, p_left_reward = reward_prob_pool[random.choice(range(reward_prob_pool.shape[0]))]
+        p_right_reward, p_left_reward = reward_prob_pool[rng.integers(reward_prob_pool.shape[0])]
         logger.info("Selected next block reward probabilities: right=%s, left=%s" % (p_right_reward, p_left_reward))
 
         # randomly pick block length
-        next_block_length = np.floor(draw_sample(block_length))
+        next_block_length = np.floor(draw_sample(block_length, rng))
         logger.info("Selected next block length: %s" % next_block_length)
 
         return Block(
@@ -5,6 +5,7 @@ from typing import Literal, Optional
 import numpy as np
 from pydantic import BaseModel, Field
 
+from .._base import SeedLike
 from ..block_based_trial_generator import (
     BlockBasedTrialMetadata,
 )
@@ -79,8 +80,8 @@ class CoupledTrialGeneratorSpec(BaseCoupledTrialGeneratorSpec):
 
     kernel_size: int = Field(default=2, description="Kernel to evaluate choice fraction.")
 
-    def create_generator(self) -> "CoupledTrialGenerator":
-        return CoupledTrialGenerator(self)
+    def create_generator(self, seed: SeedLike = None) -> "CoupledTrialGenerator":
+        return CoupledTrialGenerator(self, seed)
 
 
 class CoupledTrialGenerator(BaseCoupledTrialGenerator):
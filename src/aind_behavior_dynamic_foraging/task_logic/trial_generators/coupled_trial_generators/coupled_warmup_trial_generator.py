@@ -4,6 +4,7 @@ from typing import Literal
 from aind_behavior_services.task.distributions import Distribution, Scalar, ScalarDistributionParameter
 from pydantic import BaseModel, Field
 
+from .._base import SeedLike
 from .base_coupled_trial_generator import (
     BaseCoupledTrialGenerator,
     BaseCoupledTrialGeneratorSpec,
@@ -48,8 +49,8 @@ class CoupledWarmupTrialGeneratorSpec(BaseCoupledTrialGeneratorSpec):
 
     min_block_reward: int = Field(default=1, ge=0, title="Minimal rewards in a block to switch")
 
-    def create_generator(self) -> "CoupledWarmupTrialGenerator":
-        return CoupledWarmupTrialGenerator(self)
+    def create_generator(self, seed: SeedLike = None) -> "CoupledWarmupTrialGenerator":
+        return CoupledWarmupTrialGenerator(self, seed)
 
 
 class CoupledWarmupTrialGenerator(BaseCoupledTrialGenerator):
@@ -3,13 +3,14 @@ from typing import Literal
 from aind_behavior_services.task import distributions
 
 from ..trial_models import QuickRetractSettings, Trial, TrialOutcome
-from ._base import BaseTrialGeneratorSpecModel, ITrialGenerator
+from ._base import BaseTrialGeneratorSpecModel, ITrialGenerator, SeedLike
 
 
 class IntegrationTestTrialGeneratorSpec(BaseTrialGeneratorSpecModel):
     type: Literal["IntegrationTestTrialGenerator"] = "IntegrationTestTrialGenerator"
 
-    def create_generator(self) -> "IntegrationTestTrialGenerator":
+    def create_generator(self, seed: SeedLike = None) -> "IntegrationTestTrialGenerator":
+        # The integration test sequence is deterministic, the seed is accepted for interface compatibility.
         return IntegrationTestTrialGenerator(self)
 
 
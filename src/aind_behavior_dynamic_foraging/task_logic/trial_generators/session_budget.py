@@ -0,0 +1,119 @@
+import logging
+from typing import Optional
+
+import numpy as np
+from pydantic import BaseModel, Field
+
+from ..utils.distribution_moments import distribution_moments
+from .block_based_trial_generator import BlockBasedTrialGeneratorSpec
+from .coupled_trial_generators.base_coupled_trial_generator import BaseCoupledTrialGeneratorSpec
+from .coupled_trial_generators.coupled_trial_generator import CoupledTrialGenerationEndConditions
+from .uncoupled_trial_gnerator import UncoupledTrialGenerationEndConditions, UncoupledTrialGeneratorSpec
+
+logger = logging.getLogger(__name__)
+
+
+class SessionBudget(BaseModel):
+    """Expected session budget implied by a block based trial generator specification."""
+
+    trial_duration: float = Field(description="Expected duration of a single trial (in seconds).")
+    trial_duration_std: float = Field(description="Standard deviation of the duration of a single trial (in seconds).")
+    session_duration: float = Field(description="Expected session duration (in seconds).")
+    trial_count: float = Field(description="Expected number of trials in session.")
+    reward_count: float = Field(description="Expected number of rewarded trials in session.")
+    water_volume: float = Field(description="Expected water earned in session (in uL).")
+
+
+def estimate_session_budget(
+    spec: BlockBasedTrialGeneratorSpec,
+    response_rate: float = 1.0,
+    response_latency: float = 0.0,
+    reward_rate: Optional[float] = None,
+    session_duration: Optional[float] = None,
+) -> SessionBudget:
+    """
+    Estimate the expected trial duration, trial count and water volume of a session without simulation.
+
+    A trial is modeled as quiescence period, response period and, if a response is made,
+    reward consumption, followed by the inter-trial interval. Period durations use the
+    analytic moments of the spec distributions. The session ends at the first of the
+    maximum trial count, the maximum time, or the minimum time if the expected fraction of
+    ignored trials reaches the ignore threshold. The defaults describe a subject that
+    responds immediately on every trial, which bounds the trial count from above.
+
+    Licks during the quiescence period, autowater and bias interventions are not modeled.
+
+    Args:
+        spec (BlockBasedTrialGeneratorSpec): Trial generator specification to evaluate.
+        response_rate (float): Fraction of trials with a response.
+        response_latency (float): Mean time from go cue to response (in seconds).
+        reward_rate (float, optional): Fraction of responses that are rewarded. Defaults to the
+            reward rate of a subject choosing sides at random, without baiting.
+        session_duration (float, optional): Session duration (in seconds). Defaults to the maximum
+            time of the spec end conditions and is required for specs without a time limit.
+
+    Returns:
+        SessionBudget: The expected session budget.
+
+    Raises:
+        ValueError: If an argument is out of range, or if the reward rate or session duration
+            cannot be derived from the spec.
+    """
+    if not 0 <= response_rate <= 1:
+        raise ValueError("Response rate must be within [0, 1], got %s." % response_rate)
+    if not 0 <= response_latency <= spec.response_duration:
+        raise ValueError("Response latency must be within the response duration, got %s." % response_latency)
+    reward_rate = _chance_reward_rate(spec) if reward_rate is None else reward_rate
+    if not 0 <= reward_rate <= 1:
+        raise ValueError("Reward rate must be within [0, 1], got %s." % reward_rate)
+
+    quiescence_mean, quiescence_var = distribution_moments(spec.quiescent_duration)
+    iti_mean, iti_var = distribution_moments(spec.inter_trial_interval_duration)
+
+    # responded and ignored trials differ only in the response and consumption periods
+    responded = response_latency + spec.reward_consumption_duration
+    ignored = spec.response_duration
+    response_mean = response_rate * responded + (1 - response_rate) * ignored
+    response_var = response_rate * (1 - response_rate) * (responded - ignored) ** 2
+
+    trial_duration = quiescence_mean + response_mean + iti_mean
+    trial_duration_std = float(np.sqrt(quiescence_var + response_var + iti_var))
+
+    end_conditions = getattr(spec, "trial_generation_end_parameters", None)
+    has_limits = isinstance(
+        end_conditions, (CoupledTrialGenerationEndConditions, UncoupledTrialGenerationEndConditions)
+    )
+    if session_duration is None:
+        if not has_limits:
+            raise ValueError("Spec %s has no time limit, session duration must be provided." % spec.type)
+        session_duration = end_conditions.max_time
+        if 1 - response_rate >= end_conditions.ignore_ratio_threshold:
+            logger.debug("Expected ignore fraction reaches threshold, session ends at minimum time.")
+            session_duration = min(end_conditions.min_time, session_duration)
+
+    trial_count = session_duration / trial_duration
+    if has_limits and trial_count > end_conditions.max_trial + 1:
+        # the session ends once the trial count exceeds max_trial
+        trial_count = end_conditions.max_trial + 1
+        session_duration = trial_count * trial_duration
+
+    reward_count = trial_count * response_rate * reward_rate
+    water_volume = reward_count * (spec.reward_size.left + spec.reward_size.right) / 2
+
+    return SessionBudget(
+        trial_duration=trial_duration,
+        trial_duration_std=trial_duration_std,
+        session_duration=session_duration,
+        trial_count=trial_count,
+        reward_count=reward_count,
+        water_volume=water_volume,
+    )
+
+
+def _chance_reward_rate(spec: BlockBasedTrialGeneratorSpec) -> float:
+    """Reward rate of a subject choosing sides at random, without baiting."""
+    if isinstance(spec, BaseCoupledTrialGeneratorSpec):
+        return spec.reward_probability_parameters.base_reward_sum / 2
+    if isinstance(spec, UncoupledTrialGeneratorSpec):
+        return float(np.mean(spec.reward_probabilities))
+    raise ValueError("Cannot derive a reward rate for spec %s, reward rate must be provided." % spec.type)
@@ -11,6 +11,8 @@ from aind_behavior_services.task.distributions_utils import draw_sample
 from pydantic import BaseModel, Field
 
 from ..trial_models import TrialOutcome
+from ._base import SeedLike, make_seed_sequence
+from ._preview import BlockSchedulePreview, ScheduleRecorder, choose_excluding, draw_samples_vectorized
 from .block_based_trial_generator import (
     Block,
     BlockBasedTrialGenerator,
@@ -104,8 +106,34 @@ class UncoupledTrialGeneratorSpec(BlockBasedTrialGeneratorSpec):
         description="Distribution describing block length. Block length is floored making the upper bound exclusive.",
     )
 
-    def create_generator(self) -> "UncoupledTrialGenerator":
-        return UncoupledTrialGenerator(self)
+    def create_generator(self, seed: SeedLike = None) -> "UncoupledTrialGenerator":
+        return UncoupledTrialGenerator(self, seed)
+
+    def preview_block_schedules(
+        self, n_schedules: int = 1000, n_trials: int = 1000, seed: SeedLike = None
+    ) -> BlockSchedulePreview:
+        """Sample many block schedules implied by this specification in one vectorized call.
+
+        Assumes a behavior model where block switches are never gated by behavior. Block
+        stagger, the both-lowest correction and dominance streaks follow `UncoupledTrialGenerator`.
+        Block extensions from minimum probability perseveration depend on choices and are not modeled.
+
+        Args:
+            n_schedules: Number of independent schedules to sample.
+            n_trials: Number of trials in each schedule.
+            seed: Seed for the random number generator used for sampling.
+
+        Returns:
+            The sampled block schedules.
+        """
+        return _UncoupledSchedulePreviewSampler(self, n_schedules, n_trials, seed).sample()
+
+
+def _block_length_stagger(block_length: UniformDistribution) -> float:
+    """Number of trials the lower side's block length is staggered by."""
+    block_length_min = block_length.distribution_parameters.min
+    block_length_max = block_length.distribution_parameters.max
+    return np.floor(round(((block_length_max - 1) - block_length_min - 0.5) / 2 + block_length_min) / 2)
 
 
 class UncoupledTrialGenerator(BlockBasedTrialGenerator):
@@ -119,7 +147,7 @@ class UncoupledTrialGenerator(BlockBasedTrialGenerator):
 
     spec: UncoupledTrialGeneratorSpec
 
-    def __init__(self, spec: UncoupledTrialGeneratorSpec) -> None:
+    def __init__(self, spec: UncoupledTrialGeneratorSpec, seed: SeedLike = None) -> None:
         """Records the session start time, calculates right and left block stagger, and generates first block.
         Code adapted from https://github.com/AllenNeuralDynamics/dynamic-foraging-task/blob/develop/src/foraging_gui/reward_schedules/uncoupled_block.py
         Right and left reward probabilities evolve independently in separate blocks.
@@ -128,15 +156,12 @@ class UncoupledTrialGenerator(BlockBasedTrialGenerator):
 
         Args:
             spec: The UncoupledTrialGeneratorSpec defining task parameters.
+            seed: Seed for the generator's random number generator. If None, fresh OS entropy is used.
         """
 
-        super().__init__(spec)
+        super().__init__(spec, seed)
 
-        block_length_min = spec.block_length.distribution_parameters.min
-        block_length_max = spec.block_length.distribution_parameters.max
-        self.block_length_stagger = np.floor(
-            round(((block_length_max - 1) - block_length_min - 0.5) / 2 + block_length_min) / 2
-        )
+        self.block_length_stagger = _block_length_stagger(spec.block_length)
 
         self.block = self._generate_first_block()
 
@@ -343,18 +368,18 @@ class UncoupledTrialGenerator(BlockBasedTrialGenerator):
         """
 
         logger.info("Generating first block.")
-        p_left_reward = np.random.choice(self.spec.reward_probabilities)
-        p_right_reward = np.random.choice(self.spec.reward_probabilities)
-        left_length = np.floor(draw_sample(self.spec.block_length))
-        right_length = np.floor(draw_sample(self.spec.block_length))
+        p_left_reward = self.rng.choice(self.spec.reward_probabilities)
+        p_right_reward = self.rng.choice(self.spec.reward_probabilities)
+        left_length = np.floor(draw_sample(self.spec.block_length, self.rng))
+        right_length = np.floor(draw_sample(self.spec.block_length, self.rng))
 
         while p_right_reward == p_left_reward == min(self.spec.reward_probabilities):
-            if np.random.choice([True, False]):
+            if self.rng.choice([True, False]):
                 logger.debug("Right and left reward are both equal to min. Redrawing right probability.")
-                p_right_reward = np.random.choice(self.spec.reward_probabilities)
+                p_right_reward = self.rng.choice(self.spec.reward_probabilities)
             else:
                 logger.debug("Right and left reward are both equal to min. Redrawing left probability.")
-                p_left_reward = np.random.choice(self.spec.reward_probabilities)
+                p_left_reward = self.rng.choice(self.spec.reward_probabilities)
 
         if p_right_reward < p_left_reward:
             logger.debug("Staggering right block.")
@@ -363,7 +388,7 @@ class UncoupledTrialGenerator(BlockBasedTrialGenerator):
             logger.debug("Staggering left block.")
             left_length -= self.block_length_stagger
         else:
-            if np.random.choice([True, False]):
+            if self.rng.choice([True, False]):
                 logger.debug("Staggering right block.")
                 right_length -= self.block_length_stagger
             else:
@@ -425,37 +450,37 @@ class UncoupledTrialGenerator(BlockBasedTrialGenerator):
         if right_switching:
             logger.info("Generating right block.")
             if right_dominance_streak < max_dominance_streak:
-                p_right_reward = self._draw_reward_probability(p_right_reward, reward_probabilities)
+                p_right_reward = self._draw_reward_probability(p_right_reward, reward_probabilities, self.rng)
             else:
                 logger.info("Right dominance streak exceeded max. Forcing right reward probability to minimum.")
                 p_right_reward = p_min
 
-            right_length = np.floor(draw_sample(block_length))
+            right_length = np.floor(draw_sample(block_length, self.rng))
 
             if p_right_reward == p_left_reward == p_min:
                 logger.info(
                     "Right and left reward are both equal to min. Staggering right block length and generating new left block."
                 )
                 right_length -= block_stagger
-                p_left_reward = self._draw_reward_probability(p_left_reward, reward_probabilities)
-                left_length = np.floor(draw_sample(block_length))
+                p_left_reward = self._draw_reward_probability(p_left_reward, reward_probabilities, self.rng)
+                left_length = np.floor(draw_sample(block_length, self.rng))
         else:
             logger.info("Generating left block.")
             if left_dominance_streak < max_dominance_streak:
-                p_left_reward = self._draw_reward_probability(p_left_reward, reward_probabilities)
+                p_left_reward = self._draw_reward_probability(p_left_reward, reward_probabilities, self.rng)
             else:
                 logger.info("Left dominance streak exceeded max. Forcing left reward probability to minimum.")
                 p_left_reward = p_min
 
-            left_length = np.floor(draw_sample(block_length))
+            left_length = np.floor(draw_sample(block_length, self.rng))
 
             if p_right_reward == p_left_reward == p_min:
                 logger.info(
                     "Right and left reward are both equal to min. Staggering left block length and generating new right block."
                 )
                 left_length -= block_stagger
-                p_right_reward = self._draw_reward_probability(p_right_reward, reward_probabilities)
-                right_length = np.floor(draw_sample(block_length))
+                p_right_reward = self._draw_reward_probability(p_right_reward, reward_probabilities, self.rng)
+                right_length = np.floor(draw_sample(block_length, self.rng))
 
         return Block(
             p_right_reward=p_right_reward,
@@ -465,14 +490,138 @@ class UncoupledTrialGenerator(BlockBasedTrialGenerator):
         )
 
     @staticmethod
-    def _draw_reward_probability(previous_probability: float, reward_probabilities: list[float]) -> float:
+    def _draw_reward_probability(
+        previous_probability: float, reward_probabilities: list[float], rng: np.random.Generator
+    ) -> float:
         """Draw a new reward probability from the available probabilities, excluding the previous probability.
 
         Args:
             previous_probability: The reward probability from the previous block.
-            reward_probabilities: List of candidate probabilities to sample from."""
+            reward_probabilities: List of candidate probabilities to sample from.
+            rng: Random number generator used for the draws."""
 
-        p_reward = np.random.choice(reward_probabilities)
+        p_reward = rng.choice(reward_probabilities)
         while p_reward == previous_probability:
-            p_reward = np.random.choice(reward_probabilities)
+            p_reward = rng.choice(reward_probabilities)
         return p_reward
+
+
+class _UncoupledSchedulePreviewSampler:
+    """Vectorized counterpart of UncoupledTrialGenerator block switching, one array element per schedule.
+
+    Instead of stepping trial by trial, each iteration jumps all schedules to their next block switch.
+    """
+
+    def __init__(self, spec: UncoupledTrialGeneratorSpec, n_schedules: int, n_trials: int, seed: SeedLike) -> None:
+        self.spec = spec
+        self.n_trials = n_trials
+        self.rng = np.random.default_rng(make_seed_sequence(seed))
+        self.probabilities = np.asarray(spec.reward_probabilities, dtype=float)
+        self.p_min = self.probabilities.min()
+        if np.all(self.probabilities == self.p_min):
+            raise ValueError("At least one reward probability must be above the minimum.")
+        self.stagger = _block_length_stagger(spec.block_length)
+        self.recorder = ScheduleRecorder(n_schedules, n_trials)
+
+        self.rows = np.arange(n_schedules)
+        self.trial = np.zeros(n_schedules)
+        self.p_reward = {side: self.rng.choice(self.probabilities, n_schedules) for side in ("left", "right")}
+        self.length = {side: self._draw_length(n_schedules) for side in ("left", "right")}
+        self.trials_in_block = {side: np.zeros(n_schedules) for side in ("left", "right")}
+        self.dominance_streak = {side: np.zeros(n_schedules, dtype=int) for side in ("left", "right")}
+
+    def sample(self) -> BlockSchedulePreview:
+        self._generate_first_block()
+        is_start = np.ones(self.rows.size, dtype=bool)
+        self._record(is_start, is_start)
+
+        while self.rows.size > 0:
+            step = np.maximum(
+                np.minimum(
+                    self.length["left"] - self.trials_in_block["left"],
+                    self.length["right"] - self.trials_in_block["right"],
+                ),
+                1,
+            )
+            self.trial += step
+            for side in ("left", "right"):
+                self.trials_in_block[side] += step
+            is_switching = {side: self.trials_in_block[side] >= self.length[side] for side in ("left", "right")}
+
+            # dominance streaks are updated from the block before switching
+            p_left, p_right = self.p_reward["left"], self.p_reward["right"]
+            self.dominance_streak["right"] = np.where(p_right >= p_left, self.dominance_streak["right"] + 1, 0)
+            self.dominance_streak["left"] = np.where(p_left >= p_right, self.dominance_streak["left"] + 1, 0)
+
+            is_block_start = {side: np.zeros(self.rows.size, dtype=bool) for side in ("left", "right")}
+            for side, other in (("left", "right"), ("right", "left")):
+                self._switch_side(side, other, np.flatnonzero(is_switching[side]), is_block_start)
+            self._record(is_block_start["left"], is_block_start["right"])
+            self._keep(self.trial < self.n_trials)
+
+        return self.recorder.to_preview()
+
+    def _draw_length(self, n: int) -> np.ndarray:
+        return np.floor(draw_samples_vectorized(self.spec.block_length, n, self.rng))
+
+    def _generate_first_block(self) -> None:
+        p_left, p_right = self.p_reward["left"], self.p_reward["right"]
+        both_min = np.flatnonzero((p_left == self.p_min) & (p_right == self.p_min))
+        while both_min.size > 0:
+            is_redraw_right = self.rng.random(both_min.size) < 0.5
+            redrawn = self.rng.choice(self.probabilities, both_min.size)
+            p_right[both_min[is_redraw_right]] = redrawn[is_redraw_right]
+            p_left[both_min[~is_redraw_right]] = redrawn[~is_redraw_right]
+            both_min = both_min[(p_left[both_min] == self.p_min) & (p_right[both_min] == self.p_min)]
+
+        is_stagger_right = (p_right < p_left) | ((p_right == p_left) & (self.rng.random(self.rows.size) < 0.5))
+        self.length["right"] -= np.where(is_stagger_right, self.stagger, 0)
+        self.length["left"] -= np.where(is_stagger_right, 0, self.stagger)
+
+    def _switch_side(self, side: str, other: str, idx: np.ndarray, is_block_start: dict[str, np.ndarray]) -> None:
+        """Generate the next block for the switching side of the schedules at idx."""
+        max_streak = self.spec.maximum_dominance_streak
+        new_p = {
+            side: np.where(
+                self.dominance_streak[side][idx] < max_streak,
+                choose_excluding(self.p_reward[side][idx], self.probabilities, self.rng),
+                self.p_min,
+            ),
+            other: self.p_reward[other][idx].copy(),
+        }
+        new_length = {side: self._draw_length(idx.size), other: self.length[other][idx].copy()}
+
+        # both sides at minimum: stagger the switching side and resample the other side
+        both_min = (new_p[side] == self.p_min) & (new_p[other] == self.p_min)
+        new_length[side][both_min] -= self.stagger
+        new_p[other][both_min] = choose_excluding(new_p[other][both_min], self.probabilities, self.rng)
+        new_length[other][both_min] = self._draw_length(int(both_min.sum()))
+
+        # reset the counter for any side whose probability changed
+        for changed_side in ("right", "left"):
+            changed = idx[new_p[changed_side] != self.p_reward[changed_side][idx]]
+            self.trials_in_block[changed_side][changed] = 0
+            is_block_start[changed_side][changed] = True
+            reset = changed[self.dominance_streak[changed_side][changed] >= max_streak]
+            self.dominance_streak["left"][reset] = 0
+            self.dominance_streak["right"][reset] = 0
+
+        for updated_side in (side, other):
+            self.p_reward[updated_side][idx] = new_p[updated_side]
+            self.length[updated_side][idx] = new_length[updated_side]
+
+    def _record(self, is_left_block_start: np.ndarray, is_right_block_start: np.ndarray) -> None:
+        self.recorder.record(
+            self.rows,
+            self.trial,
+            self.p_reward["left"],
+            self.p_reward["right"],
+            is_left_block_start,
+            is_right_block_start,
+        )
+
+    def _keep(self, mask: np.ndarray) -> None:
+        self.rows, self.trial = self.rows[mask], self.trial[mask]
+        for state in (self.p_reward, self.length, self.trials_in_block, self.dominance_streak):
+            for side in state:
+                state[side] = state[side][mask]
@@ -1,4 +1,16 @@
+from .bias_estimators import BiasEstimator, BiasEstimatorName, create_bias_estimator
 from .calculate_bias import calculate_bias
+from .calculate_bias_trajectory import calculate_bias_trajectories, calculate_bias_trajectory
 from .calculate_foraging_efficiency import calculate_foraging_efficiency
+from .distribution_moments import distribution_moments
 
-__all__ = ["calculate_bias", "calculate_foraging_efficiency"]
+__all__ = [
+    "BiasEstimator",
+    "BiasEstimatorName",
+    "create_bias_estimator",
+    "calculate_bias",
+    "calculate_bias_trajectory",
+    "calculate_bias_trajectories",
+    "calculate_foraging_efficiency",
+    "distribution_moments",
+]
@@ -0,0 +1,177 @@
+import logging
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Literal
+
+import numpy as np
+from scipy.special import digamma, logit
+
+from aind_behavior_dynamic_foraging.task_logic.trial_models import TrialOutcome
+
+from .calculate_bias import HISTORY_LENGTH, TRIAL_WINDOW_LENGTH, calculate_bias
+from .calculate_bias_trajectory import _fit_logistic_regression
+
+logger = logging.getLogger(__name__)
+
+BiasEstimatorName = Literal["logistic_regression", "incremental_logistic_regression", "choice_rate", "beta_binomial"]
+
+
+class BiasEstimator(ABC):
+    """Online estimator of the side bias of an animal.
+
+    Estimators are updated once per trial and return the bias on the scale of the
+    `calculate_bias` logistic regression intercept (log-odds of a right choice), so the
+    bias intervention thresholds apply to every estimator. Positive values indicate a bias
+    toward right, negative toward left.
+    """
+
+    def __init__(self, window_length: int = HISTORY_LENGTH) -> None:
+        """Initializes the estimator with an empty history.
+
+        Args:
+            window_length: Number of most recent trials, including ignored trials, used for the estimate.
+                0 uses the whole session.
+        """
+        self.window_length = window_length
+
+    @abstractmethod
+    def update(self, outcome: TrialOutcome) -> float:
+        """Update the estimator with the outcome of the most recent trial.
+
+        Args:
+            outcome: Outcome of the most recent trial.
+
+        Returns:
+            The bias estimate including the given trial.
+        """
+
+
+class LogisticRegressionBiasEstimator(BiasEstimator):
+    """Su2022 logistic regression intercept refit on the trial window after every trial (`calculate_bias`)."""
+
+    def __init__(self, window_length: int = HISTORY_LENGTH) -> None:
+        super().__init__(window_length)
+        self.outcomes: deque[TrialOutcome] = deque(maxlen=window_length or None)
+
+    def update(self, outcome: TrialOutcome) -> float:
+        self.outcomes.append(outcome)
+        return calculate_bias(list(self.outcomes), history_length=len(self.outcomes))
+
+
+class IncrementalLogisticRegressionBiasEstimator(BiasEstimator):
+    """Same model and window as `LogisticRegressionBiasEstimator`, solved with Newton steps
+    warm-started from the previous trial instead of a fresh liblinear fit.
+
+    Agrees with `calculate_bias` up to the liblinear solver tolerance.
+    """
+
+    def __init__(self, window_length: int = HISTORY_LENGTH) -> None:
+        super().__init__(window_length)
+        self.choices: deque[float] = deque(maxlen=window_length or None)
+        self.rewards: deque[bool] = deque(maxlen=window_length or None)
+        self.weights = np.zeros(2 * TRIAL_WINDOW_LENGTH + 1)
+
+    def update(self, outcome: TrialOutcome) -> float:
+        self.choices.append(np.nan if outcome.is_right_choice is None else float(outcome.is_right_choice))
+        self.rewards.append(bool(outcome.is_rewarded))
+
+        choice = np.array(self.choices)
+        is_valid = ~np.isnan(choice)
+        choice_signed = 2 * choice[is_valid] - 1
+        if len(choice_signed) <= TRIAL_WINDOW_LENGTH:
+            return 0
+
+        y = choice_signed[TRIAL_WINDOW_LENGTH:]
+        if np.all(y == -1):
+            return -1
+        if np.all(y == 1):
+            return 1
+
+        is_rewarded = np.array(self.rewards)[is_valid]
+        x = np.ones((len(y), 2 * TRIAL_WINDOW_LENGTH + 1))
+        for k, lagged in enumerate((choice_signed * is_rewarded, choice_signed * ~is_rewarded)):
+            window = np.lib.stride_tricks.sliding_window_view(lagged[:-1], TRIAL_WINDOW_LENGTH)
+            x[:, k * TRIAL_WINDOW_LENGTH : (k + 1) * TRIAL_WINDOW_LENGTH] = window
+        self.weights = _fit_logistic_regression(x, y, self.weights)
+        return float(self.weights[-1])
+
+
+class ChoiceRateBiasEstimator(BiasEstimator):
+    """Log-odds of an exponentially weighted right choice rate.
+
+    The weight of each new choice is 2 / (window_length + 1), so the window length plays the
+    role of the span of the moving average. A window length of 0 weighs all choices equally.
+    The rate starts at 0.5 and ignored trials do not update it.
+    """
+
+    # keeps the log-odds finite when the rate saturates
+    _RATE_EPSILON = 0.01
+
+    def __init__(self, window_length: int = HISTORY_LENGTH) -> None:
+        super().__init__(window_length)
+        self.alpha = 2 / (window_length + 1) if window_length > 0 else None
+        self.right_choice_rate = 0.5
+        self.n_choices = 0
+
+    def update(self, outcome: TrialOutcome) -> float:
+        if outcome.is_right_choice is not None:
+            self.n_choices += 1
+            # the initial rate counts as one choice when all choices are weighed equally
+            alpha = self.alpha or 1 / (self.n_choices + 1)
+            self.right_choice_rate += alpha * (float(outcome.is_right_choice) - self.right_choice_rate)
+        rate = np.clip(self.right_choice_rate, self._RATE_EPSILON, 1 - self._RATE_EPSILON)
+        return float(logit(rate))
+
+
+class BetaBinomialBiasEstimator(BiasEstimator):
+    """Posterior mean log-odds of a right choice under a beta-binomial model of the trial window.
+
+    Right and left choices within the window update a uniform Beta(1, 1) prior. The expected
+    log-odds of a Beta(a, b) posterior is digamma(a) - digamma(b), which is finite for any count.
+    """
+
+    def __init__(self, window_length: int = HISTORY_LENGTH) -> None:
+        super().__init__(window_length)
+        self.choices: deque[bool | None] = deque(maxlen=window_length or None)
+        self.n_right = 0
+        self.n_left = 0
+
+    def update(self, outcome: TrialOutcome) -> float:
+        if self.choices.maxlen is not None and len(self.choices) == self.choices.maxlen:
+            self._count(self.choices[0], -1)
+        self.choices.append(outcome.is_right_choice)
+        self._count(outcome.is_right_choice, 1)
+        return float(digamma(1 + self.n_right) - digamma(1 + self.n_left))
+
+    def _count(self, is_right_choice: bool | None, increment: int) -> None:
+        if is_right_choice is True:
+            self.n_right += increment
+        elif is_right_choice is False:
+            self.n_left += increment
+
+
+BIAS_ESTIMATORS: dict[str, type[BiasEstimator]] = {
+    "logistic_regression": LogisticRegressionBiasEstimator,
+    "incremental_logistic_regression": IncrementalLogisticRegressionBiasEstimator,
+    "choice_rate": ChoiceRateBiasEstimator,
+    "beta_binomial": BetaBinomialBiasEstimator,
+}
+
+
+def create_bias_estimator(name: BiasEstimatorName, window_length: int = HISTORY_LENGTH) -> BiasEstimator:
+    """Create a bias estimator from the registry.
+
+    Args:
+        name: Registered name of the estimator.
+        window_length: Number of most recent trials used for the estimate.
+
+    Returns:
+        A new estimator with empty history.
+
+    Raises:
+        ValueError: If no estimator is registered under the given name.
+    """
+    if name not in BIAS_ESTIMATORS:
+        raise ValueError("Bias estimator %s not recognized. Available: %s" % (name, list(BIAS_ESTIMATORS)))
+    logger.debug("Creating %s bias estimator with window length %s." % (name, window_length))
+    return BIAS_ESTIMATORS[name](window_length)
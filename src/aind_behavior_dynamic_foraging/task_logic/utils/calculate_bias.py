@@ -8,8 +8,14 @@ from aind_behavior_dynamic_foraging.task_logic.trial_models import TrialOutcome
 
 logger = logging.getLogger(__name__)
 
+SOLVER = "liblinear"
+L1_RATIO = 0
+TRIAL_WINDOW_LENGTH = 5
+REGULARIZATION_STRENGTH = 10
+HISTORY_LENGTH = 200
 
-def calculate_bias(outcomes: List[TrialOutcome]) -> float:
+
+def calculate_bias(outcomes: List[TrialOutcome], history_length: int = HISTORY_LENGTH) -> float:
     """Estimate the side bias of an animal using logistic regression on recent trial history.
 
     Fits a Su2022-style logistic regression model using rewarded and unrewarded choice
@@ -20,7 +26,8 @@ def calculate_bias(outcomes: List[TrialOutcome]) -> float:
     ----------
     outcomes : List[TrialOutcome]
         List of trial outcomes. Auto-response and ignored trials are excluded.
-        Only the most recent 200 trials are used.
+    history_length : int
+        Number of most recent trials used, including ignored trials. Defaults to 200.
 
     Returns
     -------
@@ -29,12 +36,12 @@ def calculate_bias(outcomes: List[TrialOutcome]) -> float:
         Positive values indicate a bias toward right, negative toward left.
     """
 
-    solver = "liblinear"
-    l1_ratio = 0
-    trial_window_length = 5
-    regularization_strength = 10
+    solver = SOLVER
+    l1_ratio = L1_RATIO
+    trial_window_length = TRIAL_WINDOW_LENGTH
+    regularization_strength = REGULARIZATION_STRENGTH
 
-    outcomes = outcomes[-200:]
+    outcomes = outcomes[-history_length:]
 
     # exclude auto response and ignored trials
     filtered = [t for t in outcomes if t.is_right_choice is not None]
@@ -0,0 +1,137 @@
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional, Sequence
+
+import numpy as np
+from numpy.typing import ArrayLike
+from scipy.special import expit
+
+from .calculate_bias import HISTORY_LENGTH, REGULARIZATION_STRENGTH, TRIAL_WINDOW_LENGTH
+
+logger = logging.getLogger(__name__)
+
+_NEWTON_TOLERANCE = 1e-8
+_NEWTON_MAX_ITER = 50
+
+
+def calculate_bias_trajectory(is_right_choice: ArrayLike, is_rewarded: ArrayLike) -> np.ndarray:
+    """Compute the `calculate_bias` value after every trial of a session in one pass.
+
+    Element i equals `calculate_bias(outcomes[: i + 1])`: the same 200 trial history window,
+    exclusion of ignored trials, lag features and edge case values are used. The lag matrix
+    of the whole session is built once, and each trial solves the liblinear L2 logistic
+    regression objective (penalized intercept, C = 1 / regularization strength) with a
+    Newton method warm-started from the previous trial's solution. Results agree with the
+    per trial sklearn fit up to the liblinear solver tolerance.
+
+    Args:
+        is_right_choice (ArrayLike): Choice of each trial. True for right, False for left, None or
+            NaN for ignored trials.
+        is_rewarded (ArrayLike): Whether each trial was rewarded.
+
+    Returns:
+        np.ndarray: Bias after each trial. Positive values indicate a bias toward right.
+
+    Raises:
+        ValueError: If the choice and reward histories have different lengths.
+    """
+    choice = np.asarray(is_right_choice, dtype=float)
+    rewarded = np.asarray(is_rewarded, dtype=float)
+    if choice.shape != rewarded.shape or choice.ndim != 1:
+        raise ValueError("Choice and reward histories must be 1D arrays of equal length.")
+
+    n_trials = len(choice)
+    is_valid = ~np.isnan(choice)
+    choice_signed = 2 * choice[is_valid] - 1
+    if len(choice_signed) <= TRIAL_WINDOW_LENGTH:
+        return np.zeros(n_trials)
+    is_rewarded_valid = rewarded[is_valid] == 1
+
+    # lag matrix of the filtered session: row j holds the features predicting filtered choice j + window
+    rewarded_choice = choice_signed * is_rewarded_valid
+    unrewarded_choice = choice_signed * ~is_rewarded_valid
+    x = np.ones((len(choice_signed) - TRIAL_WINDOW_LENGTH, 2 * TRIAL_WINDOW_LENGTH + 1))
+    for k, lagged in enumerate((rewarded_choice, unrewarded_choice)):
+        window = np.lib.stride_tricks.sliding_window_view(lagged[:-1], TRIAL_WINDOW_LENGTH)
+        x[:, k * TRIAL_WINDOW_LENGTH : (k + 1) * TRIAL_WINDOW_LENGTH] = window
+    y = choice_signed[TRIAL_WINDOW_LENGTH:]
+    n_right_before = np.concatenate([[0], np.cumsum(y == 1)])
+
+    # range of filtered trials [start, end) inside the history window of each trial
+    n_valid_before = np.concatenate([[0], np.cumsum(is_valid)])
+    end = n_valid_before[1:]
+    start = n_valid_before[np.maximum(np.arange(1, n_trials + 1) - HISTORY_LENGTH, 0)]
+
+    bias = np.zeros(n_trials)
+    weights = np.zeros(x.shape[1])
+    previous = None
+    for i in range(n_trials):
+        rows = (start[i], end[i] - TRIAL_WINDOW_LENGTH)
+        if rows == previous:
+            bias[i] = bias[i - 1]
+            continue
+        previous = rows
+        n_fit = rows[1] - rows[0]
+        if n_fit <= 0:
+            continue
+        n_right = n_right_before[rows[1]] - n_right_before[rows[0]]
+        if n_right == 0:
+            bias[i] = -1
+        elif n_right == n_fit:
+            bias[i] = 1
+        else:
+            weights = _fit_logistic_regression(x[slice(*rows)], y[slice(*rows)], weights)
+            bias[i] = weights[-1]
+    return bias
+
+
+def calculate_bias_trajectories(
+    sessions: Sequence[tuple[ArrayLike, ArrayLike]], max_workers: Optional[int] = None
+) -> list[np.ndarray]:
+    """Compute the bias trajectories of many sessions, spread across worker processes.
+
+    Args:
+        sessions (Sequence[tuple[ArrayLike, ArrayLike]]): (is_right_choice, is_rewarded) pairs, one per session.
+        max_workers (int, optional): Number of worker processes. Defaults to the number of processors.
+            Sessions are processed in the calling process if set to 1.
+
+    Returns:
+        list[np.ndarray]: Bias trajectory of each session, in input order.
+    """
+    choices, rewards = zip(*sessions) if sessions else ((), ())
+    if max_workers == 1 or len(sessions) <= 1:
+        return list(map(calculate_bias_trajectory, choices, rewards))
+
+    logger.info("Computing bias trajectories of %d sessions.", len(sessions))
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(calculate_bias_trajectory, choices, rewards))
+
+
+def _fit_logistic_regression(x: np.ndarray, y: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """Minimize 0.5 * |w|^2 + C * sum(log(1 + exp(-y * x @ w))) with damped Newton steps.
+
+    The last column of x is the intercept column, which liblinear penalizes like any weight.
+    """
+    c = 1 / REGULARIZATION_STRENGTH
+
+    def objective(w: np.ndarray) -> float:
+        return 0.5 * w @ w + c * np.sum(np.logaddexp(0, -y * (x @ w)))
+
+    loss = objective(weights)
+    for _ in range(_NEWTON_MAX_ITER):
+        p = expit(-y * (x @ weights))
+        gradient = weights - c * x.T @ (y * p)
+        hessian = np.eye(len(weights)) + c * (x.T * (p * (1 - p))) @ x
+        step = np.linalg.solve(hessian, gradient)
+        if np.abs(step).max() < _NEWTON_TOLERANCE:
+            return weights - step
+
+        # halve the step until the objective decreases; the objective is strictly convex
+        for _ in range(30):
+            candidate = weights - step
+            candidate_loss = objective(candidate)
+            if candidate_loss <= loss:
+                break
+            step = step / 2
+        weights, loss = candidate, candidate_loss
+    return weights
@@ -0,0 +1,167 @@
+import functools
+import logging
+from typing import Optional
+
+import numpy as np
+from aind_behavior_services.task.distributions import (
+    BetaDistribution,
+    BinomialDistribution,
+    Distribution,
+    ExponentialDistribution,
+    GammaDistribution,
+    LogNormalDistribution,
+    NormalDistribution,
+    PdfDistribution,
+    PoissonDistribution,
+    Scalar,
+    UniformDistribution,
+)
+from pydantic import TypeAdapter
+from scipy import stats
+
+logger = logging.getLogger(__name__)
+
+_distribution_adapter = TypeAdapter(Distribution)
+
+# Poisson support is cut where the remaining tail mass is negligible
+_POISSON_TAIL_MASS = 1e-12
+
+
+def distribution_moments(distribution: Distribution) -> tuple[float, float]:
+    """
+    Compute the mean and variance of the values drawn from a distribution.
+
+    Moments follow the sampling semantics of `draw_sample`: raw values are scaled first
+    (value * scale + offset) and truncation is then applied to the scaled values, either
+    by resampling ("exclude") or by clipping ("clamp"). Discrete distributions are summed
+    exactly; continuous distributions are integrated numerically. Results are cached by
+    the serialized distribution, so repeated calls with equal models are free.
+
+    Args:
+        distribution (Distribution): Distribution model to compute moments for.
+
+    Returns:
+        tuple[float, float]: Mean and variance of the drawn values.
+    """
+    return _cached_moments(distribution.model_dump_json())
+
+
+@functools.lru_cache(maxsize=1024)
+def _cached_moments(serialized: str) -> tuple[float, float]:
+    distribution = _distribution_adapter.validate_json(serialized)
+    scale, offset = 1.0, 0.0
+    if distribution.scaling_parameters is not None:
+        scale, offset = distribution.scaling_parameters.scale, distribution.scaling_parameters.offset
+
+    bounds = None
+    truncation = distribution.truncation_parameters
+    if truncation is not None and truncation.min != truncation.max:
+        bounds = (truncation.min, truncation.max)
+    mode = truncation.truncation_mode if truncation is not None else None
+
+    support = _discrete_support(distribution)
+    if support is not None or scale == 0:
+        if support is None:
+            support = (np.zeros(1), np.ones(1))
+        values, probabilities = support
+        first, second = _discrete_moments(values * scale + offset, probabilities, bounds, mode)
+    else:
+        first, second = _continuous_moments(_continuous_distribution(distribution), scale, offset, bounds, mode)
+
+    logger.debug("Moments of %s: mean=%s, second moment=%s" % (serialized, first, second))
+    return float(first), float(max(second - first**2, 0.0))
+
+
+def _discrete_support(distribution: Distribution) -> Optional[tuple[np.ndarray, np.ndarray]]:
+    """Values and probabilities of distributions with a countable support, None for continuous ones."""
+    params = distribution.distribution_parameters
+    match distribution:
+        case Scalar():
+            return np.array([params.value], dtype=float), np.ones(1)
+        case PdfDistribution():
+            probabilities = np.asarray(params.pdf, dtype=float)
+            return np.asarray(params.index, dtype=float), probabilities / probabilities.sum()
+        case BinomialDistribution():
+            values = np.arange(params.n + 1)
+            return values.astype(float), stats.binom.pmf(values, params.n, params.p)
+        case PoissonDistribution():
+            values = np.arange(stats.poisson.isf(_POISSON_TAIL_MASS, params.rate) + 1)
+            return values, stats.poisson.pmf(values, params.rate)
+        case NormalDistribution() if params.std == 0:
+            return np.array([params.mean], dtype=float), np.ones(1)
+        case LogNormalDistribution() if params.std == 0:
+            return np.array([np.exp(params.mean)]), np.ones(1)
+        case UniformDistribution() if params.min == params.max:
+            return np.array([params.min], dtype=float), np.ones(1)
+        case ExponentialDistribution() | GammaDistribution() if params.rate == 0:
+            return np.zeros(1), np.ones(1)
+    return None
+
+
+def _continuous_distribution(distribution: Distribution):
+    """Frozen scipy distribution matching the raw (unscaled, untruncated) samples of `draw_sample`."""
+    params = distribution.distribution_parameters
+    match distribution:
+        case NormalDistribution():
+            return stats.norm(loc=params.mean, scale=params.std)
+        case LogNormalDistribution():
+            return stats.lognorm(s=params.std, scale=np.exp(params.mean))
+        case UniformDistribution():
+            return stats.uniform(loc=params.min, scale=params.max - params.min)
+        case ExponentialDistribution():
+            return stats.expon(scale=1.0 / params.rate)
+        case GammaDistribution():
+            return stats.gamma(a=params.shape, scale=1.0 / params.rate)
+        case BetaDistribution():
+            return stats.beta(a=params.alpha, b=params.beta)
+    raise ValueError("Unsupported distribution type: %s" % type(distribution))
+
+
+def _discrete_moments(
+    values: np.ndarray, probabilities: np.ndarray, bounds: Optional[tuple[float, float]], mode: Optional[str]
+) -> tuple[float, float]:
+    """First and second moments of scaled discrete values with truncation applied."""
+    if bounds is not None and mode == "clamp":
+        values = np.clip(values, *bounds)
+    elif bounds is not None:
+        is_valid = (values >= bounds[0]) & (values <= bounds[1])
+        mass = probabilities[is_valid].sum()
+        if mass == 0:
+            fallback = _exclude_fallback(float(np.dot(values, probabilities)), bounds)
+            return fallback, fallback**2
+        values, probabilities = values[is_valid], probabilities[is_valid] / mass
+    return float(np.dot(values, probabilities)), float(np.dot(values**2, probabilities))
+
+
+def _continuous_moments(
+    raw, scale: float, offset: float, bounds: Optional[tuple[float, float]], mode: Optional[str]
+) -> tuple[float, float]:
+    """First and second moments of scaled continuous values with truncation applied."""
+    raw_mean, raw_variance = (float(m) for m in raw.stats(moments="mv"))
+    mean = raw_mean * scale + offset
+    if bounds is None:
+        return mean, raw_variance * scale**2 + mean**2
+
+    # map the bounds on the scaled values back onto the raw values
+    lower, upper = sorted(((bounds[0] - offset) / scale, (bounds[1] - offset) / scale))
+    interior = [raw.expect(lambda x, k=k: (x * scale + offset) ** k, lb=lower, ub=upper) for k in (1, 2)]
+
+    if mode == "clamp":
+        p_below, p_above = raw.cdf(lower), raw.sf(upper)
+        if scale < 0:
+            p_below, p_above = p_above, p_below
+        return (
+            interior[0] + bounds[0] * p_below + bounds[1] * p_above,
+            interior[1] + bounds[0] ** 2 * p_below + bounds[1] ** 2 * p_above,
+        )
+
+    mass = raw.cdf(upper) - raw.cdf(lower)
+    if mass == 0:
+        fallback = _exclude_fallback(mean, bounds)
+        return fallback, fallback**2
+    return interior[0] / mass, interior[1] / mass
+
+
+def _exclude_fallback(mean: float, bounds: tuple[float, float]) -> float:
+    """Mirror `draw_sample`, which falls back to the nearest bound when no valid value is found."""
+    return bounds[0] if mean < bounds[0] else bounds[1]
@@ -4,6 +4,13 @@ import logging
 from pathlib import Path
 from types import ModuleType
 
+import numpy as np
+import pandas as pd
+from contraqctor import qc
+from harp.io import MessageType, to_file
+
+from aind_behavior_dynamic_foraging.data_qc.runner import run_suite
+
 EXAMPLES_DIR = Path(__file__).parents[1] / "examples"
 JSON_ROOT = Path("./local").resolve()
 
@@ -11,6 +18,46 @@ logger = logging.getLogger(__name__)
 logger.addHandler(logging.NullHandler())
 logging.disable(logging.CRITICAL)
 
+BEHAVIOR_YML = """%YAML 1.1
+---
+device: Behavior
+whoAmI: 1216
+firmwareVersion: "1.0"
+hardwareTargets: "1.0"
+registers:
+  DigitalInputState:
+    address: 32
+    type: U8
+    access: Event
+    maskType: DigitalInputs
+  OutputSet:
+    address: 34
+    type: U16
+    access: Write
+    maskType: DigitalOutputs
+  PulseSupplyPort0:
+    address: 40
+    type: U16
+    access: Write
+  PulseSupplyPort1:
+    address: 41
+    type: U16
+    access: Write
+  Camera1Frame:
+    address: 94
+    type: U8
+    access: Event
+bitMasks:
+  DigitalInputs:
+    bits:
+      DIPort0: 0x1
+      DIPort1: 0x2
+  DigitalOutputs:
+    bits:
+      SupplyPort0: 0x1
+      SupplyPort1: 0x2
+"""
+
 
 def build_example(script_path: str) -> ModuleType:
     module_name = Path(script_path).stem
@@ -25,3 +72,32 @@ def build_example(script_path: str) -> ModuleType:
 def build_examples(examples_dir: Path = EXAMPLES_DIR):
     for script_path in glob.glob(str(examples_dir / "*.py")):
         _ = build_example(script_path)
+
+
+def write_harp_register(
+    path: Path, address: int, times, values=1, message_type="WRITE", dtype=np.uint16, append: bool = False
+) -> None:
+    """Write the messages of a Harp register to a file, or append them as the logger of a running session does."""
+    times = np.atleast_1d(np.asarray(times, dtype=float))
+    data = pd.DataFrame(
+        {
+            "Value": np.broadcast_to(np.asarray(values, dtype=dtype), times.shape),
+            "MessageType": pd.Categorical(
+                np.broadcast_to(np.asarray(message_type), times.shape), categories=[t.name for t in MessageType]
+            ),
+        },
+        index=pd.Index(times, name="Time"),
+    )
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if not append:
+        to_file(data, path, address=address, dtype=np.dtype(dtype))
+        return
+    chunk = path.with_suffix(".chunk")
+    to_file(data, chunk, address=address, dtype=np.dtype(dtype))
+    with open(path, "ab") as file:
+        file.write(chunk.read_bytes())
+    chunk.unlink()
+
+
+def statuses(suite: qc.Suite) -> dict[str, qc.Status]:
+    return {result.test_name: result.status for result in run_suite(suite)}
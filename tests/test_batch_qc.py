@@ -0,0 +1,100 @@
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+import pandas as pd
+
+from aind_behavior_dynamic_foraging.data_qc.batch import (
+    SUMMARY_COLUMNS,
+    count_statuses,
+    expand_sessions,
+    run_batch_qc,
+    write_summary,
+)
+from aind_behavior_dynamic_foraging.data_qc.cache import CACHED_MESSAGE_PREFIX
+
+from .test_trial_table import trial_events, write_session
+
+sys.path.append(".")
+from examples import rig as example_rig  # isort:skip # pylint: disable=wrong-import-position
+
+
+def make_session(root: Path) -> None:
+    """A session with its rig and software events, whose Harp devices and videos are missing."""
+    write_session(root, [event for i in range(3) for event in trial_events(10.0 * i, True, 1)])
+    logs = root / "behavior" / "Logs"
+    logs.mkdir(parents=True)
+    (logs / "rig_output.json").write_text(example_rig.rig.model_dump_json())
+
+
+class TestBatchQc(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        for name in ("session_a", "session_b"):
+            make_session(self.root / "archive" / name)
+        # a session without its rig cannot be checked
+        (self.root / "archive" / "session_c" / "behavior").mkdir(parents=True)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_expand_sessions(self):
+        sessions = expand_sessions([str(self.root / "archive" / "*"), str(self.root / "archive" / "session_a")])
+        self.assertEqual([session.name for session in sessions], ["session_a", "session_b", "session_c"])
+
+    def test_summary_of_every_session(self):
+        sessions = expand_sessions([str(self.root / "archive" / "*")])
+        summary = run_batch_qc(sessions, max_workers=2, report_directory=self.root / "reports")
+
+        self.assertEqual(list(summary.columns), SUMMARY_COLUMNS)
+        self.assertEqual(list(summary["session"].unique()), [str(session) for session in sessions])
+        session_a = summary[summary["session"] == str(sessions[0])]
+        end_session = session_a[session_a["test"] == "test_end_session_exists"]
+        self.assertEqual(end_session["status"].tolist(), ["failed"])
+        self.assertEqual(summary.loc[summary["session"] == str(sessions[2]), "status"].tolist(), ["error"])
+        self.assertTrue((self.root / "reports" / "session_b.html").exists())
+
+        counts = count_statuses(summary)
+        self.assertEqual(list(counts.index), [str(session) for session in sessions])
+        self.assertEqual(counts.loc[str(sessions[2]), "error"], 1)
+
+        write_summary(summary, self.root / "summary.csv")
+        pd.testing.assert_frame_equal(
+            pd.read_csv(self.root / "summary.csv", dtype=str, keep_default_na=False)[["session", "status"]],
+            summary[["session", "status"]].astype(str),
+        )
+
+    def test_failed_worker_is_an_error(self):
+        sessions = [self.root / "archive" / "session_a", self.root / "archive" / "session_b"]
+        # the report of session_b cannot be written, which fails in its worker process
+        (self.root / "reports" / "session_b.html").mkdir(parents=True)
+        summary = run_batch_qc(sessions, max_workers=2, report_directory=self.root / "reports")
+
+        self.assertEqual(list(summary["session"].unique()), [str(session) for session in sessions])
+        self.assertIn("passed", summary.loc[summary["session"] == str(sessions[0]), "status"].tolist())
+        self.assertEqual(summary.loc[summary["session"] == str(sessions[1]), "status"].tolist(), ["error"])
+        self.assertTrue((self.root / "reports" / "session_a.html").exists())
+
+    def test_cache_directory_is_outside_the_sessions(self):
+        sessions = [self.root / "archive" / "session_a", self.root / "archive" / "session_b"]
+        cache_directory = self.root / "qc_cache"
+        self.assertFalse(run_batch_qc(sessions)["message"].str.startswith(CACHED_MESSAGE_PREFIX).any())
+        run_batch_qc(sessions, cache_directory=cache_directory)
+        summary = run_batch_qc(sessions, cache_directory=cache_directory)
+
+        cached = summary[summary["message"].str.startswith(CACHED_MESSAGE_PREFIX)]
+        self.assertEqual(set(cached["session"]), {str(session) for session in sessions})
+        self.assertFalse(any(path.name == ".cache" for session in sessions for path in session.rglob("*")))
+        self.assertTrue(any((cache_directory / "data").rglob("TrialOutcome.parquet")))
+
+    def test_reports_need_distinct_names(self):
+        make_session(self.root / "other" / "session_a")
+        sessions = [self.root / "archive" / "session_a", self.root / "other" / "session_a"]
+        with self.assertRaises(ValueError):
+            run_batch_qc(sessions, report_directory=self.root / "reports")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,141 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+import cv2
+import harp.reader
+import numpy as np
+import pandas as pd
+from contraqctor import qc
+from contraqctor.contract.camera import Camera
+
+from aind_behavior_dynamic_foraging.data_contract import camera_frame_index, dataset, set_cache_directory
+from aind_behavior_dynamic_foraging.data_contract._indexed_harp import IndexedHarpRegister
+from aind_behavior_dynamic_foraging.data_contract.camera_frames import (
+    FRAME_INDEX_FILE_NAME,
+    analyze_frame_timing,
+    build_frame_index,
+    count_frame_triggers,
+)
+from aind_behavior_dynamic_foraging.data_qc.camera_timing import CameraFrameTimingQcSuite
+from aind_behavior_dynamic_foraging.data_qc.camera_video import CameraVideoQcSuite
+from aind_behavior_dynamic_foraging.data_qc.runner import run_suite
+
+from . import BEHAVIOR_YML, write_harp_register
+
+FPS = 100.0
+
+
+def write_metadata(path: Path, frames: np.ndarray, times: np.ndarray) -> None:
+    path.mkdir(parents=True, exist_ok=True)
+    pd.DataFrame(
+        {"ReferenceTime": times, "CameraFrameNumber": frames, "CameraFrameTime": np.round(times * 1e9).astype(np.int64)}
+    ).to_csv(path / "metadata.csv", index=False)
+
+
+def write_video(path: Path, n_frames: int) -> None:
+    writer = cv2.VideoWriter(str(path / "video.avi"), cv2.VideoWriter_fourcc(*"MJPG"), FPS, (16, 16))
+    frame = np.full((16, 16, 3), 128, dtype=np.uint8)
+    for _ in range(n_frames):
+        writer.write(frame)
+    writer.release()
+
+
+class TestCameraFrames(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        self.camera_path = self.root / "behavior-videos" / "FaceCamera"
+        self.trigger_times = 10.0 + np.arange(1000) / FPS
+        # frames 500 and 501 were dropped, their triggers were sent
+        self.frames = np.delete(np.arange(1000), [500, 501])
+        write_metadata(self.camera_path, self.frames, self.trigger_times[self.frames])
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_index_is_cached_and_rebuilt_on_change(self):
+        self.assertNotIsInstance(build_frame_index(self.camera_path).records, np.memmap)
+        cache_directory = self.root / "cache"
+        set_cache_directory(cache_directory)
+        self.addCleanup(set_cache_directory, None)
+        index = build_frame_index(self.camera_path, chunk_size=64)
+        np.testing.assert_array_equal(index.frame, self.frames)
+        self.assertEqual([path.name for path in self.camera_path.iterdir()], ["metadata.csv"])
+        self.assertEqual(len(list(cache_directory.rglob(FRAME_INDEX_FILE_NAME))), 1)
+        self.assertIsInstance(build_frame_index(self.camera_path).records, np.memmap)
+
+        write_metadata(self.camera_path, self.frames[:10], self.trigger_times[:10])
+        self.assertEqual(len(build_frame_index(self.camera_path)), 10)
+
+    def test_index_lookups(self):
+        index = camera_frame_index(dataset(self.root), "FaceCamera")
+        np.testing.assert_allclose(index.time_of([0, 500, 999]), [10.0, np.nan, 19.99])
+        self.assertEqual(index.frame_at([0.0, 15.005, 100.0]).tolist(), [-1, 499, 999])
+
+    def test_timing_does_not_depend_on_chunks(self):
+        index = build_frame_index(self.camera_path, use_cache=False)
+        timing = analyze_frame_timing(index, expected_fps=FPS)
+        self.assertEqual((timing.n_frames, timing.n_dropped, timing.n_gaps), (998, 2, 1))
+        self.assertEqual((timing.n_repeated, timing.n_backwards, timing.n_clock_mismatch), (0, 0, 0))
+        self.assertEqual(timing.n_counted_frames, 1000)
+        self.assertEqual(timing.interval_counts.sum(), 997)
+        self.assertAlmostEqual(timing.max_interval, 3 / FPS)
+
+        chunked = analyze_frame_timing(index, expected_fps=FPS, chunk_size=7)
+        np.testing.assert_array_equal(chunked.interval_counts, timing.interval_counts)
+        self.assertEqual(chunked.n_dropped, timing.n_dropped)
+        self.assertAlmostEqual(chunked.mean_interval, timing.mean_interval)
+        self.assertAlmostEqual(chunked.interval_std, timing.interval_std)
+
+    def test_count_frame_triggers(self):
+        register = self.root / "Behavior_94.bin"
+        write_harp_register(register, 94, self.trigger_times, message_type="EVENT", dtype=np.uint8)
+        self.assertEqual(count_frame_triggers(register), 1000)
+        self.assertEqual(count_frame_triggers(register, 10.5, 11.0, chunk_size=33), 51)
+
+    def test_suite(self):
+        register = self.root / "Behavior_94.bin"
+        write_harp_register(
+            register, 94, np.concatenate([self.trigger_times, [30.0]]), message_type="EVENT", dtype=np.uint8
+        )
+        (self.root / "device.yml").write_text(BEHAVIOR_YML)
+        reader = harp.reader.create_reader(self.root / "device.yml").registers["Camera1Frame"]
+        triggers = IndexedHarpRegister.from_register_file("Camera1Frame", reader, register)
+        camera = Camera("FaceCamera", reader_params=Camera.make_params(path=self.camera_path))
+        results = {
+            result.test_name: result
+            for result in run_suite(CameraFrameTimingQcSuite(camera, expected_fps=FPS, triggers=triggers))
+        }
+
+        self.assertEqual(results["test_has_frames"].status, qc.Status.PASSED)
+        self.assertEqual(results["test_dropped_frames"].status, qc.Status.FAILED)
+        self.assertEqual(results["test_frame_rate"].status, qc.Status.PASSED)
+        self.assertEqual(results["test_inter_frame_intervals"].status, qc.Status.WARNING)
+        self.assertEqual(results["test_clock_jitter"].status, qc.Status.PASSED)
+        # the trigger sent after the last frame is not counted
+        self.assertEqual(results["test_trigger_frame_count"].status, qc.Status.PASSED)
+        self.assertEqual(results["test_trigger_frame_count"].result["triggers"], 1000)
+        self.assertEqual(results["test_video_frame_count"].status, qc.Status.SKIPPED)
+        self.assertFalse(camera.has_data)
+
+    def test_video_suites(self):
+        write_video(self.camera_path, len(self.frames))
+        camera = Camera("FaceCamera", reader_params=Camera.make_params(path=self.camera_path))
+        timing = {result.test_name: result for result in run_suite(CameraFrameTimingQcSuite(camera))}
+        self.assertEqual(timing["test_video_frame_count"].status, qc.Status.PASSED)
+        self.assertEqual(timing["test_video_frame_count"].result, len(self.frames))
+
+        video = {result.test_name: result.status for result in run_suite(CameraVideoQcSuite(camera))}
+        self.assertEqual(
+            video,
+            {
+                "test_histogram_and_create_asset": qc.Status.PASSED,
+                "test_create_pixel_saturation_visualizer": qc.Status.PASSED,
+            },
+        )
+        self.assertFalse(camera.has_data)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+import datetime
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from aind_behavior_dynamic_foraging.data_contract.catalog import SessionCatalog
+
+
+def write_session(root: Path, subject: str, date: str, stage: str, efficiency: float) -> Path:
+    logs = root / "behavior" / "Logs"
+    logs.mkdir(parents=True)
+    (logs / "session_output.json").write_text(json.dumps({"subject": subject, "date": date, "session_name": root.name}))
+    (logs / "rig_output.json").write_text(json.dumps({"rig_name": "rig-1"}))
+    (root / "behavior" / "trainer_state.json").write_text(json.dumps({"stage": {"name": stage}}))
+    (root / "behavior" / "metrics.json").write_text(
+        json.dumps({"foraging_efficiency_per_session": [0.1, efficiency], "unignored_trials_per_session": [10, 20]})
+    )
+    events = root / "behavior" / "SoftwareEvents"
+    events.mkdir()
+    (events / "TrialOutcome.json").write_text("{}\n" * 25)
+    return root
+
+
+class TestSessionCatalog(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        write_session(self.root / "789_a", "789", "2026-01-02T10:00:00Z", "STAGE_1", 0.5)
+        write_session(self.root / "789_b", "789", "2026-01-03T10:00:00Z", "STAGE_2", 0.6)
+        write_session(self.root / "790_a", "790", "2026-01-03T10:00:00Z", "STAGE_1", 0.7)
+        self.catalog = SessionCatalog(self.root / "catalog.sqlite")
+
+    def tearDown(self):
+        self.catalog.close()
+        self._tmp.cleanup()
+
+    def test_query(self):
+        self.assertEqual(len(self.catalog.update([self.root], include_water=False)), 3)
+        sessions = self.catalog.query(subject="789")
+        self.assertEqual(sessions["session_name"].tolist(), ["789_a", "789_b"])
+        self.assertEqual(sessions["n_trials"].tolist(), [25, 25])
+        self.assertEqual(sessions["n_unignored_trials"].tolist(), [20, 20])
+        self.assertEqual(sessions["rig_name"].tolist(), ["rig-1", "rig-1"])
+        self.assertEqual(self.catalog.query(stage="STAGE_1")["subject"].tolist(), ["789", "790"])
+        on_date = self.catalog.query(start_date=datetime.date(2026, 1, 3), end_date=datetime.date(2026, 1, 3))
+        self.assertEqual(on_date["foraging_efficiency"].tolist(), [0.6, 0.7])
+
+    def test_only_changed_sessions_are_reindexed(self):
+        self.catalog.update([self.root], include_water=False)
+        self.assertEqual(self.catalog.update([self.root], include_water=False), [])
+
+        trainer_state = self.root / "789_a" / "behavior" / "trainer_state.json"
+        trainer_state.write_text(json.dumps({"stage": {"name": "STAGE_3"}}))
+        stat = trainer_state.stat()
+        os.utime(trainer_state, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        self.assertEqual(self.catalog.update([self.root], include_water=False), [(self.root / "789_a").resolve()])
+        self.assertEqual(self.catalog.query(stage="STAGE_3")["session_name"].tolist(), ["789_a"])
+
+    def test_sessions_without_water_are_reindexed_with_water(self):
+        self.catalog.update([self.root], include_water=False)
+        with patch("aind_behavior_dynamic_foraging.data_contract.utils.calculate_consumed_water", return_value=1.5):
+            self.assertEqual(len(self.catalog.update([self.root], include_water=True)), 3)
+            self.assertEqual(self.catalog.update([self.root], include_water=True), [])
+        self.assertEqual(self.catalog.query()["water_ml"].tolist(), [1.5, 1.5, 1.5])
+
+    def test_prune(self):
+        self.catalog.update([self.root], include_water=False)
+        (self.root / "790_a" / "behavior" / "Logs" / "session_output.json").unlink()
+        self.catalog.update([self.root], include_water=False, prune=True)
+        self.assertEqual(len(self.catalog.query()), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
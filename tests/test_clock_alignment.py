@@ -0,0 +1,102 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+from aind_behavior_services.data_types import SoftwareEvent
+
+from aind_behavior_dynamic_foraging.data_contract import dataset, set_cache_directory
+from aind_behavior_dynamic_foraging.data_contract.clock_alignment import (
+    CACHE_FILE_NAME,
+    ClockAlignment,
+    align_software_events,
+    match_nearest,
+)
+
+from . import BEHAVIOR_YML, write_harp_register
+
+
+def software_times_for(harp_times: np.ndarray, seed: int = 0) -> np.ndarray:
+    """Software timestamps lagging the Harp events by 20 ms, with a slow drift and jitter."""
+    rng = np.random.default_rng(seed)
+    return harp_times - 0.02 - 1e-5 * harp_times + rng.normal(0, 0.002, len(harp_times))
+
+
+class TestMatchNearest(unittest.TestCase):
+    def test_one_to_one(self):
+        software_index, harp_index = match_nearest(np.array([0.9, 1.05, 5.0]), np.array([1.0, 2.0]), 0.5)
+        self.assertEqual(software_index.tolist(), [1])
+        self.assertEqual(harp_index.tolist(), [0])
+
+    def test_single_harp_event(self):
+        software_index, harp_index = match_nearest(np.array([0.9]), np.array([1.0]), 0.5)
+        self.assertEqual((software_index.tolist(), harp_index.tolist()), ([0], [0]))
+
+
+class TestClockAlignment(unittest.TestCase):
+    def test_fit_recovers_offset_and_drift(self):
+        harp_times = np.sort(np.random.default_rng(1).uniform(100, 1000, 300))
+        software_times = software_times_for(harp_times)
+        # harp events without a software counterpart, such as sounds played by the secondary reinforcer
+        distractors = harp_times[::10] + 0.3
+        alignment = ClockAlignment.fit(software_times, np.sort(np.concatenate([harp_times, distractors])))
+
+        # a few events are closer to each other than the jitter and may be left unmatched
+        self.assertGreater(alignment.n_pairs, 290)
+        self.assertLess(alignment.residual_std, 0.005)
+        np.testing.assert_allclose(alignment.to_harp(software_times), harp_times, atol=0.01)
+        np.testing.assert_allclose(alignment.to_software(alignment.to_harp(software_times)), software_times, atol=1e-4)
+
+    def test_fit_without_matches(self):
+        with self.assertRaises(ValueError):
+            ClockAlignment.fit(np.array([1.0]), np.array([]))
+
+
+class TestAlignSoftwareEvents(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        self.harp_times = np.arange(20) * 30.0 + 100.0
+
+        device_path = self.root / "behavior" / "Behavior.harp"
+        device_path.mkdir(parents=True)
+        (device_path / "device.yml").write_text(BEHAVIOR_YML)
+        write_harp_register(device_path / "Behavior_34.bin", 34, self.harp_times, 2)
+
+        events = self.root / "behavior" / "SoftwareEvents"
+        events.mkdir(parents=True)
+        (events / "GiveManualWaterRight.json").write_text(
+            "".join(
+                SoftwareEvent(name="GiveManualWaterRight", timestamp=time, data=None).model_dump_json() + "\n"
+                for time in software_times_for(self.harp_times)
+            )
+        )
+        self.events = events
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_align_and_cache(self):
+        session_files = sorted(self.root.rglob("*"))
+        alignment = align_software_events(dataset(self.root))
+        self.assertEqual(alignment.n_pairs, 20)
+        self.assertEqual(sorted(self.root.rglob("*")), session_files)
+
+        cache = tempfile.TemporaryDirectory()
+        self.addCleanup(cache.cleanup)
+        cache_directory = Path(cache.name)
+        set_cache_directory(cache_directory)
+        self.addCleanup(set_cache_directory, None)
+        self.assertEqual(align_software_events(dataset(self.root)), alignment)
+        self.assertEqual([path.name for path in cache_directory.rglob(CACHE_FILE_NAME)], [CACHE_FILE_NAME])
+        self.assertEqual(align_software_events(dataset(self.root)), alignment)
+        self.assertEqual(sorted(self.root.rglob("*")), session_files)
+
+    def test_no_alignment_events(self):
+        (self.events / "GiveManualWaterRight.json").unlink()
+        with self.assertRaises(ValueError):
+            align_software_events(dataset(self.root), use_cache=False)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+from contraqctor import qc
+
+from aind_behavior_dynamic_foraging.data_contract import dataset
+from aind_behavior_dynamic_foraging.data_contract.command_latency import (
+    measure_command_latency,
+    pair_replies,
+    summarize_command_latency,
+)
+from aind_behavior_dynamic_foraging.data_qc.command_latency import HarpCommandLatencyQcSuite
+
+from . import BEHAVIOR_YML, statuses, write_harp_register
+
+
+class TestPairReplies(unittest.TestCase):
+    def test_pairs(self):
+        # two commands in flight at once, then a command whose reply was lost
+        commands = np.array([1.0, 1.0001, 5.0, 9.0])
+        replies = np.array([1.001, 1.002, 9.002])
+        self.assertEqual(pair_replies(commands, replies, timeout=1.0).tolist(), [0, 1, -1, 2])
+        # a lost reply within a burst does not shift the pairing of the later commands
+        commands = np.array([0.0, 0.1, 0.2, 0.3])
+        replies = np.array([0.01, 0.21, 0.31])
+        self.assertEqual(pair_replies(commands, replies).tolist(), [0, -1, 1, 2])
+        # a reply later than the timeout answers no command
+        self.assertEqual(pair_replies(commands, np.array([0.01, 1.5])).tolist(), [0, -1, -1, -1])
+        self.assertEqual(pair_replies(commands, np.empty(0)).tolist(), [-1, -1, -1, -1])
+        self.assertEqual(pair_replies(np.empty(0), replies).tolist(), [])
+
+
+class TestCommandLatency(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        device = self.root / "behavior" / "Behavior.harp"
+        commands = self.root / "behavior" / "HarpCommands" / "Behavior.harp"
+        command_times = 1.0 + np.arange(100)
+        latency = np.full(100, 0.001)
+        latency[50] = 0.05
+        # the reply to the last command was lost, the reply before the session starts is ignored
+        write_harp_register(commands / "Behavior_10.bin", 10, [0.5], dtype=np.uint8)
+        write_harp_register(device / "Behavior_10.bin", 10, [0.1, 0.501], dtype=np.uint8)
+        write_harp_register(commands / "Behavior_34.bin", 34, command_times)
+        write_harp_register(device / "Behavior_34.bin", 34, (command_times + latency)[:-1])
+        (device / "device.yml").write_text(BEHAVIOR_YML)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_measure(self):
+        latency = measure_command_latency(dataset(self.root))
+        self.assertEqual(len(latency), 101)
+        self.assertEqual(set(latency["device"]), {"HarpBehavior"})
+        output_set = latency[latency["register"] == "OutputSet"]
+        self.assertEqual(len(output_set), 100)
+        self.assertTrue(np.isnan(output_set["latency"].iloc[-1]))
+        np.testing.assert_allclose(output_set["latency"].iloc[:3], 0.001, atol=32e-6)
+        self.assertEqual(latency.loc[latency["is_outlier"], "time"].tolist(), [51.0])
+
+        summary = summarize_command_latency(latency, by=("device", "register"))
+        self.assertEqual(summary.loc[("HarpBehavior", "OutputSet"), "n_commands"], 100)
+        self.assertEqual(summary.loc[("HarpBehavior", "OutputSet"), "n_unanswered"], 1)
+        self.assertEqual(summary.loc[("HarpBehavior", "OutputSet"), "n_outliers"], 1)
+        self.assertAlmostEqual(summary.loc[("HarpBehavior", "OutputSet"), "max"], 0.05, delta=32e-6)
+        self.assertEqual(summary.loc[("HarpBehavior", "OperationControl"), "n_commands"], 1)
+
+    def test_suite(self):
+        results = statuses(HarpCommandLatencyQcSuite(dataset(self.root)))
+        self.assertEqual(results["test_commands_answered"], qc.Status.FAILED)
+        self.assertEqual(results["test_command_latency"], qc.Status.PASSED)
+        self.assertEqual(results["test_latency_outliers"], qc.Status.WARNING)
+
+        slow = HarpCommandLatencyQcSuite(dataset(self.root), max_latency=0.0005)
+        self.assertEqual(statuses(slow)["test_command_latency"], qc.Status.FAILED)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from aind_behavior_services.data_types import SoftwareEvent
+
+from aind_behavior_dynamic_foraging.data_contract import clear_dataset_cache, dataset
+
+from . import BEHAVIOR_YML
+from .test_indexed_harp import write_output_set
+
+
+def write_events(path: Path, n: int) -> None:
+    path.write_text(
+        "".join(SoftwareEvent(name=path.stem, timestamp=float(i)).model_dump_json() + "\n" for i in range(n))
+    )
+
+
+class TestDatasetCache(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        self.software_events = self.root / "behavior" / "SoftwareEvents"
+        self.software_events.mkdir(parents=True)
+        write_events(self.software_events / "TrialOutcome.json", 3)
+
+    def tearDown(self):
+        clear_dataset_cache()
+        self._tmp.cleanup()
+
+    def trial_outcome(self, **kwargs):
+        return dataset(self.root, use_cache=True, **kwargs)["Behavior"]["SoftwareEvents"]["TrialOutcome"]
+
+    def test_same_dataset_is_shared(self):
+        first = dataset(self.root, use_cache=True)
+        self.assertIs(dataset(self.root, use_cache=True), first)
+        self.assertIsNot(dataset(self.root, version="0.0.1", use_cache=True), first)
+        self.assertIsNot(dataset(self.root), first)
+
+        data = self.trial_outcome().data
+        self.assertIs(self.trial_outcome().data, data)
+
+        clear_dataset_cache()
+        self.assertIsNot(dataset(self.root, use_cache=True), first)
+
+    def test_changed_stream_is_read_again(self):
+        self.assertEqual(len(self.trial_outcome().data), 3)
+
+        path = self.software_events / "TrialOutcome.json"
+        mtime = path.stat().st_mtime_ns
+        write_events(path, 5)
+        os.utime(path, ns=(mtime + 1, mtime + 1))
+        self.assertEqual(len(self.trial_outcome().data), 5)
+
+    def test_missing_stream_is_read_once_created(self):
+        end_session = dataset(self.root, use_cache=True)["Behavior"]["SoftwareEvents"]["EndSession"].load()
+        self.assertTrue(end_session.has_error)
+
+        write_events(self.software_events / "EndSession.json", 1)
+        dataset(self.root, use_cache=True, streams=["Behavior/SoftwareEvents/EndSession"])
+        self.assertTrue(end_session.has_data)
+
+    def test_lazily_read_register_is_read_again(self):
+        device_path = self.root / "behavior" / "Behavior.harp"
+        device_path.mkdir(parents=True)
+        (device_path / "device.yml").write_text(BEHAVIOR_YML)
+        register_path = device_path / "Behavior_34.bin"
+        write_output_set(register_path, 30)
+
+        # the device is first read after the dataset was returned by the cache
+        this_dataset = dataset(self.root, use_cache=True)
+        self.assertEqual(len(this_dataset["Behavior"]["HarpBehavior"]["OutputSet"].data), 30)
+
+        mtime = register_path.stat().st_mtime_ns
+        write_output_set(register_path, 60)
+        os.utime(register_path, ns=(mtime + 1, mtime + 1))
+        self.assertEqual(len(dataset(self.root, use_cache=True)["Behavior"]["HarpBehavior"]["OutputSet"].data), 60)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from contraqctor.contract.harp import DeviceYmlByFile, HarpDevice
+
+from aind_behavior_dynamic_foraging.data_contract import set_cache_directory
+from aind_behavior_dynamic_foraging.data_contract._indexed_harp import IndexedHarpDevice
+
+from . import BEHAVIOR_YML, write_harp_register
+
+
+def write_output_set(path: Path, n: int) -> None:
+    """Write `n` messages of OutputSet, every third a WRITE and the others EVENT."""
+    message_type = np.where(np.arange(n) % 3 == 0, "WRITE", "EVENT")
+    write_harp_register(path, 34, np.arange(n) * 0.5, np.arange(n) % 4, message_type)
+
+
+class TestIndexedHarpDevice(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.device_path = Path(self._tmp.name) / "Behavior.harp"
+        self.device_path.mkdir()
+        (self.device_path / "device.yml").write_text(BEHAVIOR_YML)
+        self.register_path = self.device_path / "Behavior_34.bin"
+        write_output_set(self.register_path, 30)
+        self.params = HarpDevice.make_params(path=self.device_path, device_yml_hint=DeviceYmlByFile())
+        self.device = IndexedHarpDevice("HarpBehavior", reader_params=self.params).load()
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_full_read_matches_harp_device(self):
+        expected = HarpDevice("HarpBehavior", reader_params=self.params).load()["OutputSet"].data
+        pd.testing.assert_frame_equal(self.device["OutputSet"].data, expected)
+
+    def test_read_messages_by_type_and_time(self):
+        output_set = self.device["OutputSet"]
+        data = output_set.data
+        writes = output_set.read_messages(message_type="WRITE")
+        pd.testing.assert_frame_equal(writes, data[data["MessageType"] == "WRITE"])
+
+        in_range = output_set.read_messages(start=2.0, end=4.0)
+        self.assertEqual(list(in_range.index), [2.0, 2.5, 3.0, 3.5])
+
+        empty = output_set.read_messages(message_type="READ")
+        self.assertTrue(empty.empty)
+        self.assertEqual(list(empty.columns), list(data.columns))
+
+    def test_nothing_is_cached_by_default(self):
+        self.device["OutputSet"].read_messages(message_type="WRITE")
+        self.assertEqual({path.name for path in self.device_path.iterdir()}, {"device.yml", "Behavior_34.bin"})
+
+    def test_index_cache_is_invalidated_on_append(self):
+        cache_directory = Path(self._tmp.name) / "cache"
+        set_cache_directory(cache_directory)
+        self.addCleanup(set_cache_directory, None)
+        output_set = self.device["OutputSet"]
+        self.assertEqual(len(output_set.read_messages(message_type="WRITE")), 10)
+        self.assertEqual([path.name for path in cache_directory.rglob("*.npz")], ["Behavior_34.npz"])
+        self.assertEqual({path.name for path in self.device_path.iterdir()}, {"device.yml", "Behavior_34.bin"})
+
+        write_output_set(self.register_path, 60)
+        with open(self.register_path, "ab") as file:
+            file.write(b"\x02\x0c")  # partially written message
+        self.assertEqual(len(output_set.read_messages(message_type="WRITE")), 20)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from aind_behavior_dynamic_foraging.data_contract import dataset
+from aind_behavior_dynamic_foraging.data_contract._trial_table import make_trial_table
+from aind_behavior_dynamic_foraging.data_contract.licks import (
+    assign_licks_to_periods,
+    detect_lick_bouts,
+    get_lick_edges,
+    get_lick_onsets,
+    lick_interval_statistics,
+)
+
+from .test_trial_table import trial_events, write_session
+
+
+def make_licks(left: list[float], right: list[float]) -> pd.DataFrame:
+    licks = pd.DataFrame({"side": ["left"] * len(left) + ["right"] * len(right), "onset": left + right})
+    return licks.sort_values("onset", ignore_index=True)
+
+
+class TestLickEdges(unittest.TestCase):
+    def test_edges(self):
+        state = pd.Series([False, True, False, True, True, False, True], index=[0.0, 0.5, 1.0, 2.0, 2.5, 3.0, 4.0])
+        edges = get_lick_edges(state)
+        self.assertEqual(edges["onset"].tolist(), [0.5, 2.0, 4.0])
+        self.assertEqual(edges["duration"].tolist()[:2], [0.5, 1.0])
+        self.assertTrue(np.isnan(edges["offset"].iloc[2]))
+        self.assertEqual(get_lick_onsets(state).tolist(), [0.5, 2.0, 4.0])
+        self.assertEqual(get_lick_onsets(pd.Series([], dtype=bool)).tolist(), [])
+
+
+class TestLickBouts(unittest.TestCase):
+    def test_bouts(self):
+        licks = make_licks([0.0, 0.2, 0.4, 3.0, 3.1], [0.5, 0.6])
+        bouts = detect_lick_bouts(licks, max_interval=1.0)
+        self.assertEqual(bouts["side"].tolist(), ["left", "right", "left"])
+        self.assertEqual(bouts["n_licks"].tolist(), [3, 2, 2])
+        self.assertEqual(bouts["start"].tolist(), [0.0, 0.5, 3.0])
+        self.assertEqual(bouts["end"].tolist(), [0.4, 0.6, 3.1])
+
+    def test_no_licks(self):
+        self.assertEqual(len(detect_lick_bouts(make_licks([], []))), 0)
+
+
+class TestLickPeriods(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        root = Path(self._tmp.name)
+        write_session(root, trial_events(0.0, True, block=1) + trial_events(10.0, None, block=1))
+        self.trial_table = make_trial_table(dataset(root))
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_assign(self):
+        licks = assign_licks_to_periods(make_licks([-1.0, 0.5, 1.6, 12.0, 16.0], []), self.trial_table)
+        self.assertEqual(licks["trial"].tolist(), [0, 0, 1, 1])
+        self.assertEqual(
+            licks["period"].tolist(),
+            ["quiescent_period", "reward_consumption_period", "response_period", "iti_period"],
+        )
+
+    def test_interval_statistics(self):
+        licks = make_licks([1.6, 1.8, 2.2, 5.0, 5.5], [1.7])
+        statistics = lick_interval_statistics(licks, self.trial_table)
+        consumption = statistics.loc[(0, "reward_consumption_period", "left")]
+        self.assertEqual(consumption["n_licks"], 3)
+        self.assertAlmostEqual(consumption["mean"], 0.3)
+        self.assertAlmostEqual(consumption["max"], 0.4)
+        self.assertTrue(np.isnan(statistics.loc[(0, "reward_consumption_period", "right"), "mean"]))
+        self.assertEqual(statistics.loc[(0, "iti_period", "left"), "n_licks"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
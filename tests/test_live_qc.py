@@ -0,0 +1,189 @@
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+from aind_behavior_services.data_types import SoftwareEvent
+from aind_behavior_services.rig.harp import ConnectedClockOutput, HarpWhiteRabbit
+
+from aind_behavior_dynamic_foraging.data_qc.live import (
+    CameraMonitor,
+    HarpDeviceMonitor,
+    HarpRegisterTail,
+    LiveQcMonitor,
+)
+
+from . import BEHAVIOR_YML, write_harp_register
+
+sys.path.append(".")
+from examples import rig as example_rig  # isort:skip # pylint: disable=wrong-import-position
+
+CLOCK_GENERATOR_YML = """%YAML 1.1
+---
+device: WhiteRabbit
+whoAmI: 1404
+firmwareVersion: "1.0"
+hardwareTargets: "1.0"
+registers:
+  ConnectedDevices:
+    address: 32
+    type: U16
+    access: Read
+"""
+
+
+def append_events(path: Path, name: str, timestamps) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a", encoding="UTF-8") as file:
+        for timestamp in timestamps:
+            file.write(SoftwareEvent(name=name, timestamp=timestamp, data=None).model_dump_json() + "\n")
+
+
+class TestHarpRegisterTail(unittest.TestCase):
+    def test_reads_only_appended_complete_messages(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "Behavior_34.bin"
+            tail = HarpRegisterTail(path)
+            self.assertEqual(len(tail.read_new()), 0)
+
+            write_harp_register(path, 34, [1.0, 2.0], 1, "EVENT", append=True)
+            data = path.read_bytes()
+            path.write_bytes(data[:-3])
+            self.assertEqual(len(tail.read_new()), 1)
+            path.write_bytes(data)
+            self.assertEqual(len(tail.read_new()), 1)
+            self.assertEqual(len(tail.read_new()), 0)
+
+
+class TestHarpDeviceMonitor(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        self.device_path = self.root / "Behavior.harp"
+        self.commands_path = self.root / "HarpCommands" / "Behavior.harp"
+        self.device_path.mkdir()
+        self.commands_path.mkdir(parents=True)
+        self.monitor = HarpDeviceMonitor(self.device_path, self.commands_path, response_timeout=5.0)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_timestamps_going_back_across_polls(self):
+        write_harp_register(self.device_path / "Behavior_34.bin", 34, [1.0, 2.0], 1, "EVENT", append=True)
+        alerts, messages = self.monitor.poll(0.0)
+        self.assertEqual(alerts, [])
+        self.assertEqual(len(messages[34]), 2)
+
+        write_harp_register(self.device_path / "Behavior_34.bin", 34, [1.5, 3.0], 1, "EVENT", append=True)
+        alerts, _ = self.monitor.poll(1.0)
+        self.assertEqual([alert.check for alert in alerts], ["registers_are_monotonic"])
+
+    def test_commands_without_reply(self):
+        write_harp_register(self.commands_path / "Behavior_34.bin", 34, [1.0, 2.0], 1, append=True)
+        write_harp_register(self.device_path / "Behavior_34.bin", 34, [1.0], 1, append=True)
+        self.assertEqual(self.monitor.poll(0.0)[0], [])
+        self.assertEqual(self.monitor.poll(4.0)[0], [])
+        alerts, _ = self.monitor.poll(6.0)
+        self.assertEqual([alert.check for alert in alerts], ["request_response"])
+        # reported once until the reply arrives
+        self.assertEqual(self.monitor.poll(7.0)[0], [])
+
+        write_harp_register(self.device_path / "Behavior_34.bin", 34, [2.0], 1, append=True)
+        self.assertEqual(self.monitor.poll(8.0)[0], [])
+        self.assertEqual(self.monitor._pending[34], 0)
+
+
+class TestCameraMonitor(unittest.TestCase):
+    def test_dropped_and_stalled_frames(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            camera = CameraMonitor(Path(tmp), timeout=5.0)
+            metadata = Path(tmp) / "metadata.csv"
+            self.assertEqual(camera.poll(0.0), [])
+
+            metadata.write_text("ReferenceTime,CameraFrameNumber,CameraFrameTime\n1.0,0,0\n1.1,1,100\n")
+            self.assertEqual(camera.poll(1.0), [])
+            with open(metadata, "a") as file:
+                file.write("1.2,2,200\n1.4,4,400\n1.5,5")
+            self.assertEqual([alert.message for alert in camera.poll(2.0)], ["Detected 1 dropped frames."])
+            self.assertEqual(camera.n_frames, 4)
+
+            alerts = camera.poll(8.0)
+            self.assertEqual([alert.check for alert in alerts], ["camera_stalled"])
+            self.assertEqual(camera.poll(9.0), [])
+            self.assertEqual(camera.poll(20.0, running=False), [])
+
+
+class TestLiveQcMonitor(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        self.behavior = self.root / "behavior" / "Behavior.harp"
+        self.clock = self.root / "behavior" / "ClockGenerator.harp"
+        for path, yml in ((self.behavior, BEHAVIOR_YML), (self.clock, CLOCK_GENERATOR_YML)):
+            path.mkdir(parents=True)
+            (path / "device.yml").write_text(yml)
+        self.trials = self.root / "behavior" / "SoftwareEvents" / "TrialOutcome.json"
+        rig = example_rig.rig.model_copy(
+            update={
+                "harp_clock_generator": HarpWhiteRabbit(
+                    port_name="COM11",
+                    connected_clock_outputs=[
+                        ConnectedClockOutput(output_channel=0, target_device="Behavior"),
+                        ConnectedClockOutput(output_channel=2, target_device="SoundCard"),
+                    ],
+                )
+            }
+        )
+        self.monitor = LiveQcMonitor(self.root, rig=rig, trial_timeout=60.0, lick_trials=5)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_missing_clock_output(self):
+        write_harp_register(self.clock / "WhiteRabbit_32.bin", 32, [1.0], 0b001, "READ", append=True)
+        alerts = self.monitor.poll(0.0)
+        self.assertEqual([alert.check for alert in alerts], ["clock_outputs_connected"])
+        self.assertIn("2 (SoundCard)", alerts[0].message)
+
+        write_harp_register(self.clock / "WhiteRabbit_32.bin", 32, [2.0], 0b101, "READ", append=True)
+        self.assertEqual(self.monitor.poll(1.0), [])
+
+    def test_subordinate_devices(self):
+        # bit 1 of ClockConfiguration is set when the device generates the clock
+        write_harp_register(self.behavior / "Behavior_14.bin", 14, [1.0], 0x02, "READ", dtype=np.uint8, append=True)
+        alerts = self.monitor.poll(0.0)
+        self.assertEqual([alert.check for alert in alerts], ["devices_are_subordinate"])
+
+    def test_side_without_licks(self):
+        licks = self.behavior / "Behavior_32.bin"
+        for trial in range(6):
+            # lick on the left port only
+            write_harp_register(licks, 32, [trial + 0.1, trial + 0.2], [0b01, 0b00], "EVENT", np.uint8, append=True)
+            append_events(self.trials, "TrialOutcome", [trial + 0.5])
+            alerts = self.monitor.poll(float(trial))
+            if trial < 4:
+                self.assertEqual(alerts, [])
+        self.assertEqual(self.monitor.n_trials, 6)
+        self.assertEqual(self.monitor._trials_without_lick, {"left": 0, "right": 6})
+
+        monitor = LiveQcMonitor(self.root, lick_trials=5)
+        alerts = monitor.poll(0.0)
+        self.assertEqual([(alert.check, alert.severity) for alert in alerts], [("licks_registered", "warning")])
+        self.assertIn("right", alerts[0].message)
+
+    def test_stalled_task_until_session_ends(self):
+        append_events(self.trials, "TrialOutcome", [1.0])
+        self.assertEqual(self.monitor.poll(0.0), [])
+        self.assertEqual([alert.check for alert in self.monitor.poll(61.0)], ["trials_stalled"])
+
+        append_events(self.trials, "TrialOutcome", [62.0])
+        append_events(self.trials.with_name("EndSession.json"), "EndSession", [63.0])
+        self.assertEqual(self.monitor.poll(62.0), [])
+        self.assertTrue(self.monitor.finished)
+        self.assertEqual(self.monitor.poll(200.0), [])
+        self.assertEqual(list(self.monitor.run(interval=0.01)), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,46 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from aind_behavior_services.data_types import SoftwareEvent
+
+from aind_behavior_dynamic_foraging.data_contract import dataset, load_streams
+
+
+class TestLoadStreams(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        software_events = self.root / "behavior" / "SoftwareEvents"
+        software_events.mkdir(parents=True)
+        for name in ("TrialOutcome", "Response"):
+            event = SoftwareEvent(name=name, timestamp=1.0, data=True)
+            (software_events / f"{name}.json").write_text(event.model_dump_json() + "\n")
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_only_declared_streams_are_read(self):
+        this_dataset = dataset(self.root, streams=["Behavior/SoftwareEvents/TrialOutcome"])
+        software_events = this_dataset["Behavior"]["SoftwareEvents"]
+        self.assertTrue(software_events["TrialOutcome"].has_data)
+        self.assertFalse(software_events["Response"].has_data)
+        self.assertFalse(this_dataset["Behavior"]["HarpBehavior"].has_data)
+
+    def test_loaded_streams_are_not_read_again(self):
+        this_dataset = dataset(self.root)
+        (trial_outcome,) = load_streams(this_dataset, ["Behavior/SoftwareEvents/TrialOutcome"])
+        data = trial_outcome.data
+        load_streams(this_dataset, ["Behavior/SoftwareEvents/TrialOutcome"])
+        self.assertIs(trial_outcome.data, data)
+
+    def test_missing_stream(self):
+        this_dataset = dataset(self.root)
+        (end_session,) = load_streams(this_dataset, ["Behavior/SoftwareEvents/EndSession"])
+        self.assertTrue(end_session.has_error)
+        with self.assertRaises(FileNotFoundError):
+            dataset(self.root, streams=["Behavior/SoftwareEvents/EndSession"])
+
+
+if __name__ == "__main__":
+    unittest.main()
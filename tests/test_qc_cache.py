@@ -0,0 +1,85 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from contraqctor import qc
+from contraqctor.contract.text import Text, TextParams
+from contraqctor.qc.reporters import HtmlReporter
+
+from aind_behavior_dynamic_foraging.data_qc.cache import CACHED_MESSAGE_PREFIX, QcResultCache
+from aind_behavior_dynamic_foraging.data_qc.runner import ParallelRunner
+
+from .test_qc_runner import ReadSuite, SleepSuite
+
+
+class FileSuite(qc.Suite):
+    def __init__(self, path: Path):
+        self.path = path
+
+    def test_read(self):
+        return self.pass_test(self.path.read_text(), "read")
+
+
+class TestQcResultCache(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        self.path = self.root / "A.txt"
+        self.path.write_text("A")
+        self.cache = QcResultCache(self.root / ".cache" / "qc")
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def run_qc(self, loaded: list) -> list:
+        stream = Text("A", reader_params=TextParams(path=self.path))
+        runner = ParallelRunner(max_workers=2, cache=self.cache)
+        runner.add_suite(ReadSuite(stream, loaded), "A", streams=[stream])
+        runner.add_suite(SleepSuite(0), "Sleep")
+        return runner.run_all()
+
+    def test_unchanged_suites_are_served_from_cache(self):
+        first = self.run_qc([])
+        loaded: list = []
+        second = self.run_qc(loaded)
+
+        self.assertEqual(loaded, [])
+        self.assertEqual([r.result for r in second["A"]], [r.result for r in first["A"]])
+        self.assertTrue(all(r.message.startswith(CACHED_MESSAGE_PREFIX) for r in second["A"]))
+        # suites without declared streams are always run
+        self.assertFalse(any(r.message.startswith(CACHED_MESSAGE_PREFIX) for r in second["Sleep"]))
+
+    def test_changed_streams_are_run_again(self):
+        self.run_qc([])
+        self.path.write_text("B")
+        os.utime(self.path, ns=(0, 0))
+        loaded: list = []
+        results = self.run_qc(loaded)
+        self.assertEqual(loaded, [True])
+        self.assertEqual(results["A"][0].result, "B")
+
+    def test_file_streams_key_the_cache_without_being_read(self):
+        stream = Text("A", reader_params=TextParams(path=self.path))
+
+        def run_qc() -> qc.Result:
+            runner = ParallelRunner(max_workers=1, cache=self.cache)
+            runner.add_suite(FileSuite(self.path), "A", file_streams=[stream])
+            return runner.run_all()["A"][0]
+
+        self.assertEqual(run_qc().result, "A")
+        self.assertTrue(run_qc().message.startswith(CACHED_MESSAGE_PREFIX))
+        self.path.write_text("B")
+        os.utime(self.path, ns=(0, 0))
+        self.assertEqual(run_qc().result, "B")
+        self.assertFalse(stream.has_data)
+
+    def test_report_marks_cached_results(self):
+        self.run_qc([])
+        report = self.root / "report.html"
+        HtmlReporter(output_path=report).report_results(self.run_qc([]))
+        self.assertIn(CACHED_MESSAGE_PREFIX.strip(), report.read_text(encoding="utf-8"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,120 @@
+import io
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from contraqctor import qc
+from contraqctor.contract import DataStreamCollection
+from contraqctor.contract.text import Text, TextParams
+from rich.console import Console
+
+from aind_behavior_dynamic_foraging.data_qc.runner import ParallelRunner
+
+
+class SleepSuite(qc.Suite):
+    def __init__(self, index: int, duration: float = 0.0):
+        self.index = index
+        self.duration = duration
+
+    def test_sleep(self):
+        time.sleep(self.duration)
+        return self.pass_test(self.index, "slept")
+
+    def test_parity(self):
+        if self.index % 2:
+            return self.fail_test(self.index, "odd")
+        return self.pass_test(self.index, "even")
+
+    def test_warning(self):
+        return self.warn_test(self.index, "warning")
+
+
+class ReadSuite(qc.Suite):
+    def __init__(self, stream: Text, loaded: list):
+        self.stream = stream
+        self.loaded = loaded
+
+    def test_read(self):
+        self.loaded.append(self.stream.has_data)
+        return self.pass_test(self.stream.data, "read")
+
+
+def summary(results: dict) -> list:
+    return [(group, r.suite_name, r.test_name, r.status, r.result) for group, rs in results.items() for r in rs]
+
+
+def make_runner(runner: qc.Runner, duration: float = 0.0) -> qc.Runner:
+    for i in range(4):
+        runner.add_suite(SleepSuite(i, duration), "Even" if i % 2 == 0 else "Odd")
+    return runner
+
+
+class TestParallelRunner(unittest.TestCase):
+    def test_results_match_serial_runner(self):
+        expected = summary(make_runner(qc.Runner()).run_all())
+        self.assertEqual(summary(make_runner(ParallelRunner(max_workers=4)).run_all()), expected)
+
+    def test_suites_run_concurrently(self):
+        def run(runner: qc.Runner) -> float:
+            start = time.perf_counter()
+            make_runner(runner, duration=0.2).run_all()
+            return time.perf_counter() - start
+
+        # the four suites sleep at the same time, rather than one after the other
+        self.assertLess(run(ParallelRunner(max_workers=4)), run(qc.Runner()) / 2)
+
+    def test_elevated_warnings_are_kept(self):
+        with qc.elevated_warnings():
+            results = make_runner(ParallelRunner(max_workers=2)).run_all()
+        warnings = [r for r in results["Even"] if r.test_name == "test_warning"]
+        self.assertTrue(all(r.status == qc.Status.FAILED for r in warnings))
+
+    def test_run_with_progress(self):
+        console = Console(file=io.StringIO())
+        runner = make_runner(ParallelRunner(max_workers=2, console=console))
+        results = runner.run_all_with_progress(render_context=False)
+        self.assertEqual(sum(len(r) for r in results.values()), 12)
+
+    def test_process_pool(self):
+        expected = summary(make_runner(qc.Runner()).run_all())
+        self.assertEqual(summary(make_runner(ParallelRunner(max_workers=2, executor="process")).run_all()), expected)
+
+
+class TestStreamLeases(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        root = Path(self._tmp.name)
+        self.streams = []
+        for name in ("A", "B"):
+            (root / f"{name}.txt").write_text(name)
+            self.streams.append(Text(name, reader_params=TextParams(path=root / f"{name}.txt")))
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_declared_streams_are_loaded_and_released(self):
+        a, b = self.streams
+        loaded: list = []
+        runner = ParallelRunner(max_workers=2)
+        runner.add_suite(ReadSuite(a, loaded), "A", streams=[a])
+        runner.add_suite(ReadSuite(a, loaded), "A", streams=[DataStreamCollection("Both", [a, b])])
+        runner.add_suite(ReadSuite(b, loaded), "B", streams=[b])
+        results = runner.run_all()
+
+        self.assertEqual(loaded, [True, True, True])
+        self.assertEqual([r.result for r in results["A"]], ["A", "A"])
+        self.assertFalse(a.has_data)
+        self.assertFalse(b.has_data)
+
+    def test_streams_loaded_before_the_run_are_kept(self):
+        a, _ = self.streams
+        a.load()
+        runner = ParallelRunner(max_workers=1)
+        runner.add_suite(ReadSuite(a, []), streams=[a])
+        runner.run_all()
+        self.assertTrue(a.has_data)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+import json
+import pstats
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+import numpy as np
+from contraqctor import qc
+
+from aind_behavior_dynamic_foraging.data_qc.reporters import UsageHtmlReporter
+from aind_behavior_dynamic_foraging.data_qc.runner import ParallelRunner
+from aind_behavior_dynamic_foraging.data_qc.usage import write_usage_report
+
+from .test_qc_runner import SleepSuite
+
+
+class AllocateSuite(qc.Suite):
+    def test_allocate(self):
+        data = np.ones(10_000_000, dtype=np.uint8)
+        return self.pass_test(int(data.sum()))
+
+
+class AllocateAndWaitSuite(qc.Suite):
+    def test_allocate_and_wait(self):
+        data = np.ones(10_000_000, dtype=np.uint8)
+        total = int(data.sum())
+        del data
+        # the tests of a concurrent suite start in the meantime
+        time.sleep(0.3)
+        return self.pass_test(total)
+
+
+class TestUsage(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        self.runner = ParallelRunner(max_workers=2)
+        self.runner.add_suite(SleepSuite(0, 0.2), "Slow")
+        self.runner.add_suite(SleepSuite(1), "Fast")
+        self.results = self.runner.run_all()
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_usage_per_suite_and_test(self):
+        slow, fast = self.runner.usage
+        self.assertEqual((slow.group, slow.suite), ("Slow", "SleepSuite"))
+        self.assertEqual(list(slow.tests), ["test_parity", "test_sleep", "test_warning"])
+        self.assertGreaterEqual(slow.tests["test_sleep"].wall_time, 0.2)
+        # sleeping does not use the CPU
+        self.assertLess(slow.tests["test_sleep"].cpu_time, 0.1)
+        self.assertGreater(slow.total.wall_time, fast.total.wall_time)
+        self.assertIsNone(slow.total.peak_memory)
+
+    def test_trace_memory(self):
+        runner = ParallelRunner(max_workers=1, trace_memory=True)
+        runner.add_suite(AllocateSuite())
+        runner.run_all()
+        self.assertGreaterEqual(runner.usage[0].tests["test_allocate"].peak_memory, 10_000_000)
+
+    def test_trace_memory_of_concurrent_suites(self):
+        runner = ParallelRunner(max_workers=2, trace_memory=True)
+        runner.add_suite(AllocateAndWaitSuite())
+        runner.add_suite(SleepSuite(0, 0.1))
+        runner.run_all()
+        self.assertGreaterEqual(runner.usage[0].tests["test_allocate_and_wait"].peak_memory, 10_000_000)
+
+    def test_reports(self):
+        path = self.root / "usage.json"
+        write_usage_report(self.runner.usage, path)
+        suites = json.loads(path.read_text())["suites"]
+        self.assertEqual([suite["group"] for suite in suites], ["Slow", "Fast"])
+
+        report = self.root / "report.html"
+        UsageHtmlReporter(self.runner.usage, output_path=report).report_results(self.results)
+        html = report.read_text(encoding="utf-8")
+        self.assertIn("Resource Usage", html)
+        self.assertLess(html.index("Resource Usage"), html.index("</body>"))
+
+    def test_profile_slowest_suite(self):
+        path = self.root / "qc.prof"
+        usage = self.runner.profile_slowest_suite(path)
+        self.assertEqual(usage.group, "Slow")
+        stats = pstats.Stats(str(path))
+        self.assertTrue(any(function[2] == "test_sleep" for function in stats.stats))
+
+
+if __name__ == "__main__":
+    unittest.main()
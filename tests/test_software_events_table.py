@@ -0,0 +1,95 @@
+import os
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from aind_behavior_services.data_types import SoftwareEvent
+
+from aind_behavior_dynamic_foraging.data_contract import dataset, set_cache_directory, software_events_table
+from aind_behavior_dynamic_foraging.data_contract._software_events_table import read_software_events_table
+from aind_behavior_dynamic_foraging.task_logic.trial_models import Trial, TrialOutcome
+
+
+def write_events(path: Path, events: list[SoftwareEvent]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("".join(event.model_dump_json() + "\n" for event in events))
+
+
+def trial_outcome_event(timestamp: float, is_right_choice, metadata=None) -> SoftwareEvent:
+    outcome = TrialOutcome(
+        trial=Trial(p_reward_left=0.2, p_reward_right=0.6, metadata=metadata),
+        is_right_choice=is_right_choice,
+        is_rewarded=bool(is_right_choice),
+    )
+    return SoftwareEvent(name="TrialOutcome", timestamp=timestamp, data=outcome.model_dump(mode="json"))
+
+
+class TestSoftwareEventsTable(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        self.path = self.root / "behavior" / "SoftwareEvents" / "TrialOutcome.json"
+        write_events(
+            self.path,
+            [
+                trial_outcome_event(1.0, True),
+                trial_outcome_event(2.5, None, metadata={"p_reward_left": 0.2, "p_reward_right": 0.6, "extra": None}),
+                trial_outcome_event(4.0, False),
+            ],
+        )
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_flattens_nested_fields(self):
+        table = read_software_events_table(self.path, use_cache=False)
+        self.assertEqual(list(table.index), [1.0, 2.5, 4.0])
+        self.assertEqual(list(table["trial.p_reward_right"]), [0.6] * 3)
+        self.assertEqual(table["trial.metadata.p_reward_left"].isna().tolist(), [True, False, True])
+        self.assertNotIn("trial.metadata", table.columns)
+        self.assertEqual(str(table["is_right_choice"].dtype), "boolean")
+        self.assertTrue(table["is_right_choice"].isna().iloc[1])
+
+    def test_scalar_data_column(self):
+        path = self.path.with_name("Response.json")
+        write_events(path, [SoftwareEvent(name="Response", timestamp=float(i), data=i % 2 == 0) for i in range(3)])
+        table = read_software_events_table(path, use_cache=False)
+        self.assertEqual(table["data"].tolist(), [True, False, True])
+
+    def test_nothing_is_cached_by_default(self):
+        read_software_events_table(self.path)
+        self.assertEqual([path.name for path in self.root.rglob("*") if path.is_file()], ["TrialOutcome.json"])
+
+    def test_cache_is_reused_and_invalidated(self):
+        set_cache_directory(self.root / "cache")
+        self.addCleanup(set_cache_directory, None)
+        first = read_software_events_table(self.path)
+        # the cache is kept out of the session
+        self.assertFalse((self.root / "behavior" / "SoftwareEvents" / ".cache").exists())
+        (cache_path,) = (self.root / "cache").rglob("*.parquet")
+        self.assertEqual(cache_path.name, "TrialOutcome.parquet")
+        cache_mtime = cache_path.stat().st_mtime_ns
+        self.assertTrue(read_software_events_table(self.path).equals(first))
+        self.assertEqual(cache_path.stat().st_mtime_ns, cache_mtime)
+
+        with open(self.path, "a", encoding="UTF-8") as file:
+            file.write(trial_outcome_event(5.0, True).model_dump_json() + "\n")
+        os.utime(self.path, ns=(cache_mtime + 1, cache_mtime + 1))
+        self.assertEqual(len(read_software_events_table(self.path)), 4)
+
+    def test_concurrent_writers(self):
+        set_cache_directory(self.root / "cache")
+        self.addCleanup(set_cache_directory, None)
+        with ThreadPoolExecutor(8) as executor:
+            tables = list(executor.map(lambda _: read_software_events_table(self.path), range(8)))
+        self.assertTrue(all(table.equals(tables[0]) for table in tables))
+        self.assertEqual([path.name for path in (self.root / "cache").rglob("*.*")], ["TrialOutcome.parquet"])
+
+    def test_from_dataset(self):
+        table = software_events_table(dataset(self.root), "TrialOutcome", use_cache=False)
+        self.assertEqual(len(table), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+import asyncio
+import tempfile
+import unittest
+from pathlib import Path
+
+from aind_behavior_services.data_types import SoftwareEvent
+
+from aind_behavior_dynamic_foraging.data_contract.streaming import (
+    RollingEventsBuffer,
+    SoftwareEventsFollower,
+    SoftwareEventsTail,
+)
+
+
+def event_line(name: str, timestamp: float, data=None) -> str:
+    return SoftwareEvent(name=name, timestamp=timestamp, data=data).model_dump_json() + "\n"
+
+
+class TestSoftwareEventsTail(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        self.directory = self.root / "behavior" / "SoftwareEvents"
+        self.directory.mkdir(parents=True)
+        self.path = self.directory / "TrialOutcome.json"
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def append(self, path: Path, text: str) -> None:
+        with open(path, "a", encoding="UTF-8") as file:
+            file.write(text)
+
+    def test_reads_only_appended_complete_lines(self):
+        tail = SoftwareEventsTail(self.path)
+        self.assertEqual(tail.read_new(), [])
+
+        self.append(self.path, event_line("TrialOutcome", 1.0))
+        partial = event_line("TrialOutcome", 2.0)
+        self.append(self.path, partial[:10])
+        self.assertEqual([event["timestamp"] for event in tail.read_new()], [1.0])
+
+        self.append(self.path, partial[10:])
+        self.assertEqual([event["timestamp"] for event in tail.read_new()], [2.0])
+        self.assertEqual(tail.read_new(), [])
+
+    def test_truncated_file_is_read_again(self):
+        self.append(self.path, event_line("TrialOutcome", 1.0) + event_line("TrialOutcome", 2.0))
+        tail = SoftwareEventsTail(self.path, from_end=True)
+        self.assertEqual(tail.read_new(), [])
+        self.path.write_text(event_line("TrialOutcome", 3.0))
+        self.assertEqual([event["timestamp"] for event in tail.read_new()], [3.0])
+
+    def test_follower_discovers_streams_and_calls_back(self):
+        follower = SoftwareEventsFollower(self.root, buffer_length=2)
+        received = []
+        follower.subscribe(received.append)
+
+        self.append(self.path, "".join(event_line("TrialOutcome", t, {"is_rewarded": True}) for t in (1.0, 3.0, 5.0)))
+        self.append(self.directory / "Response.json", event_line("Response", 2.0, True))
+        events = follower.poll()
+
+        self.assertEqual([event["timestamp"] for event in events], [1.0, 2.0, 3.0, 5.0])
+        self.assertEqual(received, events)
+        table = follower.table("TrialOutcome")
+        self.assertEqual(list(table.index), [3.0, 5.0])
+        self.assertTrue(table["is_rewarded"].all())
+        self.assertIs(follower.table("TrialOutcome"), table)
+
+    def test_follow(self):
+        follower = SoftwareEventsFollower(self.root, names=["TrialOutcome"])
+
+        async def first_event():
+            iterator = follower.follow(poll_interval=0.01)
+            task = asyncio.ensure_future(anext(iterator))
+            await asyncio.sleep(0.05)
+            self.append(self.path, event_line("TrialOutcome", 1.0))
+            return await asyncio.wait_for(task, timeout=5)
+
+        self.assertEqual(asyncio.run(first_event())["timestamp"], 1.0)
+
+
+class TestRollingEventsBuffer(unittest.TestCase):
+    def test_keeps_most_recent_events(self):
+        buffer = RollingEventsBuffer(maxlen=3)
+        buffer.extend({"name": "Response", "timestamp": float(t), "data": t % 2 == 0} for t in range(5))
+        self.assertEqual(len(buffer), 3)
+        self.assertEqual(buffer.to_frame()["data"].tolist(), [True, False, True])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+import datetime
+import tempfile
+import unittest
+from pathlib import Path
+
+import pandas as pd
+from aind_behavior_services.session import Session
+
+from aind_behavior_dynamic_foraging.data_contract.trial_store import read_trial_store, write_trial_store
+
+from .test_trial_table import trial_events, write_session
+
+
+def write_session_with_schema(root: Path, subject: str, n_trials: int) -> Path:
+    write_session(root, [event for i in range(n_trials) for event in trial_events(10.0 * i, True, block=1)])
+    session = Session(
+        subject=subject,
+        date=datetime.datetime(2026, 1, 2, tzinfo=datetime.timezone.utc),
+        experiment="AindDynamicForaging",
+        experimenter=["tester"],
+    )
+    logs = root / "behavior" / "Logs"
+    logs.mkdir(parents=True)
+    (logs / "session_output.json").write_text(session.model_dump_json())
+    return root
+
+
+class TestTrialStore(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        self.store = self.root / "store"
+        self.sessions = [
+            write_session_with_schema(self.root / "789_a", "789", n_trials=3),
+            write_session_with_schema(self.root / "790_a", "790", n_trials=2),
+        ]
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_write_and_read(self):
+        report = write_trial_store(self.sessions, self.store, max_workers=2, include_licks=False)
+        self.assertEqual(report.written, self.sessions)
+        self.assertEqual(report.failed, {})
+        self.assertTrue((self.store / "subject=789" / "date=2026-01-02" / "stage=unknown" / "789_a.parquet").exists())
+
+        trials = read_trial_store(self.store)
+        self.assertEqual(len(trials), 5)
+        self.assertEqual(sorted(trials["session"].unique()), ["789_a", "790_a"])
+        self.assertEqual(len(read_trial_store(self.store, filters=[("subject", "==", "790")])), 2)
+
+    def test_appends_and_reports_errors(self):
+        write_trial_store(self.sessions[:1], self.store, max_workers=1, include_licks=False)
+        broken = self.root / "791_a"
+        broken.mkdir()
+        report = write_trial_store(self.sessions + [broken], self.store, max_workers=1, include_licks=False)
+        self.assertEqual(report.skipped, self.sessions[:1])
+        self.assertEqual(report.written, self.sessions[1:])
+        self.assertEqual(list(report.failed), [broken])
+        self.assertEqual(len(read_trial_store(self.store)), 5)
+
+    def test_sessions_with_different_columns(self):
+        # the first session has neither the metadata of the second nor the same reward type
+        first = self.store / "subject=789" / "date=2026-01-02" / "stage=unknown"
+        second = self.store / "subject=790" / "date=2026-01-03" / "stage=unknown"
+        first.mkdir(parents=True)
+        second.mkdir(parents=True)
+        pd.DataFrame(
+            {"session": ["789_a"] * 2, "trial": [0, 1], "reward_size": [2, 3], "note": [None, None]}
+        ).to_parquet(first / "789_a.parquet", index=False)
+        pd.DataFrame(
+            {"session": ["790_a"], "trial": [0], "reward_size": [2.5], "note": ["x"], "block_index": [4]}
+        ).to_parquet(second / "790_a.parquet", index=False)
+
+        trials = read_trial_store(self.store)
+        self.assertEqual(trials["reward_size"].tolist(), [2.0, 3.0, 2.5])
+        self.assertEqual(trials["block_index"].isna().tolist(), [True, True, False])
+        self.assertEqual(trials["note"].tolist()[2], "x")
+        self.assertEqual(read_trial_store(self.store, filters=[("subject", "==", "790")])["block_index"].tolist(), [4])
+
+
+if __name__ == "__main__":
+    unittest.main()
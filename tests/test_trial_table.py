@@ -0,0 +1,103 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from aind_behavior_services.data_types import SoftwareEvent
+
+from aind_behavior_dynamic_foraging.data_contract import dataset
+from aind_behavior_dynamic_foraging.data_contract._trial_table import make_trial_table
+from aind_behavior_dynamic_foraging.task_logic.trial_models import Metadata, Trial, TrialOutcome
+
+SOFTWARE_EVENTS_FILES = {
+    "QuiescentPeriod": "QuiscentPeriod.json",
+    "ResponsePeriod": "ResponsePeriod.json",
+    "Response": "Response.json",
+    "RewardConsumptionPeriod": "RewardConsumptionPeriod.json",
+    "TrialOutcome": "TrialOutcome.json",
+    "ItiPeriod": "ItiPeriod.json",
+}
+
+
+def write_session(root: Path, events: list[SoftwareEvent]) -> None:
+    directory = root / "behavior" / "SoftwareEvents"
+    directory.mkdir(parents=True, exist_ok=True)
+    for name, file_name in SOFTWARE_EVENTS_FILES.items():
+        lines = [event.model_dump_json() + "\n" for event in events if event.name == name]
+        if lines:
+            (directory / file_name).write_text("".join(lines))
+
+
+def trial_events(start: float, is_right_choice, block: int) -> list[SoftwareEvent]:
+    """Events of a trial lasting 10 s, without a response when `is_right_choice` is None."""
+    outcome = TrialOutcome(
+        trial=Trial(
+            p_reward_left=0.1 * block,
+            p_reward_right=0.5,
+            metadata=Metadata(p_reward_left=0.1 * block, p_reward_right=0.5, extra={"block_index": block}),
+        ),
+        is_right_choice=is_right_choice,
+        is_rewarded=bool(is_right_choice),
+    )
+    events = [
+        SoftwareEvent(name="QuiescentPeriod", timestamp=start, data=1.0),
+        SoftwareEvent(name="ResponsePeriod", timestamp=start + 1, data=2.0),
+    ]
+    if is_right_choice is not None:
+        events += [
+            SoftwareEvent(name="Response", timestamp=start + 1.5, data=is_right_choice),
+            SoftwareEvent(name="RewardConsumptionPeriod", timestamp=start + 1.5, data=3.0),
+        ]
+    events += [
+        SoftwareEvent(name="TrialOutcome", timestamp=start + 4, data=outcome.model_dump(mode="json")),
+        SoftwareEvent(name="ItiPeriod", timestamp=start + 4, data=6.0),
+    ]
+    return events
+
+
+class TestTrialTable(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        events = trial_events(0.0, True, block=1) + trial_events(10.0, None, block=1) + trial_events(20.0, False, 2)
+        # the quiescent period of the second trial restarts, the first start is kept
+        events.append(SoftwareEvent(name="QuiescentPeriod", timestamp=10.5, data=1.0))
+        write_session(self.root, events)
+        self.dataset = dataset(self.root)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_period_times(self):
+        table = make_trial_table(self.dataset)
+        self.assertEqual(len(table), 3)
+        self.assertEqual(table["quiescent_period_start"].tolist(), [0.0, 10.0, 20.0])
+        self.assertEqual(table["outcome_time"].tolist(), [4.0, 14.0, 24.0])
+        self.assertEqual(table["iti_period_start"].tolist(), [4.0, 14.0, 24.0])
+        self.assertTrue(np.isnan(table["response_time"].iloc[1]))
+        self.assertTrue(np.isnan(table["reward_consumption_period_start"].iloc[1]))
+        np.testing.assert_allclose(table["response_latency"].to_numpy()[[0, 2]], [0.5, 0.5])
+        self.assertEqual(table["trial_end"].tolist()[:2], [10.0, 20.0])
+        self.assertTrue(np.isnan(table["trial_end"].iloc[2]))
+
+    def test_outcome_columns(self):
+        table = make_trial_table(self.dataset)
+        self.assertEqual(table["is_right_choice"].tolist(), [True, pd.NA, False])
+        self.assertEqual(table["is_rewarded"].tolist(), [True, False, False])
+        np.testing.assert_allclose(table["block_p_reward_left"].to_numpy(dtype=float), [0.1, 0.1, 0.2])
+        self.assertEqual(table["block_index"].tolist(), [1, 1, 2])
+
+    def test_lick_counts(self):
+        lick_times = {"left": np.array([0.5, 1.2, 2.0, 12.0, 30.0]), "right": np.array([3.0, 25.0])}
+        table = make_trial_table(self.dataset, lick_times=lick_times)
+        self.assertEqual(table["quiescent_period_left_licks"].tolist(), [1, 0, 0])
+        self.assertEqual(table["response_period_left_licks"].tolist(), [1, 1, 0])
+        self.assertEqual(table["reward_consumption_period_left_licks"].tolist(), [1, 0, 0])
+        self.assertEqual(table["reward_consumption_period_right_licks"].tolist(), [1, 0, 0])
+        self.assertEqual(table["iti_period_left_licks"].tolist(), [0, 0, 1])
+        self.assertEqual(table["iti_period_right_licks"].tolist(), [0, 0, 1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+from aind_behavior_services.data_types import SoftwareEvent
+from contraqctor import qc
+
+from aind_behavior_dynamic_foraging.data_contract import dataset
+from aind_behavior_dynamic_foraging.data_qc.trial_timing import TrialTimingQcSuite
+from aind_behavior_dynamic_foraging.task_logic.trial_models import Trial, TrialOutcome
+
+from . import statuses
+from .test_trial_table import write_session
+
+TRIAL = Trial(
+    quiescence_period_duration=0.5,
+    response_deadline_duration=1.0,
+    reward_consumption_duration=0.5,
+    inter_trial_interval_duration=1.0,
+)
+
+
+def timed_trial_events(start: float, is_right_choice, iti: float = 1.0) -> list[SoftwareEvent]:
+    """Events of a trial following the durations of `TRIAL`, followed by the start of the next trial after `iti`."""
+    outcome = TrialOutcome(trial=TRIAL, is_right_choice=is_right_choice, is_rewarded=bool(is_right_choice))
+    events = [
+        SoftwareEvent(name="QuiescentPeriod", timestamp=start, data=None),
+        SoftwareEvent(name="ResponsePeriod", timestamp=start + 0.5, data=None),
+    ]
+    if is_right_choice is None:
+        events.append(SoftwareEvent(name="Response", timestamp=start + 1.5, data=None))
+        outcome_time = start + 1.5
+    else:
+        events += [
+            SoftwareEvent(name="Response", timestamp=start + 0.8, data=is_right_choice),
+            SoftwareEvent(name="RewardConsumptionPeriod", timestamp=start + 0.8, data=None),
+        ]
+        outcome_time = start + 1.3
+    return events + [
+        SoftwareEvent(name="TrialOutcome", timestamp=outcome_time, data=outcome.model_dump(mode="json")),
+        SoftwareEvent(name="ItiPeriod", timestamp=outcome_time, data=None),
+        # the next trial starts when the ITI elapses
+        SoftwareEvent(name="QuiescentPeriod", timestamp=outcome_time + iti, data=None),
+    ]
+
+
+def make_session(root: Path, trials: list[tuple]) -> None:
+    events, start = [], 0.0
+    for is_right_choice, iti in trials:
+        trial = timed_trial_events(start, is_right_choice, iti)
+        events += trial[:-1]
+        start = trial[-1].timestamp
+    write_session(root, events)
+
+
+class TestTrialTimingQcSuite(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_valid_session(self):
+        make_session(self.root, [(True, 1.0), (None, 1.0), (False, 1.0)])
+        results = statuses(TrialTimingQcSuite(dataset(self.root)))
+        self.assertEqual(results.pop("test_quiescence_resets_match_licks"), qc.Status.SKIPPED)
+        self.assertEqual(results.pop("test_auto_reward_valve_writes"), qc.Status.SKIPPED)
+        self.assertTrue(all(status == qc.Status.PASSED for status in results.values()), results)
+
+    def test_timing_errors(self):
+        make_session(self.root, [(True, 0.5), (None, 1.5), (False, 1.0)])
+        results = statuses(TrialTimingQcSuite(dataset(self.root)))
+        self.assertEqual(results["test_iti_duration"], qc.Status.FAILED)
+        self.assertEqual(results["test_period_events_complete"], qc.Status.PASSED)
+
+    def test_missing_period_event(self):
+        events = timed_trial_events(0.0, True)[:-1] + timed_trial_events(2.3, True)[:-1]
+        write_session(self.root, [event for event in events if event.timestamp != 2.8])
+        results = statuses(TrialTimingQcSuite(dataset(self.root)))
+        self.assertEqual(results["test_period_events_complete"], qc.Status.FAILED)
+
+    def test_quiescence_resets_match_licks(self):
+        make_session(self.root, [(True, 1.0), (True, 1.0)])
+        suite = TrialTimingQcSuite(dataset(self.root))
+        suite.setup_suite()
+        suite._licks = np.array([0.2])
+        self.assertEqual(suite.test_quiescence_resets_match_licks().status, qc.Status.FAILED)
+        # the quiescence of the second trial restarts with the lick, from 2.3 s to 2.8 s + 0.5 s
+        suite._trials.loc[1, "response_period_start"] = 3.3
+        suite._licks = np.array([2.8])
+        self.assertEqual(suite.test_quiescence_resets_match_licks().status, qc.Status.PASSED)
+
+    def test_long_session(self):
+        make_session(self.root, [(True if i % 3 else None, 1.0) for i in range(1200)])
+        results = statuses(TrialTimingQcSuite(dataset(self.root)))
+        self.assertEqual(results["test_period_events_monotonic"], qc.Status.PASSED)
+        self.assertEqual(results["test_period_events_complete"], qc.Status.PASSED)
+        self.assertEqual(results["test_iti_duration"], qc.Status.PASSED)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+from aind_behavior_services.data_types import SoftwareEvent
+from contraqctor import qc
+
+from aind_behavior_dynamic_foraging.data_contract import dataset
+from aind_behavior_dynamic_foraging.data_contract.utils import calculate_consumed_water
+from aind_behavior_dynamic_foraging.data_contract.water import _expected_volume_ml, reconcile_water
+from aind_behavior_dynamic_foraging.data_qc.runner import run_suite
+from aind_behavior_dynamic_foraging.data_qc.water import WaterDeliveryQcSuite
+
+from . import BEHAVIOR_YML, write_harp_register
+from .test_trial_table import trial_events, write_session
+
+sys.path.append(".")
+from examples import rig as example_rig  # isort:skip # pylint: disable=wrong-import-position
+
+# the example rig delivers 0.3 mL/s, so a 7 ms opening delivers 2.1 uL
+OPEN_TIME_MS = 7
+
+
+def make_session(root: Path) -> None:
+    """Three trials of 10 s: rewarded on the right, ignored and unrewarded on the left."""
+    write_session(root, trial_events(20.0, True, 1) + trial_events(30.0, None, 1) + trial_events(40.0, False, 1))
+    (root / "behavior" / "SoftwareEvents" / "GiveManualWaterRight.json").write_text(
+        SoftwareEvent(name="GiveManualWaterRight", timestamp=45.05, data=True).model_dump_json() + "\n"
+    )
+    logs = root / "behavior" / "Logs"
+    logs.mkdir(parents=True)
+    (logs / "rig_output.json").write_text(example_rig.rig.model_dump_json())
+
+    behavior = root / "behavior" / "Behavior.harp"
+    behavior.mkdir(parents=True)
+    (behavior / "device.yml").write_text(BEHAVIOR_YML)
+    write_harp_register(behavior / "Behavior_40.bin", 40, [15.0], OPEN_TIME_MS)
+    write_harp_register(behavior / "Behavior_41.bin", 41, [15.0], OPEN_TIME_MS)
+    # right before its open time is set, right in the rewarded trial, left in the ignored trial, manual right water
+    write_harp_register(behavior / "Behavior_34.bin", 34, [10.0, 21.5, 32.0, 45.0], [0x2, 0x2, 0x1, 0x2])
+
+
+class TestWaterReconciliation(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        make_session(self.root)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_reconcile(self):
+        session = dataset(self.root)
+        reconciliation = reconcile_water(session)
+        # the valve registers are read from their files, not kept on the streams
+        self.assertFalse(session["Behavior"]["HarpBehavior"]["PulseSupplyPort0"].has_data)
+        deliveries = reconciliation.deliveries
+        self.assertEqual(deliveries["side"].tolist(), ["right", "right", "left", "right"])
+        self.assertEqual(deliveries["trial"].tolist(), [-1, 0, 1, 2])
+        self.assertEqual(deliveries["is_manual"].tolist(), [False, False, False, True])
+        np.testing.assert_allclose(deliveries["volume_ml"], [np.nan, 0.0021, 0.0021, 0.0021])
+
+        trials = reconciliation.trials
+        np.testing.assert_allclose(trials["expected_right_ml"], [0.002, 0.0, 0.0])
+        np.testing.assert_allclose(trials["delivered_right_ml"], [0.0021, 0.0, 0.0])
+        np.testing.assert_allclose(trials["delivered_left_ml"], [0.0, 0.0021, 0.0])
+        self.assertEqual(trials["n_deliveries_right"].tolist(), [1, 0, 0])
+        self.assertEqual(reconciliation.discrepancies.index.tolist(), [1])
+        self.assertAlmostEqual(reconciliation.total_delivered_ml, 0.0063)
+        self.assertAlmostEqual(reconciliation.total_expected_ml, 0.002)
+        self.assertAlmostEqual(calculate_consumed_water(self.root), 0.0063)
+
+    def test_expected_volume(self):
+        trials = pd.DataFrame(
+            {
+                "is_right_choice": [True, False, True, None],
+                "is_rewarded": [True, True, True, False],
+                "is_auto_reward_right": [None, True, True, False],
+                "reward_size_left": [1.0, 1.0, 1.0, 1.0],
+                "reward_size_right": [2.0, 2.0, 2.0, 2.0],
+            }
+        )
+        expected = _expected_volume_ml(trials)
+        # the auto reward of the chosen side is not delivered twice
+        np.testing.assert_allclose(expected["right"], [0.002, 0.002, 0.002, 0.0])
+        np.testing.assert_allclose(expected["left"], [0.0, 0.001, 0.0, 0.001])
+
+    def test_suite(self):
+        results = {result.test_name: result for result in run_suite(WaterDeliveryQcSuite(dataset(self.root)))}
+        self.assertEqual(results["test_valve_open_times"].status, qc.Status.FAILED)
+        self.assertEqual(results["test_deliveries_within_trials"].status, qc.Status.WARNING)
+        self.assertEqual(results["test_trial_water_matches_rewards"].status, qc.Status.FAILED)
+
+    def test_suite_reports_errors(self):
+        (self.root / "behavior" / "Behavior.harp" / "device.yml").unlink()
+        results = run_suite(WaterDeliveryQcSuite(dataset(self.root)))
+        self.assertEqual({result.status for result in results}, {qc.Status.SKIPPED})
+
+        # anything but missing files is a defect, which must not be hidden as a skipped test
+        with patch("aind_behavior_dynamic_foraging.data_qc.water.reconcile_water", side_effect=KeyError("side")):
+            results = run_suite(WaterDeliveryQcSuite(dataset(self.root)))
+        self.assertEqual({result.status for result in results}, {qc.Status.ERROR})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -19,8 +19,8 @@ class ConcreteBlockBasedTrialGenerator(BaseCoupledTrialGenerator):
 
 
 class ConcreteBlockBasedTrialGeneratorSpec(BaseCoupledTrialGeneratorSpec):
-    def create_generator(self) -> "ConcreteBlockBasedTrialGenerator":
-        return ConcreteBlockBasedTrialGenerator(self)
+    def create_generator(self, seed=None) -> "ConcreteBlockBasedTrialGenerator":
+        return ConcreteBlockBasedTrialGenerator(self, seed)
 
 
 class TestBaseCoupledTrialGenerator(unittest.TestCase):
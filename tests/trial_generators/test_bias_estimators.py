@@ -0,0 +1,81 @@
+import unittest
+
+import numpy as np
+
+from aind_behavior_dynamic_foraging.task_logic.interventions.bias_intervention import BiasInterventionParameters
+from aind_behavior_dynamic_foraging.task_logic.trial_generators import CoupledTrialGeneratorSpec
+from aind_behavior_dynamic_foraging.task_logic.trial_models import Trial, TrialOutcome
+from aind_behavior_dynamic_foraging.task_logic.utils import calculate_bias, create_bias_estimator
+from aind_behavior_dynamic_foraging.task_logic.utils.bias_estimators import (
+    BIAS_ESTIMATORS,
+    ChoiceRateBiasEstimator,
+)
+
+
+def make_outcomes(n: int, right_prob: float, seed: int = 0, ignore_prob: float = 0.1) -> list[TrialOutcome]:
+    rng = np.random.default_rng(seed)
+    return [
+        TrialOutcome(
+            trial=Trial(),
+            is_right_choice=None if rng.random() < ignore_prob else bool(rng.random() < right_prob),
+            is_rewarded=bool(rng.random() < 0.4),
+        )
+        for _ in range(n)
+    ]
+
+
+def run_estimator(name: str, outcomes: list[TrialOutcome], window_length: int = 200) -> np.ndarray:
+    estimator = create_bias_estimator(name, window_length)
+    return np.array([estimator.update(outcome) for outcome in outcomes])
+
+
+class TestBiasEstimators(unittest.TestCase):
+    def test_default_estimator_matches_calculate_bias(self):
+        outcomes = make_outcomes(250, 0.6)
+        expected = [calculate_bias(outcomes[: i + 1]) for i in range(len(outcomes))]
+        np.testing.assert_array_equal(run_estimator("logistic_regression", outcomes), expected)
+
+    def test_incremental_estimator_agrees_with_default(self):
+        outcomes = make_outcomes(250, 0.6, seed=1)
+        np.testing.assert_allclose(
+            run_estimator("incremental_logistic_regression", outcomes),
+            run_estimator("logistic_regression", outcomes),
+            atol=1e-3,
+        )
+
+    def test_sign_follows_choice_bias(self):
+        for name in BIAS_ESTIMATORS:
+            with self.subTest(estimator=name):
+                self.assertGreater(run_estimator(name, make_outcomes(150, 0.9))[-1], 0)
+                self.assertLess(run_estimator(name, make_outcomes(150, 0.1))[-1], 0)
+
+    def test_beta_binomial_forgets_trials_outside_window(self):
+        outcomes = make_outcomes(100, 0.0, ignore_prob=0) + make_outcomes(20, 1.0, ignore_prob=0)
+        estimator = create_bias_estimator("beta_binomial", window_length=20)
+        for outcome in outcomes:
+            bias = estimator.update(outcome)
+        self.assertEqual((estimator.n_right, estimator.n_left), (20, 0))
+        self.assertGreater(bias, 0)
+
+    def test_choice_rate_without_window_is_running_mean(self):
+        estimator = ChoiceRateBiasEstimator(window_length=0)
+        for outcome in make_outcomes(3, 1.0, ignore_prob=0):
+            estimator.update(outcome)
+        self.assertAlmostEqual(estimator.right_choice_rate, (0.5 + 3) / 4)
+
+    def test_unknown_estimator_raises(self):
+        with self.assertRaises(ValueError):
+            create_bias_estimator("unknown")
+
+    def test_generator_uses_estimator_from_spec(self):
+        spec = CoupledTrialGeneratorSpec(
+            bias_intervention_parameters=BiasInterventionParameters(bias_estimator="beta_binomial")
+        )
+        generator = spec.create_generator(seed=0)
+        generator.update(TrialOutcome(trial=Trial(), is_right_choice=True, is_rewarded=True))
+        # digamma(2) - digamma(1) == 1
+        self.assertAlmostEqual(generator.bias, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
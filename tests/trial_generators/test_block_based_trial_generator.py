@@ -1,7 +1,7 @@
 import logging
 import unittest
 from typing import Any
-from unittest.mock import patch
+from unittest.mock import Mock, patch
 
 import numpy as np
 
@@ -32,8 +32,8 @@ class ConcreteBlockBasedTrialGenerator(BlockBasedTrialGenerator):
 
 
 class ConcreteBlockBasedTrialGeneratorSpec(BlockBasedTrialGeneratorSpec):
-    def create_generator(self) -> "ConcreteBlockBasedTrialGenerator":
-        return ConcreteBlockBasedTrialGenerator(self)
+    def create_generator(self, seed=None) -> "ConcreteBlockBasedTrialGenerator":
+        return ConcreteBlockBasedTrialGenerator(self, seed)
 
 
 class TestBlockBasedTrialGenerator(unittest.TestCase):
@@ -60,7 +60,7 @@ class TestAntiBiasBlockBasedTrialGenerator(unittest.TestCase):
     def _patch_bias(self, bias_value: float) -> Any:
 
         return patch(
-            "aind_behavior_dynamic_foraging.task_logic.trial_generators.block_based_trial_generator.calculate_bias",
+            "aind_behavior_dynamic_foraging.task_logic.utils.bias_estimators.calculate_bias",
             return_value=bias_value,
         )
 
@@ -185,8 +185,9 @@ class TestBlockBaseBaitingTrialGenerator(unittest.TestCase):
         self.generator.is_right_baited = True
         self.generator.is_left_baited = True
 
-        with patch("numpy.random.random", return_value=np.array([0.9, 0.9])):
-            trial = self.generator.next()
+        self.generator.rng = Mock(wraps=self.generator.rng)
+        self.generator.rng.random.return_value = np.array([0.9, 0.9])
+        trial = self.generator.next()
         assert trial is not None
         self.assertEqual(trial.p_reward_right, 1.0)
         self.assertEqual(trial.p_reward_left, 1.0)
@@ -197,8 +198,9 @@ class TestBlockBaseBaitingTrialGenerator(unittest.TestCase):
         self.generator.is_right_baited = False
         self.generator.is_left_baited = False
 
-        with patch("numpy.random.random", return_value=np.array([0.1, 0.1])):
-            trial = self.generator.next()
+        self.generator.rng = Mock(wraps=self.generator.rng)
+        self.generator.rng.random.return_value = np.array([0.1, 0.1])
+        trial = self.generator.next()
         assert trial is not None
         self.assertEqual(trial.p_reward_right, 1.0)
         self.assertEqual(trial.p_reward_left, 1.0)
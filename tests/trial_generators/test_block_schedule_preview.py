@@ -0,0 +1,70 @@
+import unittest
+
+import numpy as np
+
+from aind_behavior_dynamic_foraging.task_logic.trial_generators import (
+    CoupledTrialGeneratorSpec,
+    UncoupledTrialGeneratorSpec,
+)
+from aind_behavior_dynamic_foraging.task_logic.trial_generators.coupled_trial_generators.base_coupled_trial_generator import (
+    RewardProbabilityParameters,
+)
+
+
+class TestCoupledBlockSchedulePreview(unittest.TestCase):
+    def setUp(self):
+        self.spec = CoupledTrialGeneratorSpec(
+            reward_probability_parameters=RewardProbabilityParameters(reward_pairs=[[8, 1], [6, 1], [3, 1], [1, 1]])
+        )
+        self.preview = self.spec.preview_block_schedules(n_schedules=200, n_trials=500, seed=0)
+
+    def test_shapes(self):
+        self.assertEqual(self.preview.p_left_reward.shape, (200, 500))
+        self.assertEqual(self.preview.is_right_block_start.shape, (200, 500))
+        self.assertFalse(np.isnan(self.preview.p_left_reward).any())
+
+    def test_reproducible_with_seed(self):
+        other = self.spec.preview_block_schedules(n_schedules=200, n_trials=500, seed=0)
+        np.testing.assert_array_equal(self.preview.p_left_reward, other.p_left_reward)
+
+    def test_probabilities_sum_to_base_reward_sum(self):
+        np.testing.assert_allclose(self.preview.p_left_reward + self.preview.p_right_reward, 0.8)
+
+    def test_block_lengths_within_truncation(self):
+        lengths = self.preview.block_lengths("left")
+        self.assertGreaterEqual(lengths.min(), 20)
+        self.assertLessEqual(lengths.max(), 60)
+        np.testing.assert_array_equal(self.preview.is_left_block_start, self.preview.is_right_block_start)
+
+    def test_next_block_switches_high_reward_side(self):
+        rows, trials = np.nonzero(self.preview.is_left_block_start[:, 1:])
+        before = self.preview.p_right_reward[rows, trials] - self.preview.p_left_reward[rows, trials]
+        after = self.preview.p_right_reward[rows, trials + 1] - self.preview.p_left_reward[rows, trials + 1]
+        unequal = before != 0
+        self.assertTrue(np.all(np.sign(before[unequal]) != np.sign(after[unequal])))
+
+
+class TestUncoupledBlockSchedulePreview(unittest.TestCase):
+    def setUp(self):
+        self.spec = UncoupledTrialGeneratorSpec()
+        self.preview = self.spec.preview_block_schedules(n_schedules=200, n_trials=500, seed=0)
+
+    def test_both_sides_never_at_minimum(self):
+        p_min = min(self.spec.reward_probabilities)
+        self.assertFalse(np.any((self.preview.p_left_reward == p_min) & (self.preview.p_right_reward == p_min)))
+
+    def test_probability_changes_start_a_block(self):
+        for side in ("left", "right"):
+            p_reward = getattr(self.preview, f"p_{side}_reward")
+            is_start = getattr(self.preview, f"is_{side}_block_start")
+            changed = np.diff(p_reward, axis=1) != 0
+            self.assertTrue(np.all(is_start[:, 1:][changed]))
+
+    def test_block_lengths_within_distribution(self):
+        lengths = np.concatenate([self.preview.block_lengths("left"), self.preview.block_lengths("right")])
+        self.assertGreaterEqual(lengths.min(), 1)
+        self.assertLess(lengths.max(), 60)
+
+
+if __name__ == "__main__":
+    unittest.main()
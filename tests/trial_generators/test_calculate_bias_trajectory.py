@@ -0,0 +1,54 @@
+import unittest
+
+import numpy as np
+
+from aind_behavior_dynamic_foraging.task_logic.trial_models import Trial, TrialOutcome
+from aind_behavior_dynamic_foraging.task_logic.utils.calculate_bias import calculate_bias
+from aind_behavior_dynamic_foraging.task_logic.utils.calculate_bias_trajectory import (
+    calculate_bias_trajectories,
+    calculate_bias_trajectory,
+)
+
+
+def make_session(n: int, seed: int, ignore_prob: float = 0.1) -> tuple[list, list]:
+    rng = np.random.default_rng(seed)
+    right_prob = np.clip(0.5 + 0.4 * np.sin(np.arange(n) / 40), 0, 1)
+    choices = [None if rng.random() < ignore_prob else bool(rng.random() < p) for p in right_prob]
+    rewards = [bool(rng.random() < 0.4) for _ in range(n)]
+    return choices, rewards
+
+
+class TestCalculateBiasTrajectory(unittest.TestCase):
+    def test_matches_calculate_bias_on_prefixes(self):
+        """Each element should equal calculate_bias on the session prefix, including the 200 trial window."""
+        choices, rewards = make_session(320, seed=0)
+        outcomes = [TrialOutcome(trial=Trial(), is_right_choice=c, is_rewarded=r) for c, r in zip(choices, rewards)]
+        expected = [calculate_bias(outcomes[: i + 1]) for i in range(len(outcomes))]
+        np.testing.assert_allclose(calculate_bias_trajectory(choices, rewards), expected, atol=1e-3)
+
+    def test_edge_cases(self):
+        """Short histories give 0 and one-sided choices give +-1, as in calculate_bias."""
+        np.testing.assert_array_equal(calculate_bias_trajectory([True] * 5, [True] * 5), np.zeros(5))
+        np.testing.assert_array_equal(calculate_bias_trajectory([True] * 8, [False] * 8), [0] * 5 + [1] * 3)
+        np.testing.assert_array_equal(calculate_bias_trajectory([False] * 8, [False] * 8), [0] * 5 + [-1] * 3)
+
+    def test_ignored_trials_repeat_previous_bias(self):
+        choices, rewards = make_session(50, seed=1, ignore_prob=0)
+        bias = calculate_bias_trajectory(choices + [None, None], rewards + [False, False])
+        self.assertEqual(bias[-1], bias[-3])
+
+    def test_mismatched_lengths_raise(self):
+        with self.assertRaises(ValueError):
+            calculate_bias_trajectory([True, False], [True])
+
+    def test_multiple_sessions_in_worker_processes(self):
+        sessions = [make_session(150, seed=seed) for seed in range(3)]
+        serial = calculate_bias_trajectories(sessions, max_workers=1)
+        parallel = calculate_bias_trajectories(sessions, max_workers=2)
+        self.assertEqual(len(parallel), 3)
+        for expected, actual in zip(serial, parallel):
+            np.testing.assert_array_equal(expected, actual)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -15,7 +15,7 @@ class MockTrialGeneratorSpec(BaseTrialGeneratorSpecModel):
     type: Literal["MockTrialGenerator"] = "MockTrialGenerator"
     num_trials: int = Field(default=10, description="Number of trials to generate")
 
-    def create_generator(self) -> "MockTrialGenerator":
+    def create_generator(self, seed=None) -> "MockTrialGenerator":
         return MockTrialGenerator(self)
 
 
@@ -0,0 +1,77 @@
+import unittest
+
+import numpy as np
+
+from aind_behavior_dynamic_foraging.task_logic.trial_generators import (
+    CoupledTrialGeneratorSpec,
+    CoupledWarmupTrialGeneratorSpec,
+    TrialGeneratorCompositeSpec,
+    UncoupledTrialGeneratorSpec,
+)
+from aind_behavior_dynamic_foraging.task_logic.trial_generators._base import make_seed_sequence
+from aind_behavior_dynamic_foraging.task_logic.trial_models import TrialOutcome
+
+
+def run_session(generator, n_trials: int = 200) -> list[tuple]:
+    """Drive a generator with a fixed, seeded behavior and record the generated trial parameters."""
+    behavior_rng = np.random.default_rng(1234)
+    trials = []
+    for _ in range(n_trials):
+        trial = generator.next()
+        if trial is None:
+            break
+        trials.append(
+            (
+                trial.p_reward_left,
+                trial.p_reward_right,
+                trial.quiescence_period_duration,
+                trial.inter_trial_interval_duration,
+            )
+        )
+        is_right_choice = bool(behavior_rng.random() < 0.5)
+        generator.update(
+            TrialOutcome(trial=trial, is_right_choice=is_right_choice, is_rewarded=bool(behavior_rng.random() < 0.5))
+        )
+    return trials
+
+
+class TestSeededTrialGenerators(unittest.TestCase):
+    def test_same_seed_reproduces_session(self):
+        for spec in [CoupledTrialGeneratorSpec(), CoupledWarmupTrialGeneratorSpec(), UncoupledTrialGeneratorSpec()]:
+            with self.subTest(spec=spec.type):
+                self.assertEqual(
+                    run_session(spec.create_generator(seed=42)), run_session(spec.create_generator(seed=42))
+                )
+
+    def test_different_seeds_produce_different_sessions(self):
+        spec = UncoupledTrialGeneratorSpec()
+        self.assertNotEqual(run_session(spec.create_generator(seed=1)), run_session(spec.create_generator(seed=2)))
+
+    def test_seed_is_independent_of_global_state(self):
+        spec = CoupledTrialGeneratorSpec()
+        np.random.seed(0)
+        first = run_session(spec.create_generator(seed=7))
+        np.random.seed(1)
+        second = run_session(spec.create_generator(seed=7))
+        self.assertEqual(first, second)
+
+    def test_composite_children_get_independent_streams(self):
+        spec = TrialGeneratorCompositeSpec(generators=[UncoupledTrialGeneratorSpec(), UncoupledTrialGeneratorSpec()])
+        generator = spec.create_generator(seed=3)
+        first, second = generator._generators
+        self.assertNotEqual(first.rng.random(), second.rng.random())
+
+    def test_composite_is_reproducible(self):
+        spec = TrialGeneratorCompositeSpec(
+            generators=[CoupledWarmupTrialGeneratorSpec(), CoupledTrialGeneratorSpec()],
+        )
+        self.assertEqual(run_session(spec.create_generator(seed=5)), run_session(spec.create_generator(seed=5)))
+
+    def test_make_seed_sequence_passes_through_seed_sequence(self):
+        seed_sequence = np.random.SeedSequence(10)
+        self.assertIs(make_seed_sequence(seed_sequence), seed_sequence)
+        self.assertEqual(make_seed_sequence(10).entropy, 10)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,137 @@
+import unittest
+
+import numpy as np
+from aind_behavior_services.task.distributions import (
+    ExponentialDistribution,
+    ExponentialDistributionParameters,
+    NormalDistribution,
+    NormalDistributionParameters,
+    PoissonDistribution,
+    PoissonDistributionParameters,
+    Scalar,
+    ScalarDistributionParameter,
+    ScalingParameters,
+    TruncationParameters,
+    UniformDistribution,
+    UniformDistributionParameters,
+)
+from aind_behavior_services.task.distributions_utils import draw_samples
+
+from aind_behavior_dynamic_foraging.task_logic.trial_generators import (
+    CoupledTrialGeneratorSpec,
+    CoupledWarmupTrialGeneratorSpec,
+    UncoupledTrialGeneratorSpec,
+)
+from aind_behavior_dynamic_foraging.task_logic.trial_generators.coupled_trial_generators.coupled_trial_generator import (
+    CoupledTrialGenerationEndConditions,
+)
+from aind_behavior_dynamic_foraging.task_logic.trial_generators.session_budget import estimate_session_budget
+from aind_behavior_dynamic_foraging.task_logic.utils import distribution_moments
+
+
+def scalar(value: float) -> Scalar:
+    return Scalar(distribution_parameters=ScalarDistributionParameter(value=value))
+
+
+class TestDistributionMoments(unittest.TestCase):
+    def assert_matches_samples(self, distribution, n: int = 50000):
+        samples = draw_samples(distribution, n, np.random.default_rng(0))
+        mean, variance = distribution_moments(distribution)
+        self.assertAlmostEqual(mean, samples.mean(), delta=4 * np.sqrt(variance / n) + 1e-9)
+        self.assertAlmostEqual(variance, samples.var(), delta=0.05 * variance + 1e-9)
+
+    def test_scalar_with_scaling(self):
+        distribution = scalar(2).model_copy(update={"scaling_parameters": ScalingParameters(scale=3, offset=1)})
+        self.assertEqual(distribution_moments(distribution), (7.0, 0.0))
+
+    def test_exponential_without_truncation(self):
+        distribution = ExponentialDistribution(distribution_parameters=ExponentialDistributionParameters(rate=0.5))
+        mean, variance = distribution_moments(distribution)
+        self.assertAlmostEqual(mean, 2)
+        self.assertAlmostEqual(variance, 4)
+
+    def test_exclude_truncation_matches_samples(self):
+        self.assert_matches_samples(
+            ExponentialDistribution(
+                distribution_parameters=ExponentialDistributionParameters(rate=1 / 2),
+                truncation_parameters=TruncationParameters(max=8),
+                scaling_parameters=ScalingParameters(offset=1),
+            )
+        )
+
+    def test_clamp_truncation_with_negative_scale_matches_samples(self):
+        self.assert_matches_samples(
+            NormalDistribution(
+                distribution_parameters=NormalDistributionParameters(mean=1, std=2),
+                scaling_parameters=ScalingParameters(scale=-2, offset=3),
+                truncation_parameters=TruncationParameters(min=-1, max=4, truncation_mode="clamp"),
+            )
+        )
+
+    def test_discrete_truncation_matches_samples(self):
+        self.assert_matches_samples(
+            PoissonDistribution(
+                distribution_parameters=PoissonDistributionParameters(rate=3),
+                truncation_parameters=TruncationParameters(min=1, max=4),
+            )
+        )
+
+    def test_exclude_without_valid_values_falls_back_to_bound(self):
+        distribution = UniformDistribution(
+            distribution_parameters=UniformDistributionParameters(min=0, max=1),
+            truncation_parameters=TruncationParameters(min=5, max=6),
+        )
+        self.assertEqual(distribution_moments(distribution), (5.0, 0.0))
+
+
+class TestEstimateSessionBudget(unittest.TestCase):
+    def setUp(self):
+        self.spec = CoupledTrialGeneratorSpec(
+            quiescent_duration=scalar(1),
+            inter_trial_interval_duration=scalar(2),
+            response_duration=1,
+            reward_consumption_duration=3,
+            trial_generation_end_parameters=CoupledTrialGenerationEndConditions(
+                max_trial=1000, max_time=600, min_time=300
+            ),
+        )
+
+    def test_time_limited_session(self):
+        budget = estimate_session_budget(self.spec)
+        self.assertAlmostEqual(budget.trial_duration, 6)
+        self.assertAlmostEqual(budget.trial_duration_std, 0)
+        self.assertAlmostEqual(budget.trial_count, 100)
+        self.assertAlmostEqual(budget.reward_count, 40)
+        self.assertAlmostEqual(budget.water_volume, 80)
+
+    def test_trial_limited_session(self):
+        self.spec.trial_generation_end_parameters.max_trial = 49
+        budget = estimate_session_budget(self.spec)
+        self.assertAlmostEqual(budget.trial_count, 50)
+        self.assertAlmostEqual(budget.session_duration, 300)
+
+    def test_ignored_trials_end_session_at_minimum_time(self):
+        budget = estimate_session_budget(self.spec, response_rate=0.1)
+        self.assertEqual(budget.session_duration, 300)
+        # ignored trials skip consumption but wait out the response window
+        self.assertAlmostEqual(budget.trial_duration, 1 + 0.1 * 3 + 0.9 * 1 + 2)
+
+    def test_uncoupled_reward_rate(self):
+        spec = UncoupledTrialGeneratorSpec(reward_probabilities=[0.1, 0.5, 0.9])
+        self.assertAlmostEqual(
+            estimate_session_budget(spec).reward_count / estimate_session_budget(spec).trial_count, 0.5
+        )
+
+    def test_spec_without_time_limit_requires_session_duration(self):
+        spec = CoupledWarmupTrialGeneratorSpec()
+        with self.assertRaises(ValueError):
+            estimate_session_budget(spec)
+        self.assertGreater(estimate_session_budget(spec, session_duration=600).trial_count, 0)
+
+    def test_invalid_response_rate(self):
+        with self.assertRaises(ValueError):
+            estimate_session_budget(self.spec, response_rate=1.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
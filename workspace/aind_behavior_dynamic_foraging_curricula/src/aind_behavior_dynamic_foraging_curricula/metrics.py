@@ -4,6 +4,7 @@ from typing import Annotated, List, Literal, Optional
 
 from aind_behavior_curriculum import Metrics
 from aind_behavior_dynamic_foraging.data_contract import dataset as df_foraging_dataset
+from aind_behavior_dynamic_foraging.data_contract import software_events_table
 from aind_behavior_dynamic_foraging.task_logic.utils.calculate_foraging_efficiency import calculate_foraging_efficiency
 from pydantic import BeforeValidator, Field
 
@@ -11,6 +12,22 @@ STAGE_NAMES = Literal["STAGE_1_WARMUP", "STAGE_1", "STAGE_2", "STAGE_3", "STAGE_
 
 logger = logging.getLogger(__name__)
 
+# streams read by metrics_from_dataset, the rest of the session is never parsed
+METRICS_STREAMS = (
+    "Behavior/SoftwareEvents/TrialGeneratorSpec",
+    "Behavior/SoftwareEvents/TrialOutcome",
+    "Behavior/TrainerState",
+)
+
+# columns of the TrialOutcome table read by metrics_from_dataset
+_OUTCOME_COLUMNS = [
+    "is_right_choice",
+    "is_rewarded",
+    "trial.is_auto_reward_right",
+    "trial.metadata.p_reward_right",
+    "trial.metadata.p_reward_left",
+]
+
 
 def coerce_none_to_nan(v: Optional[float]) -> float:
     if v is None:
@@ -59,21 +76,20 @@ def metrics_from_dataset(
             computing metrics.
     """
 
-    dataset = df_foraging_dataset(data_directory)
-    software_events = dataset["Behavior"]["SoftwareEvents"]
-    software_events.load_all()
-
-    trial_generator_spec = software_events["TrialGeneratorSpec"].data["data"].iloc[-1]
-    is_baiting = trial_generator_spec.get("is_baiting", False)
-    trial_outcomes = software_events["TrialOutcome"].data["data"].iloc
+    dataset = df_foraging_dataset(data_directory, streams=METRICS_STREAMS, use_cache=True)
+    trial_generator_spec = software_events_table(dataset, "TrialGeneratorSpec")
+    is_baiting = "is_baiting" in trial_generator_spec and bool(
+        trial_generator_spec["is_baiting"].fillna(False).iloc[-1]
+    )
+    trial_outcomes = software_events_table(dataset, "TrialOutcome").reindex(columns=_OUTCOME_COLUMNS)
     # exclude auto response and ignored trials
-    filtered = [
-        t for t in trial_outcomes if t["is_right_choice"] is not None and t["trial"]["is_auto_reward_right"] is None
+    filtered = trial_outcomes[
+        trial_outcomes["is_right_choice"].notna() & trial_outcomes["trial.is_auto_reward_right"].isna()
     ]
-    is_right_choice = [to["is_right_choice"] for to in filtered]
-    is_rewarded = [to["is_rewarded"] for to in filtered]
-    p_right_reward = [to["trial"]["metadata"]["p_reward_right"] for to in filtered]
-    p_left_reward = [to["trial"]["metadata"]["p_reward_left"] for to in filtered]
+    is_right_choice = filtered["is_right_choice"].tolist()
+    is_rewarded = filtered["is_rewarded"].tolist()
+    p_right_reward = filtered["trial.metadata.p_reward_right"].tolist()
+    p_left_reward = filtered["trial.metadata.p_reward_left"].tolist()
     foraging_efficiency = calculate_foraging_efficiency(
         is_baiting=is_baiting, is_rewarded=is_rewarded, p_left_reward=p_left_reward, p_right_reward=p_right_reward
     )
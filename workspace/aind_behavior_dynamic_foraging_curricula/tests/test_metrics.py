@@ -3,6 +3,8 @@ from pathlib import Path
 from typing import Optional
 from unittest.mock import MagicMock, PropertyMock, patch
 
+from aind_behavior_dynamic_foraging.data_contract._software_events_table import events_to_table
+
 from aind_behavior_dynamic_foraging_curricula.metrics import (
     metrics_from_dataset,
 )
@@ -29,23 +31,13 @@ def _make_trial(
 def _patch_dataset(
     trials: list[dict], is_baiting: bool = True, prev_metrics: Optional[dict] = None, stage_name: str = "stage_1"
 ):
-    """Patch df_foraging_dataset with a mock matching the access pattern in metrics_from_dataset."""
+    """Patch the dataset and software events tables with mocks matching the access pattern in metrics_from_dataset."""
 
     # software events
-    mock_trial_spec = MagicMock()
-    mock_trial_spec.data = {"data": MagicMock()}
-    mock_trial_spec.data["data"].iloc.__getitem__ = MagicMock(return_value={"is_baiting": is_baiting})
-    mock_trial_spec.data["data"].iloc[-1] = {"is_baiting": is_baiting}
-
-    # trial outcomes
-    mock_trial_outcome = MagicMock()
-    mock_trial_outcome.data = {"data": MagicMock(iloc=trials)}
-
-    # trial generator
-    mock_software_events = MagicMock()
-    mock_software_events.__getitem__ = MagicMock(
-        side_effect=lambda key: mock_trial_spec if key == "TrialGeneratorSpec" else mock_trial_outcome
-    )
+    events = {
+        "TrialGeneratorSpec": [{"name": "TrialGeneratorSpec", "timestamp": 0.0, "data": {"is_baiting": is_baiting}}],
+        "TrialOutcome": [{"name": "TrialOutcome", "timestamp": float(i), "data": t} for i, t in enumerate(trials)],
+    }
 
     # trainer state
     mock_trainer_state = MagicMock(**{"data.stage.name": stage_name})
@@ -60,7 +52,6 @@ def _patch_dataset(
     mock_behavior = MagicMock()
     mock_behavior.__getitem__ = MagicMock(
         side_effect=lambda key: {
-            "SoftwareEvents": mock_software_events,
             "TrainerState": mock_trainer_state,
             "PreviousMetrics": mock_previous_metrics,
         }[key]
@@ -68,9 +59,10 @@ def _patch_dataset(
 
     mock_dataset = MagicMock()
     mock_dataset.__getitem__ = MagicMock(return_value=mock_behavior)
-    return patch(
-        "aind_behavior_dynamic_foraging_curricula.metrics.df_foraging_dataset",
-        return_value=mock_dataset,
+    return patch.multiple(
+        "aind_behavior_dynamic_foraging_curricula.metrics",
+        df_foraging_dataset=MagicMock(return_value=mock_dataset),
+        software_events_table=lambda _, name: events_to_table(events[name]),
     )
 
 
@@ -9,7 +9,8 @@ from typing import Optional
 import git
 from aind_behavior_curriculum import TrainerState
 from aind_behavior_dynamic_foraging.data_contract import dataset as df_foraging_dataset
-from aind_behavior_dynamic_foraging.data_contract.utils import calculate_consumed_water
+from aind_behavior_dynamic_foraging.data_contract import software_events_table
+from aind_behavior_dynamic_foraging.data_contract.water import get_valve_deliveries, reconcile_water
 from aind_behavior_dynamic_foraging.rig import AindDynamicForagingRig
 from aind_behavior_dynamic_foraging.task_logic import AindDynamicForagingTaskLogic
 from aind_behavior_services.rig import Device as AbsDevice
@@ -102,7 +103,7 @@ class AindAcquisitionDataMapper(AindDataSchemaSessionDataMapper):
                 If the dataset is malformed or missing required fields for
                 computing metrics.
         """
-        dataset = df_foraging_dataset(self.data_path)
+        dataset = df_foraging_dataset(self.data_path, use_cache=True)
         input_schemas = dataset["Behavior"]["InputSchemas"]
         session_model = Session.model_validate(input_schemas["Session"].data)
         rig_model = AindDynamicForagingRig.model_validate(input_schemas["Rig"].data)
@@ -149,13 +150,25 @@ class AindAcquisitionDataMapper(AindDataSchemaSessionDataMapper):
 
         # populate behavior epoch
         metrics = dataset["Behavior"]["Metrics"].data
-        trial_outcomes = dataset["Behavior"]["SoftwareEvents"]["TrialOutcome"].data["data"].iloc
-        rewarded = sum(to["is_rewarded"] for to in trial_outcomes)
-        water = calculate_consumed_water(self.data_path)
+        trial_outcomes = software_events_table(dataset, "TrialOutcome")
+        rewarded = int(trial_outcomes["is_rewarded"].sum())
+        try:
+            water_reconciliation = reconcile_water(dataset)
+        except Exception as e:
+            # the delivered total only needs the valve openings, not their trials
+            logger.warning("Failed to reconcile the water deliveries with the trials: %s" % e)
+            water = float(get_valve_deliveries(dataset)["volume_ml"].sum())
+        else:
+            if not water_reconciliation.discrepancies.empty:
+                logger.warning(
+                    "Water delivered in %d trial(s) does not match their reward."
+                    % len(water_reconciliation.discrepancies)
+                )
+            water = water_reconciliation.total_delivered_ml
         performance_metrics = PerformanceMetrics(
             reward_consumed_during_epoch=None if not water else Decimal(str(water)),
             reward_consumed_unit=units.VolumeUnit.ML,
-            trials_total=trial_outcomes[:].shape[0],
+            trials_total=len(trial_outcomes),
             trials_finished=metrics.unignored_trials_per_session[-1],
             trials_rewarded=rewarded,
             output_parameters=metrics.model_dump(),
@@ -174,7 +187,7 @@ class AindAcquisitionDataMapper(AindDataSchemaSessionDataMapper):
         # Construct aind-data-schema session
         return Acquisition(
             subject_id=session_model.subject,
-            subject_details=_get_subject_details(self.data_path),
+            subject_details=_get_subject_details(water),
             instrument_id=rig_model.rig_name,
             acquisition_end_time=acquisition_end_time,
             acquisition_start_time=session_model.date,
@@ -186,8 +199,7 @@ class AindAcquisitionDataMapper(AindDataSchemaSessionDataMapper):
         )
 
 
-def _get_subject_details(data_path: os.PathLike) -> AcquisitionSubjectDetails:
-    water = calculate_consumed_water(data_path)
+def _get_subject_details(water: float) -> AcquisitionSubjectDetails:
     return AcquisitionSubjectDetails(
         mouse_platform_name="tube",
         reward_consumed_total=None if not water else Decimal(str(water)),
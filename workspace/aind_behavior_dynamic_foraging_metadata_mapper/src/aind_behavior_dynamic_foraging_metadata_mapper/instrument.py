@@ -129,7 +129,7 @@ class AindInstrumentDataMapper(AindDataSchemaRigDataMapper):
                 computing metrics.
         """
 
-        dataset = df_foraging_dataset(self._data_path)
+        dataset = df_foraging_dataset(self._data_path, use_cache=True)
         input_schemas = dataset["Behavior"]["InputSchemas"]
         rig = AindDynamicForagingRig.model_validate(input_schemas["Rig"].data)
 